@@ -1,5 +1,7 @@
 import { mutation, internalMutation, query } from "./_generated/server";
 import { v } from "convex/values";
+import { paginationOptsValidator } from "convex/server";
+import { internal } from "./_generated/api";
 
 export const upsertTool = mutation({
   args: {
@@ -27,6 +29,7 @@ export const upsertTool = mutation({
     features: v.array(v.string()),
     tags: v.array(v.string()),
     isOpenSource: v.boolean(),
+    syncHash: v.optional(v.string()),
   },
   handler: async (ctx, args) => {
     const category = await ctx.db
@@ -64,6 +67,7 @@ export const upsertTool = mutation({
       isOpenSource: args.isOpenSource,
       isActive: true,
       isFeatured: false,
+      syncHash: args.syncHash,
     };
 
     if (existingTool) {
@@ -237,11 +241,21 @@ export const bulkUpsertToolsPublic = mutation({
         features: v.array(v.string()),
         tags: v.array(v.string()),
         isOpenSource: v.boolean(),
+        syncHash: v.optional(v.string()),
       })
     ),
+    // Only the streaming vibe-tool sync sets this; bulk seeds stay silent
+    notifyNewTools: v.optional(v.boolean()),
   },
   handler: async (ctx, args) => {
-    const results = { created: 0, updated: 0, skipped: 0, errors: [] as string[] };
+    const results = {
+      created: 0,
+      updated: 0,
+      skipped: 0,
+      errors: [] as string[],
+      // Per-slug result, so callers only record the tools actually written
+      outcomes: [] as { slug: string; action: "created" | "updated" | "skipped" | "error" }[],
+    };
 
     for (const tool of args.tools) {
       try {
@@ -252,6 +266,8 @@ export const bulkUpsertToolsPublic = mutation({
 
         if (!category) {
           results.skipped++;
+          results.errors.push(`${tool.name}: Category not found: ${tool.categorySlug}`);
+          results.outcomes.push({ slug: tool.slug, action: "skipped" });
           continue;
         }
 
@@ -280,17 +296,33 @@ export const bulkUpsertToolsPublic = mutation({
           isOpenSource: tool.isOpenSource,
           isActive: true,
           isFeatured: false,
+          syncHash: tool.syncHash,
         };
 
         if (existingTool) {
           await ctx.db.patch(existingTool._id, toolData);
           results.updated++;
+          results.outcomes.push({ slug: tool.slug, action: "updated" });
         } else {
-          await ctx.db.insert("tools", toolData);
+          const id = await ctx.db.insert("tools", toolData);
+
+          // Fan out in a separate transaction so a batch of new tools
+          // stays within this mutation's write limits
+          if (args.notifyNewTools) {
+            await ctx.scheduler.runAfter(0, internal.ingest.notifyNewTool, {
+              toolId: id,
+              toolName: tool.name,
+              toolSlug: tool.slug,
+              categoryName: category.name,
+            });
+          }
+
           results.created++;
+          results.outcomes.push({ slug: tool.slug, action: "created" });
         }
       } catch (error) {
         results.errors.push(`${tool.name}: ${error}`);
+        results.outcomes.push({ slug: tool.slug, action: "error" });
       }
     }
 
@@ -298,6 +330,53 @@ export const bulkUpsertToolsPublic = mutation({
   },
 });
 
+export const notifyNewTool = internalMutation({
+  args: {
+    toolId: v.id("tools"),
+    toolName: v.string(),
+    toolSlug: v.string(),
+    categoryName: v.string(),
+  },
+  handler: async (ctx, args) => {
+    const allSettings = await ctx.db.query("userSettings").collect();
+    const usersToNotify = allSettings.filter(
+      (settings) => settings.notifications?.newToolAlerts !== false
+    );
+
+    for (const settings of usersToNotify) {
+      await ctx.db.insert("notifications", {
+        userId: settings.userId,
+        type: "new_tool_discovered",
+        title: "New Tool Discovered!",
+        message: `${args.toolName} has been added to ${args.categoryName}. Check it out!`,
+        icon: "Sparkles",
+        isRead: false,
+        createdAt: Date.now(),
+        metadata: {
+          toolId: args.toolId,
+          link: `/tools/${args.toolSlug}`,
+        },
+      });
+    }
+
+    return { notifiedUsers: usersToNotify.length };
+  },
+});
+
+export const listToolSyncHashes = query({
+  args: { paginationOpts: paginationOptsValidator },
+  handler: async (ctx, args) => {
+    const result = await ctx.db.query("tools").paginate(args.paginationOpts);
+    return {
+      ...result,
+      page: result.page.map((tool) => ({
+        slug: tool.slug,
+        syncHash: tool.syncHash ?? null,
+      })),
+    };
+  },
+});
+
 export const deleteToolBySlug = mutation({
   args: {
     slug: v.string(),
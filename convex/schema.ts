@@ -143,6 +143,7 @@ export default defineSchema({
       })),
       lastFetched: v.number(),
     })),
+    syncHash: v.optional(v.string()),
   })
     .index("by_slug", ["slug"])
     .index("by_category", ["categoryId"])
@@ -327,6 +327,22 @@ export const getAllForLogos = query({
   },
 });
 
+export const getNpmPackages = query({
+  handler: async (ctx) => {
+    const tools = await ctx.db
+      .query("tools")
+      .filter((q) => q.eq(q.field("isActive"), true))
+      .collect();
+
+    return tools
+      .filter((tool) => tool.npmPackageName)
+      .map((tool) => ({
+        slug: tool.slug,
+        npmPackageName: tool.npmPackageName!,
+      }));
+  },
+});
+
 export const updateLogo = mutation({
   args: {
     toolId: v.id("tools"),
@@ -338,3 +354,43 @@ export const updateLogo = mutation({
     });
   },
 });
+
+export const bulkUpdateLogos = mutation({
+  args: {
+    updates: v.array(
+      v.object({
+        toolId: v.id("tools"),
+        logoUrl: v.string(),
+      })
+    ),
+  },
+  handler: async (ctx, args) => {
+    const results = {
+      updated: 0,
+      unchanged: 0,
+      missing: 0,
+      errors: [] as string[],
+      outcomes: [] as { toolId: string; action: "updated" | "unchanged" | "missing" }[],
+    };
+
+    for (const update of args.updates) {
+      const tool = await ctx.db.get(update.toolId);
+      if (!tool) {
+        results.missing++;
+        results.errors.push(`${update.toolId}: tool not found`);
+        results.outcomes.push({ toolId: update.toolId, action: "missing" });
+        continue;
+      }
+      if (tool.logoUrl === update.logoUrl) {
+        results.unchanged++;
+        results.outcomes.push({ toolId: update.toolId, action: "unchanged" });
+        continue;
+      }
+      await ctx.db.patch(update.toolId, { logoUrl: update.logoUrl });
+      results.updated++;
+      results.outcomes.push({ toolId: update.toolId, action: "updated" });
+    }
+
+    return results;
+  },
+});
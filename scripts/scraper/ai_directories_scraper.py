@@ -1,13 +1,14 @@
 """
 AI Tool Directories Scraper - Fetches tools from AI tool aggregator sites
 """
-import os
-import json
 import asyncio
 import httpx
-from bs4 import BeautifulSoup
 from datetime import datetime
 from typing import Optional
+from artifacts import save_artifact_async
+from deduplication_tracker import DeduplicationTracker
+from directory_crawler import DirectoryCrawler, merge_unique
+from embedded_data import TOOL_TYPES, listing_fields
 
 
 THERESANAIFORTHAT_CATEGORIES = [
@@ -45,162 +46,211 @@ AITOOLS_FYI_CATEGORIES = [
 ]
 
 
-async def fetch_theresanaiforthat(client: httpx.AsyncClient, category: str) -> list:
-    """Fetch tools from theresanaiforthat.com."""
-    url = f"https://theresanaiforthat.com/{category}/"
+def parse_theresanaiforthat_item(item, category: str) -> Optional[dict]:
+    """Parse one tool from a theresanaiforthat.com category."""
+    name_elem = item.select_one("h2, h3, .tool-name, a")
+    if not name_elem:
+        return None
     
-    try:
-        response = await client.get(url, follow_redirects=True)
-        response.raise_for_status()
-        
-        soup = BeautifulSoup(response.text, "html.parser")
-        tools = []
-        
-        for item in soup.select(".ai-tool, .tool-card, article"):
-            try:
-                name_elem = item.select_one("h2, h3, .tool-name, a")
-                if not name_elem:
-                    continue
-                
-                name = name_elem.get_text(strip=True)
-                if not name or len(name) > 100:
-                    continue
-                
-                link_elem = item.select_one("a[href]")
-                href = link_elem.get("href", "") if link_elem else ""
-                
-                desc_elem = item.select_one("p, .description")
-                description = desc_elem.get_text(strip=True) if desc_elem else ""
-                
-                pricing_elem = item.select_one(".pricing, .price, [data-pricing]")
-                pricing = pricing_elem.get_text(strip=True) if pricing_elem else None
-                
-                saves_elem = item.select_one(".saves, .bookmarks, [data-saves]")
-                saves = 0
-                if saves_elem:
-                    try:
-                        saves = int(saves_elem.get_text(strip=True).replace(",", "").replace("K", "000"))
-                    except:
-                        pass
-                
-                tags = []
-                for tag in item.select(".tag, .category"):
-                    tag_text = tag.get_text(strip=True)
-                    if tag_text and len(tag_text) < 30:
-                        tags.append(tag_text)
-                
-                tools.append({
-                    "name": name,
-                    "url": href if href.startswith("http") else f"https://theresanaiforthat.com{href}",
-                    "description": description[:500] if description else "",
-                    "pricing": pricing,
-                    "saves": saves,
-                    "tags": tags,
-                    "category": category,
-                    "source": "theresanaiforthat",
-                })
-            except Exception:
-                continue
-        
-        return tools
-    except Exception as e:
-        print(f"Error fetching theresanaiforthat {category}: {e}")
-        return []
+    name = name_elem.get_text(strip=True)
+    if not name or len(name) > 100:
+        return None
+    
+    link_elem = item.select_one("a[href]")
+    href = link_elem.get("href", "") if link_elem else ""
+    
+    desc_elem = item.select_one("p, .description")
+    description = desc_elem.get_text(strip=True) if desc_elem else ""
+    
+    pricing_elem = item.select_one(".pricing, .price, [data-pricing]")
+    pricing = pricing_elem.get_text(strip=True) if pricing_elem else None
+    
+    saves_elem = item.select_one(".saves, .bookmarks, [data-saves]")
+    saves = 0
+    if saves_elem:
+        try:
+            saves = int(saves_elem.get_text(strip=True).replace(",", "").replace("K", "000"))
+        except:
+            pass
+    
+    tags = []
+    for tag in item.select(".tag, .category"):
+        tag_text = tag.get_text(strip=True)
+        if tag_text and len(tag_text) < 30:
+            tags.append(tag_text)
+    
+    return {
+        "name": name,
+        "url": href if href.startswith("http") else f"https://theresanaiforthat.com{href}",
+        "description": description[:500] if description else "",
+        "pricing": pricing,
+        "saves": saves,
+        "tags": tags,
+        "category": category,
+        "source": "theresanaiforthat",
+    }
 
 
-async def fetch_futuretools(client: httpx.AsyncClient, category: str) -> list:
-    """Fetch tools from futuretools.io."""
-    url = f"https://www.futuretools.io/tools?category={category}"
+def parse_futuretools_item(item, category: str) -> Optional[dict]:
+    """Parse one tool from a futuretools.io category."""
+    name_elem = item.select_one("h2, h3, .tool-name")
+    if not name_elem:
+        return None
     
-    try:
-        response = await client.get(url, follow_redirects=True)
-        response.raise_for_status()
-        
-        soup = BeautifulSoup(response.text, "html.parser")
-        tools = []
-        
-        for item in soup.select(".tool-card, article, [data-tool]"):
-            try:
-                name_elem = item.select_one("h2, h3, .tool-name")
-                if not name_elem:
-                    continue
-                
-                name = name_elem.get_text(strip=True)
-                
-                link_elem = item.select_one("a[href]")
-                href = link_elem.get("href", "") if link_elem else ""
-                
-                desc_elem = item.select_one("p, .description")
-                description = desc_elem.get_text(strip=True) if desc_elem else ""
-                
-                pricing_elem = item.select_one(".pricing, .price-tag")
-                pricing = pricing_elem.get_text(strip=True) if pricing_elem else None
-                
-                is_free = bool(item.select_one(".free, [data-free]"))
-                is_freemium = bool(item.select_one(".freemium, [data-freemium]"))
-                
-                tools.append({
-                    "name": name,
-                    "url": href,
-                    "description": description[:500] if description else "",
-                    "pricing": pricing,
-                    "is_free": is_free,
-                    "is_freemium": is_freemium,
-                    "category": category,
-                    "source": "futuretools",
-                })
-            except Exception:
-                continue
-        
-        return tools
-    except Exception as e:
-        print(f"Error fetching futuretools {category}: {e}")
-        return []
+    name = name_elem.get_text(strip=True)
+    
+    link_elem = item.select_one("a[href]")
+    href = link_elem.get("href", "") if link_elem else ""
+    
+    desc_elem = item.select_one("p, .description")
+    description = desc_elem.get_text(strip=True) if desc_elem else ""
+    
+    pricing_elem = item.select_one(".pricing, .price-tag")
+    pricing = pricing_elem.get_text(strip=True) if pricing_elem else None
+    
+    is_free = bool(item.select_one(".free, [data-free]"))
+    is_freemium = bool(item.select_one(".freemium, [data-freemium]"))
+    
+    return {
+        "name": name,
+        "url": href,
+        "description": description[:500] if description else "",
+        "pricing": pricing,
+        "is_free": is_free,
+        "is_freemium": is_freemium,
+        "category": category,
+        "source": "futuretools",
+    }
 
 
-async def fetch_aitools_fyi(client: httpx.AsyncClient, category: str) -> list:
-    """Fetch tools from aitools.fyi."""
-    url = f"https://aitools.fyi/category/{category}"
+def parse_aitools_fyi_item(item, category: str) -> Optional[dict]:
+    """Parse one tool from an aitools.fyi category."""
+    name_elem = item.select_one("h2, h3, .name")
+    if not name_elem:
+        return None
     
-    try:
-        response = await client.get(url, follow_redirects=True)
-        response.raise_for_status()
-        
-        soup = BeautifulSoup(response.text, "html.parser")
-        tools = []
-        
-        for item in soup.select(".tool-item, article, [data-tool]"):
-            try:
-                name_elem = item.select_one("h2, h3, .name")
-                if not name_elem:
-                    continue
-                
-                name = name_elem.get_text(strip=True)
-                
-                link_elem = item.select_one("a[href]")
-                href = link_elem.get("href", "") if link_elem else ""
-                
-                desc_elem = item.select_one("p, .description")
-                description = desc_elem.get_text(strip=True) if desc_elem else ""
-                
-                tools.append({
-                    "name": name,
-                    "url": href,
-                    "description": description[:500] if description else "",
-                    "category": category,
-                    "source": "aitools_fyi",
-                })
-            except Exception:
-                continue
-        
-        return tools
-    except Exception as e:
-        print(f"Error fetching aitools.fyi {category}: {e}")
-        return []
+    name = name_elem.get_text(strip=True)
+    
+    link_elem = item.select_one("a[href]")
+    href = link_elem.get("href", "") if link_elem else ""
+    
+    desc_elem = item.select_one("p, .description")
+    description = desc_elem.get_text(strip=True) if desc_elem else ""
+    
+    return {
+        "name": name,
+        "url": href,
+        "description": description[:500] if description else "",
+        "category": category,
+        "source": "aitools_fyi",
+    }
+
+
+def _embedded_pricing(obj: dict) -> Optional[str]:
+    """Pricing label from an embedded tool object or its schema.org offers."""
+    pricing = obj.get("pricing") or obj.get("pricingModel") or obj.get("price")
+    offers = obj.get("offers")
+    if not pricing and isinstance(offers, dict):
+        pricing = offers.get("price") or offers.get("priceSpecification")
+    return str(pricing) if isinstance(pricing, (str, int, float)) else None
 
 
-async def scrape_ai_directories() -> dict:
-    """Scrape all AI tool directories."""
+def map_theresanaiforthat_embedded(obj: dict, category: str) -> Optional[dict]:
+    """Map one tool from theresanaiforthat.com's embedded data."""
+    fields = listing_fields(obj, "https://theresanaiforthat.com")
+    if not fields:
+        return None
+    return {
+        "name": fields["name"],
+        "url": fields["url"] or f"https://theresanaiforthat.com/ai/{fields['slug']}/",
+        "description": (fields["description"] or fields["tagline"])[:500],
+        "pricing": _embedded_pricing(obj),
+        "saves": fields["votes"],
+        "tags": fields["tags"],
+        "category": category,
+        "source": "theresanaiforthat",
+    }
+
+
+def map_futuretools_embedded(obj: dict, category: str) -> Optional[dict]:
+    """Map one tool from futuretools.io's embedded data."""
+    fields = listing_fields(obj, "https://www.futuretools.io")
+    if not fields:
+        return None
+    pricing = _embedded_pricing(obj)
+    return {
+        "name": fields["name"],
+        "url": fields["url"] or f"https://www.futuretools.io/tools/{fields['slug']}",
+        "description": (fields["description"] or fields["tagline"])[:500],
+        "pricing": pricing,
+        "is_free": (pricing or "").lower() == "free",
+        "is_freemium": (pricing or "").lower() == "freemium",
+        "category": category,
+        "source": "futuretools",
+    }
+
+
+def map_aitools_fyi_embedded(obj: dict, category: str) -> Optional[dict]:
+    """Map one tool from aitools.fyi's embedded data."""
+    fields = listing_fields(obj, "https://aitools.fyi")
+    if not fields:
+        return None
+    return {
+        "name": fields["name"],
+        "url": fields["url"] or f"https://aitools.fyi/{fields['slug']}",
+        "description": (fields["description"] or fields["tagline"])[:500],
+        "category": category,
+        "source": "aitools_fyi",
+    }
+
+
+DIRECTORY_SPECS = {
+    "theresanaiforthat": {
+        "name": "theresanaiforthat",
+        "item_selector": ".ai-tool, .tool-card, article",
+        "parse_item": parse_theresanaiforthat_item,
+        "map_embedded": map_theresanaiforthat_embedded,
+        "embedded_types": TOOL_TYPES | {"Tool"},
+        "embedded_keys": {"tools"},
+        "pagination": {"param": "page", "start": 1, "max_pages": 3},
+        "listing_url": "https://theresanaiforthat.com/{category}/",
+        "categories": THERESANAIFORTHAT_CATEGORIES,
+    },
+    "futuretools": {
+        "name": "futuretools",
+        "item_selector": ".tool-card, article, [data-tool]",
+        "parse_item": parse_futuretools_item,
+        "map_embedded": map_futuretools_embedded,
+        "embedded_types": TOOL_TYPES | {"Tool"},
+        "embedded_keys": {"tools", "items"},
+        "pagination": {"param": "page", "start": 1, "max_pages": 3},
+        "listing_url": "https://www.futuretools.io/tools?category={category}",
+        "categories": FUTURETOOLS_CATEGORIES,
+    },
+    "aitools_fyi": {
+        "name": "aitools.fyi",
+        "item_selector": ".tool-item, article, [data-tool]",
+        "parse_item": parse_aitools_fyi_item,
+        "map_embedded": map_aitools_fyi_embedded,
+        "embedded_types": TOOL_TYPES | {"Tool"},
+        "embedded_keys": {"tools"},
+        "pagination": {"param": "page", "start": 1, "max_pages": 3},
+        "listing_url": "https://aitools.fyi/category/{category}",
+        "categories": AITOOLS_FYI_CATEGORIES,
+    },
+}
+
+
+async def scrape_ai_directories(tracker: Optional[DeduplicationTracker] = None) -> dict:
+    """
+    Scrape all AI tool directories.
+    
+    The directories are on different hosts and are crawled concurrently.
+    
+    Args:
+        tracker: Dedup tracker; pagination stops at the first page holding
+            only known tools when given
+    """
     results = {
         "scraped_at": datetime.now().isoformat(),
         "theresanaiforthat": {},
@@ -218,41 +268,18 @@ async def scrape_ai_directories() -> dict:
             "Accept": "text/html,application/xhtml+xml",
         }
     ) as client:
-        for category in THERESANAIFORTHAT_CATEGORIES:
-            print(f"  Fetching theresanaiforthat: {category}...")
-            tools = await fetch_theresanaiforthat(client, category)
-            results["theresanaiforthat"][category] = tools
-            
-            for tool in tools:
-                if tool["name"].lower() not in seen_tools:
-                    seen_tools.add(tool["name"].lower())
-                    results["all_tools"].append(tool)
-            
-            await asyncio.sleep(2)
+        crawler = DirectoryCrawler(client, tracker)
+        crawled = await asyncio.gather(*(
+            crawler.crawl(spec, {c: spec["listing_url"].format(category=c) for c in spec["categories"]})
+            for spec in DIRECTORY_SPECS.values()
+        ))
+        for directory, categories in zip(DIRECTORY_SPECS, crawled):
+            results[directory] = categories
+            for tools in categories.values():
+                merge_unique(results["all_tools"], tools, seen_tools)
         
-        for category in FUTURETOOLS_CATEGORIES:
-            print(f"  Fetching futuretools: {category}...")
-            tools = await fetch_futuretools(client, category)
-            results["futuretools"][category] = tools
-            
-            for tool in tools:
-                if tool["name"].lower() not in seen_tools:
-                    seen_tools.add(tool["name"].lower())
-                    results["all_tools"].append(tool)
-            
-            await asyncio.sleep(2)
-        
-        for category in AITOOLS_FYI_CATEGORIES:
-            print(f"  Fetching aitools.fyi: {category}...")
-            tools = await fetch_aitools_fyi(client, category)
-            results["aitools_fyi"][category] = tools
-            
-            for tool in tools:
-                if tool["name"].lower() not in seen_tools:
-                    seen_tools.add(tool["name"].lower())
-                    results["all_tools"].append(tool)
-            
-            await asyncio.sleep(2)
+        crawler.finish()
+        results["crawl"] = crawler.get_stats()
     
     results["total_unique_tools"] = len(results["all_tools"])
     return results
@@ -263,12 +290,7 @@ if __name__ == "__main__":
         print("Scraping AI Tool Directories...")
         results = await scrape_ai_directories()
         
-        output_dir = os.path.join(os.path.dirname(__file__), "data")
-        os.makedirs(output_dir, exist_ok=True)
-        
-        output_path = os.path.join(output_dir, "ai_directories.json")
-        with open(output_path, "w") as f:
-            json.dump(results, f, indent=2)
+        output_path = await save_artifact_async("ai_directories", results)
         
         print(f"\nSaved {results['total_unique_tools']} unique tools to {output_path}")
     
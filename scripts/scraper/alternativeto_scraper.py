@@ -1,13 +1,13 @@
 """
 AlternativeTo Scraper - Fetches software alternatives and metadata
 """
-import os
-import json
 import asyncio
 import httpx
-from bs4 import BeautifulSoup
 from datetime import datetime
 from typing import Optional
+from artifacts import save_artifact_async
+from deduplication_tracker import DeduplicationTracker
+from directory_crawler import DirectoryCrawler, merge_unique
 
 
 CATEGORIES = [
@@ -57,75 +57,64 @@ TOOL_PAGES = [
 ]
 
 
-async def fetch_category_page(client: httpx.AsyncClient, category: str) -> list:
-    """Fetch tools from a category page."""
-    url = f"https://alternativeto.net/category/{category}/"
+def parse_category_item(item, category: str) -> Optional[dict]:
+    """Parse one tool from a category listing."""
+    name_elem = item.select_one("h2 a, .app-name a, [data-testid='app-name']")
+    if not name_elem:
+        return None
     
-    try:
-        response = await client.get(url, follow_redirects=True)
-        response.raise_for_status()
-        
-        soup = BeautifulSoup(response.text, "html.parser")
-        tools = []
-        
-        for item in soup.select(".app-list-item, [data-app-slug]"):
-            try:
-                name_elem = item.select_one("h2 a, .app-name a, [data-testid='app-name']")
-                if not name_elem:
-                    continue
-                
-                name = name_elem.get_text(strip=True)
-                href = name_elem.get("href", "")
-                slug = href.strip("/").split("/")[-1] if href else ""
-                
-                desc_elem = item.select_one(".app-description, p")
-                description = desc_elem.get_text(strip=True) if desc_elem else ""
-                
-                likes_elem = item.select_one(".likes-count, [data-likes]")
-                likes = 0
-                if likes_elem:
-                    likes_text = likes_elem.get_text(strip=True)
-                    try:
-                        likes = int(likes_text.replace(",", ""))
-                    except:
-                        pass
-                
-                tags = []
-                for tag in item.select(".tag, .platform-tag"):
-                    tags.append(tag.get_text(strip=True))
-                
-                is_free = bool(item.select_one(".free-badge, [data-free]"))
-                is_open_source = bool(item.select_one(".open-source-badge, [data-opensource]"))
-                
-                tools.append({
-                    "name": name,
-                    "slug": slug,
-                    "url": f"https://alternativeto.net{href}" if href.startswith("/") else href,
-                    "description": description,
-                    "likes": likes,
-                    "tags": tags,
-                    "is_free": is_free,
-                    "is_open_source": is_open_source,
-                    "category": category,
-                })
-            except Exception:
-                continue
-        
-        return tools
-    except Exception as e:
-        print(f"Error fetching category {category}: {e}")
-        return []
+    name = name_elem.get_text(strip=True)
+    href = name_elem.get("href", "")
+    slug = href.strip("/").split("/")[-1] if href else ""
+    
+    desc_elem = item.select_one(".app-description, p")
+    description = desc_elem.get_text(strip=True) if desc_elem else ""
+    
+    likes_elem = item.select_one(".likes-count, [data-likes]")
+    likes = 0
+    if likes_elem:
+        likes_text = likes_elem.get_text(strip=True)
+        try:
+            likes = int(likes_text.replace(",", ""))
+        except:
+            pass
+    
+    tags = []
+    for tag in item.select(".tag, .platform-tag"):
+        tags.append(tag.get_text(strip=True))
+    
+    is_free = bool(item.select_one(".free-badge, [data-free]"))
+    is_open_source = bool(item.select_one(".open-source-badge, [data-opensource]"))
+    
+    return {
+        "name": name,
+        "slug": slug,
+        "url": f"https://alternativeto.net{href}" if href.startswith("/") else href,
+        "description": description,
+        "likes": likes,
+        "tags": tags,
+        "is_free": is_free,
+        "is_open_source": is_open_source,
+        "category": category,
+    }
+
+
+CATEGORY_SPEC = {
+    "name": "alternativeto",
+    "item_selector": ".app-list-item, [data-app-slug]",
+    "parse_item": parse_category_item,
+    "pagination": {"param": "p", "start": 1, "max_pages": 3},
+}
 
 
-async def fetch_tool_alternatives(client: httpx.AsyncClient, tool_slug: str) -> dict:
+async def fetch_tool_alternatives(crawler: DirectoryCrawler, tool_slug: str) -> dict:
     """Fetch alternatives for a specific tool."""
     url = f"https://alternativeto.net/software/{tool_slug}/"
     
     try:
-        response = await client.get(url, follow_redirects=True)
-        response.raise_for_status()
-        
-        soup = BeautifulSoup(response.text, "html.parser")
+        soup = await crawler.fetch_soup(url)
+        if soup is None:
+            return {"slug": tool_slug, "error": "fetch failed"}
         
         name_elem = soup.select_one("h1")
         name = name_elem.get_text(strip=True) if name_elem else tool_slug
@@ -164,8 +153,14 @@ async def fetch_tool_alternatives(client: httpx.AsyncClient, tool_slug: str) ->
         return {"slug": tool_slug, "error": str(e)}
 
 
-async def scrape_alternativeto() -> dict:
-    """Scrape AlternativeTo for developer tools."""
+async def scrape_alternativeto(tracker: Optional[DeduplicationTracker] = None) -> dict:
+    """
+    Scrape AlternativeTo for developer tools.
+    
+    Args:
+        tracker: Dedup tracker; category pagination stops at the first page
+            holding only known tools when given
+    """
     results = {
         "scraped_at": datetime.now().isoformat(),
         "categories": {},
@@ -182,23 +177,20 @@ async def scrape_alternativeto() -> dict:
             "Accept": "text/html,application/xhtml+xml",
         }
     ) as client:
-        for category in CATEGORIES:
-            print(f"  Fetching category: {category}...")
-            tools = await fetch_category_page(client, category)
-            results["categories"][category] = tools
-            
-            for tool in tools:
-                if tool["name"] not in seen_tools:
-                    seen_tools.add(tool["name"])
-                    results["all_tools"].append(tool)
-            
-            await asyncio.sleep(2)
+        crawler = DirectoryCrawler(client, tracker)
+        listings = {category: f"https://alternativeto.net/category/{category}/" for category in CATEGORIES}
         
-        for tool_slug in TOOL_PAGES:
-            print(f"  Fetching alternatives for: {tool_slug}...")
-            alternatives = await fetch_tool_alternatives(client, tool_slug)
-            results["tool_alternatives"][tool_slug] = alternatives
-            await asyncio.sleep(2)
+        categories, alternatives = await asyncio.gather(
+            crawler.crawl(CATEGORY_SPEC, listings),
+            asyncio.gather(*(fetch_tool_alternatives(crawler, slug) for slug in TOOL_PAGES)),
+        )
+        results["categories"] = categories
+        results["tool_alternatives"] = dict(zip(TOOL_PAGES, alternatives))
+        for tools in categories.values():
+            merge_unique(results["all_tools"], tools, seen_tools)
+        
+        crawler.finish()
+        results["crawl"] = crawler.get_stats()
     
     results["total_unique_tools"] = len(results["all_tools"])
     return results
@@ -209,12 +201,7 @@ if __name__ == "__main__":
         print("Scraping AlternativeTo...")
         results = await scrape_alternativeto()
         
-        output_dir = os.path.join(os.path.dirname(__file__), "data")
-        os.makedirs(output_dir, exist_ok=True)
-        
-        output_path = os.path.join(output_dir, "alternativeto.json")
-        with open(output_path, "w") as f:
-            json.dump(results, f, indent=2)
+        output_path = await save_artifact_async("alternativeto", results)
         
         print(f"\nSaved {results['total_unique_tools']} unique tools to {output_path}")
     
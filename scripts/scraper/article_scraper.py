@@ -1,14 +1,13 @@
 """
 Article Scraper - Extracts tool mentions and metadata from blog posts and articles
 """
-import os
-import json
 import re
 import httpx
 from bs4 import BeautifulSoup
 from typing import Optional
 from datetime import datetime
 import asyncio
+from artifacts import save_artifact_async
 
 
 TOOL_KEYWORDS = [
@@ -280,15 +279,10 @@ if __name__ == "__main__":
         
         results = await scrape_articles(urls)
         
-        output_dir = os.path.join(os.path.dirname(__file__), "data")
-        os.makedirs(output_dir, exist_ok=True)
-        
-        with open(os.path.join(output_dir, "article_scrapes.json"), "w") as f:
-            json.dump(results, f, indent=2)
+        await save_artifact_async("article_scrapes", results)
         
         tool_stats = aggregate_tool_mentions(results)
-        with open(os.path.join(output_dir, "tool_mentions.json"), "w") as f:
-            json.dump(tool_stats, f, indent=2)
+        await save_artifact_async("tool_mentions", tool_stats, layout="mapping")
         
         print(f"\nScraped {len(results)} articles")
         print(f"Found mentions of {len(tool_stats)} tools")
@@ -0,0 +1,334 @@
+"""
+Artifacts - Streaming NDJSON storage for scraper output
+Records are written incrementally, optionally gzipped, and renamed into place on completion
+"""
+import os
+import gzip
+import json
+import asyncio
+from typing import Any, Iterable, Iterator, Optional
+
+
+DATA_DIR = os.path.join(os.path.dirname(__file__), "data")
+
+COMPRESS_ARTIFACTS = os.environ.get("SCRAPER_COMPRESS_ARTIFACTS", "").lower() in ("1", "true", "yes")
+
+NDJSON_SUFFIX = ".ndjson"
+GZIP_SUFFIX = ".ndjson.gz"
+LEGACY_SUFFIX = ".json"
+
+# Layouts describe how load_artifact() rebuilds the original value:
+#   records  - a top-level list, one line per item
+#   mapping  - a top-level {key: value} dict, one line per key
+#   document - a dict whose list/dict values are streamed as named sections
+#              and whose scalar values are kept in the header
+LAYOUTS = ("records", "mapping", "document")
+
+
+def artifact_path(name: str, compress: Optional[bool] = None, data_dir: str = DATA_DIR) -> str:
+    """Path an artifact is written to."""
+    if compress is None:
+        compress = COMPRESS_ARTIFACTS
+    return os.path.join(data_dir, name + (GZIP_SUFFIX if compress else NDJSON_SUFFIX))
+
+
+def find_artifact(name: str, data_dir: str = DATA_DIR) -> Optional[str]:
+    """
+    Locate an artifact on disk.
+
+    Prefers NDJSON (compressed or not) and falls back to a legacy indent=2
+    JSON file written before artifacts were streamed.
+
+    Returns:
+        Path to the artifact, or None if it does not exist
+    """
+    for suffix in (GZIP_SUFFIX, NDJSON_SUFFIX, LEGACY_SUFFIX):
+        path = os.path.join(data_dir, name + suffix)
+        if os.path.exists(path):
+            return path
+    return None
+
+
+def _dumps(value: Any) -> str:
+    return json.dumps(value, separators=(",", ":"), ensure_ascii=False, default=str)
+
+
+class ArtifactWriter:
+    """
+    Writes an artifact one line at a time.
+
+    The file is built under a temporary name and atomically renamed on
+    close(), so readers never see a partial artifact and a crashed scraper
+    leaves the previous one in place. Other variants of the same artifact
+    (legacy .json, or the compressed/uncompressed twin) are removed once
+    the new one is in place.
+
+    Example:
+        with ArtifactWriter("tools_batches", layout="records") as writer:
+            for batch in batches:
+                writer.write(batch)
+    """
+
+    def __init__(
+        self,
+        name: str,
+        layout: str = "records",
+        meta: Optional[dict] = None,
+        compress: Optional[bool] = None,
+        data_dir: str = DATA_DIR,
+    ):
+        """
+        Initialize artifact writer.
+
+        Args:
+            name: Artifact name, e.g. "vibe_tools"
+            layout: One of LAYOUTS
+            meta: Scalar fields stored in the header line
+            compress: Gzip the artifact (defaults to SCRAPER_COMPRESS_ARTIFACTS)
+            data_dir: Directory artifacts are stored in
+        """
+        if layout not in LAYOUTS:
+            raise ValueError(f"Unknown artifact layout: {layout}")
+
+        self.name = name
+        self.layout = layout
+        self.data_dir = data_dir
+        self.path = artifact_path(name, compress, data_dir)
+        self.tmp_path = self.path + ".tmp"
+        self.count = 0
+        self.sections: dict[str, str] = {}
+
+        os.makedirs(data_dir, exist_ok=True)
+        if self.path.endswith(GZIP_SUFFIX):
+            self._file = gzip.open(self.tmp_path, "wt", encoding="utf-8")
+        else:
+            self._file = open(self.tmp_path, "w", encoding="utf-8")
+        self._write_line({"artifact": name, "layout": layout, "meta": meta or {}})
+
+    def _write_line(self, entry: dict):
+        self._file.write(_dumps(entry) + "\n")
+
+    def write(self, data: Any, section: Optional[str] = None, key: Optional[str] = None):
+        """
+        Write one record.
+
+        Args:
+            data: Record value
+            section: Section name (document layout only)
+            key: Mapping key, for mapping layouts and mapping sections
+        """
+        entry = {}
+        if section is not None:
+            entry["section"] = section
+            self.sections.setdefault(section, "mapping" if key is not None else "records")
+        if key is not None:
+            entry["key"] = key
+        entry["data"] = data
+        self._write_line(entry)
+        self.count += 1
+
+    def write_many(self, items: Iterable[Any], section: Optional[str] = None):
+        """Write every item of an iterable as a record."""
+        if section is not None:
+            self.sections.setdefault(section, "records")
+        for item in items:
+            self.write(item, section=section)
+
+    def write_mapping(self, mapping: dict, section: Optional[str] = None):
+        """Write every key of a mapping as a keyed record."""
+        if section is not None:
+            self.sections.setdefault(section, "mapping")
+        for key, value in mapping.items():
+            self.write(value, section=section, key=key)
+
+    def close(self) -> str:
+        """Finish the artifact and move it into place."""
+        self._write_line({"end": {"count": self.count, "sections": self.sections}})
+        self._file.flush()
+        if hasattr(self._file, "fileno") and not self.path.endswith(GZIP_SUFFIX):
+            os.fsync(self._file.fileno())
+        self._file.close()
+        os.replace(self.tmp_path, self.path)
+
+        for suffix in (GZIP_SUFFIX, NDJSON_SUFFIX, LEGACY_SUFFIX):
+            other = os.path.join(self.data_dir, self.name + suffix)
+            if other != self.path and os.path.exists(other):
+                os.remove(other)
+        return self.path
+
+    def abort(self):
+        """Discard the partial artifact, keeping the previous one."""
+        self._file.close()
+        if os.path.exists(self.tmp_path):
+            os.remove(self.tmp_path)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+        return False
+
+
+def save_artifact(
+    name: str,
+    data: Any,
+    layout: Optional[str] = None,
+    compress: Optional[bool] = None,
+    data_dir: str = DATA_DIR,
+) -> str:
+    """
+    Write a whole value as an artifact.
+
+    Lists default to the records layout and dicts to the document layout;
+    pass layout="mapping" for id-keyed dicts such as GitHub metadata.
+
+    Returns:
+        Path the artifact was written to
+    """
+    if layout is None:
+        layout = "records" if isinstance(data, list) else "document"
+
+    if layout == "document":
+        meta = {k: v for k, v in data.items() if not isinstance(v, (list, dict))}
+        with ArtifactWriter(name, layout, meta=meta, compress=compress, data_dir=data_dir) as writer:
+            for section, value in data.items():
+                if isinstance(value, list):
+                    writer.write_many(value, section=section)
+                elif isinstance(value, dict):
+                    writer.write_mapping(value, section=section)
+        return writer.path
+
+    with ArtifactWriter(name, layout, compress=compress, data_dir=data_dir) as writer:
+        if layout == "mapping":
+            writer.write_mapping(data)
+        else:
+            writer.write_many(data)
+    return writer.path
+
+
+async def save_artifact_async(
+    name: str,
+    data: Any,
+    layout: Optional[str] = None,
+    compress: Optional[bool] = None,
+    data_dir: str = DATA_DIR,
+) -> str:
+    """save_artifact() in a worker thread, keeping serialization off the event loop."""
+    return await asyncio.to_thread(save_artifact, name, data, layout, compress, data_dir)
+
+
+def _open_lines(path: str) -> Iterator[dict]:
+    opener = gzip.open if path.endswith(".gz") else open
+    with opener(path, "rt", encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+
+def _legacy_items(value: Any) -> Iterator[tuple[Optional[str], Any]]:
+    if isinstance(value, dict):
+        yield from value.items()
+    elif isinstance(value, list):
+        for item in value:
+            yield None, item
+
+
+def iter_artifact_items(
+    name: str,
+    section: Optional[str] = None,
+    data_dir: str = DATA_DIR,
+) -> Iterator[tuple[Optional[str], Any]]:
+    """
+    Stream (key, record) pairs from an artifact.
+
+    Args:
+        name: Artifact name
+        section: Section to read (document layout); None reads top-level records
+        data_dir: Directory artifacts are stored in
+
+    Yields:
+        (key, data) pairs; key is None for list records
+    """
+    path = find_artifact(name, data_dir)
+    if path is None:
+        return
+
+    if path.endswith(LEGACY_SUFFIX):
+        with open(path, "r") as f:
+            value = json.load(f)
+        if section is not None:
+            value = value.get(section) if isinstance(value, dict) else None
+        yield from _legacy_items(value)
+        return
+
+    for entry in _open_lines(path):
+        if "data" in entry and entry.get("section") == section:
+            yield entry.get("key"), entry["data"]
+
+
+def iter_artifact(name: str, section: Optional[str] = None, data_dir: str = DATA_DIR) -> Iterator[Any]:
+    """Stream records from an artifact (see iter_artifact_items)."""
+    for _, data in iter_artifact_items(name, section, data_dir):
+        yield data
+
+
+def read_artifact_meta(name: str, data_dir: str = DATA_DIR) -> dict:
+    """Read only the header fields of an artifact."""
+    path = find_artifact(name, data_dir)
+    if path is None:
+        return {}
+
+    if path.endswith(LEGACY_SUFFIX):
+        with open(path, "r") as f:
+            value = json.load(f)
+        if not isinstance(value, dict):
+            return {}
+        return {k: v for k, v in value.items() if not isinstance(v, (list, dict))}
+
+    for entry in _open_lines(path):
+        return entry.get("meta", {})
+    return {}
+
+
+def load_artifact(name: str, data_dir: str = DATA_DIR) -> Any:
+    """
+    Load a whole artifact back into its original shape.
+
+    Prefer iter_artifact() for large artifacts; this materializes everything.
+
+    Returns:
+        The saved value, or None if the artifact does not exist
+    """
+    path = find_artifact(name, data_dir)
+    if path is None:
+        return None
+
+    if path.endswith(LEGACY_SUFFIX):
+        with open(path, "r") as f:
+            return json.load(f)
+
+    value: Any = None
+    layout = "records"
+    for entry in _open_lines(path):
+        if "layout" in entry:
+            layout = entry["layout"]
+            value = dict(entry.get("meta", {})) if layout == "document" else ([] if layout == "records" else {})
+        elif "end" in entry:
+            if layout == "document":
+                for section, kind in entry["end"].get("sections", {}).items():
+                    value.setdefault(section, {} if kind == "mapping" else [])
+        elif layout == "document":
+            section = entry["section"]
+            if "key" in entry:
+                value.setdefault(section, {})[entry["key"]] = entry["data"]
+            else:
+                value.setdefault(section, []).append(entry["data"])
+        elif layout == "mapping":
+            value[entry["key"]] = entry["data"]
+        else:
+            value.append(entry["data"])
+    return value
@@ -1,8 +1,6 @@
 """
 Awesome Lists Scraper - Fetches and parses awesome-vibe-coding lists from GitHub
 """
-import os
-import json
 import re
 import httpx
 from typing import Optional
@@ -14,6 +12,8 @@ from bot_avoidance import (
     create_client_with_limits,
 )
 from cache_manager import CacheManager
+from rule_engine import RuleEngine
+from artifacts import save_artifact_async
 
 rate_limiter = RateLimiter(requests_per_minute=20)
 cache = CacheManager(cache_dir="cache", default_ttl_hours=168)
@@ -134,16 +134,26 @@ AWESOME_LISTS = [
 ]
 
 
+# Markdown links: [text](url)
+MARKDOWN_LINK = re.compile(r'\[([^\]]+)\]\(([^)]+)\)')
+
+# Markdown images: ![alt](src); removing them turns badge links [![alt](src)](url) into [](url)
+MARKDOWN_IMAGE = re.compile(r'!\[[^\]]*\]\([^)]*\)')
+
+# Bullet list items: "- ...", "* ...", "+ ..."
+MARKDOWN_LIST_ITEM = re.compile(r'^\s*[-*+]\s+(.+)$', re.M)
+
+
+def is_skipped_link(url: str) -> bool:
+    """Badges, images and in-page anchors are not tool links."""
+    return url.startswith("#") or "badge" in url.lower() or url.endswith((".png", ".jpg", ".svg", ".gif"))
+
+
 def extract_links_from_markdown(content: str) -> list:
     """Extract all links from markdown content."""
-    # Match markdown links: [text](url)
-    pattern = r'\[([^\]]+)\]\(([^)]+)\)'
-    matches = re.findall(pattern, content)
-    
     links = []
-    for text, url in matches:
-        # Skip badges, images, and anchors
-        if url.startswith("#") or "badge" in url.lower() or url.endswith((".png", ".jpg", ".svg", ".gif")):
+    for text, url in MARKDOWN_LINK.findall(content):
+        if is_skipped_link(url):
             continue
         
         links.append({
@@ -154,33 +164,55 @@ def extract_links_from_markdown(content: str) -> list:
     return links
 
 
+def extract_list_items(content: str) -> list:
+    """
+    Extract the first link of every bullet list item with the text after it.
+    
+    "- [Name](url) - Description" gives {"text": "Name", "url": "url",
+    "description": "Description"}; links in the description are reduced to
+    their text. Images, badges and anchors before the name are passed over.
+    """
+    items = []
+    for match in MARKDOWN_LIST_ITEM.finditer(content):
+        line = MARKDOWN_IMAGE.sub("", match.group(1))
+        link = next(
+            (link for link in MARKDOWN_LINK.finditer(line) if not is_skipped_link(link.group(2))),
+            None,
+        )
+        if not link:
+            continue
+        
+        description = MARKDOWN_LINK.sub(r'\1', line[link.end():])
+        items.append({
+            "text": link.group(1).strip().strip("*_`").strip(),
+            "url": link.group(2).strip(),
+            "description": description.strip().lstrip("*_").strip().lstrip("-–—:").strip(),
+        })
+    
+    return items
+
+
+LINK_CATEGORY_ENGINE = RuleEngine([
+    ("github", {"url": ["github.com"]}),
+    ("community", {"url": ["reddit.com", "discord", "slack"]}),
+    ("article", {"text": ["blog", "article", "post", "news"]}),
+    ("video", {"text": ["video", "youtube", "tutorial"]}),
+    ("documentation", {"text": ["docs", "documentation", "guide"]}),
+], default="tool")
+
+
 def categorize_link(url: str, text: str) -> str:
     """Categorize a link based on URL and text."""
-    url_lower = url.lower()
-    text_lower = text.lower()
-    
-    if "github.com" in url_lower:
-        return "github"
-    elif any(x in url_lower for x in ["reddit.com", "discord", "slack"]):
-        return "community"
-    elif any(x in text_lower for x in ["blog", "article", "post", "news"]):
-        return "article"
-    elif any(x in text_lower for x in ["video", "youtube", "tutorial"]):
-        return "video"
-    elif any(x in text_lower for x in ["docs", "documentation", "guide"]):
-        return "documentation"
-    else:
-        return "tool"
+    return LINK_CATEGORY_ENGINE.classify({"url": url, "text": text})
 
 
 def extract_tools_from_content(content: str) -> list:
     """Extract tool entries from markdown content."""
     tools = []
     links = extract_links_from_markdown(content)
+    categories = LINK_CATEGORY_ENGINE.classify_many(links)
     
-    for link in links:
-        category = categorize_link(link["url"], link["text"])
-        
+    for link, category in zip(links, categories):
         # Focus on tools and GitHub repos
         if category in ["tool", "github"]:
             # Try to extract description from surrounding context
@@ -295,17 +327,11 @@ if __name__ == "__main__":
     async def main():
         results = await scrape_awesome_lists()
         
-        output_dir = os.path.join(os.path.dirname(__file__), "data")
-        os.makedirs(output_dir, exist_ok=True)
-        
-        # Save raw results
-        with open(os.path.join(output_dir, "awesome_lists.json"), "w") as f:
-            json.dump(results, f, indent=2)
+        await save_artifact_async("awesome_lists", results, layout="mapping")
         
         # Save deduplicated tools
         unique_tools = deduplicate_tools(results)
-        with open(os.path.join(output_dir, "awesome_tools.json"), "w") as f:
-            json.dump(unique_tools, f, indent=2)
+        await save_artifact_async("awesome_tools", unique_tools)
         
         print(f"\nScraped {len(results)} awesome lists")
         print(f"Found {len(unique_tools)} unique tools")
@@ -1,13 +1,13 @@
 """
 BetaList Scraper - Fetches early-stage startups and tools from BetaList
 """
-import os
-import json
 import asyncio
 import httpx
-from bs4 import BeautifulSoup
 from datetime import datetime
 from typing import Optional
+from artifacts import save_artifact_async
+from deduplication_tracker import DeduplicationTracker
+from directory_crawler import DirectoryCrawler, merge_unique
 
 
 BETALIST_URLS = [
@@ -30,79 +30,64 @@ CATEGORIES = [
 ]
 
 
-async def fetch_startups_page(client: httpx.AsyncClient, url: str) -> list:
-    """Fetch startups from a BetaList page."""
-    try:
-        response = await client.get(url, follow_redirects=True)
-        response.raise_for_status()
-        
-        soup = BeautifulSoup(response.text, "html.parser")
-        startups = []
-        
-        for item in soup.select(".startup-card, article, [data-startup]"):
-            try:
-                name_elem = item.select_one("h2, h3, .startup-name, a")
-                if not name_elem:
-                    continue
-                
-                name = name_elem.get_text(strip=True)
-                if not name or len(name) > 100:
-                    continue
-                
-                link_elem = item.select_one("a[href*='/startups/']")
-                href = link_elem.get("href", "") if link_elem else ""
-                
-                tagline_elem = item.select_one(".tagline, .description, p")
-                tagline = tagline_elem.get_text(strip=True) if tagline_elem else ""
-                
-                votes_elem = item.select_one(".votes, .upvotes, [data-votes]")
-                votes = 0
-                if votes_elem:
-                    try:
-                        votes = int(votes_elem.get_text(strip=True).replace(",", ""))
-                    except:
-                        pass
-                
-                tags = []
-                for tag in item.select(".tag, .category, .badge"):
-                    tag_text = tag.get_text(strip=True)
-                    if tag_text and len(tag_text) < 30:
-                        tags.append(tag_text)
-                
-                img_elem = item.select_one("img")
-                logo = img_elem.get("src") if img_elem else None
-                
-                startups.append({
-                    "name": name,
-                    "url": f"https://betalist.com{href}" if href.startswith("/") else href,
-                    "tagline": tagline[:300] if tagline else "",
-                    "votes": votes,
-                    "tags": tags,
-                    "logo": logo,
-                    "source": "betalist",
-                })
-            except Exception:
-                continue
-        
-        return startups
-    except Exception as e:
-        print(f"Error fetching {url}: {e}")
-        return []
+def parse_startup_item(item, listing: str) -> Optional[dict]:
+    """Parse one startup from a BetaList listing."""
+    name_elem = item.select_one("h2, h3, .startup-name, a")
+    if not name_elem:
+        return None
+    
+    name = name_elem.get_text(strip=True)
+    if not name or len(name) > 100:
+        return None
+    
+    link_elem = item.select_one("a[href*='/startups/']")
+    href = link_elem.get("href", "") if link_elem else ""
+    
+    tagline_elem = item.select_one(".tagline, .description, p")
+    tagline = tagline_elem.get_text(strip=True) if tagline_elem else ""
+    
+    votes_elem = item.select_one(".votes, .upvotes, [data-votes]")
+    votes = 0
+    if votes_elem:
+        try:
+            votes = int(votes_elem.get_text(strip=True).replace(",", ""))
+        except:
+            pass
+    
+    tags = []
+    for tag in item.select(".tag, .category, .badge"):
+        tag_text = tag.get_text(strip=True)
+        if tag_text and len(tag_text) < 30:
+            tags.append(tag_text)
+    
+    img_elem = item.select_one("img")
+    logo = img_elem.get("src") if img_elem else None
+    
+    return {
+        "name": name,
+        "url": f"https://betalist.com{href}" if href.startswith("/") else href,
+        "tagline": tagline[:300] if tagline else "",
+        "votes": votes,
+        "tags": tags,
+        "logo": logo,
+        "source": "betalist",
+    }
 
 
-async def fetch_category_page(client: httpx.AsyncClient, category: str) -> list:
-    """Fetch startups from a specific category."""
-    url = f"https://betalist.com/markets/{category}"
-    return await fetch_startups_page(client, url)
+BETALIST_SPEC = {
+    "name": "betalist",
+    "item_selector": ".startup-card, article, [data-startup]",
+    "parse_item": parse_startup_item,
+    "pagination": {"param": "page", "start": 1, "max_pages": 3},
+}
 
 
-async def fetch_startup_details(client: httpx.AsyncClient, startup_url: str) -> dict:
+async def fetch_startup_details(crawler: DirectoryCrawler, startup_url: str) -> dict:
     """Fetch detailed info for a specific startup."""
     try:
-        response = await client.get(startup_url, follow_redirects=True)
-        response.raise_for_status()
-        
-        soup = BeautifulSoup(response.text, "html.parser")
+        soup = await crawler.fetch_soup(startup_url)
+        if soup is None:
+            return {"url": startup_url, "error": "fetch failed"}
         
         name_elem = soup.select_one("h1")
         name = name_elem.get_text(strip=True) if name_elem else ""
@@ -134,8 +119,14 @@ async def fetch_startup_details(client: httpx.AsyncClient, startup_url: str) ->
         return {"url": startup_url, "error": str(e)}
 
 
-async def scrape_betalist() -> dict:
-    """Scrape BetaList for early-stage startups."""
+async def scrape_betalist(tracker: Optional[DeduplicationTracker] = None) -> dict:
+    """
+    Scrape BetaList for early-stage startups.
+    
+    Args:
+        tracker: Dedup tracker; pagination stops at the first page holding
+            only known startups when given
+    """
     results = {
         "scraped_at": datetime.now().isoformat(),
         "pages": {},
@@ -152,31 +143,19 @@ async def scrape_betalist() -> dict:
             "Accept": "text/html,application/xhtml+xml",
         }
     ) as client:
-        for url in BETALIST_URLS:
-            page_name = url.split("=")[-1] if "=" in url else "default"
-            print(f"  Fetching BetaList page: {page_name}...")
-            
-            startups = await fetch_startups_page(client, url)
-            results["pages"][page_name] = startups
-            
-            for startup in startups:
-                if startup["name"].lower() not in seen_startups:
-                    seen_startups.add(startup["name"].lower())
-                    results["all_startups"].append(startup)
-            
-            await asyncio.sleep(2)
+        crawler = DirectoryCrawler(client, tracker)
+        pages = {(url.split("=")[-1] if "=" in url else "default"): url for url in BETALIST_URLS}
+        categories = {category: f"https://betalist.com/markets/{category}" for category in CATEGORIES}
         
-        for category in CATEGORIES:
-            print(f"  Fetching category: {category}...")
-            startups = await fetch_category_page(client, category)
-            results["categories"][category] = startups
-            
-            for startup in startups:
-                if startup["name"].lower() not in seen_startups:
-                    seen_startups.add(startup["name"].lower())
-                    results["all_startups"].append(startup)
-            
-            await asyncio.sleep(2)
+        results["pages"], results["categories"] = await asyncio.gather(
+            crawler.crawl(BETALIST_SPEC, pages),
+            crawler.crawl(BETALIST_SPEC, categories),
+        )
+        for startups in [*results["pages"].values(), *results["categories"].values()]:
+            merge_unique(results["all_startups"], startups, seen_startups)
+        
+        crawler.finish()
+        results["crawl"] = crawler.get_stats()
     
     results["total_unique_startups"] = len(results["all_startups"])
     return results
@@ -187,12 +166,7 @@ if __name__ == "__main__":
         print("Scraping BetaList...")
         results = await scrape_betalist()
         
-        output_dir = os.path.join(os.path.dirname(__file__), "data")
-        os.makedirs(output_dir, exist_ok=True)
-        
-        output_path = os.path.join(output_dir, "betalist.json")
-        with open(output_path, "w") as f:
-            json.dump(results, f, indent=2)
+        output_path = await save_artifact_async("betalist", results)
         
         print(f"\nSaved {results['total_unique_startups']} unique startups to {output_path}")
     
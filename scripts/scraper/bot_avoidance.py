@@ -4,7 +4,9 @@ Provides helpers for making scraper requests appear more human-like
 """
 import random
 import asyncio
+from contextlib import asynccontextmanager
 from typing import Optional, Callable, Any
+from urllib.parse import urlparse
 import httpx
 
 
@@ -265,19 +267,21 @@ class RateLimiter:
         self.requests_per_minute = requests_per_minute
         self.min_delay = 60.0 / requests_per_minute
         self.last_request_time = 0.0
+        self._lock = asyncio.Lock()
     
     async def wait(self):
-        """Wait if necessary to respect rate limit."""
+        """Wait if necessary to respect rate limit (safe for concurrent callers)."""
         import time
-        current_time = time.time()
-        time_since_last = current_time - self.last_request_time
-        
-        if time_since_last < self.min_delay:
-            wait_time = self.min_delay - time_since_last
-            jitter = random.uniform(0, wait_time * 0.2)
-            await asyncio.sleep(wait_time + jitter)
-        
-        self.last_request_time = time.time()
+        async with self._lock:
+            current_time = time.time()
+            time_since_last = current_time - self.last_request_time
+            
+            if time_since_last < self.min_delay:
+                wait_time = self.min_delay - time_since_last
+                jitter = random.uniform(0, wait_time * 0.2)
+                await asyncio.sleep(wait_time + jitter)
+            
+            self.last_request_time = time.time()
 
 
 _rate_limiters = {}
@@ -302,6 +306,37 @@ def get_rate_limiter(domain: str) -> RateLimiter:
     return _rate_limiters[domain]
 
 
+class HostLimiter:
+    """
+    Bounds concurrent requests per host.
+    
+    Hosts configured in RATE_LIMITS are also paced by their shared rate
+    limiter, so concurrency never exceeds a site's request budget.
+    """
+    
+    def __init__(self, per_host: int = 2):
+        """
+        Initialize host limiter.
+        
+        Args:
+            per_host: Maximum requests in flight to any one host
+        """
+        self.per_host = per_host
+        self.semaphores: dict[str, asyncio.Semaphore] = {}
+    
+    @asynccontextmanager
+    async def slot(self, url: str):
+        """Hold a request slot for the URL's host for the duration of the block."""
+        from rate_limit_config import RATE_LIMITS
+        
+        host = urlparse(url).netloc.lower().removeprefix("www.")
+        semaphore = self.semaphores.setdefault(host, asyncio.Semaphore(self.per_host))
+        async with semaphore:
+            if host in RATE_LIMITS:
+                await get_rate_limiter(host).wait()
+            yield
+
+
 def create_client_with_limits(
     timeout: float = 30.0,
     max_connections: int = 10,
@@ -10,7 +10,16 @@ from pathlib import Path
 
 
 class CacheManager:
-    """Manages caching of scraped data to avoid redundant requests."""
+    """
+    Manages caching of scraped data to avoid redundant requests.
+    
+    Instances on the same cache directory share one metadata dict, so the
+    per-module caches in a process do not overwrite each other's entries
+    when they save cache_metadata.json.
+    """
+    
+    # Resolved metadata file path -> metadata dict shared by its instances
+    _shared_metadata: dict[str, dict] = {}
     
     def __init__(self, cache_dir: str = "cache", default_ttl_hours: int = 72):
         """
@@ -24,7 +33,10 @@ class CacheManager:
         self.cache_dir.mkdir(exist_ok=True)
         self.default_ttl = timedelta(hours=default_ttl_hours)
         self.metadata_file = self.cache_dir / "cache_metadata.json"
-        self.metadata = self._load_metadata()
+        shared_key = str(self.metadata_file.resolve())
+        if shared_key not in CacheManager._shared_metadata:
+            CacheManager._shared_metadata[shared_key] = self._load_metadata()
+        self.metadata = CacheManager._shared_metadata[shared_key]
     
     def _load_metadata(self) -> dict:
         """Load cache metadata from disk."""
@@ -38,8 +50,10 @@ class CacheManager:
     
     def _save_metadata(self):
         """Save cache metadata to disk."""
-        with open(self.metadata_file, 'w') as f:
+        tmp_file = self.metadata_file.with_suffix(self.metadata_file.suffix + ".tmp")
+        with open(tmp_file, 'w') as f:
             json.dump(self.metadata, f, indent=2)
+        os.replace(tmp_file, self.metadata_file)
     
     def _get_cache_key(self, key: str) -> str:
         """Generate a cache key hash."""
@@ -83,7 +97,7 @@ class CacheManager:
         except Exception:
             return None
     
-    def set(self, key: str, data: Any, metadata: Optional[dict] = None):
+    def set(self, key: str, data: Any, metadata: Optional[dict] = None, ttl_hours: Optional[int] = None):
         """
         Cache data with optional metadata.
         
@@ -91,6 +105,8 @@ class CacheManager:
             key: Cache key
             data: Data to cache
             metadata: Optional metadata about the cached data
+            ttl_hours: TTL clear_expired applies to this entry (defaults to
+                this instance's default TTL)
         """
         cache_key = self._get_cache_key(key)
         cache_path = self._get_cache_path(cache_key)
@@ -101,6 +117,7 @@ class CacheManager:
         self.metadata[cache_key] = {
             'key': key,
             'cached_at': datetime.now().isoformat(),
+            'ttl_hours': ttl_hours or int(self.default_ttl.total_seconds() // 3600),
             'metadata': metadata or {}
         }
         self._save_metadata()
@@ -123,7 +140,8 @@ class CacheManager:
         
         for cache_key, meta in self.metadata.items():
             cached_at = datetime.fromisoformat(meta['cached_at'])
-            if datetime.now() - cached_at > self.default_ttl:
+            ttl = timedelta(hours=meta['ttl_hours']) if meta.get('ttl_hours') else self.default_ttl
+            if datetime.now() - cached_at > ttl:
                 expired_keys.append(meta['key'])
         
         for key in expired_keys:
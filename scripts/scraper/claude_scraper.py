@@ -2,8 +2,6 @@
 Claude Ecosystem Scraper - Fetches Claude skills, MCP servers, plugins, and resources
 Tracks Claude models, versions, and awesome-claude repositories
 """
-import os
-import json
 import re
 import httpx
 from typing import Optional, Dict, List
@@ -16,6 +14,8 @@ from bot_avoidance import (
     create_client_with_limits,
 )
 from cache_manager import CacheManager
+from rule_engine import RuleEngine
+from artifacts import save_artifact_async
 
 rate_limiter = RateLimiter(requests_per_minute=20)
 cache = CacheManager(cache_dir="cache", default_ttl_hours=24)
@@ -166,6 +166,18 @@ def extract_links_from_markdown(content: str) -> List[Dict]:
     return links
 
 
+CLAUDE_RESOURCE_ENGINE = RuleEngine([
+    ("mcp_servers", {"text": ["mcp"], "url": ["model-context-protocol"]}),
+    ("skills", {"text": ["skill"]}),
+    ("plugins", {"text": ["plugin"]}),
+    ("extensions", {"text": ["extension"], "url": ["vscode", "chrome"]}),
+    ("tutorials", {"text": ["tutorial", "guide", "course", "learn"]}),
+    ("examples", {"text": ["example", "demo", "sample"]}),
+    ("libraries", {"text": ["library", "sdk", "api", "package"]}),
+    ("tools", {"url": ["github.com"]}),
+], default="other")
+
+
 def categorize_claude_resources(links: List[Dict], content: str) -> Dict:
     """Categorize Claude resources into skills, plugins, MCP servers, etc."""
     categories = {
@@ -180,38 +192,18 @@ def categorize_claude_resources(links: List[Dict], content: str) -> Dict:
         "other": []
     }
     
-    for link in links:
-        url_lower = link["url"].lower()
-        text_lower = link["text"].lower()
-        
+    labels = CLAUDE_RESOURCE_ENGINE.classify_many(links)
+    
+    for link, label in zip(links, labels):
         pattern = rf'\[{re.escape(link["text"])}\]\({re.escape(link["url"])}\)\s*[-–—]?\s*([^.\n\[]+)'
         match = re.search(pattern, content)
         description = match.group(1).strip() if match else None
         
-        resource = {
+        categories[label].append({
             "name": link["text"],
             "url": link["url"],
             "description": description
-        }
-        
-        if "mcp" in text_lower or "model-context-protocol" in url_lower:
-            categories["mcp_servers"].append(resource)
-        elif "skill" in text_lower:
-            categories["skills"].append(resource)
-        elif "plugin" in text_lower:
-            categories["plugins"].append(resource)
-        elif "extension" in text_lower or "vscode" in url_lower or "chrome" in url_lower:
-            categories["extensions"].append(resource)
-        elif any(x in text_lower for x in ["tutorial", "guide", "course", "learn"]):
-            categories["tutorials"].append(resource)
-        elif any(x in text_lower for x in ["example", "demo", "sample"]):
-            categories["examples"].append(resource)
-        elif any(x in text_lower for x in ["library", "sdk", "api", "package"]):
-            categories["libraries"].append(resource)
-        elif "github.com" in url_lower:
-            categories["tools"].append(resource)
-        else:
-            categories["other"].append(resource)
+        })
     
     return categories
 
@@ -466,12 +458,8 @@ if __name__ == "__main__":
     async def main():
         results = await scrape_claude_ecosystem()
         
-        output_dir = os.path.join(os.path.dirname(__file__), "data")
-        os.makedirs(output_dir, exist_ok=True)
-        
-        with open(os.path.join(output_dir, "claude_ecosystem.json"), "w") as f:
-            json.dump(results, f, indent=2)
+        output_path = await save_artifact_async("claude_ecosystem", results)
         
-        print(f"\nResults saved to {output_dir}/claude_ecosystem.json")
+        print(f"\nResults saved to {output_path}")
     
     asyncio.run(main())
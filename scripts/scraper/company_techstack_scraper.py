@@ -2,14 +2,17 @@
 Company Tech Stack Scraper - Fetches companies and their publicly visible tech stacks
 Sources: StackShare companies, Wappalyzer, BuiltWith-style detection, and public tech blogs
 """
-import os
-import json
 import asyncio
 import httpx
 from bs4 import BeautifulSoup
 from datetime import datetime
 from typing import List, Dict, Optional
 import re
+from artifacts import save_artifact_async
+from bot_avoidance import HostLimiter
+from cache_manager import CacheManager
+from tech_fingerprints import get_fingerprint_engine
+from website_metadata import get_website_metadata_service
 
 
 COMPANY_SOURCES = {
@@ -48,28 +51,13 @@ COMPANY_SOURCES = {
 }
 
 
-TECH_STACK_PATTERNS = {
-    "frontend": [
-        r"react", r"vue\.?js", r"angular", r"svelte", r"next\.?js", r"nuxt",
-        r"typescript", r"javascript", r"tailwind", r"bootstrap", r"material-ui"
-    ],
-    "backend": [
-        r"node\.?js", r"python", r"django", r"flask", r"fastapi", r"ruby on rails",
-        r"go", r"rust", r"java", r"spring", r"\.net", r"php", r"laravel"
-    ],
-    "database": [
-        r"postgresql", r"mysql", r"mongodb", r"redis", r"elasticsearch",
-        r"dynamodb", r"cassandra", r"sqlite", r"supabase", r"firebase"
-    ],
-    "infrastructure": [
-        r"aws", r"gcp", r"azure", r"docker", r"kubernetes", r"terraform",
-        r"vercel", r"netlify", r"cloudflare", r"heroku", r"railway"
-    ],
-    "monitoring": [
-        r"datadog", r"sentry", r"new relic", r"grafana", r"prometheus",
-        r"logflare", r"papertrail", r"logtail"
-    ]
-}
+STACKSHARE_HOST = "stackshare.io"
+
+# Company stacks change slowly; category listings are refreshed daily
+COMPANY_TTL_HOURS = 168
+COMPANY_LIST_TTL_HOURS = 24
+
+cache = CacheManager(cache_dir="cache", default_ttl_hours=COMPANY_TTL_HOURS)
 
 
 async def fetch_stackshare_company(client: httpx.AsyncClient, company_slug: str) -> Dict:
@@ -150,48 +138,23 @@ async def fetch_stackshare_company(client: httpx.AsyncClient, company_slug: str)
 
 
 async def detect_tech_from_website(client: httpx.AsyncClient, url: str) -> Dict:
-    """Detect technologies from a website's HTML and headers."""
-    try:
-        response = await client.get(url, follow_redirects=True, timeout=10.0)
-        response.raise_for_status()
-        
-        html = response.text.lower()
-        headers = {k.lower(): v.lower() for k, v in response.headers.items()}
-        
-        detected_tech = {
-            "frontend": [],
-            "backend": [],
-            "database": [],
-            "infrastructure": [],
-            "monitoring": []
-        }
-        
-        for category, patterns in TECH_STACK_PATTERNS.items():
-            for pattern in patterns:
-                if re.search(pattern, html, re.IGNORECASE):
-                    tech_name = pattern.replace(r"\.", ".").replace(r"\?", "")
-                    detected_tech[category].append(tech_name)
-        
-        if "x-powered-by" in headers:
-            detected_tech["backend"].append(headers["x-powered-by"])
-        
-        if "server" in headers:
-            detected_tech["infrastructure"].append(headers["server"])
-        
-        detected_tech = {k: list(set(v)) for k, v in detected_tech.items() if v}
-        
-        return {
-            "url": url,
-            "detected_tech": detected_tech,
-            "method": "html_analysis",
-            "scraped_at": datetime.now().isoformat(),
-        }
-    except Exception as e:
+    """Detect technologies from a website's HTML and headers (via the shared website metadata service)."""
+    record = await get_website_metadata_service().get(client, url)
+    if "error" in record:
         return {
             "url": url,
-            "error": str(e),
+            "error": record["error"],
             "method": "html_analysis"
         }
+    
+    tech = record["tech"] or {}
+    return {
+        "url": url,
+        "detected_tech": tech.get("by_category", {}),
+        "versions": tech.get("versions", {}),
+        "method": "html_analysis",
+        "scraped_at": record["fetched_at"],
+    }
 
 
 async def scrape_stackshare_companies_list(client: httpx.AsyncClient, category: str = None) -> List[str]:
@@ -220,6 +183,34 @@ async def scrape_stackshare_companies_list(client: httpx.AsyncClient, category:
         return []
 
 
+async def get_stackshare_company(client: httpx.AsyncClient, hosts: HostLimiter, company_slug: str) -> Dict:
+    """Fetch a StackShare company, serving it from the cache within COMPANY_TTL_HOURS."""
+    key = f"stackshare:company:{company_slug}"
+    cached = cache.get(key)
+    if cached is not None:
+        return {**cached, "cached": True}
+    
+    async with hosts.slot(f"https://{STACKSHARE_HOST}/{company_slug}"):
+        company_data = await fetch_stackshare_company(client, company_slug)
+    if "error" not in company_data:
+        cache.set(key, company_data, {"slug": company_slug})
+    return company_data
+
+
+async def get_stackshare_companies_list(client: httpx.AsyncClient, hosts: HostLimiter, category: str) -> List[str]:
+    """List company slugs in a StackShare category, cached for COMPANY_LIST_TTL_HOURS."""
+    key = f"stackshare:companies:{category}"
+    cached = cache.get(key, ttl_hours=COMPANY_LIST_TTL_HOURS)
+    if cached is not None:
+        return cached
+    
+    async with hosts.slot(f"https://{STACKSHARE_HOST}/companies/{category}"):
+        company_slugs = await scrape_stackshare_companies_list(client, category)
+    if company_slugs:
+        cache.set(key, company_slugs, {"category": category})
+    return company_slugs
+
+
 async def scrape_tech_blog_stack_info(client: httpx.AsyncClient, blog_url: str) -> Dict:
     """Scrape tech stack info from engineering blogs."""
     try:
@@ -228,23 +219,8 @@ async def scrape_tech_blog_stack_info(client: httpx.AsyncClient, blog_url: str)
         
         soup = BeautifulSoup(response.text, "html.parser")
         
-        tech_mentions = {
-            "frontend": [],
-            "backend": [],
-            "database": [],
-            "infrastructure": [],
-            "monitoring": []
-        }
-        
-        text_content = soup.get_text().lower()
-        
-        for category, patterns in TECH_STACK_PATTERNS.items():
-            for pattern in patterns:
-                if re.search(pattern, text_content, re.IGNORECASE):
-                    tech_name = pattern.replace(r"\.", ".").replace(r"\?", "")
-                    tech_mentions[category].append(tech_name)
-        
-        tech_mentions = {k: list(set(v)) for k, v in tech_mentions.items() if v}
+        engine = get_fingerprint_engine()
+        tech_mentions = engine.by_category(engine.analyze_text(soup.get_text(separator=" ")))
         
         return {
             "blog_url": blog_url,
@@ -260,8 +236,25 @@ async def scrape_tech_blog_stack_info(client: httpx.AsyncClient, blog_url: str)
         }
 
 
-async def scrape_company_tech_stacks() -> Dict:
-    """Main function to scrape company tech stacks from multiple sources."""
+async def scrape_company_tech_stacks(
+    per_host_concurrency: int = 2,
+    companies_per_category: int = 10,
+    website_limit: Optional[int] = 20,
+) -> Dict:
+    """
+    Main function to scrape company tech stacks from multiple sources.
+    
+    Companies are kept in a slug index, so each one is fetched once however
+    many category listings mention it. StackShare pages and company websites
+    are fetched concurrently with at most per_host_concurrency requests in
+    flight per host (StackShare is additionally paced by RATE_LIMITS), and
+    company pages are served from the cache for COMPANY_TTL_HOURS.
+    
+    Args:
+        per_host_concurrency: Maximum requests in flight to any one host
+        companies_per_category: Companies taken from each category listing
+        website_limit: Maximum company websites to analyze (None for all)
+    """
     results = {
         "scraped_at": datetime.now().isoformat(),
         "companies": [],
@@ -270,8 +263,10 @@ async def scrape_company_tech_stacks() -> Dict:
             "stackshare": 0,
             "website_detection": 0,
             "blog_analysis": 0,
-        }
+        },
+        "cached_companies": 0,
     }
+    hosts = HostLimiter(per_host_concurrency)
     
     async with httpx.AsyncClient(
         timeout=30.0,
@@ -280,39 +275,44 @@ async def scrape_company_tech_stacks() -> Dict:
             "Accept": "text/html,application/xhtml+xml",
         }
     ) as client:
-        print("Fetching featured companies from StackShare...")
-        for company_slug in COMPANY_SOURCES["stackshare_featured"]:
-            print(f"  Scraping: {company_slug}...")
-            company_data = await fetch_stackshare_company(client, company_slug)
+        print("Discovering companies by category...")
+        categories = COMPANY_SOURCES["tech_categories"]
+        listings = await asyncio.gather(
+            *(get_stackshare_companies_list(client, hosts, category) for category in categories)
+        )
+        
+        # Slug index: insertion-ordered, featured companies first
+        slugs = dict.fromkeys(COMPANY_SOURCES["stackshare_featured"])
+        for category, company_slugs in zip(categories, listings):
+            print(f"  {category}: {len(company_slugs)} companies")
+            slugs.update(dict.fromkeys(company_slugs[:companies_per_category]))
+        
+        print(f"\nFetching {len(slugs)} companies from StackShare...")
+        fetched = await asyncio.gather(
+            *(get_stackshare_company(client, hosts, slug) for slug in slugs)
+        )
+        companies = {}
+        for company_data in fetched:
             if "error" not in company_data:
-                results["companies"].append(company_data)
-                results["sources"]["stackshare"] += 1
-            await asyncio.sleep(2)
-        
-        print("\nDiscovering additional companies by category...")
-        for category in COMPANY_SOURCES["tech_categories"]:
-            print(f"  Fetching companies in: {category}...")
-            company_slugs = await scrape_stackshare_companies_list(client, category)
-            
-            for slug in company_slugs[:10]:
-                if not any(c.get("slug") == slug for c in results["companies"]):
-                    print(f"    Scraping: {slug}...")
-                    company_data = await fetch_stackshare_company(client, slug)
-                    if "error" not in company_data:
-                        results["companies"].append(company_data)
-                        results["sources"]["stackshare"] += 1
-                    await asyncio.sleep(2)
+                companies[company_data["slug"]] = company_data
+                results["cached_companies"] += company_data.pop("cached", False)
+        results["companies"] = list(companies.values())
+        results["sources"]["stackshare"] = len(companies)
         
         print("\nEnhancing with website detection...")
-        for company in results["companies"][:20]:
-            if company.get("website"):
-                print(f"  Analyzing website: {company['website']}")
+        with_websites = [c for c in results["companies"] if c.get("website")][:website_limit]
+        
+        async def analyze_website(company: Dict):
+            async with hosts.slot(company["website"]):
                 website_tech = await detect_tech_from_website(client, company["website"])
-                if "detected_tech" in website_tech:
-                    company["website_detected_tech"] = website_tech["detected_tech"]
-                    results["sources"]["website_detection"] += 1
-                await asyncio.sleep(1)
+            if "detected_tech" in website_tech:
+                company["website_detected_tech"] = website_tech["detected_tech"]
+                company["website_tech_versions"] = website_tech["versions"]
+                results["sources"]["website_detection"] += 1
+        
+        await asyncio.gather(*(analyze_website(company) for company in with_websites))
     
+    get_website_metadata_service().save()
     results["total_companies"] = len(results["companies"])
     
     seen_companies = {}
@@ -337,12 +337,7 @@ if __name__ == "__main__":
         
         results = await scrape_company_tech_stacks()
         
-        output_dir = os.path.join(os.path.dirname(__file__), "data")
-        os.makedirs(output_dir, exist_ok=True)
-        
-        output_path = os.path.join(output_dir, "company_tech_stacks.json")
-        with open(output_path, "w") as f:
-            json.dump(results, f, indent=2)
+        output_path = await save_artifact_async("company_tech_stacks", results)
         
         print("\n" + "=" * 60)
         print("SCRAPING COMPLETE")
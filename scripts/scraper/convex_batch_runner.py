@@ -0,0 +1,501 @@
+"""
+Convex Batch Runner - Parallel bulk mutations over a persistent connection
+Used by the CLI sync scripts to push pre-built tool and article batches
+"""
+import os
+import json
+import time
+import asyncio
+from typing import Any, Callable, Iterable, Optional
+import httpx
+
+from bot_avoidance import exponential_backoff_delay
+from sync_journal import SyncJournal
+
+
+CONVEX_URL = os.environ.get("CONVEX_URL", "")
+CONVEX_DEPLOY_KEY = os.environ.get("CONVEX_DEPLOY_KEY", "")
+
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+RETRYABLE_STATUS = {408, 429, 500, 502, 503, 504}
+
+# What a failure says about the batch that caused it:
+#   record: the mutation rejected something in the batch (a thrown error or
+#           argument validation), so bisecting can isolate the bad records
+#   batch:  the call never got a verdict (timeout, transport, 5xx) after
+#           retries; smaller batches would fail the same way
+#   fatal:  no call can succeed (bad deploy key, unknown function path)
+RECORD, BATCH, FATAL = "record", "batch", "fatal"
+
+AUTH_STATUS = {401, 403}
+
+FATAL_MESSAGES = (
+    "could not find public function",
+    "could not find function",
+    "unauthorized",
+    "unauthenticated",
+    "baddeploykey",
+    "invaliddeploykey",
+    "not authorized",
+)
+
+
+def written_by_outcome(key: str = "slug", actions: tuple = ("created", "updated")) -> Callable[[list, dict], list]:
+    """
+    Build a written_records filter for mutations that report per-record outcomes.
+
+    The mutation returns {"outcomes": [{key: ..., "action": ...}, ...]}; only
+    records whose action is in `actions` count as written. Output without
+    outcomes (an older deployment) counts every record as written.
+    """
+    def written(records: list, output: dict) -> list:
+        outcomes = output.get("outcomes")
+        if not isinstance(outcomes, list):
+            return records
+        done = {o.get(key) for o in outcomes if o.get("action") in actions}
+        return [r for r in records if r.get(key) in done]
+    return written
+
+
+def classify_error_message(message: str) -> str:
+    """RECORD unless the message names an auth or missing-function failure."""
+    lowered = message.lower()
+    return FATAL if any(marker in lowered for marker in FATAL_MESSAGES) else RECORD
+
+
+class ConvexCallError(Exception):
+    """A Convex function call failed."""
+
+    def __init__(self, message: str, retryable: bool = False, kind: str = RECORD):
+        super().__init__(message)
+        self.retryable = retryable
+        self.kind = BATCH if retryable else kind
+
+
+class HttpTransport:
+    """
+    Calls Convex functions over the HTTP API with one keep-alive client.
+
+    Avoids paying Node startup and CLI auth for every batch; requires
+    CONVEX_URL and CONVEX_DEPLOY_KEY.
+    """
+
+    name = "http"
+
+    def __init__(
+        self,
+        convex_url: str = CONVEX_URL,
+        deploy_key: str = CONVEX_DEPLOY_KEY,
+        timeout: float = 120.0,
+        max_connections: int = 8,
+    ):
+        self.convex_url = convex_url.rstrip("/")
+        self.client = httpx.AsyncClient(
+            timeout=timeout,
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_connections,
+            ),
+            headers={
+                "Authorization": f"Convex {deploy_key}",
+                "Content-Type": "application/json",
+            },
+        )
+
+    async def call(self, function_path: str, args: dict) -> dict:
+        """Run a mutation and return its value."""
+        payload = {"path": function_path, "args": args, "format": "json"}
+
+        try:
+            response = await self.client.post(f"{self.convex_url}/api/mutation", json=payload)
+        except (httpx.TimeoutException, httpx.TransportError) as e:
+            raise ConvexCallError(f"{type(e).__name__}: {e}", retryable=True)
+
+        if response.status_code != 200:
+            message = f"HTTP {response.status_code}: {response.text[:200]}"
+            if response.status_code in AUTH_STATUS:
+                raise ConvexCallError(message, kind=FATAL)
+            if response.status_code >= 500:
+                raise ConvexCallError(message, retryable=response.status_code in RETRYABLE_STATUS, kind=BATCH)
+            raise ConvexCallError(
+                message,
+                retryable=response.status_code in RETRYABLE_STATUS,
+                kind=classify_error_message(message),
+            )
+
+        body = response.json()
+        if body.get("status") == "error":
+            message = body.get("errorMessage", "Unknown Convex error")[:200]
+            raise ConvexCallError(message, kind=classify_error_message(message))
+        return body.get("value") or {}
+
+    async def close(self):
+        await self.client.aclose()
+
+
+class CliTransport:
+    """
+    Calls Convex functions through the Convex CLI.
+
+    Fallback for local runs without a deploy key. Uses the project's
+    installed convex binary directly to skip npx package resolution.
+    """
+
+    name = "cli"
+
+    def __init__(self, project_dir: str = PROJECT_DIR, timeout: float = 120.0):
+        self.project_dir = project_dir
+        self.timeout = timeout
+
+        local_bin = os.path.join(project_dir, "node_modules", ".bin", "convex")
+        self.command = [local_bin] if os.path.exists(local_bin) else ["npx", "convex"]
+
+    async def call(self, function_path: str, args: dict) -> dict:
+        """Run a function with `convex run` and parse its JSON output."""
+        process = await asyncio.create_subprocess_exec(
+            *self.command, "run", function_path, json.dumps(args),
+            cwd=self.project_dir,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+        )
+
+        try:
+            stdout, stderr = await asyncio.wait_for(process.communicate(), timeout=self.timeout)
+        except asyncio.TimeoutError:
+            process.kill()
+            await process.wait()
+            raise ConvexCallError(f"Timeout after {self.timeout}s", retryable=True)
+
+        if process.returncode != 0:
+            message = stderr.decode(errors="replace")[:200]
+            raise ConvexCallError(message, kind=classify_error_message(message))
+
+        output = stdout.decode(errors="replace").strip()
+        try:
+            return json.loads(output)
+        except json.JSONDecodeError:
+            raise ConvexCallError(f"Unparseable output: {output[:200]}", kind=BATCH)
+
+    async def close(self):
+        pass
+
+
+def create_transport(kind: str = "auto", timeout: float = 120.0, concurrency: int = 4):
+    """
+    Pick a transport.
+
+    Args:
+        kind: "http", "cli" or "auto" (HTTP when a deploy key is configured)
+        timeout: Per-call timeout in seconds
+        concurrency: Number of parallel calls the transport should support
+    """
+    if kind == "auto":
+        kind = "http" if CONVEX_URL and CONVEX_DEPLOY_KEY else "cli"
+
+    if kind == "http":
+        if not CONVEX_URL or not CONVEX_DEPLOY_KEY:
+            raise ValueError("CONVEX_URL and CONVEX_DEPLOY_KEY must be set for the HTTP transport")
+        return HttpTransport(timeout=timeout, max_connections=concurrency)
+    return CliTransport(timeout=timeout)
+
+
+class ConvexBatchRunner:
+    """
+    Runs a bulk mutation over many batches with bounded parallelism.
+
+    Failed batches are retried with backoff when the failure looks transient.
+    Failures the mutation reports about the batch's contents are bisected
+    until the records that cause them are isolated; a batch that never got
+    a verdict is marked failed as a whole, and an auth or missing-function
+    error aborts the run, since no other batch can succeed either.
+    Numeric fields of each batch result are summed and "errors" lists merged.
+
+    With a journal, every successful call durably commits the labels of the
+    records it wrote (a Convex mutation is a single transaction), and records
+    already committed by an interrupted run are filtered out before sending.
+    """
+
+    def __init__(
+        self,
+        function_path: str,
+        arg_name: str,
+        transport=None,
+        concurrency: int = 4,
+        max_retries: int = 2,
+        label_record: Optional[Callable[[dict], str]] = None,
+        on_batch_done: Optional[Callable[[int, list, dict], None]] = None,
+        journal: Optional[SyncJournal] = None,
+        record_version: Optional[Callable[[dict], Any]] = None,
+        written_records: Optional[Callable[[list, dict], list]] = None,
+        extra_args: Optional[dict] = None,
+    ):
+        """
+        Initialize the runner.
+
+        Args:
+            function_path: Convex function, e.g. "ingest:bulkUpsertToolsPublic"
+            arg_name: Argument the batch list is passed as, e.g. "tools"
+            transport: HttpTransport or CliTransport (auto-selected if None)
+            concurrency: Maximum number of in-flight calls
+            max_retries: Retries for transient failures before bisecting
+            label_record: Returns a short identifier for a record in reports
+            on_batch_done: Called with (batch index, written records, output)
+                after each successful call
+            journal: Started SyncJournal used to skip and checkpoint records
+            record_version: Value committed to the journal per record (e.g.
+                its content hash); a record is only skipped on resume if
+                the value still matches. Defaults to True
+            written_records: Returns the records of a successful call the
+                mutation actually wrote (see written_by_outcome); only those
+                are journaled and passed to on_batch_done. Defaults to all
+            extra_args: Arguments passed with every batch, e.g. flags the
+                function takes alongside the batch list
+        """
+        self.function_path = function_path
+        self.arg_name = arg_name
+        self.extra_args = extra_args or {}
+        self.transport = transport or create_transport(concurrency=concurrency)
+        self.concurrency = concurrency
+        self.max_retries = max_retries
+        self.label_record = label_record or (lambda r: r.get("slug") or r.get("name") or "?")
+        self.on_batch_done = on_batch_done
+        self.journal = journal
+        self.record_version = record_version or (lambda r: True)
+        self.written_records = written_records or (lambda records, output: records)
+        self.resumed_records = 0
+        self._next_index = 0
+        self._semaphore = asyncio.Semaphore(concurrency)
+
+        self.totals: dict[str, int] = {}
+        self.errors: list[str] = []
+        self.bad_records: list[dict] = []
+        self.failed_batches: list[dict] = []
+        self.batch_stats: list[dict] = []
+        self.aborted: Optional[str] = None
+
+    def _merge_output(self, output: dict):
+        for key, value in output.items():
+            if key == "errors" and isinstance(value, list):
+                self.errors.extend(value)
+            elif isinstance(value, (int, float)) and not isinstance(value, bool):
+                self.totals[key] = self.totals.get(key, 0) + value
+
+    async def _call(self, records: list) -> tuple[dict, float]:
+        """Call the mutation, timing only the call itself (not the queue wait)."""
+        async with self._semaphore:
+            started = time.perf_counter()
+            output = await self.transport.call(self.function_path, {**self.extra_args, self.arg_name: records})
+            return output, time.perf_counter() - started
+
+    async def _run_batch(self, index: int, records: list, depth: int = 0):
+        if self.aborted:
+            self.failed_batches.append({"batch": index, "size": len(records), "error": f"run aborted: {self.aborted}"})
+            return
+
+        last_error: Optional[ConvexCallError] = None
+        started = time.perf_counter()
+        attempts = 0
+
+        for attempt in range(self.max_retries + 1):
+            attempts += 1
+            try:
+                output, latency = await self._call(records)
+            except ConvexCallError as e:
+                last_error = e
+                if not e.retryable or attempt == self.max_retries:
+                    break
+                await exponential_backoff_delay(attempt, base_delay=2.0, max_delay=30.0)
+                continue
+
+            self._merge_output(output)
+            self.batch_stats.append({
+                "batch": index,
+                "size": len(records),
+                "depth": depth,
+                "attempts": attempts,
+                "latency_s": round(latency, 3),
+                "status": "ok",
+            })
+            print(f"  Batch {index + 1}{f' (split depth {depth})' if depth else ''}: {len(records)} records in {latency:.2f}s {self._describe(output)}")
+            written = self.written_records(records, output)
+            if self.journal and written:
+                self.journal.commit_many(
+                    [self.label_record(r) for r in written],
+                    [self.record_version(r) for r in written],
+                )
+            if self.on_batch_done:
+                self.on_batch_done(index, written, output)
+            return
+
+        self.batch_stats.append({
+            "batch": index,
+            "size": len(records),
+            "depth": depth,
+            "attempts": attempts,
+            "latency_s": round(time.perf_counter() - started, 3),
+            "status": "failed",
+            "error": str(last_error),
+        })
+
+        if last_error.kind == FATAL:
+            if not self.aborted:
+                self.aborted = str(last_error)
+                print(f"  Batch {index + 1}: {last_error}; aborting run")
+            self.failed_batches.append({"batch": index, "size": len(records), "error": str(last_error)})
+            return
+
+        if last_error.kind == BATCH:
+            print(f"  Batch {index + 1}: failed ({last_error}), not retrying")
+            self.failed_batches.append({"batch": index, "size": len(records), "error": str(last_error)})
+            return
+
+        if len(records) == 1:
+            label = self.label_record(records[0])
+            self.bad_records.append({"record": label, "batch": index, "error": str(last_error)})
+            print(f"  Batch {index + 1}: bad record {label}: {last_error}")
+            return
+
+        print(f"  Batch {index + 1}: failed ({last_error}), bisecting {len(records)} records")
+        mid = len(records) // 2
+        await asyncio.gather(
+            self._run_batch(index, records[:mid], depth + 1),
+            self._run_batch(index, records[mid:], depth + 1),
+        )
+
+    def _describe(self, output: dict) -> str:
+        counts = [f"{k}={v}" for k, v in output.items() if isinstance(v, int) and not isinstance(v, bool)]
+        return f"({', '.join(counts)})" if counts else ""
+
+    async def run(self, batches: Iterable[list]) -> dict:
+        """
+        Run all batches.
+
+        Batches are pulled from the iterable only as call slots free up, so a
+        streaming reader keeps at most `concurrency` batches in memory.
+
+        Args:
+            batches: Iterable of record batches
+
+        Returns:
+            Summary with totals, errors, bad records and latency stats
+        """
+        started = time.perf_counter()
+
+        if self.journal:
+            print(f"Journal run {self.journal.run_id}{' (resumed)' if self.journal.resumed else ''}")
+
+        print(f"Running batches via {self.transport.name} transport (concurrency {self.concurrency})")
+
+        in_flight: set[asyncio.Task] = set()
+        try:
+            for batch in batches:
+                if self.aborted:
+                    break
+                if self.journal:
+                    batch = self._pending(batch)
+                if not batch:
+                    continue
+
+                while len(in_flight) >= self.concurrency:
+                    done, in_flight = await asyncio.wait(in_flight, return_when=asyncio.FIRST_COMPLETED)
+                    for task in done:
+                        task.result()
+                in_flight.add(asyncio.create_task(self.run_batch(batch)))
+
+            if in_flight:
+                await asyncio.gather(*in_flight)
+        finally:
+            await self.close()
+
+        summary = self.summary(time.perf_counter() - started)
+        if self.journal:
+            if self.aborted or self.failed_batches:
+                # Leave the run open so the next begin(resume=True) retries
+                # the batches that were never committed
+                self.journal.close()
+            else:
+                self.journal.finish({
+                    "totals": self.totals,
+                    "bad_records": len(self.bad_records),
+                })
+        return summary
+
+    async def run_batch(self, records: list):
+        """
+        Run one batch as soon as a call slot is free.
+
+        Used directly by streaming producers that build batches while
+        scraping is still in progress; call close() when done.
+        """
+        index = self._next_index
+        self._next_index += 1
+        await self._run_batch(index, records)
+
+    async def close(self):
+        """Release the transport."""
+        await self.transport.close()
+
+    def _pending(self, batch: list) -> list:
+        """Drop records the journal already has committed."""
+        pending = [
+            r for r in batch
+            if not self.journal.is_committed(self.label_record(r), self.record_version(r))
+        ]
+        self.resumed_records += len(batch) - len(pending)
+        return pending
+
+    def summary(self, elapsed: float) -> dict:
+        """Build the run summary."""
+        latencies = sorted(s["latency_s"] for s in self.batch_stats if s["status"] == "ok")
+        latency_stats = {}
+        if latencies:
+            latency_stats = {
+                "min_s": latencies[0],
+                "median_s": latencies[len(latencies) // 2],
+                "p95_s": latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))],
+                "max_s": latencies[-1],
+            }
+
+        return {
+            "totals": self.totals,
+            "errors": self.errors,
+            "bad_records": self.bad_records,
+            "failed_batches": self.failed_batches,
+            "aborted": self.aborted,
+            "batches": self.batch_stats,
+            "latency": latency_stats,
+            "elapsed_s": round(elapsed, 2),
+            "run_id": self.journal.run_id if self.journal else None,
+            "resumed_records": self.resumed_records,
+        }
+
+
+def print_summary(title: str, summary: dict, count_keys: list[str]):
+    """Print a runner summary in the CLI scripts' format."""
+    print("\n" + "=" * 50)
+    print(title)
+    print("=" * 50)
+    for key in count_keys:
+        print(f"Total {key}: {summary['totals'].get(key, 0)}")
+    print(f"Total errors: {len(summary['errors'])}")
+    print(f"Bad records: {len(summary['bad_records'])}")
+    print(f"Failed batches: {len(summary['failed_batches'])}")
+    if summary.get("aborted"):
+        print(f"Aborted: {summary['aborted']}")
+    if summary.get("run_id"):
+        print(f"Run id: {summary['run_id']} ({summary['resumed_records']} records skipped from an earlier attempt)")
+    print(f"Elapsed: {summary['elapsed_s']}s")
+    if summary["latency"]:
+        latency = summary["latency"]
+        print(f"Batch latency: median {latency['median_s']}s, p95 {latency['p95_s']}s, max {latency['max_s']}s")
+
+    if summary["errors"][:10]:
+        print("\nFirst 10 errors:")
+        for err in summary["errors"][:10]:
+            print(f"  - {err}")
+
+    if summary["bad_records"][:10]:
+        print("\nFirst 10 bad records:")
+        for bad in summary["bad_records"][:10]:
+            print(f"  - {bad['record']}: {bad['error']}")
@@ -1,13 +1,14 @@
 """
 DevHunt Scraper - Fetches developer tools from DevHunt.org
 """
-import os
-import json
 import asyncio
 import httpx
-from bs4 import BeautifulSoup
 from datetime import datetime
 from typing import Optional
+from artifacts import save_artifact_async
+from deduplication_tracker import DeduplicationTracker
+from directory_crawler import DirectoryCrawler, merge_unique
+from embedded_data import TOOL_TYPES, listing_fields
 
 
 DEVHUNT_URLS = [
@@ -36,72 +37,84 @@ CATEGORIES = [
 ]
 
 
-async def fetch_devhunt_page(client: httpx.AsyncClient, url: str) -> list:
-    """Fetch and parse a DevHunt page."""
-    try:
-        response = await client.get(url, follow_redirects=True)
-        response.raise_for_status()
-        
-        soup = BeautifulSoup(response.text, "html.parser")
-        tools = []
-        
-        for item in soup.select("article, .tool-card, [data-tool]"):
-            try:
-                name_elem = item.select_one("h2, h3, .tool-name")
-                if not name_elem:
-                    continue
-                
-                name = name_elem.get_text(strip=True)
-                
-                link_elem = item.select_one("a[href*='/tool/'], a[href*='devhunt.org']")
-                href = link_elem.get("href", "") if link_elem else ""
-                
-                desc_elem = item.select_one("p, .description")
-                description = desc_elem.get_text(strip=True) if desc_elem else ""
-                
-                votes_elem = item.select_one(".votes, [data-votes], .upvote-count")
-                votes = 0
-                if votes_elem:
-                    try:
-                        votes = int(votes_elem.get_text(strip=True).replace(",", ""))
-                    except:
-                        pass
-                
-                tags = []
-                for tag in item.select(".tag, .category, .badge"):
-                    tag_text = tag.get_text(strip=True)
-                    if tag_text and len(tag_text) < 30:
-                        tags.append(tag_text)
-                
-                img_elem = item.select_one("img")
-                logo = img_elem.get("src") if img_elem else None
-                
-                tools.append({
-                    "name": name,
-                    "url": href if href.startswith("http") else f"https://devhunt.org{href}",
-                    "description": description,
-                    "votes": votes,
-                    "tags": tags,
-                    "logo": logo,
-                    "source": "devhunt",
-                })
-            except Exception:
-                continue
-        
-        return tools
-    except Exception as e:
-        print(f"Error fetching {url}: {e}")
-        return []
+def parse_tool_item(item, listing: str) -> Optional[dict]:
+    """Parse one tool from a DevHunt listing."""
+    name_elem = item.select_one("h2, h3, .tool-name")
+    if not name_elem:
+        return None
+    
+    name = name_elem.get_text(strip=True)
+    
+    link_elem = item.select_one("a[href*='/tool/'], a[href*='devhunt.org']")
+    href = link_elem.get("href", "") if link_elem else ""
+    
+    desc_elem = item.select_one("p, .description")
+    description = desc_elem.get_text(strip=True) if desc_elem else ""
+    
+    votes_elem = item.select_one(".votes, [data-votes], .upvote-count")
+    votes = 0
+    if votes_elem:
+        try:
+            votes = int(votes_elem.get_text(strip=True).replace(",", ""))
+        except:
+            pass
+    
+    tags = []
+    for tag in item.select(".tag, .category, .badge"):
+        tag_text = tag.get_text(strip=True)
+        if tag_text and len(tag_text) < 30:
+            tags.append(tag_text)
+    
+    img_elem = item.select_one("img")
+    logo = img_elem.get("src") if img_elem else None
+    
+    return {
+        "name": name,
+        "url": href if href.startswith("http") else f"https://devhunt.org{href}",
+        "description": description,
+        "votes": votes,
+        "tags": tags,
+        "logo": logo,
+        "source": "devhunt",
+    }
+
+
+def map_embedded_tool(obj: dict, listing: str) -> Optional[dict]:
+    """Map one tool from the page's embedded Next.js data."""
+    fields = listing_fields(obj, "https://devhunt.org")
+    if not fields:
+        return None
+    url = fields["url"] or f"https://devhunt.org/tool/{fields['slug']}"
+    return {
+        "name": fields["name"],
+        "url": url,
+        "description": fields["description"] or fields["tagline"],
+        "votes": fields["votes"],
+        "tags": fields["tags"],
+        "logo": fields["logo"],
+        "source": "devhunt",
+    }
 
 
-async def fetch_category_page(client: httpx.AsyncClient, category: str) -> list:
-    """Fetch tools from a specific category."""
-    url = f"https://devhunt.org/tools?category={category}"
-    return await fetch_devhunt_page(client, url)
+DEVHUNT_SPEC = {
+    "name": "devhunt",
+    "item_selector": "article, .tool-card, [data-tool]",
+    "parse_item": parse_tool_item,
+    "map_embedded": map_embedded_tool,
+    "embedded_types": TOOL_TYPES | {"Tool"},
+    "embedded_keys": {"tools"},
+    "pagination": {"param": "page", "start": 1, "max_pages": 3},
+}
 
 
-async def scrape_devhunt() -> dict:
-    """Scrape DevHunt for developer tools."""
+async def scrape_devhunt(tracker: Optional[DeduplicationTracker] = None) -> dict:
+    """
+    Scrape DevHunt for developer tools.
+    
+    Args:
+        tracker: Dedup tracker; pagination stops at the first page holding
+            only known tools when given
+    """
     results = {
         "scraped_at": datetime.now().isoformat(),
         "pages": {},
@@ -118,31 +131,19 @@ async def scrape_devhunt() -> dict:
             "Accept": "text/html,application/xhtml+xml",
         }
     ) as client:
-        for url in DEVHUNT_URLS:
-            page_name = url.split("?")[-1] if "?" in url else "main"
-            print(f"  Fetching DevHunt page: {page_name}...")
-            
-            tools = await fetch_devhunt_page(client, url)
-            results["pages"][page_name] = tools
-            
-            for tool in tools:
-                if tool["name"] not in seen_tools:
-                    seen_tools.add(tool["name"])
-                    results["all_tools"].append(tool)
-            
-            await asyncio.sleep(1.5)
+        crawler = DirectoryCrawler(client, tracker)
+        pages = {(url.split("?")[-1] if "?" in url else "main"): url for url in DEVHUNT_URLS}
+        categories = {category: f"https://devhunt.org/tools?category={category}" for category in CATEGORIES}
         
-        for category in CATEGORIES:
-            print(f"  Fetching category: {category}...")
-            tools = await fetch_category_page(client, category)
-            results["categories"][category] = tools
-            
-            for tool in tools:
-                if tool["name"] not in seen_tools:
-                    seen_tools.add(tool["name"])
-                    results["all_tools"].append(tool)
-            
-            await asyncio.sleep(1.5)
+        results["pages"], results["categories"] = await asyncio.gather(
+            crawler.crawl(DEVHUNT_SPEC, pages),
+            crawler.crawl(DEVHUNT_SPEC, categories),
+        )
+        for tools in [*results["pages"].values(), *results["categories"].values()]:
+            merge_unique(results["all_tools"], tools, seen_tools)
+        
+        crawler.finish()
+        results["crawl"] = crawler.get_stats()
     
     results["total_unique_tools"] = len(results["all_tools"])
     return results
@@ -153,12 +154,7 @@ if __name__ == "__main__":
         print("Scraping DevHunt...")
         results = await scrape_devhunt()
         
-        output_dir = os.path.join(os.path.dirname(__file__), "data")
-        os.makedirs(output_dir, exist_ok=True)
-        
-        output_path = os.path.join(output_dir, "devhunt.json")
-        with open(output_path, "w") as f:
-            json.dump(results, f, indent=2)
+        output_path = await save_artifact_async("devhunt", results)
         
         print(f"\nSaved {results['total_unique_tools']} unique tools to {output_path}")
     
@@ -0,0 +1,193 @@
+"""
+Directory Crawler - Shared paginated crawler for tool directory sites
+Sites are declared as specs; listings are crawled concurrently within per-host limits and can stop early on known items
+"""
+import asyncio
+from typing import Optional
+from urllib.parse import urlencode, urlparse, parse_qsl, urlunparse
+import httpx
+from bs4 import BeautifulSoup
+from bot_avoidance import HostLimiter, safe_get
+from deduplication_tracker import DeduplicationTracker
+from embedded_data import find_records
+
+
+# A spec describes how to read one kind of listing page:
+#   name:          Site name used in log lines
+#   item_selector: CSS selector matching one listed item
+#   parse_item:    fn(item element, listing key) -> record dict, or None to skip
+#   pagination:    {"param", "start", "max_pages"} for ?param=N paging, or None
+#   key:           Record field identifying an item (defaults to "url")
+#   map_embedded:  Optional fn(embedded object, listing key) -> record dict, or
+#                  None to skip; when given, the page's embedded JSON
+#                  (__NEXT_DATA__, hydration state, JSON-LD) is read first and
+#                  the selectors only run if it yields nothing
+#   embedded_types: __typename / @type names of a listed item
+#   embedded_keys:  Keys holding the listing in the embedded JSON (e.g. the
+#                   pageProps array); together with embedded_types these
+#                   decide which embedded objects map_embedded sees
+#
+# Listings are passed to crawl() as {listing key: first page URL}, so one
+# spec serves every category, sort order or search of a site.
+
+
+def page_url(url: str, pagination: Optional[dict], page: int) -> str:
+    """URL of a listing page; the first page is the listing URL unchanged."""
+    if not pagination or page == pagination.get("start", 1):
+        return url
+    parsed = urlparse(url)
+    query = dict(parse_qsl(parsed.query))
+    query[pagination["param"]] = str(page)
+    return urlunparse(parsed._replace(query=urlencode(query)))
+
+
+class DirectoryCrawler:
+    """
+    Crawls directory listings declared by specs.
+
+    Listings run concurrently, bounded per host (and paced by RATE_LIMITS
+    where the host has an entry); pages within a listing are fetched in
+    order so pagination can stop as soon as it stops paying off:
+
+    - a page fails, has no items, or only repeats items from earlier pages
+      of the same listing (the site ignored the page parameter)
+    - incremental mode: every item on the page is already in the dedup
+      tracker, so later pages, which are older, hold nothing new
+
+    Items found are marked in the tracker by finish(), after the crawl, so
+    one listing's new items never stop another listing early.
+    """
+
+    def __init__(
+        self,
+        client: httpx.AsyncClient,
+        tracker: Optional[DeduplicationTracker] = None,
+        per_host: int = 2,
+    ):
+        """
+        Initialize the crawler.
+
+        Args:
+            client: HTTP client
+            tracker: Dedup tracker; enables incremental mode when given
+            per_host: Maximum requests in flight to any one host
+        """
+        self.client = client
+        self.tracker = tracker
+        self.hosts = HostLimiter(per_host)
+        self.found_urls: list[str] = []
+        self.stats = {
+            "pages": 0, "items": 0, "new_items": 0, "early_stops": 0,
+            "embedded_pages": 0, "selector_pages": 0,
+        }
+
+    async def fetch(self, url: str) -> Optional[httpx.Response]:
+        """GET a URL within the host limits, with retries; None on failure."""
+        async with self.hosts.slot(url):
+            self.stats["pages"] += 1
+            return await safe_get(self.client, url, max_retries=2, follow_redirects=True)
+
+    async def fetch_soup(self, url: str) -> Optional[BeautifulSoup]:
+        """Fetch and parse a page; None on failure."""
+        response = await self.fetch(url)
+        return BeautifulSoup(response.text, "html.parser") if response else None
+
+    def parse_page(self, spec: dict, html: str, listing: str) -> list[dict]:
+        """
+        Parse every item on a listing page, skipping items that fail to parse.
+
+        Embedded JSON is tried first when the spec has a map_embedded mapper;
+        the DOM is only built when it yields no records.
+        """
+        mapper = spec.get("map_embedded")
+        if mapper:
+            records = find_records(
+                html,
+                lambda obj: mapper(obj, listing),
+                spec.get("key", "url"),
+                types=spec.get("embedded_types"),
+                within=spec.get("embedded_keys"),
+            )
+            if records:
+                self.stats["embedded_pages"] += 1
+                return records
+
+        self.stats["selector_pages"] += 1
+        items = []
+        for element in BeautifulSoup(html, "html.parser").select(spec["item_selector"]):
+            try:
+                record = spec["parse_item"](element, listing)
+            except Exception:
+                continue
+            if record:
+                items.append(record)
+        return items
+
+    async def crawl_listing(self, spec: dict, listing: str, url: str, max_pages: Optional[int] = None) -> list[dict]:
+        """Crawl one listing's pages in order until a stop condition."""
+        pagination = spec.get("pagination")
+        key = spec.get("key", "url")
+        start = pagination.get("start", 1) if pagination else 1
+        if max_pages is None:
+            max_pages = pagination.get("max_pages", 1) if pagination else 1
+
+        items, seen = [], set()
+        for page in range(start, start + max_pages):
+            response = await self.fetch(page_url(url, pagination, page))
+            if response is None:
+                break
+            page_items = self.parse_page(spec, response.text, listing)
+            keys = {item.get(key) or item.get("name") for item in page_items}
+            if not page_items or keys <= seen:
+                break
+            seen |= keys
+            items.extend(page_items)
+
+            urls = [item["url"] for item in page_items if item.get("url")]
+            self.found_urls.extend(urls)
+            if self.tracker is not None:
+                new = [u for u in urls if not self.tracker.is_scraped(u)]
+                self.stats["new_items"] += len(new)
+                if urls and not new:
+                    self.stats["early_stops"] += 1
+                    break
+
+        self.stats["items"] += len(items)
+        return items
+
+    async def crawl(self, spec: dict, listings: dict[str, str], max_pages: Optional[int] = None) -> dict[str, list]:
+        """
+        Crawl several listings of one site concurrently.
+
+        Args:
+            spec: Site spec
+            listings: {listing key: first page URL}
+            max_pages: Page limit override for these listings
+
+        Returns:
+            {listing key: [record, ...]} in the order listings were given
+        """
+        async def crawl_one(listing: str, url: str) -> list[dict]:
+            print(f"  Fetching {spec['name']}: {listing}...")
+            return await self.crawl_listing(spec, listing, url, max_pages)
+
+        crawled = await asyncio.gather(*(crawl_one(k, u) for k, u in listings.items()))
+        return dict(zip(listings, crawled))
+
+    def finish(self):
+        """Record every item found this run in the dedup tracker."""
+        if self.tracker is not None and self.found_urls:
+            self.tracker.mark_multiple_scraped(self.found_urls)
+
+    def get_stats(self) -> dict:
+        """Get crawl statistics."""
+        return {**self.stats, "incremental": self.tracker is not None}
+
+
+def merge_unique(target: list, records: list[dict], seen: set, key: str = "name"):
+    """Append records whose lowercased key has not been seen yet."""
+    for record in records:
+        value = (record.get(key) or "").lower()
+        if value and value not in seen:
+            seen.add(value)
+            target.append(record)
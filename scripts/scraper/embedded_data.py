@@ -0,0 +1,252 @@
+"""
+Embedded Data - Reads the listing data single-page apps ship inside their HTML
+Finds __NEXT_DATA__, Nuxt/Remix/Apollo hydration payloads and JSON-LD with plain string scans, no DOM
+"""
+import re
+import json
+from typing import Callable, Iterator, Optional
+from urllib.parse import urljoin
+
+
+# <script> elements whose body is JSON
+SCRIPT_JSON_PATTERNS = {
+    "next_data": re.compile(r'<script[^>]*\bid=["\']__NEXT_DATA__["\'][^>]*>(.*?)</script>', re.S | re.I),
+    "nuxt_data": re.compile(r'<script[^>]*\bid=["\']__NUXT_DATA__["\'][^>]*>(.*?)</script>', re.S | re.I),
+    "json_ld": re.compile(r'<script[^>]*\btype=["\']application/ld\+json["\'][^>]*>(.*?)</script>', re.S | re.I),
+}
+
+# window.X = {...} assignments whose value is a JSON literal
+ASSIGNMENT_PATTERNS = {
+    "remix": re.compile(r'window\.__remixContext\s*=\s*'),
+    "apollo": re.compile(r'window\.__APOLLO_STATE__\s*=\s*'),
+    "nuxt": re.compile(r'window\.__NUXT__\s*=\s*'),
+    "initial_state": re.compile(r'window\.__INITIAL_STATE__\s*=\s*'),
+}
+
+# Tags devalue (Nuxt 3) wraps values in: ["Reactive", index] and friends
+DEVALUE_WRAPPERS = {"Reactive", "ShallowReactive", "Ref", "ShallowRef", "EmptyRef", "EmptyShallowRef"}
+
+# schema.org types describing the page or site itself rather than a listed item
+PAGE_TYPES = {"WebSite", "WebPage", "CollectionPage", "Organization", "BreadcrumbList", "SearchAction", "Person"}
+
+# schema.org types of a listed software product
+TOOL_TYPES = {"SoftwareApplication", "WebApplication", "MobileApplication", "Product"}
+
+MAX_DEPTH = 40
+
+_decoder = json.JSONDecoder()
+
+
+def _revive_devalue(payload: list):
+    """Rebuild the object graph of a devalue payload (Nuxt 3 __NUXT_DATA__)."""
+    revived: dict[int, object] = {}
+
+    def revive(index, depth=0):
+        if not isinstance(index, int) or index < 0 or index >= len(payload) or depth > MAX_DEPTH:
+            return None
+        if index in revived:
+            return revived[index]
+        value = payload[index]
+        if isinstance(value, list):
+            if len(value) == 2 and value[0] in DEVALUE_WRAPPERS:
+                result = revive(value[1], depth + 1)
+            elif value and isinstance(value[0], str):
+                result = None  # Date, Set, Map and other tagged values
+            else:
+                result = []
+                revived[index] = result
+                result.extend(revive(i, depth + 1) for i in value)
+        elif isinstance(value, dict):
+            result = {}
+            revived[index] = result
+            for key, i in value.items():
+                result[key] = revive(i, depth + 1)
+        else:
+            result = value
+        revived[index] = result
+        return result
+
+    return revive(0)
+
+
+def extract_blobs(html: str) -> list[tuple[str, object]]:
+    """
+    Find every embedded JSON payload in a page.
+
+    Returns:
+        [(kind, data), ...] where kind is one of SCRIPT_JSON_PATTERNS or
+        ASSIGNMENT_PATTERNS; payloads that are not valid JSON are skipped
+    """
+    blobs = []
+    for kind, pattern in SCRIPT_JSON_PATTERNS.items():
+        for match in pattern.finditer(html):
+            try:
+                data = json.loads(match.group(1))
+            except ValueError:
+                continue
+            if kind == "nuxt_data" and isinstance(data, list):
+                data = _revive_devalue(data)
+            blobs.append((kind, data))
+
+    for kind, pattern in ASSIGNMENT_PATTERNS.items():
+        match = pattern.search(html)
+        if not match:
+            continue
+        try:
+            data, _ = _decoder.raw_decode(html, match.end())
+        except ValueError:
+            continue  # e.g. Nuxt 2 ships a function call, not a literal
+        blobs.append((kind, data))
+
+    return blobs
+
+
+def iter_held_objects(data) -> Iterator[tuple[Optional[str], dict]]:
+    """
+    Yield (holder key, dict) for every dict in a JSON tree, depth-first.
+
+    The holder key is the object key whose value is the dict, or the list
+    the dict is an element of; it is None at the root.
+    """
+    stack = [(data, None, 0)]
+    while stack:
+        value, holder, depth = stack.pop()
+        if depth > MAX_DEPTH:
+            continue
+        if isinstance(value, dict):
+            yield holder, value
+            stack.extend(
+                (v, k, depth + 1) for k, v in reversed(list(value.items())) if isinstance(v, (dict, list))
+            )
+        elif isinstance(value, list):
+            stack.extend((v, holder, depth + 1) for v in reversed(value) if isinstance(v, (dict, list)))
+
+
+def iter_objects(data) -> Iterator[dict]:
+    """Yield every dict in a JSON tree, depth-first."""
+    for _, obj in iter_held_objects(data):
+        yield obj
+
+
+def object_types(obj: dict) -> set[str]:
+    """Type names an embedded object declares through __typename or @type."""
+    names = set()
+    for value in (obj.get("__typename"), obj.get("@type")):
+        if isinstance(value, str):
+            names.add(value)
+        elif isinstance(value, list):
+            names.update(v for v in value if isinstance(v, str))
+    return names
+
+
+def _first(obj: dict, keys: tuple) -> Optional[object]:
+    for key in keys:
+        value = obj.get(key)
+        if value not in (None, "", [], {}):
+            return value
+    return None
+
+
+def _image_url(value) -> Optional[str]:
+    if isinstance(value, str):
+        return value
+    if isinstance(value, dict):
+        return _first(value, ("url", "src", "contentUrl"))
+    if isinstance(value, list) and value:
+        return _image_url(value[0])
+    return None
+
+
+def listing_fields(obj: dict, base_url: str = "") -> Optional[dict]:
+    """
+    Read the common fields of a listed item from an embedded object.
+
+    An object counts as a listed item when it has a string name (or title)
+    plus a link or slug and a description or tagline. Field names cover
+    the usual spellings (camelCase, snake_case, schema.org).
+
+    Returns:
+        {"name", "url", "slug", "description", "tagline", "votes", "logo",
+        "tags", "typename"} or None if the object is not a listed item
+    """
+    if obj.get("@type") in PAGE_TYPES:
+        return None
+    name = _first(obj, ("name", "title"))
+    if not isinstance(name, str) or not name.strip() or len(name) > 100:
+        return None
+
+    url = _first(obj, ("url", "website", "websiteUrl", "website_url", "link", "href", "@id"))
+    slug = _first(obj, ("slug", "handle"))
+    description = _first(obj, ("description", "shortDescription", "short_description", "summary"))
+    tagline = _first(obj, ("tagline", "slogan", "subtitle", "headline"))
+    if not (url or slug) or not (description or tagline):
+        return None
+
+    tags = []
+    for tag in obj.get("tags") or obj.get("topics") or obj.get("categories") or []:
+        if isinstance(tag, dict):
+            tag = tag.get("name") or (tag.get("node") or {}).get("name")
+        if isinstance(tag, str) and tag and len(tag) < 30:
+            tags.append(tag)
+
+    votes = _first(obj, ("votesCount", "votes_count", "upvotes", "votes", "upvoteCount"))
+    if isinstance(obj.get("aggregateRating"), dict):
+        votes = votes or obj["aggregateRating"].get("ratingCount")
+
+    return {
+        "name": name.strip(),
+        "url": urljoin(base_url, url) if isinstance(url, str) else None,
+        "slug": slug if isinstance(slug, str) else None,
+        "description": description if isinstance(description, str) else "",
+        "tagline": tagline if isinstance(tagline, str) else "",
+        "votes": votes if isinstance(votes, int) else 0,
+        "logo": _image_url(_first(obj, ("logo", "logoUrl", "thumbnail", "image", "icon"))),
+        "tags": tags,
+        "typename": obj.get("__typename") or obj.get("@type"),
+    }
+
+
+def find_records(
+    html: str,
+    mapper: Callable[[dict], Optional[dict]],
+    key: str = "url",
+    types: Optional[set] = None,
+    within: Optional[set] = None,
+) -> list[dict]:
+    """
+    Map every embedded object a mapper accepts to a record.
+
+    When types or within is given, only objects declaring one of the types
+    or held directly under one of the keys reach the mapper, so categories,
+    authors and navigation entries shaped like items are not read as items.
+
+    Args:
+        html: Page HTML
+        mapper: fn(embedded object) -> record, or None to skip the object
+        key: Record field used to drop duplicates (falls back to name)
+        types: __typename / @type names of a listed item
+        within: Keys whose value holds the listing, e.g. a pageProps "tools" array
+
+    Returns:
+        Records in document order, without duplicates; empty if the page
+        embeds no data the mapper recognizes
+    """
+    gated = bool(types or within)
+    types, within = types or set(), within or set()
+    records, seen = [], set()
+    for _, blob in extract_blobs(html):
+        for holder, obj in iter_held_objects(blob):
+            if gated and holder not in within and not object_types(obj) & types:
+                continue
+            try:
+                record = mapper(obj)
+            except Exception:
+                continue
+            if not record:
+                continue
+            identity = record.get(key) or record.get("name")
+            if identity in seen:
+                continue
+            seen.add(identity)
+            records.append(record)
+    return records
@@ -2,7 +2,6 @@
 GitHub Scraper - Fetches metadata about tools from GitHub repositories
 """
 import os
-import json
 import httpx
 from typing import Optional
 from dotenv import load_dotenv
@@ -14,6 +13,7 @@ from bot_avoidance import (
     create_client_with_limits,
 )
 from cache_manager import CacheManager, ConditionalFetcher
+from artifacts import save_artifact_async
 
 load_dotenv()
 
@@ -381,11 +381,7 @@ if __name__ == "__main__":
     async def main():
         results = await scrape_github_repos(TOOL_GITHUB_URLS)
         
-        output_path = os.path.join(os.path.dirname(__file__), "data", "github_metadata.json")
-        os.makedirs(os.path.dirname(output_path), exist_ok=True)
-        
-        with open(output_path, "w") as f:
-            json.dump(results, f, indent=2)
+        output_path = await save_artifact_async("github_metadata", results, layout="mapping")
         
         print(f"\nSaved {len(results)} repos to {output_path}")
         
@@ -7,7 +7,17 @@ import asyncio
 import httpx
 from bs4 import BeautifulSoup
 from datetime import datetime
+from pathlib import Path
 from typing import Optional
+from artifacts import save_artifact_async
+from bot_avoidance import get_rate_limiter
+from cache_manager import CacheManager
+
+
+DATA_DIR = os.path.join(os.path.dirname(__file__), "data")
+
+cache = CacheManager(cache_dir="cache", default_ttl_hours=24)
+github_html_limiter = get_rate_limiter("github.com")
 
 
 TRENDING_URLS = {
@@ -16,6 +26,14 @@ TRENDING_URLS = {
     "monthly": "https://github.com/trending?since=monthly",
 }
 
+# How long a cached page is trusted, by trending period
+PAGE_TTL_HOURS = {
+    "daily": 3,
+    "weekly": 24,
+    "monthly": 72,
+    "topic": 24,
+}
+
 LANGUAGE_FILTERS = [
     "",
     "typescript",
@@ -155,8 +173,127 @@ async def fetch_topic_page(client: httpx.AsyncClient, url: str) -> list:
         return []
 
 
-async def scrape_github_trending() -> dict:
-    """Scrape all GitHub trending pages and topics."""
+def page_ttl_hours(period: Optional[str]) -> int:
+    """Cache TTL for a page; topic pages (period None) change about daily."""
+    return PAGE_TTL_HOURS.get(period, PAGE_TTL_HOURS["topic"])
+
+
+def observation_window(period: Optional[str], now: datetime) -> str:
+    """Window an appearance belongs to, so re-runs inside it add nothing new."""
+    if period == "weekly":
+        year, week, _ = now.isocalendar()
+        return f"{year}-W{week:02d}"
+    if period == "monthly":
+        return now.strftime("%Y-%m")
+    return now.strftime("%Y-%m-%d")
+
+
+class TrendingHistory:
+    """
+    Every trending/topic appearance observed per repo, across runs.
+
+    An appearance is identified by (page, observation window), so the
+    same daily page seen twice on one day, or a weekly page within one
+    ISO week, is recorded once.
+    """
+
+    def __init__(self, history_file: Optional[str] = None):
+        """
+        Initialize trending history.
+
+        Args:
+            history_file: Path to the history (defaults to data/github_trending_history.json)
+        """
+        if history_file is None:
+            history_file = os.path.join(DATA_DIR, "github_trending_history.json")
+        self.history_file = Path(history_file)
+        self.history_file.parent.mkdir(parents=True, exist_ok=True)
+        self.repos: dict[str, dict] = self._load_history()
+        # Appearance keys per repo, so observe() checks membership in O(1)
+        self.appearance_keys: dict[str, set[str]] = {
+            name: {a["key"] for a in entry.get("appearances", [])}
+            for name, entry in self.repos.items()
+        }
+        self.new_observations = 0
+
+    def _load_history(self) -> dict:
+        """Load the history from disk."""
+        if self.history_file.exists():
+            try:
+                with open(self.history_file, 'r') as f:
+                    return json.load(f).get('repos', {})
+            except Exception:
+                return {}
+        return {}
+
+    def save(self):
+        """Atomically write the history to disk."""
+        tmp_file = self.history_file.with_suffix(self.history_file.suffix + ".tmp")
+        with open(tmp_file, 'w') as f:
+            json.dump({'repos': self.repos}, f, indent=2, sort_keys=True)
+        os.replace(tmp_file, self.history_file)
+
+    def observe(self, page: str, window: str, rank: int, repo: dict):
+        """Record an appearance unless it was already observed in this window."""
+        entry = self.repos.setdefault(repo["repo"], {"first_seen": window, "appearances": []})
+        key = f"{page}@{window}"
+        seen = self.appearance_keys.setdefault(repo["repo"], set())
+        if key in seen:
+            return
+        seen.add(key)
+        entry["appearances"].append({
+            "key": key,
+            "page": page,
+            "window": window,
+            "rank": rank,
+            "stars": repo.get("stars"),
+            "stars_period": repo.get("stars_period"),
+        })
+        entry["last_seen"] = window
+        self.new_observations += 1
+
+
+def _merge_repo(index: dict, repo: dict, page: str):
+    """Merge a page record into the repo index, filling fields earlier pages lacked."""
+    merged = index.get(repo["repo"])
+    if merged is None:
+        index[repo["repo"]] = {**repo, "pages": [page]}
+        return
+    for key, value in repo.items():
+        if key != "source" and merged.get(key) in (None, "") and value not in (None, ""):
+            merged[key] = value
+    merged["stars"] = max(merged.get("stars") or 0, repo.get("stars") or 0)
+    merged["pages"].append(page)
+
+
+async def _fetch_cached(
+    client: httpx.AsyncClient,
+    fetcher,
+    url: str,
+    period: Optional[str],
+    stats: dict,
+) -> list:
+    cached = cache.get(url, ttl_hours=page_ttl_hours(period))
+    if cached is not None:
+        stats["cached"] += 1
+        return cached
+    
+    await github_html_limiter.wait()
+    stats["fetched"] += 1
+    repos = await fetcher(client, url)
+    if repos:
+        cache.set(url, repos, {"period": period or "topic"}, ttl_hours=page_ttl_hours(period))
+    return repos
+
+
+async def scrape_github_trending(concurrency: int = 4) -> dict:
+    """
+    Scrape all GitHub trending pages and topics.
+    
+    Each page is cached with a TTL matching its period, so monthly pages
+    are not refetched as often as daily ones. Uncached pages are fetched
+    concurrently under the shared github.com HTML rate limiter.
+    """
     results = {
         "scraped_at": datetime.now().isoformat(),
         "trending": {},
@@ -164,48 +301,50 @@ async def scrape_github_trending() -> dict:
         "all_repos": [],
     }
     
-    seen_repos = set()
+    pages = []
+    for period, base_url in TRENDING_URLS.items():
+        results["trending"][period] = {}
+        for lang in LANGUAGE_FILTERS:
+            url = f"https://github.com/trending/{lang}?since={period}" if lang else base_url
+            pages.append((f"trending:{period}:{lang or 'all'}", url, period, fetch_trending_page))
+    for topic_url in TOPIC_URLS:
+        pages.append((f"topic:{topic_url.split('/')[-1]}", topic_url, None, fetch_topic_page))
+    
+    stats = {"cached": 0, "fetched": 0}
+    semaphore = asyncio.Semaphore(concurrency)
     
     async with httpx.AsyncClient(
         timeout=30.0,
         headers={"User-Agent": "Mozilla/5.0 (compatible; VibeBuff/1.0)"}
     ) as client:
-        for period, base_url in TRENDING_URLS.items():
-            results["trending"][period] = {}
-            
-            for lang in LANGUAGE_FILTERS:
-                url = base_url if not lang else f"{base_url}&spoken_language_code=en"
-                if lang:
-                    url = f"https://github.com/trending/{lang}?since={period}"
-                
-                print(f"  Fetching trending {period} - {lang or 'all'}...")
-                repos = await fetch_trending_page(client, url)
-                
-                lang_key = lang or "all"
-                results["trending"][period][lang_key] = repos
-                
-                for repo in repos:
-                    if repo["repo"] not in seen_repos:
-                        seen_repos.add(repo["repo"])
-                        results["all_repos"].append(repo)
-                
-                await asyncio.sleep(1)
+        async def fetch_page(page: str, url: str, period: Optional[str], fetcher) -> list:
+            async with semaphore:
+                print(f"  Fetching {page}...")
+                return await _fetch_cached(client, fetcher, url, period, stats)
+        
+        fetched = await asyncio.gather(*(fetch_page(*page) for page in pages))
+    
+    now = datetime.now()
+    history = TrendingHistory()
+    index: dict[str, dict] = {}
+    for (page, _, period, _), repos in zip(pages, fetched):
+        kind, *parts = page.split(":")
+        if kind == "trending":
+            results["trending"][parts[0]][parts[1]] = repos
+        else:
+            results["topics"][parts[0]] = repos
         
-        for topic_url in TOPIC_URLS:
-            topic_name = topic_url.split("/")[-1]
-            print(f"  Fetching topic: {topic_name}...")
-            
-            repos = await fetch_topic_page(client, topic_url)
-            results["topics"][topic_name] = repos
-            
-            for repo in repos:
-                if repo["repo"] not in seen_repos:
-                    seen_repos.add(repo["repo"])
-                    results["all_repos"].append(repo)
-            
-            await asyncio.sleep(1)
+        window = observation_window(period, now)
+        for rank, repo in enumerate(repos, start=1):
+            _merge_repo(index, repo, page)
+            history.observe(page, window, rank, repo)
+    history.save()
     
+    results["all_repos"] = list(index.values())
     results["total_unique_repos"] = len(results["all_repos"])
+    results["pages"] = stats
+    results["new_observations"] = history.new_observations
+    print(f"  Pages: {stats['fetched']} fetched, {stats['cached']} from cache; {history.new_observations} new trending observations")
     return results
 
 
@@ -214,12 +353,7 @@ if __name__ == "__main__":
         print("Scraping GitHub Trending...")
         results = await scrape_github_trending()
         
-        output_dir = os.path.join(os.path.dirname(__file__), "data")
-        os.makedirs(output_dir, exist_ok=True)
-        
-        output_path = os.path.join(output_dir, "github_trending.json")
-        with open(output_path, "w") as f:
-            json.dump(results, f, indent=2)
+        output_path = await save_artifact_async("github_trending", results)
         
         print(f"\nSaved {results['total_unique_repos']} unique repos to {output_path}")
     
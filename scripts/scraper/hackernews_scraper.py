@@ -2,17 +2,30 @@
 Hacker News Scraper - Fetches Show HN, Launch HN, and tool-related posts
 """
 import os
+import re
+import html
 import json
+import time
 import asyncio
 import httpx
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
+from pathlib import Path
 from typing import Optional
+from artifacts import save_artifact_async
+from article_scraper import extract_tool_mentions
+from bot_avoidance import HostLimiter
 
 
+DATA_DIR = os.path.join(os.path.dirname(__file__), "data")
+
 HN_API_BASE = "https://hacker-news.firebaseio.com/v0"
 
 ALGOLIA_API = "https://hn.algolia.com/api/v1"
 
+# Concurrent Algolia requests; pacing comes from RATE_LIMITS["hn.algolia.com"]
+algolia_hosts = HostLimiter(per_host=4)
+
 SEARCH_QUERIES = [
     "Show HN",
     "Launch HN",
@@ -111,76 +124,223 @@ async def fetch_show_hn(client: httpx.AsyncClient, limit: int = 100) -> list:
         return []
 
 
-async def search_algolia(client: httpx.AsyncClient, query: str, tags: str = "story", hits_per_page: int = 50) -> list:
-    """Search HN using Algolia API."""
-    url = f"{ALGOLIA_API}/search"
+def hit_to_story(hit: dict, **extra) -> dict:
+    """Map an Algolia hit to a story; ids are ints, like the Firebase API's."""
+    story_id = int(hit["objectID"])
+    return {
+        "id": story_id,
+        "title": hit.get("title"),
+        "url": hit.get("url"),
+        "score": hit.get("points") or 0,
+        "by": hit.get("author"),
+        "created_at": hit.get("created_at"),
+        "created_at_i": hit.get("created_at_i"),
+        "num_comments": hit.get("num_comments") or 0,
+        "hn_url": f"https://news.ycombinator.com/item?id={story_id}",
+        **extra,
+    }
+
+
+async def search_algolia_page(
+    client: httpx.AsyncClient,
+    query: str,
+    tags: str = "story",
+    hits_per_page: int = 50,
+    created_after: Optional[int] = None,
+    page: int = 0,
+    created_before: Optional[int] = None,
+) -> Optional[dict]:
+    """
+    Fetch one page of Algolia search_by_date results (newest first).
+
+    Args:
+        created_after: Only return items with created_at_i above this
+        page: Zero-based result page
+        created_before: Only return items with created_at_i below this
+
+    Returns:
+        The Algolia response ({"hits", "nbHits", "nbPages", ...}), or None on failure
+    """
+    url = f"{ALGOLIA_API}/search_by_date"
     params = {
         "query": query,
         "tags": tags,
         "hitsPerPage": hits_per_page,
+        "page": page,
     }
-    
-    try:
-        response = await client.get(url, params=params)
-        response.raise_for_status()
-        
-        data = response.json()
-        hits = data.get("hits", [])
-        
-        stories = []
-        for hit in hits:
-            stories.append({
-                "id": hit.get("objectID"),
-                "title": hit.get("title"),
-                "url": hit.get("url"),
-                "score": hit.get("points", 0),
-                "by": hit.get("author"),
-                "created_at": hit.get("created_at"),
-                "num_comments": hit.get("num_comments", 0),
-                "hn_url": f"https://news.ycombinator.com/item?id={hit.get('objectID')}",
-                "search_query": query,
-            })
-        
-        return stories
-    except Exception as e:
-        print(f"Error searching Algolia for '{query}': {e}")
-        return []
+    filters = []
+    if created_after is not None:
+        filters.append(f"created_at_i>{created_after}")
+    if created_before is not None:
+        filters.append(f"created_at_i<{created_before}")
+    if filters:
+        params["numericFilters"] = ",".join(filters)
+
+    async with algolia_hosts.slot(url):
+        try:
+            response = await client.get(url, params=params)
+            response.raise_for_status()
+            return response.json()
+        except Exception as e:
+            print(f"Error searching Algolia for '{query}': {e}")
+            return None
+
 
+async def search_algolia(
+    client: httpx.AsyncClient,
+    query: str,
+    tags: str = "story",
+    hits_per_page: int = 50,
+    created_after: Optional[int] = None,
+    max_pages: int = 1,
+    created_before: Optional[int] = None,
+) -> tuple[list, str]:
+    """
+    Search HN using Algolia, newest first, paging until results run out.
 
-async def search_show_hn(client: httpx.AsyncClient, query: str = "", hits_per_page: int = 50) -> list:
+    Algolia serves at most 1000 hits per query, so a query can also be cut
+    short with pages left to read.
+
+    Args:
+        created_after: Only return stories newer than this created_at_i
+        max_pages: Page limit (backfills use several, steady state needs one)
+        created_before: Only return stories older than this created_at_i
+
+    Returns:
+        (stories, status) where status is "complete", "truncated" (the page
+        limit or Algolia's hit cap left the oldest hits unread) or "failed"
+    """
+    is_show_hn = tags == "show_hn"
+    stories = []
+    for page in range(max_pages):
+        data = await search_algolia_page(client, query, tags, hits_per_page, created_after, page, created_before)
+        if data is None:
+            return stories, "failed"
+        for hit in data.get("hits", []):
+            if is_show_hn:
+                stories.append(hit_to_story(hit, is_show_hn=True))
+            else:
+                stories.append(hit_to_story(hit, search_query=query))
+        if page + 1 >= data.get("nbPages", 0):
+            break
+    return stories, "complete" if len(stories) >= data.get("nbHits", 0) else "truncated"
+
+
+async def search_show_hn(
+    client: httpx.AsyncClient,
+    query: str = "",
+    hits_per_page: int = 50,
+    created_after: Optional[int] = None,
+    max_pages: int = 1,
+    created_before: Optional[int] = None,
+) -> tuple[list, str]:
     """Search Show HN posts using Algolia."""
-    url = f"{ALGOLIA_API}/search"
-    params = {
-        "query": f"Show HN {query}",
-        "tags": "show_hn",
-        "hitsPerPage": hits_per_page,
-    }
-    
-    try:
-        response = await client.get(url, params=params)
-        response.raise_for_status()
-        
-        data = response.json()
-        hits = data.get("hits", [])
-        
-        stories = []
-        for hit in hits:
-            stories.append({
-                "id": hit.get("objectID"),
-                "title": hit.get("title"),
-                "url": hit.get("url"),
-                "score": hit.get("points", 0),
-                "by": hit.get("author"),
-                "created_at": hit.get("created_at"),
-                "num_comments": hit.get("num_comments", 0),
-                "hn_url": f"https://news.ycombinator.com/item?id={hit.get('objectID')}",
-                "is_show_hn": True,
-            })
-        
-        return stories
-    except Exception as e:
-        print(f"Error searching Show HN: {e}")
-        return []
+    return await search_algolia(
+        client, f"Show HN {query}".strip(), "show_hn", hits_per_page, created_after, max_pages, created_before
+    )
+
+
+class SearchWatermarks:
+    """
+    Newest created_at_i seen per Algolia search query.
+
+    Each run only asks Algolia for hits above a query's watermark; the
+    watermark only advances when the query's pages were all fetched.
+    """
+
+    def __init__(self, state_file: Optional[str] = None):
+        """
+        Initialize the watermarks.
+
+        Args:
+            state_file: Path to the state (defaults to data/hackernews_watermarks.json)
+        """
+        if state_file is None:
+            state_file = os.path.join(DATA_DIR, "hackernews_watermarks.json")
+        self.state_file = Path(state_file)
+        self.state_file.parent.mkdir(parents=True, exist_ok=True)
+        self.queries = self._load_queries()
+
+    def _load_queries(self) -> dict:
+        """Load watermarks from disk."""
+        if self.state_file.exists():
+            try:
+                with open(self.state_file, 'r') as f:
+                    return json.load(f).get("queries", {})
+            except Exception:
+                pass
+        return {}
+
+    def get(self, query: str) -> Optional[int]:
+        """Watermark of a query, or None if it was never searched."""
+        return self.queries.get(query)
+
+    def advance(self, query: str, stories: list[dict]):
+        """Move a query's watermark to the newest story found (never back)."""
+        newest = max((s["created_at_i"] for s in stories if s.get("created_at_i")), default=None)
+        if newest is not None and newest > self.queries.get(query, 0):
+            self.queries[query] = newest
+
+    def save(self):
+        """Atomically write the watermarks to disk."""
+        tmp_file = self.state_file.with_suffix(self.state_file.suffix + ".tmp")
+        with open(tmp_file, 'w') as f:
+            json.dump({"queries": self.queries, "updated_at": datetime.now().isoformat()}, f, indent=2)
+        os.replace(tmp_file, self.state_file)
+
+
+async def search_incremental(
+    client: httpx.AsyncClient,
+    query: str,
+    watermarks: SearchWatermarks,
+    backfill_days: int = 30,
+    backfill_pages: int = 5,
+    max_pages: int = 10,
+    max_rounds: int = 10,
+) -> tuple[list, dict]:
+    """
+    Search a query for hits newer than its watermark.
+
+    Hits come newest first, so when a search is truncated the hits it
+    missed are the oldest ones above the watermark. The search is then
+    narrowed to hits older than the oldest one fetched and repeated until
+    it completes; only a complete search advances the watermark.
+
+    A query without a watermark backfills its last backfill_days, up to
+    backfill_pages pages, and starts its watermark from whatever that
+    finds; after that, a run usually needs a single page.
+
+    Returns:
+        (stories, stats)
+    """
+    since = watermarks.get(query)
+    backfill = since is None
+    if backfill:
+        since = int(time.time()) - backfill_days * 86400
+        max_pages = backfill_pages
+
+    stories, seen, before, rounds = [], set(), None, 0
+    while True:
+        if query == "Show HN":
+            found, status = await search_show_hn(client, "", created_after=since, max_pages=max_pages, created_before=before)
+        else:
+            found, status = await search_algolia(client, query, created_after=since, max_pages=max_pages, created_before=before)
+        rounds += 1
+        for story in found:
+            if story["id"] not in seen:
+                seen.add(story["id"])
+                stories.append(story)
+        if status != "truncated" or backfill or rounds >= max_rounds:
+            break
+        # created_at_i<before is exclusive; keep the oldest second in the next round
+        oldest = min((s["created_at_i"] for s in found if s.get("created_at_i")), default=None)
+        if oldest is None or (before is not None and oldest + 1 >= before):
+            break
+        before = oldest + 1
+
+    if status == "complete" or (backfill and status == "truncated"):
+        watermarks.advance(query, stories)
+    return stories, {"since": since, "hits": len(stories), "status": status, "rounds": rounds}
 
 
 def extract_tool_info(story: dict) -> dict:
@@ -213,56 +373,242 @@ def extract_tool_info(story: dict) -> dict:
     }
 
 
-async def scrape_hackernews() -> dict:
-    """Scrape Hacker News for developer tools and Show HN posts."""
+def select_threads(stories: list[dict], min_comments: int = 5, limit: int = 300) -> list[dict]:
+    """
+    Pick the discussion threads worth mining: tool launches first, then by comment count.
+
+    Stories from the Firebase API count comments as "descendants", Algolia
+    hits as "num_comments".
+    """
+    def comments(story: dict) -> int:
+        return story.get("num_comments") or story.get("descendants") or 0
+
+    candidates = [s for s in stories if s.get("id") and comments(s) >= min_comments]
+    candidates.sort(key=lambda s: (not (s.get("is_show_hn") or s.get("is_launch_hn")), -comments(s)))
+    return candidates[:limit]
+
+
+async def fetch_item_tree(client: httpx.AsyncClient, story_id: int) -> Optional[dict]:
+    """Fetch a story with its whole comment tree in one Algolia items/<id> request."""
+    url = f"{ALGOLIA_API}/items/{story_id}"
+    async with algolia_hosts.slot(url):
+        try:
+            response = await client.get(url)
+            response.raise_for_status()
+            return response.json()
+        except Exception as e:
+            print(f"  Error fetching thread {story_id}: {e}")
+            return None
+
+
+def comment_texts(tree: dict) -> list[str]:
+    """Plain text of every comment in an item tree (HTML tags stripped, entities decoded)."""
+    texts = []
+    stack = list(tree.get("children") or [])
+    while stack:
+        node = stack.pop()
+        if node.get("text"):
+            texts.append(html.unescape(re.sub(r"<[^>]+>", " ", node["text"])))
+        stack.extend(node.get("children") or [])
+    return texts
+
+
+def mine_comments(texts: list[str]) -> dict:
+    """
+    Run the tool-mention matcher over one thread's comments.
+
+    Runs in a worker process, so it only takes and returns plain data.
+
+    Returns:
+        {tool: {"category", "mentions", "comments", "contexts"}}
+    """
+    tools = {}
+    for text in texts:
+        for mention in extract_tool_mentions(text):
+            entry = tools.setdefault(mention["tool"], {
+                "category": mention["category"],
+                "mentions": 0,
+                "comments": 0,
+                "contexts": [],
+            })
+            entry["mentions"] += mention["count"]
+            entry["comments"] += 1
+            if len(entry["contexts"]) < 2:
+                entry["contexts"].append(mention["contexts"][0])
+    return tools
+
+
+async def mine_comment_threads(
+    client: httpx.AsyncClient,
+    stories: list[dict],
+    concurrency: int = 8,
+    time_budget: float = 180.0,
+    max_workers: Optional[int] = None,
+) -> dict:
+    """
+    Mine tool mentions from the comment trees of many threads.
+
+    Fetch workers pull stories from a queue and hand each thread's comments
+    to a process pool for matching, so fetching and matching overlap.
+    Workers stop taking threads once the time budget is spent; threads
+    already in flight finish.
+
+    Args:
+        client: HTTP client
+        stories: Threads to mine, in priority order (see select_threads)
+        concurrency: Threads fetched and matched at once
+        time_budget: Seconds after which no new thread is started
+        max_workers: Matcher processes (defaults to the CPU count)
+
+    Returns:
+        {"tool_mentions": {tool: aggregate}, "threads": {story id: summary}, "stats": {...}}
+    """
+    started = time.monotonic()
+    deadline = started + time_budget
+    queue: asyncio.Queue = asyncio.Queue()
+    for story in stories:
+        queue.put_nowait(story)
+
+    threads = {}
+    tool_mentions = {}
+    stats = {"threads_mined": 0, "threads_failed": 0, "threads_skipped": 0, "comments": 0}
+    loop = asyncio.get_running_loop()
+    executor = ProcessPoolExecutor(max_workers=max_workers)
+
+    async def handle_story(story: dict):
+        tree = await fetch_item_tree(client, story["id"])
+        if tree is None:
+            stats["threads_failed"] += 1
+            return
+        texts = comment_texts(tree)
+        mentions = await loop.run_in_executor(executor, mine_comments, texts)
+
+        stats["threads_mined"] += 1
+        stats["comments"] += len(texts)
+        threads[story["id"]] = {
+            "title": story.get("title"),
+            "hn_url": story.get("hn_url"),
+            "comments": len(texts),
+            "mentions": {tool: entry["mentions"] for tool, entry in mentions.items()},
+        }
+        for tool, entry in mentions.items():
+            total = tool_mentions.setdefault(tool, {
+                "tool": tool,
+                "category": entry["category"],
+                "total_mentions": 0,
+                "comment_count": 0,
+                "thread_count": 0,
+                "threads": [],
+                "contexts": [],
+            })
+            total["total_mentions"] += entry["mentions"]
+            total["comment_count"] += entry["comments"]
+            total["thread_count"] += 1
+            total["threads"].append(story["id"])
+            if len(total["contexts"]) < 5:
+                total["contexts"].extend(entry["contexts"][:5 - len(total["contexts"])])
+
+    async def worker():
+        while time.monotonic() < deadline:
+            try:
+                story = queue.get_nowait()
+            except asyncio.QueueEmpty:
+                return
+            await handle_story(story)
+
+    try:
+        await asyncio.gather(*(worker() for _ in range(min(concurrency, len(stories)) or 1)))
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    stats["threads_skipped"] = queue.qsize()
+    stats["elapsed_seconds"] = round(time.monotonic() - started, 1)
+    return {
+        "tool_mentions": dict(sorted(tool_mentions.items(), key=lambda x: x[1]["total_mentions"], reverse=True)),
+        "threads": threads,
+        "stats": stats,
+    }
+
+
+def merge_stories(index: dict, stories: list[dict]):
+    """Merge stories into an id-keyed index, collecting every query that found each."""
+    for story in stories:
+        story_id = story.get("id")
+        if not story_id:
+            continue
+        existing = index.get(story_id)
+        if existing is None:
+            existing = index[story_id] = {**story, "search_queries": []}
+        else:
+            existing["score"] = max(existing.get("score") or 0, story.get("score") or 0)
+            existing["is_show_hn"] = existing.get("is_show_hn") or story.get("is_show_hn")
+        query = story.get("search_query")
+        if query and query not in existing["search_queries"]:
+            existing["search_queries"].append(query)
+
+
+async def scrape_hackernews(
+    watermarks: Optional[SearchWatermarks] = None,
+    mine_threads: int = 300,
+    mining_time_budget: float = 180.0,
+) -> dict:
+    """
+    Scrape Hacker News for developer tools and Show HN posts.
+    
+    Algolia searches are incremental: each query only fetches hits newer
+    than its persisted created_at_i watermark, and queries run concurrently.
+    The comment trees of the most discussed threads are then mined for
+    tool mentions.
+    
+    Args:
+        watermarks: Search watermarks (defaults to data/hackernews_watermarks.json)
+        mine_threads: Maximum threads to mine for comment mentions (0 disables mining)
+        mining_time_budget: Seconds of comment mining per run
+    """
+    if watermarks is None:
+        watermarks = SearchWatermarks()
+    
     results = {
         "scraped_at": datetime.now().isoformat(),
         "show_hn": [],
         "top_stories": [],
         "search_results": {},
+        "search_stats": {},
         "all_stories": [],
     }
     
-    seen_ids = set()
+    stories_by_id = {}
     
     async with httpx.AsyncClient(timeout=30.0) as client:
         print("  Fetching Show HN stories...")
         show_hn = await fetch_show_hn(client, limit=50)
         results["show_hn"] = [extract_tool_info(s) for s in show_hn]
-        
-        for story in results["show_hn"]:
-            if story["id"] not in seen_ids:
-                seen_ids.add(story["id"])
-                results["all_stories"].append(story)
+        merge_stories(stories_by_id, results["show_hn"])
         
         print("  Fetching top stories...")
         top_stories = await fetch_top_stories(client, limit=30)
         results["top_stories"] = [extract_tool_info(s) for s in top_stories]
+        merge_stories(stories_by_id, results["top_stories"])
         
-        for story in results["top_stories"]:
-            if story["id"] not in seen_ids:
-                seen_ids.add(story["id"])
-                results["all_stories"].append(story)
+        print(f"  Searching {len(SEARCH_QUERIES)} queries...")
+        searched = await asyncio.gather(*(
+            search_incremental(client, query, watermarks) for query in SEARCH_QUERIES
+        ))
+        for query, (stories, stats) in zip(SEARCH_QUERIES, searched):
+            results["search_results"][query] = [extract_tool_info(s) for s in stories]
+            results["search_stats"][query] = stats
+            merge_stories(stories_by_id, results["search_results"][query])
         
-        for query in SEARCH_QUERIES:
-            print(f"  Searching: {query}...")
-            
-            if query == "Show HN":
-                search_results = await search_show_hn(client, "", hits_per_page=30)
-            else:
-                search_results = await search_algolia(client, query, hits_per_page=20)
-            
-            results["search_results"][query] = [extract_tool_info(s) for s in search_results]
-            
-            for story in results["search_results"][query]:
-                story_id = story.get("id")
-                if story_id and story_id not in seen_ids:
-                    seen_ids.add(story_id)
-                    results["all_stories"].append(story)
-            
-            await asyncio.sleep(0.5)
+        watermarks.save()
+        
+        threads = select_threads(list(stories_by_id.values()), limit=mine_threads) if mine_threads else []
+        if threads:
+            print(f"  Mining comments of {len(threads)} threads...")
+            results["comment_mining"] = await mine_comment_threads(client, threads, time_budget=mining_time_budget)
     
+    results["all_stories"] = list(stories_by_id.values())
     results["total_unique_stories"] = len(results["all_stories"])
+    results["total_new_search_hits"] = sum(s["hits"] for s in results["search_stats"].values())
     
     results["tool_launches"] = [
         s for s in results["all_stories"]
@@ -278,12 +624,7 @@ if __name__ == "__main__":
         print("Scraping Hacker News...")
         results = await scrape_hackernews()
         
-        output_dir = os.path.join(os.path.dirname(__file__), "data")
-        os.makedirs(output_dir, exist_ok=True)
-        
-        output_path = os.path.join(output_dir, "hackernews.json")
-        with open(output_path, "w") as f:
-            json.dump(results, f, indent=2)
+        output_path = await save_artifact_async("hackernews", results)
         
         print(f"\nSaved {results['total_unique_stories']} unique stories to {output_path}")
         print(f"  - {results['total_tool_launches']} tool launches (Show HN / Launch HN)")
@@ -1,13 +1,15 @@
 """
 Indie Hackers Scraper - Fetches products and tools from Indie Hackers
 """
-import os
-import json
 import asyncio
 import httpx
-from bs4 import BeautifulSoup
 from datetime import datetime
 from typing import Optional
+from urllib.parse import urlencode
+from artifacts import save_artifact_async
+from deduplication_tracker import DeduplicationTracker
+from directory_crawler import DirectoryCrawler, merge_unique
+from embedded_data import TOOL_TYPES, listing_fields
 
 
 PRODUCT_CATEGORIES = [
@@ -37,75 +39,132 @@ SEARCH_QUERIES = [
 ]
 
 
-async def fetch_products_page(client: httpx.AsyncClient, page: int = 1) -> list:
-    """Fetch products from Indie Hackers products page."""
-    url = f"https://www.indiehackers.com/products?page={page}"
+def parse_product_item(item, listing: str) -> Optional[dict]:
+    """Parse one product from the products listing."""
+    name_elem = item.select_one("h2, h3, .product-name, a")
+    if not name_elem:
+        return None
     
-    try:
-        response = await client.get(url, follow_redirects=True)
-        response.raise_for_status()
-        
-        soup = BeautifulSoup(response.text, "html.parser")
-        products = []
-        
-        for item in soup.select(".product-card, [data-product], article"):
-            try:
-                name_elem = item.select_one("h2, h3, .product-name, a")
-                if not name_elem:
-                    continue
-                
-                name = name_elem.get_text(strip=True)
-                if not name or len(name) > 100:
-                    continue
-                
-                link_elem = item.select_one("a[href*='/product/']")
-                href = link_elem.get("href", "") if link_elem else ""
-                
-                desc_elem = item.select_one("p, .description, .tagline")
-                description = desc_elem.get_text(strip=True) if desc_elem else ""
-                
-                revenue_elem = item.select_one(".revenue, [data-revenue], .mrr")
-                revenue = revenue_elem.get_text(strip=True) if revenue_elem else None
-                
-                followers_elem = item.select_one(".followers, [data-followers]")
-                followers = 0
-                if followers_elem:
-                    try:
-                        followers = int(followers_elem.get_text(strip=True).replace(",", ""))
-                    except:
-                        pass
-                
-                tags = []
-                for tag in item.select(".tag, .category, .badge"):
-                    tag_text = tag.get_text(strip=True)
-                    if tag_text and len(tag_text) < 30:
-                        tags.append(tag_text)
-                
-                products.append({
-                    "name": name,
-                    "url": f"https://www.indiehackers.com{href}" if href.startswith("/") else href,
-                    "description": description[:500] if description else "",
-                    "revenue": revenue,
-                    "followers": followers,
-                    "tags": tags,
-                    "source": "indiehackers",
-                })
-            except Exception:
-                continue
-        
-        return products
-    except Exception as e:
-        print(f"Error fetching Indie Hackers page {page}: {e}")
-        return []
+    name = name_elem.get_text(strip=True)
+    if not name or len(name) > 100:
+        return None
+    
+    link_elem = item.select_one("a[href*='/product/']")
+    href = link_elem.get("href", "") if link_elem else ""
+    
+    desc_elem = item.select_one("p, .description, .tagline")
+    description = desc_elem.get_text(strip=True) if desc_elem else ""
+    
+    revenue_elem = item.select_one(".revenue, [data-revenue], .mrr")
+    revenue = revenue_elem.get_text(strip=True) if revenue_elem else None
+    
+    followers_elem = item.select_one(".followers, [data-followers]")
+    followers = 0
+    if followers_elem:
+        try:
+            followers = int(followers_elem.get_text(strip=True).replace(",", ""))
+        except:
+            pass
+    
+    tags = []
+    for tag in item.select(".tag, .category, .badge"):
+        tag_text = tag.get_text(strip=True)
+        if tag_text and len(tag_text) < 30:
+            tags.append(tag_text)
+    
+    return {
+        "name": name,
+        "url": f"https://www.indiehackers.com{href}" if href.startswith("/") else href,
+        "description": description[:500] if description else "",
+        "revenue": revenue,
+        "followers": followers,
+        "tags": tags,
+        "source": "indiehackers",
+    }
+
+
+def parse_search_item(item, query: str) -> Optional[dict]:
+    """Parse one product from search results."""
+    name_elem = item.select_one("h2, h3, a")
+    if not name_elem:
+        return None
+    
+    name = name_elem.get_text(strip=True)
+    
+    link_elem = item.select_one("a[href]")
+    href = link_elem.get("href", "") if link_elem else ""
+    
+    desc_elem = item.select_one("p, .description")
+    description = desc_elem.get_text(strip=True) if desc_elem else ""
+    
+    return {
+        "name": name,
+        "url": href if href.startswith("http") else f"https://www.indiehackers.com{href}",
+        "description": description[:300] if description else "",
+        "search_query": query,
+        "source": "indiehackers",
+    }
 
 
-async def fetch_product_details(client: httpx.AsyncClient, product_url: str) -> dict:
+def map_embedded_product(obj: dict, listing: str) -> Optional[dict]:
+    """Map one product from the page's embedded app state."""
+    fields = listing_fields(obj, "https://www.indiehackers.com")
+    if not fields:
+        return None
+    revenue = obj.get("revenue") or obj.get("monthlyRevenue")
+    followers = obj.get("followerCount") or obj.get("followers")
+    return {
+        "name": fields["name"],
+        "url": fields["url"] or f"https://www.indiehackers.com/product/{fields['slug']}",
+        "description": (fields["description"] or fields["tagline"])[:500],
+        "revenue": str(revenue) if revenue else None,
+        "followers": followers if isinstance(followers, int) else 0,
+        "tags": fields["tags"],
+        "source": "indiehackers",
+    }
+
+
+def map_embedded_search_result(obj: dict, query: str) -> Optional[dict]:
+    """Map one search result from the page's embedded app state."""
+    fields = listing_fields(obj, "https://www.indiehackers.com")
+    if not fields:
+        return None
+    return {
+        "name": fields["name"],
+        "url": fields["url"] or f"https://www.indiehackers.com/product/{fields['slug']}",
+        "description": (fields["description"] or fields["tagline"])[:300],
+        "search_query": query,
+        "source": "indiehackers",
+    }
+
+
+PRODUCTS_SPEC = {
+    "name": "indiehackers products",
+    "item_selector": ".product-card, [data-product], article",
+    "parse_item": parse_product_item,
+    "map_embedded": map_embedded_product,
+    "embedded_types": TOOL_TYPES,
+    "embedded_keys": {"products"},
+    "pagination": {"param": "page", "start": 1, "max_pages": 5},
+}
+
+SEARCH_SPEC = {
+    "name": "indiehackers search",
+    "item_selector": ".search-result, .product-item, article",
+    "parse_item": parse_search_item,
+    "map_embedded": map_embedded_search_result,
+    "embedded_types": TOOL_TYPES,
+    "embedded_keys": {"products", "hits", "results"},
+    "pagination": None,
+}
+
+
+async def fetch_product_details(crawler: DirectoryCrawler, product_url: str) -> dict:
     """Fetch detailed info for a specific product."""
     try:
-        response = await client.get(product_url, follow_redirects=True)
-        response.raise_for_status()
-        
-        soup = BeautifulSoup(response.text, "html.parser")
+        soup = await crawler.fetch_soup(product_url)
+        if soup is None:
+            return {"url": product_url, "error": "fetch failed"}
         
         name_elem = soup.select_one("h1")
         name = name_elem.get_text(strip=True) if name_elem else ""
@@ -138,49 +197,14 @@ async def fetch_product_details(client: httpx.AsyncClient, product_url: str) ->
         return {"url": product_url, "error": str(e)}
 
 
-async def search_products(client: httpx.AsyncClient, query: str) -> list:
-    """Search for products on Indie Hackers."""
-    url = f"https://www.indiehackers.com/search?q={query}"
+async def scrape_indiehackers(tracker: Optional[DeduplicationTracker] = None) -> dict:
+    """
+    Scrape Indie Hackers for developer products.
     
-    try:
-        response = await client.get(url, follow_redirects=True)
-        response.raise_for_status()
-        
-        soup = BeautifulSoup(response.text, "html.parser")
-        products = []
-        
-        for item in soup.select(".search-result, .product-item, article"):
-            try:
-                name_elem = item.select_one("h2, h3, a")
-                if not name_elem:
-                    continue
-                
-                name = name_elem.get_text(strip=True)
-                
-                link_elem = item.select_one("a[href]")
-                href = link_elem.get("href", "") if link_elem else ""
-                
-                desc_elem = item.select_one("p, .description")
-                description = desc_elem.get_text(strip=True) if desc_elem else ""
-                
-                products.append({
-                    "name": name,
-                    "url": href if href.startswith("http") else f"https://www.indiehackers.com{href}",
-                    "description": description[:300] if description else "",
-                    "search_query": query,
-                    "source": "indiehackers",
-                })
-            except Exception:
-                continue
-        
-        return products
-    except Exception as e:
-        print(f"Error searching Indie Hackers for '{query}': {e}")
-        return []
-
-
-async def scrape_indiehackers() -> dict:
-    """Scrape Indie Hackers for developer products."""
+    Args:
+        tracker: Dedup tracker; products pagination stops at the first page
+            holding only known products when given
+    """
     results = {
         "scraped_at": datetime.now().isoformat(),
         "products_pages": {},
@@ -197,29 +221,19 @@ async def scrape_indiehackers() -> dict:
             "Accept": "text/html,application/xhtml+xml",
         }
     ) as client:
-        for page in range(1, 6):
-            print(f"  Fetching products page {page}...")
-            products = await fetch_products_page(client, page)
-            results["products_pages"][f"page_{page}"] = products
-            
-            for product in products:
-                if product["name"].lower() not in seen_products:
-                    seen_products.add(product["name"].lower())
-                    results["all_products"].append(product)
-            
-            await asyncio.sleep(2)
-        
-        for query in SEARCH_QUERIES:
-            print(f"  Searching: {query}...")
-            products = await search_products(client, query)
-            results["search_results"][query] = products
-            
-            for product in products:
-                if product["name"].lower() not in seen_products:
-                    seen_products.add(product["name"].lower())
-                    results["all_products"].append(product)
-            
-            await asyncio.sleep(2)
+        crawler = DirectoryCrawler(client, tracker)
+        searches = {query: f"https://www.indiehackers.com/search?{urlencode({'q': query})}" for query in SEARCH_QUERIES}
+        
+        listed, results["search_results"] = await asyncio.gather(
+            crawler.crawl(PRODUCTS_SPEC, {"products": "https://www.indiehackers.com/products?page=1"}),
+            crawler.crawl(SEARCH_SPEC, searches),
+        )
+        results["products_pages"] = {"products": listed["products"]}
+        for products in [listed["products"], *results["search_results"].values()]:
+            merge_unique(results["all_products"], products, seen_products)
+        
+        crawler.finish()
+        results["crawl"] = crawler.get_stats()
     
     results["total_unique_products"] = len(results["all_products"])
     return results
@@ -230,12 +244,7 @@ if __name__ == "__main__":
         print("Scraping Indie Hackers...")
         results = await scrape_indiehackers()
         
-        output_dir = os.path.join(os.path.dirname(__file__), "data")
-        os.makedirs(output_dir, exist_ok=True)
-        
-        output_path = os.path.join(output_dir, "indiehackers.json")
-        with open(output_path, "w") as f:
-            json.dump(results, f, indent=2)
+        output_path = await save_artifact_async("indiehackers", results)
         
         print(f"\nSaved {results['total_unique_products']} unique products to {output_path}")
     
@@ -0,0 +1,258 @@
+"""
+Logo Assets - Self-hosted logo pipeline
+Downloads resolved logos, dedupes them by content hash and renders fixed-size PNG variants
+"""
+import os
+import io
+import json
+import asyncio
+import hashlib
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from typing import Optional
+import httpx
+
+try:
+    from PIL import Image
+except ImportError:  # Pillow is only needed for the optional asset pipeline
+    Image = None
+
+
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+DATA_DIR = os.path.join(os.path.dirname(__file__), "data")
+
+ASSET_DIR = os.path.join(PROJECT_DIR, "public", "logos")
+ASSET_BASE_URL = os.environ.get("LOGO_ASSET_BASE_URL", "").rstrip("/")
+
+VARIANT_SIZES = (32, 64, 128)
+DEFAULT_VARIANT = 128
+MAX_LOGO_BYTES = 2 * 1024 * 1024
+
+
+def asset_hash(data: bytes) -> str:
+    """Content hash identifying a logo asset."""
+    return hashlib.sha256(data).hexdigest()[:16]
+
+
+def variant_filename(digest: str, size: int) -> str:
+    return f"{digest}-{size}.png"
+
+
+def render_variants(data: bytes, digest: str, asset_dir: str, sizes: tuple = VARIANT_SIZES) -> dict:
+    """
+    Normalize a logo and write its square PNG variants.
+
+    Runs in a worker process. ICO files use their largest frame, images are
+    converted to RGBA and centered on a transparent square before resizing,
+    so every variant has the same aspect ratio regardless of the source.
+
+    Args:
+        data: Raw downloaded logo bytes
+        digest: Asset hash used for file names
+        asset_dir: Directory variants are written to
+        sizes: Edge lengths to render
+
+    Returns:
+        Asset metadata (source dimensions and rendered sizes)
+    """
+    image = Image.open(io.BytesIO(data))
+    source_format = image.format
+    if image.format == "ICO" and hasattr(image, "ico"):
+        largest = max(image.ico.sizes(), key=lambda s: s[0] * s[1])
+        image = image.ico.getimage(largest)
+
+    image = image.convert("RGBA")
+    width, height = image.size
+    edge = max(width, height)
+    square = Image.new("RGBA", (edge, edge), (0, 0, 0, 0))
+    square.paste(image, ((edge - width) // 2, (edge - height) // 2))
+
+    os.makedirs(asset_dir, exist_ok=True)
+    for size in sizes:
+        variant = square.resize((size, size), Image.LANCZOS) if edge != size else square
+        path = os.path.join(asset_dir, variant_filename(digest, size))
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        variant.save(tmp_path, format="PNG", optimize=True)
+        os.replace(tmp_path, path)
+
+    return {
+        "source_format": source_format,
+        "width": width,
+        "height": height,
+        "sizes": list(sizes),
+    }
+
+
+class LogoAssetPipeline:
+    """
+    Turns third-party logo URLs into self-hosted assets.
+
+    Each resolved logo is downloaded once and stored under its content hash,
+    so tools sharing an org avatar share one asset. A manifest records
+    tool id -> asset hash and source URL -> asset hash, so unchanged logos
+    are neither downloaded nor re-rendered on later runs. Image decoding
+    and resizing run in a process pool to keep the event loop free.
+    """
+
+    def __init__(
+        self,
+        asset_dir: str = ASSET_DIR,
+        manifest_file: Optional[str] = None,
+        base_url: str = ASSET_BASE_URL,
+        sizes: tuple = VARIANT_SIZES,
+        max_workers: Optional[int] = None,
+    ):
+        """
+        Initialize the asset pipeline.
+
+        Args:
+            asset_dir: Directory variants are written to (served at /logos)
+            manifest_file: Path to the manifest (defaults to data/logo_manifest.json)
+            base_url: Origin prepended to /logos/... (empty for site-relative URLs)
+            sizes: Variant edge lengths
+            max_workers: Process pool size (defaults to the CPU count)
+        """
+        if Image is None:
+            raise RuntimeError("Pillow is required for local logo assets: pip install Pillow")
+
+        if manifest_file is None:
+            manifest_file = os.path.join(DATA_DIR, "logo_manifest.json")
+        self.asset_dir = asset_dir
+        self.manifest_file = Path(manifest_file)
+        self.manifest_file.parent.mkdir(parents=True, exist_ok=True)
+        self.base_url = base_url
+        self.sizes = tuple(sizes)
+        self.manifest = self._load_manifest()
+        self.executor = ProcessPoolExecutor(max_workers=max_workers)
+        self.stats = {"downloaded": 0, "rendered": 0, "deduplicated": 0, "reused": 0, "failed": 0}
+        self._pending: dict[str, asyncio.Future] = {}
+        self._rendering: dict[str, asyncio.Future] = {}
+
+    def _load_manifest(self) -> dict:
+        """Load the manifest from disk."""
+        manifest = {"tools": {}, "sources": {}, "assets": {}}
+        if self.manifest_file.exists():
+            try:
+                with open(self.manifest_file, 'r') as f:
+                    manifest.update(json.load(f))
+            except Exception:
+                pass
+        return manifest
+
+    def save(self):
+        """Atomically write the manifest to disk."""
+        tmp_file = self.manifest_file.with_suffix(self.manifest_file.suffix + ".tmp")
+        with open(tmp_file, 'w') as f:
+            json.dump(self.manifest, f, indent=2, sort_keys=True)
+        os.replace(tmp_file, self.manifest_file)
+
+    def asset_url(self, digest: str, size: int = DEFAULT_VARIANT) -> str:
+        """Public URL of an asset variant."""
+        return f"{self.base_url}/logos/{variant_filename(digest, size)}"
+
+    def is_local(self, logo_url: Optional[str]) -> bool:
+        """Whether a logo URL already points at a self-hosted asset."""
+        return bool(logo_url) and logo_url.startswith(f"{self.base_url}/logos/")
+
+    def _asset_on_disk(self, digest: str) -> bool:
+        return all(
+            os.path.exists(os.path.join(self.asset_dir, variant_filename(digest, size)))
+            for size in self.sizes
+        )
+
+    async def _download(self, client: httpx.AsyncClient, source_url: str) -> Optional[bytes]:
+        try:
+            response = await client.get(source_url, follow_redirects=True, timeout=10.0)
+        except Exception as e:
+            print(f"  Error downloading logo {source_url}: {e}")
+            return None
+        if response.status_code != 200 or len(response.content) > MAX_LOGO_BYTES:
+            return None
+        if "svg" in response.headers.get("content-type", ""):
+            # Rasterizing SVG needs a renderer Pillow does not ship
+            return None
+        self.stats["downloaded"] += 1
+        return response.content
+
+    async def _build_asset(self, client: httpx.AsyncClient, source_url: str) -> Optional[str]:
+        data = await self._download(client, source_url)
+        if not data:
+            return None
+
+        digest = asset_hash(data)
+        if digest in self.manifest["assets"] and self._asset_on_disk(digest):
+            self.stats["deduplicated"] += 1
+            return digest
+
+        # Different source URLs can serve identical bytes; render them once
+        if digest not in self._rendering:
+            loop = asyncio.get_running_loop()
+            self._rendering[digest] = loop.run_in_executor(
+                self.executor, render_variants, data, digest, self.asset_dir, self.sizes
+            )
+        else:
+            self.stats["deduplicated"] += 1
+        try:
+            metadata = await asyncio.shield(self._rendering[digest])
+        except Exception as e:
+            print(f"  Error rendering logo {source_url}: {e}")
+            return None
+        finally:
+            self._rendering.pop(digest, None)
+        if digest in self.manifest["assets"]:
+            return digest
+
+        self.stats["rendered"] += 1
+        self.manifest["assets"][digest] = {
+            **metadata,
+            "source_url": source_url,
+            "created_at": datetime.now().isoformat(),
+        }
+        return digest
+
+    async def process(self, client: httpx.AsyncClient, tool_id: str, source_url: str) -> Optional[str]:
+        """
+        Make a self-hosted asset for a tool's resolved logo.
+
+        Args:
+            client: HTTP client used for the download
+            tool_id: Convex tool id
+            source_url: Third-party logo URL picked by the resolver
+
+        Returns:
+            URL of the default-size asset, or None to keep the source URL
+        """
+        digest = self.manifest["sources"].get(source_url)
+        if digest and self._asset_on_disk(digest):
+            self.stats["reused"] += 1
+        else:
+            # Tools sharing a source URL wait on the same download
+            if source_url not in self._pending:
+                self._pending[source_url] = asyncio.ensure_future(self._build_asset(client, source_url))
+            try:
+                digest = await asyncio.shield(self._pending[source_url])
+            finally:
+                self._pending.pop(source_url, None)
+
+            if digest is None:
+                self.stats["failed"] += 1
+                return None
+            self.manifest["sources"][source_url] = digest
+
+        self.manifest["tools"][tool_id] = digest
+        return self.asset_url(digest)
+
+    def close(self):
+        """Save the manifest and shut down the process pool."""
+        self.save()
+        self.executor.shutdown()
+
+    def get_stats(self) -> dict:
+        """Get pipeline statistics."""
+        return {
+            **self.stats,
+            'assets': len(self.manifest["assets"]),
+            'tools': len(self.manifest["tools"]),
+            'manifest_file': str(self.manifest_file),
+        }
@@ -1,22 +1,34 @@
 """
 Logo Scraper for VibeBuff Tools
 
-Fetches logos for tools using multiple sources:
+Fetches logos for tools using multiple sources, probed concurrently
+and chosen in priority order:
 1. Clearbit Logo API (free, high quality)
-2. Google Favicon Service
-3. DuckDuckGo Favicon Service
-4. Direct favicon.ico from website
+2. GitHub org/user avatar
+3. Google Favicon Service
+4. DuckDuckGo Favicon Service
+5. Direct favicon.ico from website
+
+Resolved logos are cached per domain in data/logo_cache.json. With
+--local-assets, logos are downloaded into self-hosted, resized variants
+under public/logos (see logo_assets.py).
 
 Syncs logos to Convex database.
 """
 import os
 import json
 import httpx
+import time
 import asyncio
+from datetime import datetime, timedelta
+from pathlib import Path
 from typing import Optional
 from urllib.parse import urlparse
 from dotenv import load_dotenv
 
+from convex_batch_runner import ConvexBatchRunner, HttpTransport, written_by_outcome
+from logo_assets import LogoAssetPipeline
+
 load_dotenv()
 
 CONVEX_URL = os.environ.get("CONVEX_URL", "")
@@ -103,13 +115,161 @@ async def get_github_avatar(client: httpx.AsyncClient, github_url: Optional[str]
     return None
 
 
+# Probe order is also priority order: the first source in this list that
+# has a logo wins, even if a later source answers sooner.
+LOGO_SOURCES = ["clearbit", "github", "google", "duckduckgo", "favicon"]
+
+NEGATIVE_CACHE_TTL = timedelta(days=7)
+
+
+class LogoCache:
+    """
+    Persistent cache of resolved logos, keyed by domain and GitHub owner.
+
+    Found logos are kept until refreshed; misses are retried after
+    NEGATIVE_CACHE_TTL so new sites eventually get picked up.
+    """
+    
+    def __init__(
+        self,
+        cache_file: Optional[str] = None,
+        autosave_every: int = 50,
+        refresh: bool = False,
+    ):
+        """
+        Initialize logo cache.
+        
+        Args:
+            cache_file: Path to the cache file (defaults to data/logo_cache.json)
+            autosave_every: Save after this many new entries
+            refresh: Treat every lookup as a miss (entries are still updated)
+        """
+        if cache_file is None:
+            cache_file = os.path.join(DATA_DIR, "logo_cache.json")
+        self.cache_file = Path(cache_file)
+        self.cache_file.parent.mkdir(parents=True, exist_ok=True)
+        self.entries: dict[str, dict] = self._load_cache()
+        self.autosave_every = autosave_every
+        self.refresh = refresh
+        self.hits = 0
+        self.misses = 0
+        self._unsaved = 0
+    
+    def _load_cache(self) -> dict:
+        """Load cache entries from disk."""
+        if self.cache_file.exists():
+            try:
+                with open(self.cache_file, 'r') as f:
+                    return json.load(f).get('entries', {})
+            except Exception:
+                return {}
+        return {}
+    
+    def save(self):
+        """Atomically write the cache to disk."""
+        if not self._unsaved:
+            return
+        tmp_file = self.cache_file.with_suffix(self.cache_file.suffix + ".tmp")
+        with open(tmp_file, 'w') as f:
+            json.dump({'entries': self.entries, 'total_count': len(self.entries)}, f, indent=2)
+        os.replace(tmp_file, self.cache_file)
+        self._unsaved = 0
+    
+    def get(self, key: str) -> Optional[dict]:
+        """Return a cached entry, or None if absent or an expired miss."""
+        entry = None if self.refresh else self.entries.get(key)
+        if entry and not entry.get("logo_url"):
+            checked_at = datetime.fromisoformat(entry["checked_at"])
+            if datetime.now() - checked_at > NEGATIVE_CACHE_TTL:
+                entry = None
+        if entry is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return entry
+    
+    def set(self, key: str, logo_url: Optional[str], source: Optional[str]):
+        """Record a resolution result (logo_url None for a miss)."""
+        self.entries[key] = {
+            "logo_url": logo_url,
+            "source": source,
+            "checked_at": datetime.now().isoformat(),
+        }
+        self._unsaved += 1
+        if self.autosave_every and self._unsaved >= self.autosave_every:
+            self.save()
+    
+    def get_stats(self) -> dict:
+        """Get cache statistics."""
+        return {
+            'entries': len(self.entries),
+            'hits': self.hits,
+            'misses': self.misses,
+            'cache_file': str(self.cache_file),
+        }
+
+
+def logo_cache_key(domain: str, github_url: Optional[str]) -> str:
+    """Cache key for a tool: its domain plus the GitHub owner, if any."""
+    owner = ""
+    if github_url:
+        owner = urlparse(github_url).path.strip("/").split("/")[0].lower()
+    return f"{domain}|{owner}"
+
+
+async def resolve_logo(
+    client: httpx.AsyncClient,
+    domain: str,
+    website_url: str,
+    github_url: Optional[str],
+) -> tuple[Optional[str], Optional[str]]:
+    """
+    Probe every logo source concurrently and pick by priority.
+    
+    Results are consumed in LOGO_SOURCES order: as soon as a source
+    succeeds and every higher-priority source has failed, the remaining
+    probes are cancelled. A tool without any logo costs one probe
+    timeout instead of the sum of all of them.
+    
+    Returns:
+        (logo_url, source) or (None, None)
+    """
+    probes = {
+        "clearbit": get_clearbit_logo(client, domain),
+        "github": get_github_avatar(client, github_url),
+        "google": get_google_favicon(client, domain),
+        "duckduckgo": get_duckduckgo_favicon(client, domain),
+        "favicon": get_direct_favicon(client, website_url),
+    }
+    tasks = {source: asyncio.create_task(probes[source]) for source in LOGO_SOURCES}
+    
+    try:
+        for source in LOGO_SOURCES:
+            logo_url = await tasks[source]
+            if logo_url:
+                return logo_url, source
+        return None, None
+    finally:
+        for task in tasks.values():
+            task.cancel()
+
+
 async def fetch_logo_for_tool(
     client: httpx.AsyncClient,
-    tool: dict
+    tool: dict,
+    cache: Optional[LogoCache] = None,
+    in_flight: Optional[dict] = None,
 ) -> Optional[str]:
     """
     Fetch logo for a tool using multiple sources.
-    Returns the first successful logo URL found.
+    Returns the highest-priority logo URL found.
+    
+    Args:
+        client: HTTP client
+        tool: Tool with websiteUrl and optional githubUrl
+        cache: Persistent logo cache; cached tools are not probed again
+        in_flight: Shared dict of pending resolutions, so tools on the
+            same domain running concurrently are only probed once
     """
     website_url = tool.get("websiteUrl", "")
     github_url = tool.get("githubUrl")
@@ -121,27 +281,28 @@ async def fetch_logo_for_tool(
     if not domain:
         return None
     
-    clearbit_logo = await get_clearbit_logo(client, domain)
-    if clearbit_logo:
-        return clearbit_logo
-    
-    github_avatar = await get_github_avatar(client, github_url)
-    if github_avatar:
-        return github_avatar
-    
-    google_favicon = await get_google_favicon(client, domain)
-    if google_favicon:
-        return google_favicon
+    key = logo_cache_key(domain, github_url)
+    if cache:
+        entry = cache.get(key)
+        if entry is not None:
+            return entry["logo_url"]
     
-    duckduckgo_favicon = await get_duckduckgo_favicon(client, domain)
-    if duckduckgo_favicon:
-        return duckduckgo_favicon
+    if in_flight is not None and key in in_flight:
+        logo_url, _ = await asyncio.shield(in_flight[key])
+        return logo_url
     
-    direct_favicon = await get_direct_favicon(client, website_url)
-    if direct_favicon:
-        return direct_favicon
+    resolution = asyncio.ensure_future(resolve_logo(client, domain, website_url, github_url))
+    if in_flight is not None:
+        in_flight[key] = resolution
+    try:
+        logo_url, source = await resolution
+    finally:
+        if in_flight is not None:
+            in_flight.pop(key, None)
     
-    return None
+    if cache:
+        cache.set(key, logo_url, source)
+    return logo_url
 
 
 async def fetch_tools_from_convex(client: httpx.AsyncClient) -> list:
@@ -175,50 +336,119 @@ async def fetch_tools_from_convex(client: httpx.AsyncClient) -> list:
         return []
 
 
-async def update_tool_logo(
-    client: httpx.AsyncClient,
-    tool_id: str,
-    logo_url: str
-) -> bool:
-    """Update a tool's logo in Convex."""
-    if not CONVEX_URL or not CONVEX_DEPLOY_KEY:
-        return False
+class LogoUpdateBatcher:
+    """
+    Accumulates (toolId, logoUrl) pairs and writes them in bulk.
     
-    url = f"{CONVEX_URL}/api/mutation"
-    headers = {
-        "Authorization": f"Convex {CONVEX_DEPLOY_KEY}",
-        "Content-Type": "application/json",
-    }
+    Pairs are flushed to tools:bulkUpdateLogos as soon as batch_size of
+    them are pending, while probing continues. Failed batches are retried
+    and bisected by ConvexBatchRunner, which also records per-batch
+    latency. In dry-run mode the same batches are built but not sent.
+    """
     
-    payload = {
-        "path": "tools:updateLogo",
-        "args": {
-            "toolId": tool_id,
-            "logoUrl": logo_url,
-        },
-        "format": "json",
-    }
+    def __init__(self, batch_size: int = 100, concurrency: int = 2, dry_run: bool = False):
+        """
+        Initialize the batcher.
+        
+        Args:
+            batch_size: Maximum updates per mutation call
+            concurrency: Maximum mutation calls in flight
+            dry_run: Build batches without sending them
+        """
+        self.batch_size = batch_size
+        self.dry_run = dry_run
+        self.pending: list[dict] = []
+        self.names: dict[str, str] = {}
+        self.batches: list[list[dict]] = []
+        self.written: set[str] = set()
+        self.unchanged: set[str] = set()
+        self._tasks: set[asyncio.Task] = set()
+        self._started = time.perf_counter()
+        
+        self.runner = None
+        if not dry_run:
+            self.runner = ConvexBatchRunner(
+                "tools:bulkUpdateLogos",
+                "updates",
+                transport=HttpTransport(CONVEX_URL, CONVEX_DEPLOY_KEY, timeout=30.0, max_connections=concurrency),
+                concurrency=concurrency,
+                label_record=lambda update: self.names.get(update["toolId"], update["toolId"]),
+                written_records=written_by_outcome("toolId", ("updated",)),
+                on_batch_done=self._on_batch_done,
+            )
     
-    try:
-        response = await client.post(url, json=payload, headers=headers, timeout=10.0)
-        return response.status_code == 200
-    except Exception as e:
-        print(f"Error updating logo for {tool_id}: {e}")
-        return False
+    def add(self, tool_id: str, tool_name: str, logo_url: str):
+        """Queue a logo update, flushing when a batch is full."""
+        self.pending.append({"toolId": tool_id, "logoUrl": logo_url})
+        self.names[tool_id] = tool_name
+        if len(self.pending) >= self.batch_size:
+            self._flush()
+    
+    def _flush(self):
+        if not self.pending:
+            return
+        batch, self.pending = self.pending, []
+        self.batches.append(batch)
+        if self.runner:
+            task = asyncio.create_task(self.runner.run_batch(batch))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+    
+    def _on_batch_done(self, index: int, updates: list, output: dict):
+        # updates holds only the ids the mutation patched; missing tools come
+        # back in its errors, and already-current logos as "unchanged"
+        self.written.update(update["toolId"] for update in updates)
+        self.unchanged.update(
+            outcome["toolId"] for outcome in output.get("outcomes", [])
+            if outcome.get("action") == "unchanged"
+        )
+    
+    async def close(self) -> dict:
+        """
+        Flush the remaining updates and wait for every batch.
+        
+        Returns:
+            Write-back summary (runner summary, or batch counts in dry-run mode)
+        """
+        self._flush()
+        
+        if not self.runner:
+            return {
+                "dry_run": True,
+                "updates": sum(len(batch) for batch in self.batches),
+                "batches": len(self.batches),
+            }
+        
+        try:
+            if self._tasks:
+                await asyncio.gather(*self._tasks)
+        finally:
+            await self.runner.close()
+        return self.runner.summary(time.perf_counter() - self._started)
 
 
 async def scrape_logos(
     only_missing: bool = True,
-    batch_size: int = 10,
-    dry_run: bool = False
+    concurrency: int = 10,
+    dry_run: bool = False,
+    refresh_cache: bool = False,
+    local_assets: bool = False,
+    update_batch_size: int = 100,
 ) -> dict:
     """
     Main function to scrape logos for all tools.
     
+    Tools are processed by a fixed pool of workers pulling from a queue, so
+    one slow tool never holds up the others.
+    
     Args:
         only_missing: Only fetch logos for tools without existing logos
-        batch_size: Number of concurrent requests
+        concurrency: Number of tools resolved at once
         dry_run: If True, don't actually update Convex
+        refresh_cache: Ignore the logo cache and probe every tool again
+        local_assets: Download resolved logos into self-hosted assets and
+            point tools at those instead of the third-party URL
+        update_batch_size: Logo updates written per Convex mutation
     
     Returns:
         Summary of results
@@ -232,7 +462,11 @@ async def scrape_logos(
         "details": [],
     }
     
-    async with httpx.AsyncClient() as client:
+    cache = LogoCache(refresh=refresh_cache)
+    pipeline = LogoAssetPipeline() if local_assets else None
+    
+    limits = httpx.Limits(max_connections=concurrency * len(LOGO_SOURCES))
+    async with httpx.AsyncClient(limits=limits) as client:
         print("Fetching tools from Convex...")
         tools = await fetch_tools_from_convex(client)
         results["total"] = len(tools)
@@ -243,60 +477,102 @@ async def scrape_logos(
         
         print(f"Found {len(tools)} tools")
         
-        if only_missing:
+        if only_missing and pipeline:
+            tools = [t for t in tools if not pipeline.is_local(t.get("logoUrl"))]
+            print(f"Filtering to {len(tools)} tools without self-hosted logos")
+        elif only_missing:
             tools = [t for t in tools if not t.get("logoUrl")]
             print(f"Filtering to {len(tools)} tools without logos")
         
-        for i in range(0, len(tools), batch_size):
-            batch = tools[i:i + batch_size]
-            print(f"Processing batch {i // batch_size + 1}/{(len(tools) + batch_size - 1) // batch_size}")
+        queue: asyncio.Queue = asyncio.Queue()
+        for tool in tools:
+            queue.put_nowait(tool)
+        in_flight: dict = {}
+        updates = LogoUpdateBatcher(batch_size=update_batch_size, dry_run=dry_run)
+        resolved: dict[str, tuple[str, str]] = {}
+        
+        async def handle_tool(tool: dict):
+            tool_name = tool.get("name", "Unknown")
+            tool_id = tool.get("_id")
+            logo_url = await fetch_logo_for_tool(client, tool, cache, in_flight)
             
-            tasks = [fetch_logo_for_tool(client, tool) for tool in batch]
-            logos = await asyncio.gather(*tasks)
+            if not logo_url:
+                results["failed"] += 1
+                results["details"].append({
+                    "name": tool_name,
+                    "status": "no_logo_found",
+                })
+                print(f"  No logo found for: {tool_name}")
+                return
             
-            for tool, logo_url in zip(batch, logos):
-                tool_name = tool.get("name", "Unknown")
-                tool_id = tool.get("_id")
-                
-                if not logo_url:
-                    results["failed"] += 1
-                    results["details"].append({
-                        "name": tool_name,
-                        "status": "no_logo_found",
-                    })
-                    print(f"  No logo found for: {tool_name}")
-                    continue
-                
-                results["fetched"] += 1
-                
-                if dry_run:
-                    results["details"].append({
-                        "name": tool_name,
-                        "status": "dry_run",
-                        "logo_url": logo_url,
-                    })
-                    print(f"  [DRY RUN] Would update: {tool_name} -> {logo_url}")
-                else:
-                    success = await update_tool_logo(client, tool_id, logo_url)
-                    if success:
-                        results["updated"] += 1
-                        results["details"].append({
-                            "name": tool_name,
-                            "status": "updated",
-                            "logo_url": logo_url,
-                        })
-                        print(f"  Updated: {tool_name} -> {logo_url}")
-                    else:
-                        results["failed"] += 1
-                        results["details"].append({
-                            "name": tool_name,
-                            "status": "update_failed",
-                            "logo_url": logo_url,
-                        })
-                        print(f"  Failed to update: {tool_name}")
+            results["fetched"] += 1
             
-            await asyncio.sleep(0.5)
+            if pipeline:
+                asset_url = await pipeline.process(client, tool_id, logo_url)
+                if asset_url:
+                    logo_url = asset_url
+            
+            if dry_run:
+                print(f"  [DRY RUN] Would update: {tool_name} -> {logo_url}")
+            resolved[tool_id] = (tool_name, logo_url)
+            updates.add(tool_id, tool_name, logo_url)
+        
+        async def worker():
+            while True:
+                try:
+                    tool = queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    return
+                await handle_tool(tool)
+                done = len(tools) - queue.qsize()
+                if done % 50 == 0:
+                    print(f"Progress: {done}/{len(tools)} tools")
+        
+        try:
+            await asyncio.gather(*(worker() for _ in range(min(concurrency, len(tools)) or 1)))
+        finally:
+            cache.save()
+            if pipeline:
+                pipeline.close()
+        
+        write_back = await updates.close()
+        if dry_run:
+            print(f"\n[DRY RUN] Would update {write_back['updates']} tools in {write_back['batches']} batches")
+        else:
+            print(f"\nWrote {len(updates.written)} logos in {len(updates.batches)} batches")
+    
+    for tool_id, (tool_name, logo_url) in resolved.items():
+        if dry_run:
+            status = "dry_run"
+        elif tool_id in updates.written:
+            status = "updated"
+            results["updated"] += 1
+        elif tool_id in updates.unchanged:
+            status = "unchanged"
+            results["skipped"] += 1
+        else:
+            status = "update_failed"
+            results["failed"] += 1
+        results["details"].append({
+            "name": tool_name,
+            "status": status,
+            "logo_url": logo_url,
+        })
     
+    results["write_back"] = {k: v for k, v in write_back.items() if not isinstance(v, list)}
+    if write_back.get("latency"):
+        latency = write_back["latency"]
+        print(f"Write-back: {write_back['elapsed_s']}s, batch latency median {latency['median_s']}s, p95 {latency['p95_s']}s")
+    for bad in write_back.get("bad_records", [])[:10]:
+        print(f"  Failed to update: {bad['record']}: {bad['error']}")
+    for failed in write_back.get("failed_batches", [])[:10]:
+        print(f"  Failed batch {failed['batch'] + 1} ({failed['size']} updates): {failed['error']}")
+    
+    results["cache"] = cache.get_stats()
+    if pipeline:
+        results["assets"] = pipeline.get_stats()
+        print(f"Logo assets: {results['assets']}")
+    print(f"Logo cache: {results['cache']['hits']} hits, {results['cache']['misses']} probed")
     return results
 
 
@@ -316,10 +592,28 @@ async def main():
         help="Don't actually update Convex, just show what would be done"
     )
     parser.add_argument(
+        "--concurrency",
         "--batch-size",
+        dest="concurrency",
         type=int,
         default=10,
-        help="Number of concurrent requests (default: 10)"
+        help="Number of tools resolved concurrently (default: 10)"
+    )
+    parser.add_argument(
+        "--update-batch-size",
+        type=int,
+        default=100,
+        help="Logo updates written per Convex mutation (default: 100)"
+    )
+    parser.add_argument(
+        "--local-assets",
+        action="store_true",
+        help="Self-host logos: download, dedupe and resize them into public/logos"
+    )
+    parser.add_argument(
+        "--refresh-cache",
+        action="store_true",
+        help="Ignore cached logos and probe every tool again"
     )
     parser.add_argument(
         "--output",
@@ -335,8 +629,11 @@ async def main():
     
     results = await scrape_logos(
         only_missing=not args.all,
-        batch_size=args.batch_size,
+        concurrency=args.concurrency,
         dry_run=args.dry_run,
+        refresh_cache=args.refresh_cache,
+        local_assets=args.local_assets,
+        update_batch_size=args.update_batch_size,
     )
     
     print("\n" + "=" * 60)
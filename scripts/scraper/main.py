@@ -2,13 +2,11 @@
 Main Scraper - Aggregates data from all sources
 Enhanced with article scraping, Product Hunt discovery, and comprehensive metadata extraction
 """
-import os
-import json
 import asyncio
 from datetime import datetime
 
 from github_scraper import scrape_github_repos, TOOL_GITHUB_URLS
-from npm_scraper import scrape_npm_packages, NPM_PACKAGES
+from npm_scraper import scrape_tracked_npm_packages
 from rss_feeds import scrape_all_feeds, get_latest_releases, get_latest_blog_posts, RSS_FEEDS
 from web_search import search_multiple_tools, TOOLS_TO_SEARCH, DISCOVERY_SEARCH_QUERIES
 from awesome_lists_scraper import scrape_awesome_lists, deduplicate_tools
@@ -28,7 +26,9 @@ from hackernews_scraper import scrape_hackernews
 from vibe_tools_scraper import scrape_vibe_tools
 from company_techstack_scraper import scrape_company_tech_stacks
 from claude_scraper import scrape_claude_ecosystem
-from sync_to_convex import sync_all_scraped_tools
+from sync_to_convex import sync_all_scraped_tools, CONVEX_URL, CONVEX_DEPLOY_KEY
+from sync_stream import ToolSyncStream
+from artifacts import save_artifact_async
 
 
 async def run_all_scrapers(
@@ -53,11 +53,16 @@ async def run_all_scrapers(
     skip_vibe_tools: bool = False,
     skip_company_stacks: bool = False,
     skip_claude: bool = False,
+    stream_sync: bool = True,
 ) -> dict:
-    """Run all scrapers and aggregate results."""
+    """
+    Run all scrapers and aggregate results.
     
-    output_dir = os.path.join(os.path.dirname(__file__), "data")
-    os.makedirs(output_dir, exist_ok=True)
+    With stream_sync, vibe tools are upserted to Convex while the remaining
+    scrapers run instead of re-reading vibe_tools.json after every scraper
+    has finished. Falls back to the file-based sync when vibe tools are
+    skipped or Convex credentials are missing.
+    """
     
     dedup_tracker = DeduplicationTracker() if use_deduplication else None
     if dedup_tracker:
@@ -69,6 +74,11 @@ async def run_all_scrapers(
         "deduplication_enabled": use_deduplication,
     }
     
+    sync_stream = None
+    if stream_sync and not skip_vibe_tools and CONVEX_URL and CONVEX_DEPLOY_KEY:
+        sync_stream = ToolSyncStream()
+        await sync_stream.start()
+    
     # GitHub metadata
     if not skip_github:
         print("\n=== Scraping GitHub Repositories ===")
@@ -77,20 +87,18 @@ async def run_all_scrapers(
             "count": len(github_data),
             "successful": sum(1 for r in github_data.values() if "error" not in r),
         }
-        with open(os.path.join(output_dir, "github_metadata.json"), "w") as f:
-            json.dump(github_data, f, indent=2)
+        await save_artifact_async("github_metadata", github_data, layout="mapping")
         print(f"GitHub: {results['sources']['github']['successful']}/{results['sources']['github']['count']} repos")
     
     # NPM packages
     if not skip_npm:
         print("\n=== Scraping NPM Packages ===")
-        npm_data = await scrape_npm_packages(NPM_PACKAGES)
+        npm_data = await scrape_tracked_npm_packages()
         results["sources"]["npm"] = {
             "count": len(npm_data),
             "successful": sum(1 for r in npm_data.values() if "error" not in r),
         }
-        with open(os.path.join(output_dir, "npm_metadata.json"), "w") as f:
-            json.dump(npm_data, f, indent=2)
+        await save_artifact_async("npm_metadata", npm_data, layout="mapping")
         print(f"NPM: {results['sources']['npm']['successful']}/{results['sources']['npm']['count']} packages")
     
     # RSS feeds
@@ -101,17 +109,14 @@ async def run_all_scrapers(
             "count": len(rss_data),
             "successful": sum(1 for r in rss_data.values() if "error" not in r),
         }
-        with open(os.path.join(output_dir, "rss_feeds.json"), "w") as f:
-            json.dump(rss_data, f, indent=2)
+        await save_artifact_async("rss_feeds", rss_data, layout="mapping")
         
         # Save processed data
         releases = get_latest_releases(rss_data)
-        with open(os.path.join(output_dir, "latest_releases.json"), "w") as f:
-            json.dump(releases, f, indent=2)
+        await save_artifact_async("latest_releases", releases)
         
         posts = get_latest_blog_posts(rss_data)
-        with open(os.path.join(output_dir, "latest_posts.json"), "w") as f:
-            json.dump(posts, f, indent=2)
+        await save_artifact_async("latest_posts", posts)
         
         results["sources"]["rss"]["releases"] = len(releases)
         results["sources"]["rss"]["posts"] = len(posts)
@@ -125,8 +130,7 @@ async def run_all_scrapers(
         results["sources"]["web_search"] = {
             "count": len(web_data),
         }
-        with open(os.path.join(output_dir, "web_search.json"), "w") as f:
-            json.dump(web_data, f, indent=2)
+        await save_artifact_async("web_search", web_data, layout="mapping")
         print(f"Web Search: {len(web_data)} tools searched")
     
     # Awesome lists
@@ -146,10 +150,8 @@ async def run_all_scrapers(
             "count": len(awesome_data),
             "unique_tools": len(unique_tools),
         }
-        with open(os.path.join(output_dir, "awesome_lists.json"), "w") as f:
-            json.dump(awesome_data, f, indent=2)
-        with open(os.path.join(output_dir, "awesome_tools.json"), "w") as f:
-            json.dump(unique_tools, f, indent=2)
+        await save_artifact_async("awesome_lists", awesome_data, layout="mapping")
+        await save_artifact_async("awesome_tools", unique_tools)
         print(f"Awesome Lists: {len(unique_tools)} unique tools from {len(awesome_data)} lists")
     
     # Article scraping
@@ -172,10 +174,8 @@ async def run_all_scrapers(
                 "unique_tools_mentioned": len(tool_mentions),
             }
             
-            with open(os.path.join(output_dir, "article_scrapes.json"), "w") as f:
-                json.dump(article_data, f, indent=2)
-            with open(os.path.join(output_dir, "tool_mentions.json"), "w") as f:
-                json.dump(tool_mentions, f, indent=2)
+            await save_artifact_async("article_scrapes", article_data)
+            await save_artifact_async("tool_mentions", tool_mentions, layout="mapping")
             
             print(f"Articles: {len(articles_with_tools)} articles mention tools")
             print(f"  - {len(tool_mentions)} unique tools mentioned")
@@ -189,10 +189,10 @@ async def run_all_scrapers(
             "topics_scraped": len(ph_data.get("topics", {})),
             "searches_performed": len(ph_data.get("searches", {})),
             "unique_products": ph_data.get("total_unique", 0),
+            "mode": ph_data.get("mode"),
         }
         
-        with open(os.path.join(output_dir, "producthunt_tools.json"), "w") as f:
-            json.dump(ph_data, f, indent=2)
+        await save_artifact_async("producthunt_tools", ph_data)
         
         print(f"Product Hunt: {ph_data.get('total_unique', 0)} unique products discovered")
     
@@ -203,52 +203,47 @@ async def run_all_scrapers(
         results["sources"]["github_trending"] = {
             "unique_repos": trending_data.get("total_unique_repos", 0),
         }
-        with open(os.path.join(output_dir, "github_trending.json"), "w") as f:
-            json.dump(trending_data, f, indent=2)
+        await save_artifact_async("github_trending", trending_data)
         print(f"GitHub Trending: {trending_data.get('total_unique_repos', 0)} unique repos")
     
     # AlternativeTo
     if not skip_alternativeto:
         print("\n=== Scraping AlternativeTo ===")
-        alt_data = await scrape_alternativeto()
+        alt_data = await scrape_alternativeto(tracker=dedup_tracker)
         results["sources"]["alternativeto"] = {
             "unique_tools": alt_data.get("total_unique_tools", 0),
         }
-        with open(os.path.join(output_dir, "alternativeto.json"), "w") as f:
-            json.dump(alt_data, f, indent=2)
+        await save_artifact_async("alternativeto", alt_data)
         print(f"AlternativeTo: {alt_data.get('total_unique_tools', 0)} unique tools")
     
     # StackShare
     if not skip_stackshare:
         print("\n=== Scraping StackShare ===")
-        stack_data = await scrape_stackshare()
+        stack_data = await scrape_stackshare(tracker=dedup_tracker)
         results["sources"]["stackshare"] = {
             "unique_tools": stack_data.get("total_unique_tools", 0),
         }
-        with open(os.path.join(output_dir, "stackshare.json"), "w") as f:
-            json.dump(stack_data, f, indent=2)
+        await save_artifact_async("stackshare", stack_data)
         print(f"StackShare: {stack_data.get('total_unique_tools', 0)} unique tools")
     
     # DevHunt
     if not skip_devhunt:
         print("\n=== Scraping DevHunt ===")
-        devhunt_data = await scrape_devhunt()
+        devhunt_data = await scrape_devhunt(tracker=dedup_tracker)
         results["sources"]["devhunt"] = {
             "unique_tools": devhunt_data.get("total_unique_tools", 0),
         }
-        with open(os.path.join(output_dir, "devhunt.json"), "w") as f:
-            json.dump(devhunt_data, f, indent=2)
+        await save_artifact_async("devhunt", devhunt_data)
         print(f"DevHunt: {devhunt_data.get('total_unique_tools', 0)} unique tools")
     
     # AI Directories
     if not skip_ai_directories:
         print("\n=== Scraping AI Tool Directories ===")
-        ai_dir_data = await scrape_ai_directories()
+        ai_dir_data = await scrape_ai_directories(tracker=dedup_tracker)
         results["sources"]["ai_directories"] = {
             "unique_tools": ai_dir_data.get("total_unique_tools", 0),
         }
-        with open(os.path.join(output_dir, "ai_directories.json"), "w") as f:
-            json.dump(ai_dir_data, f, indent=2)
+        await save_artifact_async("ai_directories", ai_dir_data)
         print(f"AI Directories: {ai_dir_data.get('total_unique_tools', 0)} unique tools")
     
     # VS Code Marketplace
@@ -258,8 +253,7 @@ async def run_all_scrapers(
         results["sources"]["vscode_marketplace"] = {
             "unique_extensions": vscode_data.get("total_unique_extensions", 0),
         }
-        with open(os.path.join(output_dir, "vscode_marketplace.json"), "w") as f:
-            json.dump(vscode_data, f, indent=2)
+        await save_artifact_async("vscode_marketplace", vscode_data)
         print(f"VS Code Marketplace: {vscode_data.get('total_unique_extensions', 0)} unique extensions")
     
     # Package Registries (PyPI, crates.io, pkg.go.dev)
@@ -269,30 +263,27 @@ async def run_all_scrapers(
         results["sources"]["package_registries"] = {
             "total_packages": pkg_data.get("total_packages", 0),
         }
-        with open(os.path.join(output_dir, "package_registries.json"), "w") as f:
-            json.dump(pkg_data, f, indent=2)
+        await save_artifact_async("package_registries", pkg_data)
         print(f"Package Registries: {pkg_data.get('total_packages', 0)} packages")
     
     # Indie Hackers
     if not skip_indiehackers:
         print("\n=== Scraping Indie Hackers ===")
-        ih_data = await scrape_indiehackers()
+        ih_data = await scrape_indiehackers(tracker=dedup_tracker)
         results["sources"]["indiehackers"] = {
             "unique_products": ih_data.get("total_unique_products", 0),
         }
-        with open(os.path.join(output_dir, "indiehackers.json"), "w") as f:
-            json.dump(ih_data, f, indent=2)
+        await save_artifact_async("indiehackers", ih_data)
         print(f"Indie Hackers: {ih_data.get('total_unique_products', 0)} unique products")
     
     # BetaList
     if not skip_betalist:
         print("\n=== Scraping BetaList ===")
-        beta_data = await scrape_betalist()
+        beta_data = await scrape_betalist(tracker=dedup_tracker)
         results["sources"]["betalist"] = {
             "unique_startups": beta_data.get("total_unique_startups", 0),
         }
-        with open(os.path.join(output_dir, "betalist.json"), "w") as f:
-            json.dump(beta_data, f, indent=2)
+        await save_artifact_async("betalist", beta_data)
         print(f"BetaList: {beta_data.get('total_unique_startups', 0)} unique startups")
     
     # Hacker News
@@ -302,22 +293,22 @@ async def run_all_scrapers(
         results["sources"]["hackernews"] = {
             "unique_stories": hn_data.get("total_unique_stories", 0),
             "tool_launches": hn_data.get("total_tool_launches", 0),
+            "new_search_hits": hn_data.get("total_new_search_hits", 0),
+            "threads_mined": hn_data.get("comment_mining", {}).get("stats", {}).get("threads_mined", 0),
         }
-        with open(os.path.join(output_dir, "hackernews.json"), "w") as f:
-            json.dump(hn_data, f, indent=2)
+        await save_artifact_async("hackernews", hn_data)
         print(f"Hacker News: {hn_data.get('total_unique_stories', 0)} stories, {hn_data.get('total_tool_launches', 0)} tool launches")
     
     # Vibe Tools (AI Coding Workflow & Orchestration)
     if not skip_vibe_tools:
         print("\n=== Scraping Vibe Coding Tools ===")
-        vibe_data = await scrape_vibe_tools()
+        vibe_data = await scrape_vibe_tools(emit=sync_stream.emit_vibe_tool if sync_stream else None)
         results["sources"]["vibe_tools"] = {
             "known_tools": len(vibe_data.get("known_tools", [])),
             "discovered_tools": len(vibe_data.get("discovered_tools", [])),
             "total_unique": vibe_data.get("total_unique_tools", 0),
         }
-        with open(os.path.join(output_dir, "vibe_tools.json"), "w") as f:
-            json.dump(vibe_data, f, indent=2)
+        await save_artifact_async("vibe_tools", vibe_data)
         print(f"Vibe Tools: {vibe_data.get('total_unique_tools', 0)} unique tools")
     
     # Company Tech Stacks
@@ -329,8 +320,7 @@ async def run_all_scrapers(
             "stackshare": company_data.get("sources", {}).get("stackshare", 0),
             "website_detection": company_data.get("sources", {}).get("website_detection", 0),
         }
-        with open(os.path.join(output_dir, "company_tech_stacks.json"), "w") as f:
-            json.dump(company_data, f, indent=2)
+        await save_artifact_async("company_tech_stacks", company_data)
         print(f"Company Stacks: {company_data.get('total_unique_companies', 0)} companies")
     
     # Claude Ecosystem
@@ -343,23 +333,28 @@ async def run_all_scrapers(
             "mcp_servers": claude_data.get("stats", {}).get("official_mcp_servers", 0) + claude_data.get("stats", {}).get("community_mcp_servers", 0),
             "skills": claude_data.get("stats", {}).get("total_skills", 0),
         }
-        with open(os.path.join(output_dir, "claude_ecosystem.json"), "w") as f:
-            json.dump(claude_data, f, indent=2)
+        await save_artifact_async("claude_ecosystem", claude_data)
         print(f"Claude Ecosystem: {claude_data.get('stats', {}).get('total_models', 0)} models, {claude_data.get('stats', {}).get('total_resources_from_awesome', 0)} resources")
     
     # Save summary
-    with open(os.path.join(output_dir, "scrape_summary.json"), "w") as f:
-        json.dump(results, f, indent=2)
+    await save_artifact_async("scrape_summary", results)
     
     # Sync scraped tools to Convex DB
     print("\n=== Syncing Scraped Tools to Convex ===\n")
     try:
-        sync_results = await sync_all_scraped_tools()
+        if sync_stream:
+            sync_results = await sync_stream.close()
+        else:
+            sync_results = await sync_all_scraped_tools()
         results["sync"] = {
             "total_synced": sync_results.get("total_synced", 0),
             "total_errors": sync_results.get("total_errors", 0),
+            "total_created": sync_results.get("total_created", 0),
+            "total_changed": sync_results.get("total_changed", 0),
+            "total_unchanged": sync_results.get("total_unchanged", 0),
         }
         print(f"Sync complete: {sync_results.get('total_synced', 0)} synced, {sync_results.get('total_errors', 0)} errors")
+        print(f"  - {sync_results.get('total_created', 0)} created, {sync_results.get('total_changed', 0)} changed, {sync_results.get('total_unchanged', 0)} unchanged")
     except Exception as e:
         print(f"Sync to Convex failed: {e}")
         results["sync"] = {"error": str(e)}
@@ -402,6 +397,7 @@ if __name__ == "__main__":
     parser.add_argument("--skip-vibe-tools", action="store_true", help="Skip Vibe Tools scraping")
     parser.add_argument("--skip-company-stacks", action="store_true", help="Skip Company Tech Stacks scraping")
     parser.add_argument("--skip-claude", action="store_true", help="Skip Claude Ecosystem scraping")
+    parser.add_argument("--no-stream-sync", action="store_true", help="Sync to Convex only after all scrapers finish")
     parser.add_argument("--only", choices=[
         "github", "npm", "rss", "web", "awesome", "articles", "producthunt",
         "trending", "alternativeto", "stackshare", "devhunt", "ai-directories",
@@ -483,6 +479,7 @@ if __name__ == "__main__":
             skip_vibe_tools=skip_vibe_tools,
             skip_company_stacks=skip_company_stacks,
             skip_claude=skip_claude,
+            stream_sync=not args.no_stream_sync,
         )
         print_summary(results)
     
@@ -0,0 +1,164 @@
+"""
+NPM Changes - Follows the npm replication changes feed between runs
+Persists the feed sequence so each run only refreshes tracked packages that published something
+"""
+import os
+import json
+from datetime import datetime
+from pathlib import Path
+from typing import Iterable, Optional
+import httpx
+from dotenv import load_dotenv
+
+load_dotenv()
+
+CONVEX_URL = os.getenv("CONVEX_URL", "https://impressive-tiger-694.convex.cloud")
+NPM_REPLICATE_URL = os.getenv("NPM_REPLICATE_URL", "https://replicate.npmjs.com").rstrip("/")
+DATA_DIR = os.path.join(os.path.dirname(__file__), "data")
+
+CHANGES_PAGE_SIZE = 10000
+
+
+async def fetch_catalog_npm_packages(client: httpx.AsyncClient) -> list[str]:
+    """
+    Fetch the npm package names of every active tool in the catalog.
+
+    Returns:
+        Package names, or an empty list if Convex is unreachable
+    """
+    try:
+        response = await client.post(
+            f"{CONVEX_URL}/api/query",
+            json={"path": "tools:getNpmPackages", "args": {}, "format": "json"},
+            timeout=30.0,
+        )
+        if response.status_code != 200:
+            print(f"Error fetching npm packages from Convex: {response.status_code}")
+            return []
+        return sorted({t["npmPackageName"] for t in response.json().get("value", [])})
+    except Exception as e:
+        print(f"Error fetching npm packages from Convex: {e}")
+        return []
+
+
+class NpmChangesFollower:
+    """
+    Tracks which packages changed on the npm registry since the last run.
+
+    Each consumer (npm_scraper, tool_metadata_enricher) has its own state
+    file holding the last feed sequence it read and the tracked packages it
+    still has to refresh. Changed packages stay pending until the consumer
+    acknowledges them, so a failed run retries them next time. The sequence
+    is saved after every page, so an interrupted follow loses no progress.
+    """
+
+    def __init__(self, name: str, state_file: Optional[str] = None, page_size: int = CHANGES_PAGE_SIZE):
+        """
+        Initialize the follower.
+
+        Args:
+            name: Consumer name, used for the default state file
+            state_file: Path to the state (defaults to data/npm_changes_<name>.json)
+            page_size: Changes requested per feed page
+        """
+        if state_file is None:
+            state_file = os.path.join(DATA_DIR, f"npm_changes_{name}.json")
+        self.state_file = Path(state_file)
+        self.state_file.parent.mkdir(parents=True, exist_ok=True)
+        self.page_size = page_size
+        self.state = self._load_state()
+        self.stats = {"pages": 0, "changes_read": 0, "tracked_changed": 0, "new_packages": 0}
+
+    def _load_state(self) -> dict:
+        """Load follower state from disk."""
+        state = {"seq": None, "known": [], "pending": [], "updated_at": None}
+        if self.state_file.exists():
+            try:
+                with open(self.state_file, 'r') as f:
+                    state.update(json.load(f))
+            except Exception:
+                pass
+        return state
+
+    def save(self):
+        """Atomically write the state to disk."""
+        self.state["updated_at"] = datetime.now().isoformat()
+        tmp_file = self.state_file.with_suffix(self.state_file.suffix + ".tmp")
+        with open(tmp_file, 'w') as f:
+            json.dump(self.state, f, indent=2)
+        os.replace(tmp_file, self.state_file)
+
+    async def _current_seq(self, client: httpx.AsyncClient):
+        response = await client.get(f"{NPM_REPLICATE_URL}/", timeout=30.0)
+        response.raise_for_status()
+        return response.json().get("update_seq")
+
+    async def follow(self, client: httpx.AsyncClient, tracked: Iterable[str]) -> list[str]:
+        """
+        Read the changes feed up to now and return the packages to refresh.
+
+        Packages new to the tracked set are always pending. On the first run
+        there is no sequence yet, so every tracked package is pending and the
+        follower starts from the registry's current sequence.
+
+        Args:
+            client: HTTP client
+            tracked: Package names from the tool catalog
+
+        Returns:
+            Pending tracked packages (changed or never refreshed)
+        """
+        tracked = set(tracked)
+        pending = set(self.state["pending"]) & tracked
+
+        new_packages = tracked - set(self.state["known"])
+        self.stats["new_packages"] = len(new_packages)
+        pending |= new_packages
+        self.state["known"] = sorted(tracked)
+
+        if self.state["seq"] is None:
+            self.state["seq"] = await self._current_seq(client)
+            self.state["pending"] = sorted(pending)
+            self.save()
+            return self.state["pending"]
+
+        while True:
+            response = await client.get(
+                f"{NPM_REPLICATE_URL}/_changes",
+                params={"since": self.state["seq"], "limit": self.page_size},
+                timeout=60.0,
+            )
+            response.raise_for_status()
+            data = response.json()
+            results = data.get("results", [])
+
+            changed = {change["id"] for change in results if change.get("id") in tracked}
+            self.stats["pages"] += 1
+            self.stats["changes_read"] += len(results)
+            self.stats["tracked_changed"] += len(changed - pending)
+            pending |= changed
+
+            self.state["seq"] = data.get("last_seq", self.state["seq"])
+            self.state["pending"] = sorted(pending)
+            self.save()
+
+            if len(results) < self.page_size:
+                break
+
+        return self.state["pending"]
+
+    def acknowledge(self, packages: Iterable[str]):
+        """Mark packages as refreshed so they are no longer pending."""
+        done = set(packages)
+        self.state["pending"] = [p for p in self.state["pending"] if p not in done]
+        self.save()
+
+    def get_stats(self) -> dict:
+        """Get follower statistics."""
+        return {
+            **self.stats,
+            'seq': self.state["seq"],
+            'pending': len(self.state["pending"]),
+            'tracked': len(self.state["known"]),
+            'state_file': str(self.state_file),
+        }
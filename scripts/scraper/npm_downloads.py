@@ -0,0 +1,213 @@
+"""
+NPM Downloads - Bulk and range download statistics from api.npmjs.org
+One daily series per package, with weekly, monthly and yearly totals derived locally
+"""
+import os
+import json
+import asyncio
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Iterable, Optional
+import httpx
+
+
+NPM_DOWNLOADS_API = "https://api.npmjs.org/downloads"
+DATA_DIR = os.path.join(os.path.dirname(__file__), "data")
+
+# The bulk endpoint accepts up to 128 unscoped packages and at most a year of data
+BULK_LIMIT = 128
+RANGE_PERIOD = "last-year"
+
+
+def summarize_series(days: list[dict]) -> dict:
+    """
+    Derive download totals from a daily series.
+
+    Totals match the point endpoints: last-week is the last 7 days of the
+    series, last-month the last 30 and last-year the whole range.
+
+    Args:
+        days: [{"day": "YYYY-MM-DD", "downloads": n}, ...] in date order
+
+    Returns:
+        Weekly, monthly and yearly totals plus the series end date
+    """
+    counts = [day.get("downloads", 0) for day in days]
+    return {
+        "weekly": sum(counts[-7:]),
+        "monthly": sum(counts[-30:]),
+        "yearly": sum(counts),
+        "end": days[-1]["day"] if days else None,
+    }
+
+
+class NpmDownloadsClient:
+    """
+    Fetches npm download statistics with as few requests as possible.
+
+    Unscoped packages are requested through the bulk range endpoint, up to
+    BULK_LIMIT per call; scoped packages (which the bulk endpoint rejects)
+    get one range call each. Every package costs one daily series instead
+    of one point call per period. Totals are cached on disk, so npm_scraper
+    and tool_metadata_enricher share results within and across runs.
+    """
+
+    def __init__(
+        self,
+        cache_file: Optional[str] = None,
+        ttl_hours: int = 12,
+        concurrency: int = 4,
+    ):
+        """
+        Initialize the downloads client.
+
+        Args:
+            cache_file: Path to the cache (defaults to data/npm_downloads_cache.json)
+            ttl_hours: Age after which cached totals are refetched (npm updates daily)
+            concurrency: Maximum requests in flight
+        """
+        if cache_file is None:
+            cache_file = os.path.join(DATA_DIR, "npm_downloads_cache.json")
+        self.cache_file = Path(cache_file)
+        self.cache_file.parent.mkdir(parents=True, exist_ok=True)
+        self.ttl = timedelta(hours=ttl_hours)
+        self.semaphore = asyncio.Semaphore(concurrency)
+        self.entries: dict[str, dict] = self._load_cache()
+        self.stats = {"hits": 0, "fetched": 0, "requests": 0, "missing": 0}
+        self._dirty = False
+
+    def _load_cache(self) -> dict:
+        """Load cached totals from disk."""
+        if self.cache_file.exists():
+            try:
+                with open(self.cache_file, 'r') as f:
+                    return json.load(f).get('packages', {})
+            except Exception:
+                return {}
+        return {}
+
+    def save(self):
+        """Atomically write the cache to disk if it changed."""
+        if not self._dirty:
+            return
+
+        tmp_file = self.cache_file.with_suffix(self.cache_file.suffix + ".tmp")
+        with open(tmp_file, 'w') as f:
+            json.dump({'packages': self.entries}, f, indent=2, sort_keys=True)
+        os.replace(tmp_file, self.cache_file)
+        self._dirty = False
+
+    def _cached(self, package: str) -> Optional[dict]:
+        entry = self.entries.get(package)
+        if not entry:
+            return None
+        if datetime.now() - datetime.fromisoformat(entry["fetched_at"]) > self.ttl:
+            return None
+        return entry
+
+    def _store(self, package: str, series: Optional[dict]):
+        if series is None:
+            self.stats["missing"] += 1
+            entry = {"found": False}
+        else:
+            self.stats["fetched"] += 1
+            entry = {"found": True, **summarize_series(series.get("downloads", []))}
+        entry["fetched_at"] = datetime.now().isoformat()
+        self.entries[package] = entry
+        self._dirty = True
+
+    async def _get_range(self, client: httpx.AsyncClient, packages: list[str]) -> Optional[dict]:
+        url = f"{NPM_DOWNLOADS_API}/range/{RANGE_PERIOD}/{','.join(packages)}"
+        async with self.semaphore:
+            self.stats["requests"] += 1
+            response = await client.get(url, timeout=30.0)
+        if response.status_code == 404:
+            return None
+        response.raise_for_status()
+        return response.json()
+
+    async def _fetch_one(self, client: httpx.AsyncClient, package: str):
+        try:
+            self._store(package, await self._get_range(client, [package]))
+        except Exception as e:
+            print(f"  Error fetching npm downloads for {package}: {e}")
+
+    async def _fetch_bulk(self, client: httpx.AsyncClient, packages: list[str]):
+        # A single package comes back in the point shape rather than keyed by name
+        if len(packages) == 1:
+            await self._fetch_one(client, packages[0])
+            return
+
+        try:
+            data = await self._get_range(client, packages)
+        except Exception as e:
+            print(f"  Bulk npm downloads request failed ({e}), falling back to single requests")
+            await asyncio.gather(*(self._fetch_one(client, p) for p in packages))
+            return
+
+        data = data or {}
+        for package in packages:
+            self._store(package, data.get(package))
+
+    async def get_many(self, client: httpx.AsyncClient, packages: Iterable[str]) -> dict[str, Optional[dict]]:
+        """
+        Get download totals for several packages.
+
+        Args:
+            client: HTTP client
+            packages: npm package names
+
+        Returns:
+            Mapping of package to {"weekly", "monthly", "yearly", "end"},
+            or None for packages npm has no statistics for (or that failed)
+        """
+        packages = list(dict.fromkeys(p for p in packages if p))
+        missing = []
+        for package in packages:
+            if self._cached(package):
+                self.stats["hits"] += 1
+            else:
+                missing.append(package)
+
+        unscoped = [p for p in missing if not p.startswith("@")]
+        scoped = [p for p in missing if p.startswith("@")]
+        tasks = [
+            self._fetch_bulk(client, unscoped[i:i + BULK_LIMIT])
+            for i in range(0, len(unscoped), BULK_LIMIT)
+        ]
+        tasks.extend(self._fetch_one(client, p) for p in scoped)
+        if tasks:
+            await asyncio.gather(*tasks)
+            self.save()
+
+        results = {}
+        for package in packages:
+            entry = self.entries.get(package)
+            if entry and entry.get("found"):
+                results[package] = {k: entry[k] for k in ("weekly", "monthly", "yearly", "end")}
+            else:
+                results[package] = None
+        return results
+
+    async def get(self, client: httpx.AsyncClient, package: str) -> Optional[dict]:
+        """Get download totals for one package (see get_many)."""
+        return (await self.get_many(client, [package])).get(package)
+
+    def get_stats(self) -> dict:
+        """Get client statistics."""
+        return {
+            **self.stats,
+            'cached_packages': len(self.entries),
+            'cache_file': str(self.cache_file),
+        }
+
+
+_shared_client: Optional[NpmDownloadsClient] = None
+
+
+def get_downloads_client() -> NpmDownloadsClient:
+    """Process-wide client, so scrapers running together share one cache."""
+    global _shared_client
+    if _shared_client is None:
+        _shared_client = NpmDownloadsClient()
+    return _shared_client
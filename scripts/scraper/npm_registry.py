@@ -0,0 +1,225 @@
+"""
+NPM Registry - Lean package metadata from registry.npmjs.org
+Reads the small /<pkg>/latest manifest and only touches the full packument for publish times
+"""
+import os
+import json
+import time
+import tracemalloc
+from datetime import datetime
+from pathlib import Path
+from typing import Optional
+import httpx
+
+try:
+    import ijson
+except ImportError:  # Without ijson the packument is buffered and parsed whole
+    ijson = None
+
+
+NPM_REGISTRY_URL = "https://registry.npmjs.org"
+DATA_DIR = os.path.join(os.path.dirname(__file__), "data")
+
+
+class NpmRegistryError(Exception):
+    """A registry request failed."""
+
+
+async def fetch_latest_manifest(client: httpx.AsyncClient, package_name: str) -> dict:
+    """
+    Fetch the package.json of the latest published version.
+
+    A few KB, versus megabytes for the full packument of popular packages.
+
+    Raises:
+        NpmRegistryError: On 404 ("Package not found") or another HTTP error
+    """
+    response = await client.get(f"{NPM_REGISTRY_URL}/{package_name}/latest")
+    if response.status_code == 404:
+        raise NpmRegistryError("Package not found")
+    if response.status_code != 200:
+        raise NpmRegistryError(f"HTTP {response.status_code}")
+    return response.json()
+
+
+async def stream_packument_time(client: httpx.AsyncClient, package_name: str) -> dict:
+    """
+    Read only the "time" object of the full packument.
+
+    With ijson the body is parsed as it arrives and only the time entries
+    are materialized; the versions object is skipped without being built.
+    """
+    async with client.stream("GET", f"{NPM_REGISTRY_URL}/{package_name}") as response:
+        if response.status_code != 200:
+            raise NpmRegistryError(f"HTTP {response.status_code}")
+
+        if ijson is None:
+            body = await response.aread()
+            return json.loads(body).get("time", {})
+
+        times = {}
+        parser = ijson.parse_async(_AsyncBytesReader(response))
+        async for prefix, event, value in parser:
+            if prefix.startswith("time.") and event == "string":
+                times[prefix[len("time."):]] = value
+            elif prefix == "time" and event == "end_map":
+                break
+        return times
+
+
+class _AsyncBytesReader:
+    """Adapts an httpx streaming response to the file-like object ijson reads."""
+
+    def __init__(self, response: httpx.Response):
+        self._chunks = response.aiter_bytes()
+
+    async def read(self, size: int = -1) -> bytes:
+        try:
+            return await self._chunks.__anext__()
+        except StopAsyncIteration:
+            return b""
+
+
+class PublishTimeCache:
+    """
+    Caches publish times per package, keyed by the latest version.
+
+    The created date never changes and the latest publish date only changes
+    with a new version, so the packument is read once per release instead
+    of on every run.
+    """
+
+    def __init__(self, cache_file: Optional[str] = None):
+        """
+        Initialize publish time cache.
+
+        Args:
+            cache_file: Path to the cache (defaults to data/npm_publish_times.json)
+        """
+        if cache_file is None:
+            cache_file = os.path.join(DATA_DIR, "npm_publish_times.json")
+        self.cache_file = Path(cache_file)
+        self.cache_file.parent.mkdir(parents=True, exist_ok=True)
+        self.entries: dict[str, dict] = self._load_cache()
+        self.stats = {"hits": 0, "misses": 0}
+        self._dirty = False
+
+    def _load_cache(self) -> dict:
+        """Load cached times from disk."""
+        if self.cache_file.exists():
+            try:
+                with open(self.cache_file, 'r') as f:
+                    return json.load(f).get('packages', {})
+            except Exception:
+                return {}
+        return {}
+
+    def save(self):
+        """Atomically write the cache to disk if it changed."""
+        if not self._dirty:
+            return
+
+        tmp_file = self.cache_file.with_suffix(self.cache_file.suffix + ".tmp")
+        with open(tmp_file, 'w') as f:
+            json.dump({'packages': self.entries}, f, indent=2, sort_keys=True)
+        os.replace(tmp_file, self.cache_file)
+        self._dirty = False
+
+    async def get(self, client: httpx.AsyncClient, package_name: str, version: str) -> dict:
+        """
+        Get created/modified/latest_published times for a package version.
+
+        Returns:
+            Time fields; empty values if the packument could not be read
+        """
+        entry = self.entries.get(package_name)
+        if entry and entry.get("version") == version:
+            self.stats["hits"] += 1
+            return {k: entry.get(k) for k in ("created", "modified", "latest_published")}
+
+        self.stats["misses"] += 1
+        try:
+            times = await stream_packument_time(client, package_name)
+        except Exception as e:
+            print(f"  Error reading publish times for {package_name}: {e}")
+            return {"created": None, "modified": None, "latest_published": None}
+
+        result = {
+            "created": times.get("created"),
+            "modified": times.get("modified"),
+            "latest_published": times.get(version),
+        }
+        self.entries[package_name] = {
+            **result,
+            "version": version,
+            "fetched_at": datetime.now().isoformat(),
+        }
+        self._dirty = True
+        return result
+
+
+_shared_time_cache: Optional[PublishTimeCache] = None
+
+
+def get_publish_time_cache() -> PublishTimeCache:
+    """Process-wide publish time cache shared by the npm scrapers."""
+    global _shared_time_cache
+    if _shared_time_cache is None:
+        _shared_time_cache = PublishTimeCache()
+    return _shared_time_cache
+
+
+async def fetch_package_lean(client: httpx.AsyncClient, package_name: str) -> tuple[dict, dict]:
+    """
+    Fetch the latest manifest and publish times of a package.
+
+    Returns:
+        (manifest, times) where times has created, modified and latest_published
+
+    Raises:
+        NpmRegistryError: If the manifest cannot be fetched
+    """
+    manifest = await fetch_latest_manifest(client, package_name)
+    times = await get_publish_time_cache().get(client, package_name, manifest.get("version"))
+    return manifest, times
+
+
+async def measure_fetch(client: httpx.AsyncClient, package_name: str, lean: bool) -> dict:
+    """
+    Measure one metadata fetch, full packument versus lean.
+
+    Returns:
+        Bytes downloaded, wall time, CPU time (mostly JSON parsing) and
+        peak Python memory for the fetch
+    """
+    downloaded = []
+
+    async def count_bytes(response: httpx.Response):
+        downloaded.append(response)
+
+    client.event_hooks["response"].append(count_bytes)
+    tracemalloc.start()
+    started, cpu_started = time.perf_counter(), time.process_time()
+    try:
+        if lean:
+            await fetch_package_lean(client, package_name)
+        else:
+            response = await client.get(f"{NPM_REGISTRY_URL}/{package_name}")
+            response.json()
+        error = None
+    except Exception as e:
+        error = str(e)
+    finally:
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        client.event_hooks["response"].remove(count_bytes)
+
+    return {
+        "package": package_name,
+        "mode": "lean" if lean else "full",
+        "bytes": sum(r.num_bytes_downloaded for r in downloaded),
+        "wall_s": round(time.perf_counter() - started, 3),
+        "cpu_s": round(time.process_time() - cpu_started, 3),
+        "peak_kb": peak // 1024,
+        "error": error,
+    }
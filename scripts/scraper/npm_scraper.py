@@ -1,16 +1,51 @@
 """
 NPM Scraper - Fetches metadata about packages from npm registry
 """
-import os
-import json
 import httpx
 from typing import Optional
+from artifacts import load_artifact, save_artifact_async
+from npm_changes import NpmChangesFollower, fetch_catalog_npm_packages
+from npm_downloads import get_downloads_client
+from npm_registry import (
+    NPM_REGISTRY_URL,
+    fetch_package_lean,
+    get_publish_time_cache,
+    measure_fetch,
+)
 
-NPM_REGISTRY_URL = "https://registry.npmjs.org"
+
+def _format_package(data: dict, latest_info: dict, latest_version: Optional[str], times: dict) -> dict:
+    repository = latest_info.get("repository") or data.get("repository")
+    return {
+        "name": data.get("name"),
+        "description": latest_info.get("description") or data.get("description"),
+        "latest_version": latest_version,
+        "homepage": latest_info.get("homepage") or data.get("homepage"),
+        "repository": repository.get("url") if isinstance(repository, dict) else repository,
+        "license": latest_info.get("license") or data.get("license"),
+        "keywords": latest_info.get("keywords", []) or data.get("keywords", []),
+        "author": latest_info.get("author") or data.get("author"),
+        "maintainers": [m.get("name") for m in (latest_info.get("maintainers") or data.get("maintainers", []))],
+        "time": times,
+        "dependencies_count": len(latest_info.get("dependencies", {})),
+        "dev_dependencies_count": len(latest_info.get("devDependencies", {})),
+    }
 
 
-async def fetch_npm_package(client: httpx.AsyncClient, package_name: str) -> dict:
-    """Fetch package metadata from npm registry."""
+async def fetch_npm_package(client: httpx.AsyncClient, package_name: str, lean: bool = True) -> dict:
+    """
+    Fetch package metadata from npm registry.
+    
+    Lean mode reads the latest version's manifest and takes publish times
+    from the per-version cache; full mode downloads the whole packument.
+    """
+    if lean:
+        try:
+            manifest, times = await fetch_package_lean(client, package_name)
+        except Exception as e:
+            return {"error": str(e)}
+        return _format_package(manifest, manifest, manifest.get("version"), times)
+    
     url = f"{NPM_REGISTRY_URL}/{package_name}"
     
     try:
@@ -19,25 +54,13 @@ async def fetch_npm_package(client: httpx.AsyncClient, package_name: str) -> dic
             data = response.json()
             latest_version = data.get("dist-tags", {}).get("latest")
             latest_info = data.get("versions", {}).get(latest_version, {}) if latest_version else {}
+            time_data = data.get("time", {})
             
-            return {
-                "name": data.get("name"),
-                "description": data.get("description"),
-                "latest_version": latest_version,
-                "homepage": latest_info.get("homepage") or data.get("homepage"),
-                "repository": data.get("repository", {}).get("url") if isinstance(data.get("repository"), dict) else data.get("repository"),
-                "license": latest_info.get("license") or data.get("license"),
-                "keywords": latest_info.get("keywords", []) or data.get("keywords", []),
-                "author": data.get("author"),
-                "maintainers": [m.get("name") for m in data.get("maintainers", [])],
-                "time": {
-                    "created": data.get("time", {}).get("created"),
-                    "modified": data.get("time", {}).get("modified"),
-                    "latest_published": data.get("time", {}).get(latest_version) if latest_version else None,
-                },
-                "dependencies_count": len(latest_info.get("dependencies", {})),
-                "dev_dependencies_count": len(latest_info.get("devDependencies", {})),
-            }
+            return _format_package(data, latest_info, latest_version, {
+                "created": time_data.get("created"),
+                "modified": time_data.get("modified"),
+                "latest_published": time_data.get(latest_version) if latest_version else None,
+            })
         elif response.status_code == 404:
             return {"error": "Package not found"}
         else:
@@ -47,57 +70,119 @@ async def fetch_npm_package(client: httpx.AsyncClient, package_name: str) -> dic
 
 
 async def fetch_npm_downloads(client: httpx.AsyncClient, package_name: str) -> dict:
-    """Fetch download stats from npm API."""
-    # Weekly downloads
-    url = f"https://api.npmjs.org/downloads/point/last-week/{package_name}"
-    
-    try:
-        response = await client.get(url)
-        if response.status_code == 200:
-            data = response.json()
-            weekly = data.get("downloads", 0)
-        else:
-            weekly = None
-    except Exception:
-        weekly = None
-    
-    # Monthly downloads
-    url = f"https://api.npmjs.org/downloads/point/last-month/{package_name}"
-    
-    try:
-        response = await client.get(url)
-        if response.status_code == 200:
-            data = response.json()
-            monthly = data.get("downloads", 0)
-        else:
-            monthly = None
-    except Exception:
-        monthly = None
+    """Fetch download stats from npm API (served from the shared downloads cache)."""
+    totals = await get_downloads_client().get(client, package_name)
+    if not totals:
+        return {
+            "weekly_downloads": None,
+            "monthly_downloads": None,
+            "yearly_downloads": None,
+        }
     
     return {
-        "weekly_downloads": weekly,
-        "monthly_downloads": monthly,
+        "weekly_downloads": totals["weekly"],
+        "monthly_downloads": totals["monthly"],
+        "yearly_downloads": totals["yearly"],
     }
 
 
-async def scrape_npm_packages(package_names: list[str]) -> dict:
+async def scrape_npm_packages(package_names: list[str], lean: bool = True) -> dict:
     """Scrape metadata for multiple npm packages."""
     results = {}
     
     async with httpx.AsyncClient(timeout=30.0) as client:
+        # One bulk pass fills the downloads cache for every package
+        await get_downloads_client().get_many(client, package_names)
+        
         for package_name in package_names:
             print(f"Fetching npm: {package_name}")
             
-            metadata = await fetch_npm_package(client, package_name)
+            metadata = await fetch_npm_package(client, package_name, lean=lean)
             if "error" not in metadata:
                 downloads = await fetch_npm_downloads(client, package_name)
                 metadata["downloads"] = downloads
             
             results[package_name] = metadata
     
+    get_publish_time_cache().save()
     return results
 
 
+async def scrape_tracked_npm_packages(lean: bool = True, full_refresh: bool = False) -> dict:
+    """
+    Scrape every npm package in the tool catalog, refreshing only changed ones.
+    
+    Metadata is refetched for packages the changes feed reports as published
+    since the last run (and packages missing from the previous artifact);
+    the rest keep their previous metadata with download stats refreshed
+    through the shared downloads cache.
+    
+    Args:
+        lean: Use lean metadata fetching (see fetch_npm_package)
+        full_refresh: Refetch metadata for every tracked package
+    
+    Returns:
+        Mapping of package name to metadata, like scrape_npm_packages()
+    """
+    follower = NpmChangesFollower("npm_scraper")
+    previous = load_artifact("npm_metadata") or {}
+    
+    async with httpx.AsyncClient(timeout=30.0) as client:
+        packages = await fetch_catalog_npm_packages(client)
+        if not packages:
+            print("No npm packages in the catalog, using the built-in package list")
+            packages = NPM_PACKAGES
+        
+        try:
+            changed = set(await follower.follow(client, packages))
+        except Exception as e:
+            print(f"Error reading npm changes feed ({e}), refreshing every package")
+            changed = set(packages)
+        
+        if full_refresh:
+            changed = set(packages)
+        to_refresh = [p for p in packages if p in changed or p not in previous]
+        print(f"npm: {len(to_refresh)}/{len(packages)} tracked packages changed since the last run")
+        
+        await get_downloads_client().get_many(client, packages)
+        results = {}
+        for package_name in packages:
+            if package_name in to_refresh:
+                continue
+            metadata = dict(previous[package_name])
+            if "error" not in metadata:
+                metadata["downloads"] = await fetch_npm_downloads(client, package_name)
+            results[package_name] = metadata
+    
+    refreshed = await scrape_npm_packages(to_refresh, lean=lean)
+    results.update(refreshed)
+    follower.acknowledge(p for p, metadata in refreshed.items() if "error" not in metadata)
+    
+    return {package_name: results[package_name] for package_name in packages}
+
+
+async def measure_npm_fetches(package_names: list[str]) -> list[dict]:
+    """Compare bandwidth, CPU time and peak memory of full and lean fetches."""
+    measurements = []
+    async with httpx.AsyncClient(timeout=30.0) as client:
+        for package_name in package_names:
+            full = await measure_fetch(client, package_name, lean=False)
+            lean = await measure_fetch(client, package_name, lean=True)
+            measurements.extend([full, lean])
+            print(
+                f"{package_name}: full {full['bytes'] // 1024} KB / {full['cpu_s']}s CPU / {full['peak_kb']} KB peak, "
+                f"lean {lean['bytes'] // 1024} KB / {lean['cpu_s']}s CPU / {lean['peak_kb']} KB peak"
+            )
+    
+    get_publish_time_cache().save()
+    totals = {
+        mode: sum(m["bytes"] for m in measurements if m["mode"] == mode)
+        for mode in ("full", "lean")
+    }
+    print(f"\nTotal downloaded: full {totals['full'] // 1024} KB, lean {totals['lean'] // 1024} KB")
+    return measurements
+
+
 # NPM packages for tools in our database
 NPM_PACKAGES = [
     "react",
@@ -135,15 +220,37 @@ NPM_PACKAGES = [
 
 if __name__ == "__main__":
     import asyncio
+    import argparse
+    
+    parser = argparse.ArgumentParser(description="Scrape npm package metadata")
+    parser.add_argument(
+        "--full-packument",
+        action="store_true",
+        help="Download full packuments instead of the lean latest manifest"
+    )
+    parser.add_argument(
+        "--full-refresh",
+        action="store_true",
+        help="Refetch every tracked package, not just those in the changes feed"
+    )
+    parser.add_argument(
+        "--measure",
+        action="store_true",
+        help="Compare full and lean fetches per package instead of scraping"
+    )
+    args = parser.parse_args()
     
     async def main():
-        results = await scrape_npm_packages(NPM_PACKAGES)
+        if args.measure:
+            await measure_npm_fetches(NPM_PACKAGES)
+            return
         
-        output_path = os.path.join(os.path.dirname(__file__), "data", "npm_metadata.json")
-        os.makedirs(os.path.dirname(output_path), exist_ok=True)
+        results = await scrape_tracked_npm_packages(
+            lean=not args.full_packument,
+            full_refresh=args.full_refresh,
+        )
         
-        with open(output_path, "w") as f:
-            json.dump(results, f, indent=2)
+        output_path = await save_artifact_async("npm_metadata", results, layout="mapping")
         
         print(f"\nSaved {len(results)} packages to {output_path}")
         
@@ -1,12 +1,24 @@
 """
-Package Registries Scraper - Fetches package metadata from PyPI, crates.io, pkg.go.dev
+Package Registries Scraper - Fetches package metadata from PyPI, crates.io and the Go module proxy
 """
 import os
+import re
 import json
 import asyncio
 import httpx
+from abc import ABC, abstractmethod
 from datetime import datetime
+from email.utils import parsedate_to_datetime
+from pathlib import Path
 from typing import Optional
+from xml.etree import ElementTree
+from packaging.version import InvalidVersion, Version
+from artifacts import save_artifact_async
+from bot_avoidance import get_rate_limiter
+from rate_limit_config import RATE_LIMITS
+
+
+DATA_DIR = os.path.join(os.path.dirname(__file__), "data")
 
 
 PYPI_PACKAGES = [
@@ -120,33 +132,179 @@ GO_PACKAGES = [
 ]
 
 
-async def fetch_pypi_package(client: httpx.AsyncClient, package: str) -> dict:
-    """Fetch package info from PyPI."""
-    url = f"https://pypi.org/pypi/{package}/json"
-    
-    try:
-        response = await client.get(url)
+def newest_version(versions: list[str]) -> Optional[str]:
+    """
+    Highest stable version by PEP 440 ordering, or the highest pre-release
+    if there is no stable one. Unparseable versions are ignored.
+    """
+    parsed = []
+    for version in versions:
+        try:
+            parsed.append((Version(version), version))
+        except (InvalidVersion, TypeError):
+            continue
+    stable = [p for p in parsed if not p[0].is_prerelease]
+    candidates = stable or parsed
+    return max(candidates)[1] if candidates else None
+
+
+class RegistryCache:
+    """
+    Caches per-package registry data keyed by the latest version.
+
+    Clients first make a cheap "what is the latest version" request and only
+    fetch the heavier metadata when the version differs from the cached one.
+    """
+
+    def __init__(self, cache_file: Optional[str] = None):
+        """
+        Initialize registry cache.
+
+        Args:
+            cache_file: Path to the cache (defaults to data/registry_cache.json)
+        """
+        if cache_file is None:
+            cache_file = os.path.join(DATA_DIR, "registry_cache.json")
+        self.cache_file = Path(cache_file)
+        self.cache_file.parent.mkdir(parents=True, exist_ok=True)
+        self.entries: dict[str, dict] = self._load_cache()
+        self.stats = {"hits": 0, "misses": 0}
+        self._dirty = False
+
+    def _load_cache(self) -> dict:
+        """Load cached entries from disk."""
+        if self.cache_file.exists():
+            try:
+                with open(self.cache_file, 'r') as f:
+                    return json.load(f).get('entries', {})
+            except Exception:
+                return {}
+        return {}
+
+    def save(self):
+        """Atomically write the cache to disk if it changed."""
+        if not self._dirty:
+            return
+
+        tmp_file = self.cache_file.with_suffix(self.cache_file.suffix + ".tmp")
+        with open(tmp_file, 'w') as f:
+            json.dump({'entries': self.entries}, f, indent=2, sort_keys=True)
+        os.replace(tmp_file, self.cache_file)
+        self._dirty = False
+
+    def get(self, registry: str, package: str, version: Optional[str]) -> Optional[dict]:
+        """Cached data for a package if it was stored for this version."""
+        entry = self.entries.get(f"{registry}:{package}")
+        if entry and version and entry.get("version") == version:
+            self.stats["hits"] += 1
+            return entry["data"]
+        self.stats["misses"] += 1
+        return None
+
+    def set(self, registry: str, package: str, version: Optional[str], data: dict):
+        """Store data for a package version."""
+        self.entries[f"{registry}:{package}"] = {
+            "version": version,
+            "data": data,
+            "fetched_at": datetime.now().isoformat(),
+        }
+        self._dirty = True
+
+
+class RegistryClient(ABC):
+    """
+    Base class for a registry client with its own per-host concurrency limit.
+    """
+
+    name = ""
+    host = ""
+    concurrency = 8
+
+    def __init__(self, cache: RegistryCache):
+        self.cache = cache
+        self.semaphore = asyncio.Semaphore(self.concurrency)
+        self.requests = 0
+
+    async def get(self, client: httpx.AsyncClient, url: str, **kwargs) -> httpx.Response:
+        """GET a URL on this registry's host, respecting its limits."""
+        async with self.semaphore:
+            if self.host in RATE_LIMITS:
+                await get_rate_limiter(self.host).wait()
+            self.requests += 1
+            response = await client.get(url, **kwargs)
         response.raise_for_status()
-        
-        data = response.json()
-        info = data.get("info", {})
-        
-        releases = data.get("releases", {})
-        release_dates = []
-        for version, files in releases.items():
-            if files:
-                release_dates.append({
-                    "version": version,
-                    "upload_time": files[0].get("upload_time"),
-                })
-        
-        release_dates.sort(key=lambda x: x.get("upload_time", ""), reverse=True)
-        
+        return response
+
+    @abstractmethod
+    async def fetch(self, client: httpx.AsyncClient, package: str) -> dict:
+        """Fetch one package's metadata, serving unchanged versions from the cache."""
+
+    async def fetch_all(self, client: httpx.AsyncClient, packages: list[str]) -> dict:
+        """Fetch every package concurrently (bounded by the host limit)."""
+        async def fetch_one(package: str) -> dict:
+            print(f"  Fetching {self.name}: {package}...")
+            try:
+                return await self.fetch(client, package)
+            except Exception as e:
+                print(f"Error fetching {self.name} package {package}: {e}")
+                return {"name": package, "error": str(e), "source": self.name}
+
+        fetched = await asyncio.gather(*(fetch_one(p) for p in packages))
+        return dict(zip(packages, fetched))
+
+
+class PyPIClient(RegistryClient):
+    """
+    PyPI client that never downloads the all-releases JSON.
+
+    The per-project releases RSS feed (a few KB) gives the latest versions
+    and their dates. Only when the latest stable version changes are the
+    per-version JSON (project info) and the simple API (release count)
+    requested.
+    """
+
+    name = "pypi"
+    host = "pypi.org"
+    concurrency = 8
+
+    async def fetch(self, client: httpx.AsyncClient, package: str) -> dict:
+        response = await self.get(client, f"https://pypi.org/rss/project/{package}/releases.xml")
+        releases = []
+        for item in ElementTree.fromstring(response.content).iter("item"):
+            version = item.findtext("title")
+            published = item.findtext("pubDate")
+            releases.append({
+                "version": version,
+                "upload_time": parsedate_to_datetime(published).isoformat() if published else None,
+            })
+
+        # The feed is ordered by upload time, so a backport release (4.2.x
+        # after 5.1) can come first; pick the highest version instead
+        version = newest_version([r["version"] for r in releases])
+        if version is None:
+            return {"name": package, "error": "no releases", "recent_releases": releases[:5], "source": self.name}
+
+        data = self.cache.get(self.name, package, version)
+        if data is None:
+            data = await self._fetch_version(client, package, version)
+            self.cache.set(self.name, package, version, data)
+        return {**data, "recent_releases": releases[:5]}
+
+    async def _fetch_version(self, client: httpx.AsyncClient, package: str, version: str) -> dict:
+        response = await self.get(client, f"https://pypi.org/pypi/{package}/{version}/json")
+        info = response.json().get("info", {})
+
+        simple = await self.get(
+            client,
+            f"https://pypi.org/simple/{package}/",
+            headers={"Accept": "application/vnd.pypi.simple.v1+json"},
+        )
+
         return {
             "name": info.get("name"),
             "version": info.get("version"),
             "summary": info.get("summary"),
-            "description": info.get("description", "")[:500],
+            "description": (info.get("description") or "")[:500],
             "author": info.get("author"),
             "author_email": info.get("author_email"),
             "license": info.get("license"),
@@ -155,29 +313,52 @@ async def fetch_pypi_package(client: httpx.AsyncClient, package: str) -> dict:
             "package_url": info.get("package_url"),
             "requires_python": info.get("requires_python"),
             "keywords": info.get("keywords"),
-            "classifiers": info.get("classifiers", [])[:10],
-            "project_urls": info.get("project_urls", {}),
-            "recent_releases": release_dates[:5],
-            "total_releases": len(releases),
+            "classifiers": (info.get("classifiers") or [])[:10],
+            "project_urls": info.get("project_urls") or {},
+            "total_releases": len(simple.json().get("versions", [])),
             "source": "pypi",
         }
-    except Exception as e:
-        print(f"Error fetching PyPI package {package}: {e}")
-        return {"name": package, "error": str(e), "source": "pypi"}
 
 
-async def fetch_crates_package(client: httpx.AsyncClient, crate: str) -> dict:
-    """Fetch package info from crates.io."""
-    url = f"https://crates.io/api/v1/crates/{crate}"
-    
-    try:
-        response = await client.get(url)
-        response.raise_for_status()
-        
-        data = response.json()
-        crate_data = data.get("crate", {})
-        versions = data.get("versions", [])
-        
+class CratesClient(RegistryClient):
+    """
+    crates.io client following its crawler policy (one request per second).
+
+    The crate endpoint is requested without the embedded version list;
+    recent versions are fetched separately, and only when the newest
+    version changed.
+    """
+
+    name = "crates"
+    host = "crates.io"
+    concurrency = 1
+
+    async def fetch(self, client: httpx.AsyncClient, crate: str) -> dict:
+        response = await self.get(
+            client,
+            f"https://crates.io/api/v1/crates/{crate}",
+            params={"include": "keywords,categories"},
+        )
+        crate_data = response.json().get("crate", {})
+        version = crate_data.get("newest_version") or crate_data.get("max_version")
+
+        versions = self.cache.get(self.name, crate, version)
+        if versions is None:
+            response = await self.get(
+                client,
+                f"https://crates.io/api/v1/crates/{crate}/versions",
+                params={"per_page": 5, "sort": "date"},
+            )
+            payload = response.json()
+            versions = {
+                "versions_count": payload.get("meta", {}).get("total", crate_data.get("num_versions")),
+                "recent_versions": [
+                    {"version": v.get("num"), "created_at": v.get("created_at")}
+                    for v in payload.get("versions", [])[:5]
+                ],
+            }
+            self.cache.set(self.name, crate, version, versions)
+
         return {
             "name": crate_data.get("name"),
             "description": crate_data.get("description"),
@@ -192,61 +373,65 @@ async def fetch_crates_package(client: httpx.AsyncClient, crate: str) -> dict:
             "updated_at": crate_data.get("updated_at"),
             "keywords": crate_data.get("keywords", []),
             "categories": crate_data.get("categories", []),
-            "versions_count": len(versions),
-            "recent_versions": [
-                {"version": v.get("num"), "created_at": v.get("created_at")}
-                for v in versions[:5]
-            ],
+            **versions,
             "source": "crates",
         }
-    except Exception as e:
-        print(f"Error fetching crates.io package {crate}: {e}")
-        return {"name": crate, "error": str(e), "source": "crates"}
 
 
-async def fetch_go_package(client: httpx.AsyncClient, package: str) -> dict:
-    """Fetch package info from pkg.go.dev."""
-    url = f"https://pkg.go.dev/{package}"
-    
-    try:
-        response = await client.get(url, follow_redirects=True)
-        response.raise_for_status()
-        
-        from bs4 import BeautifulSoup
-        soup = BeautifulSoup(response.text, "html.parser")
-        
-        title_elem = soup.select_one("h1")
-        title = title_elem.get_text(strip=True) if title_elem else package
-        
-        desc_elem = soup.select_one(".Documentation-overview p")
-        description = desc_elem.get_text(strip=True) if desc_elem else ""
-        
-        version_elem = soup.select_one(".DetailsHeader-version")
-        version = version_elem.get_text(strip=True) if version_elem else None
-        
-        license_elem = soup.select_one(".DetailsHeader-license a")
-        license_info = license_elem.get_text(strip=True) if license_elem else None
-        
-        repo_elem = soup.select_one(".DetailsHeader-infoLabelRecipient a[href*='github.com']")
-        repository = repo_elem.get("href") if repo_elem else None
-        
+def escape_module_path(module: str) -> str:
+    """Escape a Go module path for the module proxy (uppercase -> !lowercase)."""
+    return re.sub(r"[A-Z]", lambda m: "!" + m.group(0).lower(), module)
+
+
+def _semver_key(version: str) -> tuple:
+    core, _, prerelease = version.lstrip("v").split("+")[0].partition("-")
+    numbers = [int(part) if part.isdigit() else 0 for part in core.split(".")[:3]]
+    return (*numbers, not prerelease, prerelease)
+
+
+class GoProxyClient(RegistryClient):
+    """
+    Go module client reading JSON and text from the module proxy.
+
+    @latest gives the version, its publish time and origin repository;
+    @v/list (fetched only when @latest changes) gives the version history.
+    """
+
+    name = "go"
+    host = "proxy.golang.org"
+    concurrency = 8
+
+    async def fetch(self, client: httpx.AsyncClient, module: str) -> dict:
+        base_url = f"https://proxy.golang.org/{escape_module_path(module)}"
+        response = await self.get(client, f"{base_url}/@latest")
+        latest = response.json()
+        version = latest.get("Version")
+
+        history = self.cache.get(self.name, module, version)
+        if history is None:
+            response = await self.get(client, f"{base_url}/@v/list")
+            versions = sorted(response.text.split(), key=_semver_key, reverse=True)
+            history = {"versions_count": len(versions), "recent_versions": versions[:5]}
+            self.cache.set(self.name, module, version, history)
+
+        repository = (latest.get("Origin") or {}).get("URL")
+        if not repository and module.startswith("github.com/"):
+            repository = "https://" + "/".join(module.split("/")[:3])
+
         return {
-            "name": package,
-            "title": title,
-            "description": description[:500] if description else "",
+            "name": module,
+            "title": module,
             "version": version,
-            "license": license_info,
+            "published_at": latest.get("Time"),
             "repository": repository,
-            "pkg_url": f"https://pkg.go.dev/{package}",
+            **history,
+            "pkg_url": f"https://pkg.go.dev/{module}",
             "source": "go",
         }
-    except Exception as e:
-        print(f"Error fetching Go package {package}: {e}")
-        return {"name": package, "error": str(e), "source": "go"}
 
 
 async def scrape_package_registries() -> dict:
-    """Scrape all package registries."""
+    """Scrape all package registries, each concurrently within its own host limit."""
     results = {
         "scraped_at": datetime.now().isoformat(),
         "pypi": {},
@@ -255,44 +440,35 @@ async def scrape_package_registries() -> dict:
         "all_packages": [],
     }
     
+    cache = RegistryCache()
+    registries = [
+        (PyPIClient(cache), PYPI_PACKAGES),
+        (CratesClient(cache), CRATES_PACKAGES),
+        (GoProxyClient(cache), GO_PACKAGES),
+    ]
+    limits = httpx.Limits(max_connections=sum(registry.concurrency for registry, _ in registries))
+    
     async with httpx.AsyncClient(
         timeout=30.0,
+        limits=limits,
+        follow_redirects=True,
         headers={
             "User-Agent": "Mozilla/5.0 (compatible; VibeBuff/1.0)",
             "Accept": "application/json",
         }
     ) as client:
-        for package in PYPI_PACKAGES:
-            print(f"  Fetching PyPI: {package}...")
-            pkg_data = await fetch_pypi_package(client, package)
-            results["pypi"][package] = pkg_data
-            
-            if "error" not in pkg_data:
-                results["all_packages"].append(pkg_data)
-            
-            await asyncio.sleep(0.3)
-        
-        for crate in CRATES_PACKAGES:
-            print(f"  Fetching crates.io: {crate}...")
-            crate_data = await fetch_crates_package(client, crate)
-            results["crates"][crate] = crate_data
-            
-            if "error" not in crate_data:
-                results["all_packages"].append(crate_data)
-            
-            await asyncio.sleep(0.3)
-        
-        for package in GO_PACKAGES:
-            print(f"  Fetching pkg.go.dev: {package}...")
-            go_data = await fetch_go_package(client, package)
-            results["go"][package] = go_data
-            
-            if "error" not in go_data:
-                results["all_packages"].append(go_data)
-            
-            await asyncio.sleep(1)
+        fetched = await asyncio.gather(*(
+            registry.fetch_all(client, packages) for registry, packages in registries
+        ))
+    cache.save()
+    
+    for (registry, _), packages in zip(registries, fetched):
+        results[registry.name] = packages
+        results["all_packages"].extend(p for p in packages.values() if "error" not in p)
+        print(f"  {registry.name}: {registry.requests} requests")
     
     results["total_packages"] = len(results["all_packages"])
+    results["cache"] = cache.stats
     return results
 
 
@@ -301,12 +477,7 @@ if __name__ == "__main__":
         print("Scraping Package Registries...")
         results = await scrape_package_registries()
         
-        output_dir = os.path.join(os.path.dirname(__file__), "data")
-        os.makedirs(output_dir, exist_ok=True)
-        
-        output_path = os.path.join(output_dir, "package_registries.json")
-        with open(output_path, "w") as f:
-            json.dump(results, f, indent=2)
+        output_path = await save_artifact_async("package_registries", results)
         
         print(f"\nSaved {results['total_packages']} packages to {output_path}")
     
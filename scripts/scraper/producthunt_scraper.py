@@ -2,22 +2,53 @@
 Product Hunt Scraper - Discovers new developer tools from Product Hunt
 """
 import os
-import json
 import re
+import json
 import httpx
 from bs4 import BeautifulSoup
+from pathlib import Path
 from typing import Optional
-from datetime import datetime
+from datetime import datetime, timedelta, timezone
 import asyncio
+from dotenv import load_dotenv
 from bot_avoidance import (
+    get_api_headers,
     get_realistic_headers,
     random_delay,
     retry_with_backoff,
     RateLimiter,
     create_client_with_limits,
 )
+from rule_engine import RuleEngine
+from artifacts import save_artifact_async
+from embedded_data import find_records, listing_fields
+
+load_dotenv()
+
+PRODUCTHUNT_TOKEN = os.getenv("PRODUCTHUNT_TOKEN")
+PRODUCTHUNT_GRAPHQL_URL = "https://api.producthunt.com/v2/api/graphql"
+DATA_DIR = os.path.join(os.path.dirname(__file__), "data")
 
 rate_limiter = RateLimiter(requests_per_minute=15)
+api_rate_limiter = RateLimiter(requests_per_minute=60)
+
+# Only the fields discover/enrich store: one query per page replaces the
+# topic page, the search pages and a detail page per product
+POSTS_QUERY = """
+query TopicPosts($topic: String!, $postedAfter: DateTime!, $postedBefore: DateTime!, $after: String) {
+  posts(topic: $topic, postedAfter: $postedAfter, postedBefore: $postedBefore, order: NEWEST, first: 20, after: $after) {
+    pageInfo { hasNextPage endCursor }
+    edges {
+      node {
+        id name tagline description slug url website votesCount createdAt
+        thumbnail { url }
+        topics(first: 10) { edges { node { name slug } } }
+        makers { name username }
+      }
+    }
+  }
+}
+"""
 
 
 DEVELOPER_TOPICS = [
@@ -48,6 +79,27 @@ TOOL_CATEGORIES = {
     "api": ["api", "rest", "graphql", "sdk"],
 }
 
+TOOL_CATEGORY_ENGINE = RuleEngine.from_table(TOOL_CATEGORIES)
+
+# Apollo cache entries (__typename) and JSON-LD types that describe a launched product
+POST_TYPES = {"Post", "Product", "SoftwareApplication", "WebApplication"}
+
+
+def map_embedded_post(obj: dict) -> Optional[dict]:
+    """Map one post from the page's embedded Apollo state or JSON-LD."""
+    if obj.get("__typename", obj.get("@type")) not in POST_TYPES:
+        return None
+    fields = listing_fields(obj, "https://www.producthunt.com")
+    if not fields:
+        return None
+    url = f"https://www.producthunt.com/posts/{fields['slug']}" if fields["slug"] else fields["url"]
+    return {
+        "name": fields["name"],
+        "tagline": fields["tagline"] or fields["description"] or None,
+        "url": url,
+        "votes": fields["votes"],
+    }
+
 
 async def fetch_producthunt_topic(client: httpx.AsyncClient, topic: str) -> list[dict]:
     """Fetch products from a Product Hunt topic page."""
@@ -65,8 +117,15 @@ async def fetch_producthunt_topic(client: httpx.AsyncClient, topic: str) -> list
         if response.status_code != 200:
             return []
         
+        products = [
+            {**post, "topic": topic, "source": "producthunt"}
+            for post in find_records(response.text, map_embedded_post)
+        ]
+        if products:
+            await random_delay(0.5, 1.5)
+            return products
+        
         soup = BeautifulSoup(response.text, "lxml")
-        products = []
         
         for item in soup.select("[data-test='post-item']"):
             name_elem = item.select_one("h3, [data-test='post-name']")
@@ -106,8 +165,15 @@ async def fetch_producthunt_search(client: httpx.AsyncClient, query: str) -> lis
         if response.status_code != 200:
             return []
         
+        products = [
+            {**post, "search_query": query, "source": "producthunt_search"}
+            for post in find_records(response.text, map_embedded_post)
+        ]
+        if products:
+            await random_delay(0.5, 1.5)
+            return products
+        
         soup = BeautifulSoup(response.text, "lxml")
-        products = []
         
         for item in soup.select("[data-test='search-result']"):
             name_elem = item.select_one("h3")
@@ -187,25 +253,290 @@ async def scrape_product_details(client: httpx.AsyncClient, url: str) -> dict:
         return {"url": url, "error": str(e)}
 
 
+def product_search_text(product: dict) -> str:
+    """Join the product fields that category keywords are matched against."""
+    return " ".join([
+        product.get("name") or "",
+        product.get("tagline") or "",
+        product.get("description") or "",
+        " ".join(product.get("topics") or []),
+    ])
+
+
 def categorize_product(product: dict) -> Optional[str]:
     """Categorize a product based on its description and topics."""
-    text = " ".join([
-        product.get("name", ""),
-        product.get("tagline", ""),
-        product.get("description", ""),
-        " ".join(product.get("topics", [])),
-    ]).lower()
-    
-    for category, keywords in TOOL_CATEGORIES.items():
-        for keyword in keywords:
-            if keyword in text:
-                return category
-    
-    return None
+    return TOOL_CATEGORY_ENGINE.classify({"text": product_search_text(product)})
+
+
+def categorize_products(products: list[dict]) -> list[Optional[str]]:
+    """Categorize many products with a single rule-engine pass."""
+    return TOOL_CATEGORY_ENGINE.classify_many([{"text": product_search_text(p)} for p in products])
+
+
+class TopicWatermarks:
+    """
+    Last ingested post date per Product Hunt topic.
+
+    API ingestion only asks for posts after a topic's watermark; the
+    watermark moves forward after each fully read date window, so an
+    interrupted run resumes where it stopped.
+    """
+
+    def __init__(self, state_file: Optional[str] = None):
+        """
+        Initialize the watermarks.
+
+        Args:
+            state_file: Path to the state (defaults to data/producthunt_watermarks.json)
+        """
+        if state_file is None:
+            state_file = os.path.join(DATA_DIR, "producthunt_watermarks.json")
+        self.state_file = Path(state_file)
+        self.state_file.parent.mkdir(parents=True, exist_ok=True)
+        self.topics = self._load_topics()
+
+    def _load_topics(self) -> dict:
+        """Load watermarks from disk."""
+        if self.state_file.exists():
+            try:
+                with open(self.state_file, 'r') as f:
+                    return json.load(f).get("topics", {})
+            except Exception:
+                pass
+        return {}
+
+    def get(self, topic: str) -> Optional[datetime]:
+        """Watermark of a topic, or None if it was never ingested."""
+        value = self.topics.get(topic)
+        return datetime.fromisoformat(value) if value else None
+
+    def advance(self, topic: str, until: datetime):
+        """Move a topic's watermark forward (never back)."""
+        current = self.get(topic)
+        if current is None or until > current:
+            self.topics[topic] = until.isoformat()
+
+    def save(self):
+        """Atomically write the watermarks to disk."""
+        tmp_file = self.state_file.with_suffix(self.state_file.suffix + ".tmp")
+        with open(tmp_file, 'w') as f:
+            json.dump({"topics": self.topics, "updated_at": datetime.now().isoformat()}, f, indent=2)
+        os.replace(tmp_file, self.state_file)
+
+
+def post_to_product(node: dict, topic: str) -> dict:
+    """Map a GraphQL post node to the product shape enrich_products produces."""
+    return {
+        "id": node.get("id"),
+        "name": node.get("name"),
+        "tagline": node.get("tagline"),
+        "description": node.get("description"),
+        "url": node.get("url") or f"https://www.producthunt.com/posts/{node.get('slug')}",
+        "website": node.get("website"),
+        "upvotes": node.get("votesCount"),
+        "topics": [e["node"]["name"] for e in (node.get("topics") or {}).get("edges", [])],
+        "makers": [m.get("name") or m.get("username") for m in node.get("makers") or []],
+        "image": (node.get("thumbnail") or {}).get("url"),
+        "created_at": node.get("createdAt"),
+        "topic": topic,
+        "source": "producthunt_api",
+    }
+
+
+async def fetch_topic_window(
+    client: httpx.AsyncClient,
+    topic: str,
+    posted_after: datetime,
+    posted_before: datetime,
+    max_pages: int = 10,
+) -> tuple[list[dict], str]:
+    """
+    Fetch a topic's posts in one date window, following cursors.
+
+    Returns:
+        (post nodes, status) where status is "complete", "truncated" (the
+        page limit cut the window short) or "failed"
+    """
+    nodes, cursor = [], None
+    headers = get_api_headers(api_key=PRODUCTHUNT_TOKEN, extra_headers={"Content-Type": "application/json"})
+    variables = {
+        "topic": topic,
+        "postedAfter": posted_after.isoformat(),
+        "postedBefore": posted_before.isoformat(),
+    }
+
+    for _ in range(max_pages):
+        await api_rate_limiter.wait()
+
+        async def _query():
+            return await client.post(
+                PRODUCTHUNT_GRAPHQL_URL,
+                json={"query": POSTS_QUERY, "variables": {**variables, "after": cursor}},
+                headers=headers,
+            )
+
+        try:
+            response = await retry_with_backoff(_query, max_retries=2)
+            payload = response.json()
+        except Exception as e:
+            print(f"Error querying topic {topic}: {e}")
+            return nodes, "failed"
+        if response.status_code != 200 or payload.get("errors"):
+            print(f"Error querying topic {topic}: {payload.get('errors') or response.status_code}")
+            return nodes, "failed"
+
+        posts = payload["data"]["posts"]
+        nodes.extend(edge["node"] for edge in posts["edges"])
+        if not posts["pageInfo"]["hasNextPage"]:
+            return nodes, "complete"
+        cursor = posts["pageInfo"]["endCursor"]
 
+    return nodes, "truncated"
 
-async def discover_developer_tools(topics: list[str] = None, search_queries: list[str] = None) -> dict:
-    """Discover developer tools from Product Hunt."""
+
+def _created_at(node: dict) -> Optional[datetime]:
+    try:
+        return datetime.fromisoformat(node["createdAt"].replace("Z", "+00:00"))
+    except (KeyError, AttributeError, ValueError):
+        return None
+
+
+async def ingest_topic(
+    client: httpx.AsyncClient,
+    topic: str,
+    watermarks: TopicWatermarks,
+    initial_days: int = 30,
+    window_days: int = 7,
+    max_pages_per_window: int = 10,
+) -> dict:
+    """
+    Ingest a topic's posts since its watermark, one date window at a time.
+
+    Windows run oldest first and the watermark advances after each one, so
+    a failure leaves the remaining windows for the next run. Posts come
+    back newest first, so when the page limit cuts a window short the
+    fetched pages cover its newest part; the window is narrowed to end at
+    the oldest post fetched and queried again until it is complete. Only
+    a window that cannot be narrowed (more posts in one second than the
+    page limit holds) advances with posts missing, counted as truncated.
+
+    Returns:
+        {"products": [...], "windows": n, "truncated_windows": n, "failed": bool}
+    """
+    now = datetime.now(timezone.utc)
+    start = watermarks.get(topic) or now - timedelta(days=initial_days)
+    result = {"products": [], "windows": 0, "truncated_windows": 0, "failed": False}
+
+    while start < now:
+        end = min(start + timedelta(days=window_days), now)
+        before, seen = end, set()
+        while True:
+            nodes, status = await fetch_topic_window(client, topic, start, before, max_pages_per_window)
+            for node in nodes:
+                if node.get("id") not in seen:
+                    seen.add(node.get("id"))
+                    result["products"].append(post_to_product(node, topic))
+            if status != "truncated":
+                break
+            # postedBefore is exclusive; keep the oldest second in the next query
+            oldest = min(filter(None, map(_created_at, nodes)), default=None)
+            if oldest is None or oldest + timedelta(seconds=1) >= before:
+                break
+            before = oldest + timedelta(seconds=1)
+
+        result["windows"] += 1
+        if status == "failed":
+            result["failed"] = True
+            break
+        if status == "truncated":
+            result["truncated_windows"] += 1
+        watermarks.advance(topic, end)
+        start = end
+
+    return result
+
+
+async def ingest_developer_tools_api(
+    topics: list[str] = None,
+    watermarks: Optional[TopicWatermarks] = None,
+    initial_days: int = 30,
+    window_days: int = 7,
+) -> dict:
+    """
+    Ingest new developer tool posts through the Product Hunt GraphQL API.
+
+    Incremental: each topic only fetches posts newer than its watermark.
+    Posts come back with makers, topics, votes and website, so there is no
+    detail-page enrichment step.
+
+    Args:
+        topics: Topic slugs (defaults to DEVELOPER_TOPICS)
+        watermarks: Watermark store (defaults to data/producthunt_watermarks.json)
+        initial_days: How far back a topic without a watermark starts
+        window_days: Size of the postedAfter/postedBefore window per query
+
+    Returns:
+        The discover_developer_tools result shape, with new posts only
+    """
+    if topics is None:
+        topics = DEVELOPER_TOPICS
+    if watermarks is None:
+        watermarks = TopicWatermarks()
+
+    results = {
+        "scraped_at": datetime.now().isoformat(),
+        "mode": "api",
+        "topics": {},
+        "searches": {},
+        "all_products": [],
+        "ingest": {},
+    }
+
+    async with create_client_with_limits(timeout=30.0) as client:
+        for topic in topics:
+            print(f"Ingesting topic: {topic} (since {watermarks.topics.get(topic, 'first run')})")
+            ingested = await ingest_topic(client, topic, watermarks, initial_days, window_days)
+            results["topics"][topic] = ingested.pop("products")
+            results["ingest"][topic] = ingested
+            results["all_products"].extend(results["topics"][topic])
+            watermarks.save()
+
+    seen_ids = set()
+    unique_products = []
+    for product in results["all_products"]:
+        if product["id"] not in seen_ids:
+            seen_ids.add(product["id"])
+            unique_products.append(product)
+
+    for product, category in zip(unique_products, categorize_products(unique_products)):
+        product["category"] = category
+
+    results["unique_products"] = unique_products
+    results["total_unique"] = len(unique_products)
+    results["watermarks"] = dict(watermarks.topics)
+
+    return results
+
+
+async def discover_developer_tools(
+    topics: list[str] = None,
+    search_queries: list[str] = None,
+    use_api: Optional[bool] = None,
+) -> dict:
+    """
+    Discover developer tools from Product Hunt.
+    
+    Args:
+        topics: Topic slugs (defaults to DEVELOPER_TOPICS)
+        search_queries: Search page queries (HTML mode only)
+        use_api: Ingest through the GraphQL API; defaults to whether
+            PRODUCTHUNT_TOKEN is set, otherwise topic and search pages are scraped
+    """
+    if use_api is None:
+        use_api = bool(PRODUCTHUNT_TOKEN)
+    if use_api:
+        return await ingest_developer_tools_api(topics)
+    
     if topics is None:
         topics = DEVELOPER_TOPICS
     
@@ -223,6 +554,7 @@ async def discover_developer_tools(topics: list[str] = None, search_queries: lis
     
     results = {
         "scraped_at": datetime.now().isoformat(),
+        "mode": "html",
         "topics": {},
         "searches": {},
         "all_products": [],
@@ -251,6 +583,9 @@ async def discover_developer_tools(topics: list[str] = None, search_queries: lis
             seen_names.add(name)
             unique_products.append(product)
     
+    for product, category in zip(unique_products, categorize_products(unique_products)):
+        product["category"] = category
+    
     results["unique_products"] = unique_products
     results["total_unique"] = len(unique_products)
     
@@ -276,11 +611,7 @@ if __name__ == "__main__":
     async def main():
         results = await discover_developer_tools()
         
-        output_dir = os.path.join(os.path.dirname(__file__), "data")
-        os.makedirs(output_dir, exist_ok=True)
-        
-        with open(os.path.join(output_dir, "producthunt_tools.json"), "w") as f:
-            json.dump(results, f, indent=2)
+        await save_artifact_async("producthunt_tools", results)
         
         print(f"\nDiscovered {results['total_unique']} unique products")
         print(f"From {len(results['topics'])} topics and {len(results['searches'])} searches")
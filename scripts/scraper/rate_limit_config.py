@@ -12,6 +12,9 @@ RATE_LIMITS = {
     "theresanaiforthat.com": 8,
     "futuretools.io": 8,
     "aitools.fyi": 8,
+    "crates.io": 60,
+    "html.duckduckgo.com": 20,
+    "hn.algolia.com": 120,
     "default": 15,
 }
 
@@ -1,14 +1,13 @@
 """
 RSS Feed Scraper - Fetches latest updates from developer blogs and news sources
 """
-import os
-import json
 import ssl
 import certifi
 import feedparser
 from datetime import datetime
 from typing import Optional
 import httpx
+from artifacts import save_artifact
 
 # RSS Feeds for developer tools and vibe coding news
 RSS_FEEDS = {
@@ -275,22 +274,16 @@ def get_latest_blog_posts(results: dict, limit: int = 50) -> list:
 if __name__ == "__main__":
     results = scrape_all_feeds()
     
-    output_dir = os.path.join(os.path.dirname(__file__), "data")
-    os.makedirs(output_dir, exist_ok=True)
-    
     # Save all feed data
-    with open(os.path.join(output_dir, "rss_feeds.json"), "w") as f:
-        json.dump(results, f, indent=2)
+    save_artifact("rss_feeds", results, layout="mapping")
     
     # Save latest releases
     releases = get_latest_releases(results)
-    with open(os.path.join(output_dir, "latest_releases.json"), "w") as f:
-        json.dump(releases, f, indent=2)
+    save_artifact("latest_releases", releases)
     
     # Save latest blog posts
     posts = get_latest_blog_posts(results)
-    with open(os.path.join(output_dir, "latest_posts.json"), "w") as f:
-        json.dump(posts, f, indent=2)
+    save_artifact("latest_posts", posts)
     
     print(f"\nSaved {len(results)} feeds")
     print(f"Found {len(releases)} releases")
@@ -0,0 +1,289 @@
+"""
+Rule Engine - Compiled keyword rules for tagging and categorization
+Replaces nested substring loops with one word-boundary-aware matcher per field
+"""
+import re
+from bisect import bisect_right
+from typing import Iterable, Optional, Union
+
+
+WORD_CHARS = "a-z0-9"
+
+# Light inflection support so "test" still matches "tests"/"testing" once
+# substring matching is gone. Only applied to keywords of 4+ characters,
+# otherwise "go" would start matching "goes" and "god".
+INFLECTION_SUFFIX = r"(?:s|es|d|ed|ing|er|ers)?"
+MIN_INFLECTED_LENGTH = 4
+
+# Joins records for batch scans. Never appears in keywords and is not a word
+# character, so a match can never span two records.
+RECORD_SEPARATOR = "\x00"
+
+FieldValue = Union[str, list, tuple, None]
+RuleSpec = Union[list, tuple, dict]
+
+
+def normalize_field(value: FieldValue) -> str:
+    """Lowercase a field value, joining list values with spaces."""
+    if not value:
+        return ""
+    if isinstance(value, (list, tuple)):
+        return " ".join(str(v) for v in value if v).lower()
+    return str(value).lower()
+
+
+def keyword_pattern(keyword: str, inflect: bool = True) -> str:
+    """
+    Build the standalone regex for a single keyword.
+
+    A word boundary is only enforced on sides where the keyword itself starts
+    or ends with a word character, so punctuated keywords like ".ts", "ng-"
+    or "/docs/" keep behaving like anchored fragments.
+
+    Args:
+        keyword: Lowercased keyword
+        inflect: Whether to allow common English suffixes
+
+    Returns:
+        Regex source for the keyword
+    """
+    pattern = re.escape(keyword)
+    if keyword[0].isalnum():
+        pattern = rf"(?<![{WORD_CHARS}])" + pattern
+    return pattern + keyword_end_pattern(keyword, inflect)
+
+
+def keyword_end_pattern(keyword: str, inflect: bool) -> str:
+    """Regex that must follow a keyword for it to count as a match."""
+    if not keyword[-1].isalnum():
+        return ""
+    if inflect and len(keyword) >= MIN_INFLECTED_LENGTH:
+        return INFLECTION_SUFFIX + rf"(?![{WORD_CHARS}])"
+    return rf"(?![{WORD_CHARS}])"
+
+
+def trie_pattern(keywords: list[str], inflect: bool) -> str:
+    """
+    Compile keywords into a prefix-trie regex.
+
+    Shared prefixes are factored out so each text position is tested against
+    at most one branch per character, instead of once per keyword. Longer
+    continuations are tried before a keyword ends, giving longest-match
+    semantics through backtracking.
+    """
+    trie: dict = {}
+    for keyword in keywords:
+        node = trie
+        for char in keyword:
+            node = node.setdefault(char, {})
+        node[""] = keyword
+
+    def build(node: dict) -> str:
+        branches = [
+            re.escape(char) + build(child)
+            for char, child in sorted(node.items())
+            if char
+        ]
+        if "" in node:
+            branches.append(keyword_end_pattern(node[""], inflect))
+        if len(branches) == 1:
+            return branches[0]
+        return "(?:" + "|".join(branches) + ")"
+
+    return build(trie)
+
+
+class KeywordAutomaton:
+    """
+    A single compiled matcher for one field.
+
+    All keywords are merged into one trie-shaped regex so a field is scanned
+    once regardless of how many rules reference it. Keywords that occur
+    inside a longer keyword (e.g. "react" in "react-native") are resolved at
+    compile time, so the longest match still reports every rule.
+    """
+
+    def __init__(self, keyword_rules: dict[str, set[int]], inflect: bool = True):
+        """
+        Compile the matcher.
+
+        Args:
+            keyword_rules: Mapping of keyword to the rule ids it triggers
+            inflect: Whether to allow common English suffixes
+        """
+        self.inflect = inflect
+
+        bounded = [k for k in keyword_rules if k[0].isalnum()]
+        unbounded = [k for k in keyword_rules if not k[0].isalnum()]
+        branches = []
+        if bounded:
+            branches.append(rf"(?<![{WORD_CHARS}])" + trie_pattern(bounded, inflect))
+        if unbounded:
+            branches.append(trie_pattern(unbounded, inflect))
+        self.pattern = re.compile("|".join(branches)) if branches else None
+
+        compiled = {k: re.compile(keyword_pattern(k, inflect)) for k in keyword_rules}
+        self.keyword_rules: dict[str, frozenset[int]] = {}
+        for keyword, rule_ids in keyword_rules.items():
+            implied = set(rule_ids)
+            for other, other_pattern in compiled.items():
+                if len(other) < len(keyword) and other_pattern.search(keyword):
+                    implied.update(keyword_rules[other])
+            self.keyword_rules[keyword] = frozenset(implied)
+
+        self._match_cache: dict[str, frozenset[int]] = {}
+
+    def _rules_for(self, matched: str) -> frozenset[int]:
+        """Map matched text (possibly inflected) back to its rule ids."""
+        cached = self._match_cache.get(matched)
+        if cached is not None:
+            return cached
+
+        rule_ids = self.keyword_rules.get(matched)
+        if rule_ids is None:
+            rule_ids = frozenset()
+            for size in range(1, 4):
+                stem = matched[:-size]
+                if len(stem) >= MIN_INFLECTED_LENGTH and stem in self.keyword_rules:
+                    rule_ids = self.keyword_rules[stem]
+                    break
+
+        self._match_cache[matched] = rule_ids
+        return rule_ids
+
+    def scan(self, text: str) -> set[int]:
+        """Return the ids of all rules triggered by text."""
+        matched: set[int] = set()
+        if not text or self.pattern is None:
+            return matched
+
+        for found in self.pattern.findall(text):
+            matched |= self._rules_for(found)
+        return matched
+
+    def scan_many(self, texts: list[str]) -> list[set[int]]:
+        """
+        Scan many texts with a single regex pass.
+
+        Texts are joined with RECORD_SEPARATOR and matches are mapped back to
+        their record by offset, which avoids per-record call overhead when
+        classifying thousands of tools.
+
+        Args:
+            texts: Normalized field values
+
+        Returns:
+            Rule id sets, one per input text
+        """
+        results: list[set[int]] = [set() for _ in texts]
+        if not texts or self.pattern is None:
+            return results
+
+        starts = []
+        offset = 0
+        for text in texts:
+            starts.append(offset)
+            offset += len(text) + len(RECORD_SEPARATOR)
+
+        for match in self.pattern.finditer(RECORD_SEPARATOR.join(texts)):
+            index = bisect_right(starts, match.start()) - 1
+            results[index] |= self._rules_for(match.group())
+        return results
+
+
+class RuleEngine:
+    """
+    Declarative, ordered keyword rules compiled into one automaton per field.
+
+    Each rule is a label plus keywords per field; a rule fires when any of
+    its keywords matches its field. classify() returns the first firing rule
+    (if/elif chains), match() returns every firing rule (tagging).
+
+    Example:
+        engine = RuleEngine([
+            ("github", {"url": ["github.com"]}),
+            ("article", {"text": ["blog", "article"]}),
+        ], default="tool")
+        engine.classify({"url": "https://github.com/x/y", "text": "Y"})
+    """
+
+    def __init__(
+        self,
+        rules: Iterable[tuple[str, RuleSpec]],
+        default: Optional[str] = None,
+        default_field: str = "text",
+        inflect: bool = True,
+    ):
+        """
+        Compile rules.
+
+        Args:
+            rules: Ordered (label, spec) pairs. A spec is either a keyword
+                list (matched against default_field) or a {field: keywords} dict
+            default: Label returned by classify() when nothing matches
+            default_field: Field used for keyword-list specs
+            inflect: Whether to allow common English suffixes on keywords
+        """
+        self.labels: list[str] = []
+        self.default = default
+
+        field_keywords: dict[str, dict[str, set[int]]] = {}
+        for rule_id, (label, spec) in enumerate(rules):
+            self.labels.append(label)
+            if not isinstance(spec, dict):
+                spec = {default_field: spec}
+
+            for field, keywords in spec.items():
+                keyword_rules = field_keywords.setdefault(field, {})
+                for keyword in keywords:
+                    keyword = keyword.strip().lower()
+                    if keyword:
+                        keyword_rules.setdefault(keyword, set()).add(rule_id)
+
+        self.automata = {
+            field: KeywordAutomaton(keyword_rules, inflect)
+            for field, keyword_rules in field_keywords.items()
+        }
+        self.fields = list(self.automata)
+
+    @classmethod
+    def from_table(cls, table: dict[str, list[str]], **kwargs) -> "RuleEngine":
+        """Build an engine from a {label: keywords} table, keeping its order."""
+        return cls(table.items(), **kwargs)
+
+    def _rule_ids(self, record: dict) -> set[int]:
+        matched: set[int] = set()
+        for field, automaton in self.automata.items():
+            matched |= automaton.scan(normalize_field(record.get(field)))
+        return matched
+
+    def _rule_ids_many(self, records: list[dict]) -> list[set[int]]:
+        matched: list[set[int]] = [set() for _ in records]
+        for field, automaton in self.automata.items():
+            texts = [normalize_field(record.get(field)) for record in records]
+            for i, rule_ids in enumerate(automaton.scan_many(texts)):
+                matched[i] |= rule_ids
+        return matched
+
+    def match(self, record: dict) -> list[str]:
+        """Return every label whose rule fires for record, in rule order."""
+        return [self.labels[i] for i in sorted(self._rule_ids(record))]
+
+    def classify(self, record: dict) -> Optional[str]:
+        """Return the label of the first rule that fires, or the default."""
+        rule_ids = self._rule_ids(record)
+        return self.labels[min(rule_ids)] if rule_ids else self.default
+
+    def match_many(self, records: list[dict]) -> list[list[str]]:
+        """Batch version of match()."""
+        return [
+            [self.labels[i] for i in sorted(rule_ids)]
+            for rule_ids in self._rule_ids_many(records)
+        ]
+
+    def classify_many(self, records: list[dict]) -> list[Optional[str]]:
+        """Batch version of classify()."""
+        return [
+            self.labels[min(rule_ids)] if rule_ids else self.default
+            for rule_ids in self._rule_ids_many(records)
+        ]
@@ -0,0 +1,135 @@
+"""
+Search Service - Shared DuckDuckGo HTML search for all scrapers
+One result parser, one rate limiter for html.duckduckgo.com and a persistent query cache
+"""
+import asyncio
+import re
+import urllib.parse
+from typing import Optional
+import httpx
+from bs4 import BeautifulSoup
+from bot_avoidance import get_rate_limiter, get_realistic_headers, retry_with_backoff
+from cache_manager import CacheManager
+
+
+DDG_HOST = "html.duckduckgo.com"
+DDG_URL = f"https://{DDG_HOST}/html/"
+
+# Results are cached at this depth and sliced per caller
+CACHED_RESULTS = 10
+SEARCH_TTL_HOURS = 72
+
+cache = CacheManager(cache_dir="cache", default_ttl_hours=SEARCH_TTL_HOURS)
+ddg_limiter = get_rate_limiter(DDG_HOST)
+
+_in_flight: dict[str, asyncio.Future] = {}
+stats = {"hits": 0, "searches": 0, "shared": 0, "errors": 0}
+
+
+def normalize_query(query: str) -> str:
+    """Case- and whitespace-insensitive form of a query, used as its cache key."""
+    return re.sub(r"\s+", " ", query.strip().lower())
+
+
+def _resolve_link(href: str) -> str:
+    # DuckDuckGo wraps result links in a redirect; the target is in uddg=
+    if "uddg=" in href:
+        parsed = urllib.parse.parse_qs(urllib.parse.urlparse(href).query)
+        return parsed.get("uddg", [""])[0]
+    return href
+
+
+def parse_results(html: str, max_results: int = CACHED_RESULTS) -> list[dict]:
+    """
+    Parse a DuckDuckGo HTML results page.
+
+    Returns:
+        [{"title", "snippet", "url"}, ...] with redirect links resolved
+    """
+    soup = BeautifulSoup(html, "lxml")
+    results = []
+
+    for result in soup.select(".result"):
+        if len(results) >= max_results:
+            break
+        title_elem = result.select_one(".result__title")
+        if not title_elem:
+            continue
+
+        snippet_elem = result.select_one(".result__snippet")
+        a_tag = title_elem.select_one("a")
+        link = _resolve_link(a_tag.get("href", "")) if a_tag and a_tag.get("href") else ""
+
+        results.append({
+            "title": title_elem.get_text(strip=True),
+            "snippet": snippet_elem.get_text(strip=True) if snippet_elem else "",
+            "url": link,
+        })
+
+    return results
+
+
+async def _search_uncached(client: httpx.AsyncClient, query: str) -> Optional[list[dict]]:
+    await ddg_limiter.wait()
+    stats["searches"] += 1
+
+    async def _search():
+        return await client.post(DDG_URL, data={"q": query}, headers=get_realistic_headers(), timeout=15.0)
+
+    try:
+        response = await retry_with_backoff(_search, max_retries=2)
+    except Exception as e:
+        print(f"Search error for '{query}': {e}")
+        stats["errors"] += 1
+        return None
+    if response.status_code != 200:
+        stats["errors"] += 1
+        return None
+    return parse_results(response.text)
+
+
+async def search(
+    client: httpx.AsyncClient,
+    query: str,
+    max_results: int = 5,
+    ttl_hours: Optional[int] = None,
+) -> list[dict]:
+    """
+    Search DuckDuckGo, serving repeated queries from the cache.
+
+    Identical queries issued concurrently share one request, and failed
+    searches are not cached.
+
+    Args:
+        client: HTTP client
+        query: Search query
+        max_results: Number of results to return (at most CACHED_RESULTS)
+        ttl_hours: Cache TTL override
+
+    Returns:
+        [{"title", "snippet", "url"}, ...]
+    """
+    key = f"ddg:{normalize_query(query)}"
+    cached = cache.get(key, ttl_hours=ttl_hours)
+    if cached is not None:
+        stats["hits"] += 1
+        return cached[:max_results]
+
+    if key in _in_flight:
+        stats["shared"] += 1
+        results = await asyncio.shield(_in_flight[key])
+    else:
+        _in_flight[key] = asyncio.ensure_future(_search_uncached(client, query))
+        try:
+            results = await asyncio.shield(_in_flight[key])
+        finally:
+            _in_flight.pop(key, None)
+        if results is not None:
+            cache.set(key, results, {"query": query})
+
+    return (results or [])[:max_results]
+
+
+def get_stats() -> dict:
+    """Get search statistics for this process."""
+    return dict(stats)
@@ -1,13 +1,13 @@
 """
 StackShare Scraper - Fetches tech stack data and tool comparisons
 """
-import os
-import json
 import asyncio
 import httpx
-from bs4 import BeautifulSoup
 from datetime import datetime
 from typing import Optional
+from artifacts import save_artifact_async
+from deduplication_tracker import DeduplicationTracker
+from directory_crawler import DirectoryCrawler, merge_unique
 
 
 STACK_CATEGORIES = [
@@ -68,71 +68,60 @@ TOOL_SLUGS = [
 ]
 
 
-async def fetch_category_tools(client: httpx.AsyncClient, category: str) -> list:
-    """Fetch tools from a StackShare category."""
-    url = f"https://stackshare.io/categories/{category}"
+def parse_category_item(item, category: str) -> Optional[dict]:
+    """Parse one tool from a category listing."""
+    name_elem = item.select_one(".tool-name, h3, a")
+    if not name_elem:
+        return None
     
-    try:
-        response = await client.get(url, follow_redirects=True)
-        response.raise_for_status()
-        
-        soup = BeautifulSoup(response.text, "html.parser")
-        tools = []
-        
-        for item in soup.select(".tool-card, [data-tool]"):
-            try:
-                name_elem = item.select_one(".tool-name, h3, a")
-                if not name_elem:
-                    continue
-                
-                name = name_elem.get_text(strip=True)
-                href = name_elem.get("href", "")
-                
-                desc_elem = item.select_one(".tool-description, p")
-                description = desc_elem.get_text(strip=True) if desc_elem else ""
-                
-                stacks_elem = item.select_one(".stacks-count, [data-stacks]")
-                stacks_count = 0
-                if stacks_elem:
-                    try:
-                        stacks_count = int(stacks_elem.get_text(strip=True).replace(",", "").replace("K", "000"))
-                    except:
-                        pass
-                
-                votes_elem = item.select_one(".votes-count, [data-votes]")
-                votes = 0
-                if votes_elem:
-                    try:
-                        votes = int(votes_elem.get_text(strip=True).replace(",", ""))
-                    except:
-                        pass
-                
-                tools.append({
-                    "name": name,
-                    "url": f"https://stackshare.io{href}" if href.startswith("/") else href,
-                    "description": description,
-                    "stacks_count": stacks_count,
-                    "votes": votes,
-                    "category": category,
-                })
-            except Exception:
-                continue
-        
-        return tools
-    except Exception as e:
-        print(f"Error fetching category {category}: {e}")
-        return []
+    name = name_elem.get_text(strip=True)
+    href = name_elem.get("href", "")
+    
+    desc_elem = item.select_one(".tool-description, p")
+    description = desc_elem.get_text(strip=True) if desc_elem else ""
+    
+    stacks_elem = item.select_one(".stacks-count, [data-stacks]")
+    stacks_count = 0
+    if stacks_elem:
+        try:
+            stacks_count = int(stacks_elem.get_text(strip=True).replace(",", "").replace("K", "000"))
+        except:
+            pass
+    
+    votes_elem = item.select_one(".votes-count, [data-votes]")
+    votes = 0
+    if votes_elem:
+        try:
+            votes = int(votes_elem.get_text(strip=True).replace(",", ""))
+        except:
+            pass
+    
+    return {
+        "name": name,
+        "url": f"https://stackshare.io{href}" if href.startswith("/") else href,
+        "description": description,
+        "stacks_count": stacks_count,
+        "votes": votes,
+        "category": category,
+    }
+
+
+CATEGORY_SPEC = {
+    "name": "stackshare",
+    "item_selector": ".tool-card, [data-tool]",
+    "parse_item": parse_category_item,
+    "pagination": {"param": "page", "start": 1, "max_pages": 3},
+}
 
 
-async def fetch_tool_details(client: httpx.AsyncClient, tool_slug: str) -> dict:
+async def fetch_tool_details(crawler: DirectoryCrawler, tool_slug: str) -> dict:
     """Fetch detailed info for a specific tool."""
     url = f"https://stackshare.io/{tool_slug}"
     
     try:
-        response = await client.get(url, follow_redirects=True)
-        response.raise_for_status()
-        
-        soup = BeautifulSoup(response.text, "html.parser")
+        soup = await crawler.fetch_soup(url)
+        if soup is None:
+            return {"slug": tool_slug, "error": "fetch failed"}
         
         name_elem = soup.select_one("h1")
         name = name_elem.get_text(strip=True) if name_elem else tool_slug
@@ -185,8 +174,14 @@ async def fetch_tool_details(client: httpx.AsyncClient, tool_slug: str) -> dict:
         return {"slug": tool_slug, "error": str(e)}
 
 
-async def scrape_stackshare() -> dict:
-    """Scrape StackShare for developer tools and stacks."""
+async def scrape_stackshare(tracker: Optional[DeduplicationTracker] = None) -> dict:
+    """
+    Scrape StackShare for developer tools and stacks.
+    
+    Args:
+        tracker: Dedup tracker; category pagination stops at the first page
+            holding only known tools when given
+    """
     results = {
         "scraped_at": datetime.now().isoformat(),
         "categories": {},
@@ -203,23 +198,20 @@ async def scrape_stackshare() -> dict:
             "Accept": "text/html,application/xhtml+xml",
         }
     ) as client:
-        for category in STACK_CATEGORIES:
-            print(f"  Fetching category: {category}...")
-            tools = await fetch_category_tools(client, category)
-            results["categories"][category] = tools
-            
-            for tool in tools:
-                if tool["name"] not in seen_tools:
-                    seen_tools.add(tool["name"])
-                    results["all_tools"].append(tool)
-            
-            await asyncio.sleep(2)
-        
-        for tool_slug in TOOL_SLUGS:
-            print(f"  Fetching tool details: {tool_slug}...")
-            tool_data = await fetch_tool_details(client, tool_slug)
-            results["tools"][tool_slug] = tool_data
-            await asyncio.sleep(2)
+        crawler = DirectoryCrawler(client, tracker)
+        listings = {category: f"https://stackshare.io/categories/{category}" for category in STACK_CATEGORIES}
+        
+        categories, details = await asyncio.gather(
+            crawler.crawl(CATEGORY_SPEC, listings),
+            asyncio.gather(*(fetch_tool_details(crawler, slug) for slug in TOOL_SLUGS)),
+        )
+        results["categories"] = categories
+        results["tools"] = dict(zip(TOOL_SLUGS, details))
+        for tools in categories.values():
+            merge_unique(results["all_tools"], tools, seen_tools)
+        
+        crawler.finish()
+        results["crawl"] = crawler.get_stats()
     
     results["total_unique_tools"] = len(results["all_tools"])
     return results
@@ -230,12 +222,7 @@ if __name__ == "__main__":
         print("Scraping StackShare...")
         results = await scrape_stackshare()
         
-        output_dir = os.path.join(os.path.dirname(__file__), "data")
-        os.makedirs(output_dir, exist_ok=True)
-        
-        output_path = os.path.join(output_dir, "stackshare.json")
-        with open(output_path, "w") as f:
-            json.dump(results, f, indent=2)
+        output_path = await save_artifact_async("stackshare", results)
         
         print(f"\nSaved {results['total_unique_tools']} unique tools to {output_path}")
     
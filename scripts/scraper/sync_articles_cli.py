@@ -1,85 +1,41 @@
-import json
-import subprocess
-import os
-import time
+import asyncio
 
-def main():
-    data_dir = os.path.join(os.path.dirname(__file__), "data")
-    batches_path = os.path.join(data_dir, "articles_batches.json")
+from artifacts import find_artifact, iter_artifact
+from convex_batch_runner import ConvexBatchRunner, create_transport, print_summary
+from sync_journal import SyncJournal, file_fingerprint
+
+def main(concurrency: int = 4, transport: str = "auto", restart: bool = False):
+    batches_path = find_artifact("articles_batches")
     
-    if not os.path.exists(batches_path):
-        print("No articles_batches.json found. Run sync_tools_batch.py first.")
+    if batches_path is None:
+        print("No articles_batches artifact found. Run sync_tools_batch.py first.")
         return
     
-    with open(batches_path, "r") as f:
-        batches = json.load(f)
-    
-    print(f"Total article batches: {len(batches)}")
-    
-    total_created = 0
-    total_updated = 0
-    total_linked = 0
-    total_errors = []
+    print(f"Streaming article batches from: {batches_path}")
     
-    project_dir = os.path.dirname(os.path.dirname(os.path.dirname(__file__)))
+    journal = SyncJournal("articles_cli")
+    journal.begin(file_fingerprint(batches_path), resume=not restart)
     
-    for i, batch in enumerate(batches):
-        print(f"\nProcessing batch {i+1}/{len(batches)} ({len(batch)} articles)...")
-        
-        args_json = json.dumps({"articles": batch})
-        
-        cmd = [
-            "npx", "convex", "run", "articles:bulkUpsertArticles",
-            args_json
-        ]
-        
-        try:
-            result = subprocess.run(
-                cmd,
-                cwd=project_dir,
-                capture_output=True,
-                text=True,
-                timeout=120
-            )
-            
-            if result.returncode == 0:
-                try:
-                    output = json.loads(result.stdout.strip())
-                    created = output.get("created", 0)
-                    updated = output.get("updated", 0)
-                    linked = output.get("linked", 0)
-                    errors = output.get("errors", [])
-                    
-                    total_created += created
-                    total_updated += updated
-                    total_linked += linked
-                    total_errors.extend(errors)
-                    
-                    print(f"  Created: {created}, Updated: {updated}, Linked: {linked}")
-                except json.JSONDecodeError:
-                    print(f"  Output: {result.stdout[:200]}")
-            else:
-                print(f"  Error: {result.stderr[:200]}")
-        
-        except subprocess.TimeoutExpired:
-            print(f"  Timeout on batch {i+1}")
-        except Exception as e:
-            print(f"  Exception: {e}")
-        
-        time.sleep(0.5)
+    runner = ConvexBatchRunner(
+        "articles:bulkUpsertArticles",
+        "articles",
+        transport=create_transport(transport, concurrency=concurrency),
+        concurrency=concurrency,
+        journal=journal,
+        label_record=lambda article: article.get("url") or article.get("slug", "?"),
+    )
+    summary = asyncio.run(runner.run(iter_artifact("articles_batches")))
     
-    print("\n" + "=" * 50)
-    print("ARTICLE SYNC COMPLETE")
-    print("=" * 50)
-    print(f"Total created: {total_created}")
-    print(f"Total updated: {total_updated}")
-    print(f"Total linked: {total_linked}")
-    print(f"Total errors: {len(total_errors)}")
-    
-    if total_errors[:10]:
-        print("\nFirst 10 errors:")
-        for err in total_errors[:10]:
-            print(f"  - {err}")
+    print_summary("ARTICLE SYNC COMPLETE", summary, ["created", "updated", "linked"])
+    return summary
 
 if __name__ == "__main__":
-    main()
+    import argparse
+    
+    parser = argparse.ArgumentParser(description="Sync article batches to Convex")
+    parser.add_argument("--concurrency", type=int, default=4, help="Parallel batches in flight (default: 4)")
+    parser.add_argument("--transport", choices=["auto", "http", "cli"], default="auto", help="How to call Convex (default: auto)")
+    parser.add_argument("--restart", action="store_true", help="Ignore an interrupted run and start from the first batch")
+    args = parser.parse_args()
+    
+    main(concurrency=args.concurrency, transport=args.transport, restart=args.restart)
@@ -0,0 +1,180 @@
+"""
+Sync Journal - Durable checkpoints so interrupted Convex syncs can resume
+Append-only JSONL log of committed keys, fsynced after every write
+"""
+import os
+import json
+import uuid
+import hashlib
+from datetime import datetime
+from typing import Any, Iterable, Optional
+from pathlib import Path
+
+
+DATA_DIR = os.path.join(os.path.dirname(__file__), "data")
+
+
+def file_fingerprint(path: str) -> str:
+    """Hash a file's bytes to detect whether a resumed run has the same input."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class SyncJournal:
+    """
+    Records which keys (slugs, URLs) a sync run has committed to Convex.
+
+    A run starts with begin(). If the previous run never reached finish()
+    and its input fingerprint matches, the run is resumed: its run id and
+    committed keys are restored so already-pushed records are skipped.
+    Every commit is flushed and fsynced before returning, so a crash loses
+    at most the record that was in flight.
+    """
+
+    def __init__(self, name: str, journal_file: Optional[str] = None):
+        """
+        Initialize sync journal.
+
+        Args:
+            name: Journal name, used for the default file name
+            journal_file: Path to the journal (defaults to data/sync_journal_<name>.jsonl)
+        """
+        if journal_file is None:
+            journal_file = os.path.join(DATA_DIR, f"sync_journal_{name}.jsonl")
+        self.journal_file = Path(journal_file)
+        self.journal_file.parent.mkdir(parents=True, exist_ok=True)
+
+        self.run_id: Optional[str] = None
+        self.resumed = False
+        self.committed: dict[str, Any] = {}
+        self._handle = None
+
+    def _read_last_run(self) -> Optional[dict]:
+        """Replay the journal and return the state of its last run."""
+        if not self.journal_file.exists():
+            return None
+
+        run = None
+        with open(self.journal_file, 'r') as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    # A torn final line from a crash mid-write
+                    continue
+
+                event = entry.get("event")
+                if event == "begin":
+                    run = {
+                        "run_id": entry["run_id"],
+                        "fingerprint": entry.get("fingerprint"),
+                        "committed": {},
+                        "finished": False,
+                    }
+                elif run and entry.get("run_id") == run["run_id"]:
+                    if event == "commit":
+                        run["committed"].update(entry.get("entries", {}))
+                    elif event == "finish":
+                        run["finished"] = True
+        return run
+
+    def _append(self, entry: dict):
+        if self._handle is None:
+            self._handle = open(self.journal_file, 'a')
+            # Terminate a torn final line so the next entry stays parseable
+            if self._handle.tell() > 0:
+                with open(self.journal_file, 'rb') as f:
+                    f.seek(-1, os.SEEK_END)
+                    if f.read(1) != b"\n":
+                        self._handle.write("\n")
+        self._handle.write(json.dumps(entry, separators=(",", ":")) + "\n")
+        self._handle.flush()
+        os.fsync(self._handle.fileno())
+
+    def begin(self, fingerprint: Optional[str] = None, resume: bool = True) -> bool:
+        """
+        Start or resume a run.
+
+        Args:
+            fingerprint: Identifies the input; a mismatch forces a fresh run
+            resume: Set False to discard an unfinished run
+
+        Returns:
+            True if an unfinished run was resumed
+        """
+        last_run = self._read_last_run()
+        can_resume = (
+            resume
+            and last_run is not None
+            and not last_run["finished"]
+            and (fingerprint is None or last_run["fingerprint"] == fingerprint)
+        )
+
+        if can_resume:
+            self.run_id = last_run["run_id"]
+            self.committed = last_run["committed"]
+            self.resumed = True
+            self._append({
+                "event": "resume",
+                "run_id": self.run_id,
+                "at": datetime.now().isoformat(),
+            })
+            return True
+
+        self.run_id = f"{datetime.now().strftime('%Y%m%dT%H%M%S')}-{uuid.uuid4().hex[:8]}"
+        self.committed = {}
+        self.resumed = False
+        self.close()
+        self.journal_file.write_text("")
+        self._append({
+            "event": "begin",
+            "run_id": self.run_id,
+            "fingerprint": fingerprint,
+            "at": datetime.now().isoformat(),
+        })
+        return False
+
+    def is_committed(self, key: str, value: Any = True) -> bool:
+        """Check whether key was committed in this run (with the same value)."""
+        return key in self.committed and self.committed[key] == value
+
+    def commit(self, key: str, value: Any = True):
+        """Durably record a single committed key."""
+        self.commit_many([key], [value])
+
+    def commit_many(self, keys: Iterable[str], values: Optional[Iterable[Any]] = None):
+        """Durably record several committed keys in one journal line."""
+        keys = list(keys)
+        values = list(values) if values is not None else [True] * len(keys)
+        entries = dict(zip(keys, values))
+        if not entries:
+            return
+        self.committed.update(entries)
+        self._append({"event": "commit", "run_id": self.run_id, "entries": entries})
+
+    def finish(self, summary: Optional[dict] = None):
+        """Mark the run complete so the next run starts fresh."""
+        self._append({
+            "event": "finish",
+            "run_id": self.run_id,
+            "at": datetime.now().isoformat(),
+            "summary": summary or {},
+        })
+        self.close()
+
+    def close(self):
+        if self._handle is not None:
+            self._handle.close()
+            self._handle = None
+
+    def get_stats(self) -> dict:
+        """Get journal statistics."""
+        return {
+            'run_id': self.run_id,
+            'resumed': self.resumed,
+            'committed': len(self.committed),
+            'journal_file': str(self.journal_file),
+        }
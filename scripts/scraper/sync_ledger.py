@@ -0,0 +1,171 @@
+"""
+Sync Ledger - Content-hash change detection for Convex syncs
+Remembers what was last pushed per slug so unchanged tools are not re-upserted
+"""
+import os
+import json
+import hashlib
+from typing import Optional
+from pathlib import Path
+
+
+DATA_DIR = os.path.join(os.path.dirname(__file__), "data")
+
+HASH_EXCLUDED_KEYS = {"syncHash"}
+
+
+def content_hash(payload: dict) -> str:
+    """
+    Compute a stable hash of a transformed payload.
+
+    Keys are sorted and None values dropped (they are never sent to Convex),
+    so the hash only changes when the upserted content does.
+
+    Args:
+        payload: Transformed tool payload
+
+    Returns:
+        Hex SHA-256 digest
+    """
+    cleaned = {
+        k: v for k, v in payload.items()
+        if v is not None and k not in HASH_EXCLUDED_KEYS
+    }
+    encoded = json.dumps(cleaned, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+class SyncLedger:
+    """Tracks the content hash of every slug last pushed to Convex."""
+
+    CREATED = "created"
+    CHANGED = "changed"
+    UNCHANGED = "unchanged"
+
+    def __init__(
+        self,
+        ledger_file: Optional[str] = None,
+        name: str = "tools",
+        autosave_every: int = 100,
+    ):
+        """
+        Initialize sync ledger.
+
+        Args:
+            ledger_file: Path to the ledger file (defaults to data/sync_ledger_<name>.json)
+            name: Ledger name, used for the default file name
+            autosave_every: Save after this many recorded pushes, so an
+                interrupted sync keeps most of its progress
+        """
+        if ledger_file is None:
+            ledger_file = os.path.join(DATA_DIR, f"sync_ledger_{name}.json")
+        self.ledger_file = Path(ledger_file)
+        self.ledger_file.parent.mkdir(parents=True, exist_ok=True)
+        self.hashes: dict[str, str] = self._load_ledger()
+        self.counts = {self.CREATED: 0, self.CHANGED: 0, self.UNCHANGED: 0}
+        self.autosave_every = autosave_every
+        self._dirty = False
+        self._unsaved = 0
+
+    def _load_ledger(self) -> dict[str, str]:
+        """Load slug hashes from the ledger file."""
+        if self.ledger_file.exists():
+            try:
+                with open(self.ledger_file, 'r') as f:
+                    return json.load(f).get('hashes', {})
+            except Exception:
+                return {}
+        return {}
+
+    def save(self):
+        """Atomically write the ledger to disk if it changed."""
+        if not self._dirty:
+            return
+
+        data = {
+            'hashes': dict(sorted(self.hashes.items())),
+            'total_count': len(self.hashes),
+        }
+        tmp_file = self.ledger_file.with_suffix(self.ledger_file.suffix + ".tmp")
+        with open(tmp_file, 'w') as f:
+            json.dump(data, f, indent=2)
+        os.replace(tmp_file, self.ledger_file)
+        self._dirty = False
+        self._unsaved = 0
+
+    def status(self, slug: str, sync_hash: str) -> str:
+        """
+        Compare a payload hash against the ledger.
+
+        Args:
+            slug: Tool slug
+            sync_hash: Hash from content_hash()
+
+        Returns:
+            One of CREATED, CHANGED or UNCHANGED
+        """
+        previous = self.hashes.get(slug)
+        if previous is None:
+            return self.CREATED
+        if previous != sync_hash:
+            return self.CHANGED
+        return self.UNCHANGED
+
+    def count(self, status: str):
+        """Increment the run counter for a status."""
+        self.counts[status] += 1
+
+    def record(self, slug: str, sync_hash: str):
+        """Record a successfully pushed payload hash."""
+        if self.hashes.get(slug) != sync_hash:
+            self.hashes[slug] = sync_hash
+            self._dirty = True
+            self._unsaved += 1
+            if self.autosave_every and self._unsaved >= self.autosave_every:
+                self.save()
+
+    def forget(self, slug: str):
+        """Drop a slug so it is pushed again on the next sync."""
+        if self.hashes.pop(slug, None) is not None:
+            self._dirty = True
+
+    def reconcile(self, remote_hashes: dict[str, Optional[str]]) -> dict:
+        """
+        Align the ledger with what Convex actually stores.
+
+        Slugs missing remotely are dropped so they get pushed again, and the
+        hash Convex stores replaces the local one wherever they disagree.
+
+        Args:
+            remote_hashes: Mapping of slug to the syncHash stored in Convex
+
+        Returns:
+            Reconciliation stats
+        """
+        stale = [
+            slug for slug, sync_hash in self.hashes.items()
+            if remote_hashes.get(slug) != sync_hash
+        ]
+        for slug in stale:
+            self.forget(slug)
+
+        adopted = 0
+        for slug, sync_hash in remote_hashes.items():
+            if sync_hash and slug not in self.hashes:
+                self.hashes[slug] = sync_hash
+                self._dirty = True
+                adopted += 1
+
+        return {
+            'remote_total': len(remote_hashes),
+            'invalidated': len(stale),
+            'adopted': adopted,
+        }
+
+    def get_stats(self) -> dict:
+        """Get ledger statistics and this run's counts."""
+        return {
+            'tracked_slugs': len(self.hashes),
+            'ledger_file': str(self.ledger_file),
+            **self.counts,
+        }
@@ -3,11 +3,15 @@
 cd /Users/kavyrattana/Coding/vibebuff
 
 python3 scripts/scraper/venv/bin/python -c "
+import sys
 import json
 import subprocess
 import re
 import time
 
+sys.path.insert(0, 'scripts/scraper')
+from artifacts import iter_artifact
+
 def slugify(name):
     slug = name.lower()
     slug = re.sub(r'[^a-z0-9\s-]', '', slug)
@@ -49,9 +53,7 @@ def determine_category(tool):
     
     return 'other'
 
-data = json.load(open('scripts/scraper/data/vibe_tools.json'))
-known_tools = data.get('known_tools', [])
-mcp_tools = [t for t in known_tools if t.get('category') == 'mcp']
+mcp_tools = [t for t in iter_artifact('vibe_tools', 'known_tools') if t.get('category') == 'mcp']
 
 print(f'Syncing {len(mcp_tools)} MCP servers to Convex...')
 print()
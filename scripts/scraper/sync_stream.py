@@ -0,0 +1,262 @@
+"""
+Sync Stream - Upsert tools to Convex while scrapers are still running
+Scrapers emit records onto a bounded queue that a consumer drains into bulk upserts
+"""
+import asyncio
+from typing import Optional
+import httpx
+
+from convex_batch_runner import ConvexBatchRunner, create_transport, written_by_outcome
+from sync_journal import SyncJournal
+from sync_ledger import SyncLedger, content_hash
+from sync_to_convex import normalize_vibe_tool, replay_journal, upsert_mcp_server
+
+
+_CLOSE = object()
+
+
+class ToolSyncStream:
+    """
+    Producer/consumer bridge between scrapers and Convex.
+
+    Scrapers call emit() as records are scraped. Records are normalized,
+    checked against the sync ledger and journal, and collected into batches
+    that are pushed with ingest:bulkUpsertToolsPublic while scraping goes on.
+
+    Backpressure: the queue holds at most max_queue records and at most
+    `concurrency` batches are in flight; when Convex falls behind, emit()
+    blocks the scraper instead of buffering the whole catalog in memory.
+    """
+
+    def __init__(
+        self,
+        tool_ledger: Optional[SyncLedger] = None,
+        mcp_ledger: Optional[SyncLedger] = None,
+        journal: Optional[SyncJournal] = None,
+        force: bool = False,
+        batch_size: int = 50,
+        max_queue: int = 500,
+        concurrency: int = 4,
+        flush_interval: float = 5.0,
+    ):
+        """
+        Initialize the stream.
+
+        Args:
+            tool_ledger: Ledger for tools (defaults to the "tools" ledger)
+            mcp_ledger: Ledger for MCP servers (defaults to the "mcp_servers" ledger)
+            journal: Sync journal (defaults to the shared "convex_sync" journal)
+            force: Push every record even if its content hash is unchanged
+            batch_size: Tools per bulk upsert
+            max_queue: Maximum records buffered between scrapers and the consumer
+            concurrency: Maximum bulk upserts in flight
+            flush_interval: Seconds a partial batch may wait for more records
+        """
+        self.tool_ledger = tool_ledger or SyncLedger(name="tools")
+        self.mcp_ledger = mcp_ledger or SyncLedger(name="mcp_servers")
+        self.journal = journal or SyncJournal("convex_sync")
+        self.force = force
+        self.batch_size = batch_size
+        self.concurrency = concurrency
+        self.flush_interval = flush_interval
+
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=max_queue)
+        self.runner = ConvexBatchRunner(
+            "ingest:bulkUpsertToolsPublic",
+            "tools",
+            transport=create_transport("http", concurrency=concurrency),
+            concurrency=concurrency,
+            label_record=lambda r: f"tool:{r['slug']}",
+            record_version=lambda r: r["syncHash"],
+            written_records=written_by_outcome(),
+            extra_args={"notifyNewTools": True},
+            on_batch_done=self._on_batch_done,
+            journal=self.journal,
+        )
+
+        self.results = {
+            "emitted": 0,
+            "processed": 0,
+            "success": 0,
+            "skipped": 0,
+            "created": 0,
+            "changed": 0,
+            "unchanged": 0,
+            "resumed": 0,
+            "batches": 0,
+            "errors": [],
+        }
+        self._seen: set[tuple[str, str]] = set()
+        self._status: dict[str, str] = {}
+        self._batch: list[dict] = []
+        self._in_flight: set[asyncio.Task] = set()
+        self._consumer: Optional[asyncio.Task] = None
+        self._mcp_client: Optional[httpx.AsyncClient] = None
+
+    async def start(self):
+        """Begin (or resume) the journal run and start the consumer."""
+        if self.journal.begin():
+            print(f"Resuming interrupted sync run {self.journal.run_id} ({len(self.journal.committed)} records already committed)")
+            replay_journal(self.journal, self.tool_ledger, self.mcp_ledger)
+        self._mcp_client = httpx.AsyncClient()
+        self._consumer = asyncio.create_task(self._consume())
+
+    async def emit_vibe_tool(self, kind: str, tool: dict):
+        """Normalize a scraped vibe tool and queue its records."""
+        for target, record in normalize_vibe_tool(kind, tool):
+            await self.emit(target, record)
+
+    async def emit(self, target: str, record: dict):
+        """
+        Queue a normalized record, waiting while the queue is full.
+
+        Args:
+            target: "tool" or "mcp"
+            record: Record in Convex format
+        """
+        if self._consumer is None or self._consumer.done():
+            # The consumer failed; its error is raised from close(), and
+            # scraping must not block on a queue nobody drains
+            return
+        self.results["emitted"] += 1
+        await self.queue.put((target, record))
+
+    async def _consume(self):
+        while True:
+            try:
+                item = await asyncio.wait_for(self.queue.get(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                await self._flush()
+                continue
+
+            if item is _CLOSE:
+                await self._flush()
+                return
+
+            target, record = item
+            if target == "mcp":
+                await self._sync_mcp_server(record)
+            else:
+                await self._add_tool(record)
+
+    def _admit(self, target: str, record: dict, ledger: SyncLedger) -> Optional[str]:
+        """Dedupe and hash a record; returns its hash if it needs pushing."""
+        slug = record["slug"]
+        if (target, slug) in self._seen:
+            self.results["skipped"] += 1
+            return None
+        self._seen.add((target, slug))
+        self.results["processed"] += 1
+
+        sync_hash = content_hash(record)
+        if self.journal.is_committed(f"{target}:{slug}", sync_hash):
+            self.results["resumed"] += 1
+            return None
+
+        status = ledger.status(slug, sync_hash)
+        if status == SyncLedger.UNCHANGED and not self.force:
+            ledger.count(status)
+            self.results["unchanged"] += 1
+            return None
+
+        self._status[f"{target}:{slug}"] = status
+        return sync_hash
+
+    async def _add_tool(self, record: dict):
+        sync_hash = self._admit("tool", record, self.tool_ledger)
+        if sync_hash is None:
+            return
+
+        # Optional Convex validators reject null, so drop None values here
+        cleaned = {k: v for k, v in record.items() if v is not None}
+        self._batch.append({**cleaned, "syncHash": sync_hash})
+        if len(self._batch) >= self.batch_size:
+            await self._flush()
+
+    async def _flush(self):
+        """Hand the current batch to the runner, waiting for a free slot."""
+        if not self._batch:
+            return
+        batch, self._batch = self._batch, []
+
+        while len(self._in_flight) >= self.concurrency:
+            _, self._in_flight = await asyncio.wait(self._in_flight, return_when=asyncio.FIRST_COMPLETED)
+
+        task = asyncio.create_task(self.runner.run_batch(batch))
+        self._in_flight.add(task)
+        self.results["batches"] += 1
+
+    def _on_batch_done(self, index: int, records: list, output: dict):
+        # Only the tools the mutation wrote; skipped and failed ones are in
+        # its errors and stay out of the ledger so the next run retries them
+        for record in records:
+            slug = record["slug"]
+            status = self._status.pop(f"tool:{slug}", SyncLedger.CREATED)
+            self.results["success"] += 1
+            self.results[status] += 1
+            self.tool_ledger.count(status)
+            self.tool_ledger.record(slug, record["syncHash"])
+
+    async def _sync_mcp_server(self, record: dict):
+        sync_hash = self._admit("mcp", record, self.mcp_ledger)
+        if sync_hash is None:
+            return
+
+        slug = record["slug"]
+        result = await upsert_mcp_server(self._mcp_client, record)
+        status = self._status.pop(f"mcp:{slug}")
+        if "error" in result:
+            self.results["errors"].append(f"{record['name']}: {result['error']}")
+            return
+
+        self.results["success"] += 1
+        self.results[status] += 1
+        self.mcp_ledger.count(status)
+        self.mcp_ledger.record(slug, sync_hash)
+        self.journal.commit(f"mcp:{slug}", sync_hash)
+
+    async def close(self) -> dict:
+        """
+        Drain the queue, wait for in-flight batches and finish the run.
+
+        Returns:
+            Sync results, in the shape of sync_all_scraped_tools()
+        """
+        if not self._consumer.done():
+            await self.queue.put(_CLOSE)
+        try:
+            await self._consumer
+            if self._in_flight:
+                await asyncio.gather(*self._in_flight)
+        finally:
+            await self.runner.close()
+            await self._mcp_client.aclose()
+            self.tool_ledger.save()
+            self.mcp_ledger.save()
+
+        summary = self.runner.summary(0)
+        self.results["errors"].extend(summary["errors"])
+        self.results["errors"].extend(
+            f"{bad['record']}: {bad['error']}" for bad in summary["bad_records"]
+        )
+        self.results["errors"].extend(
+            f"batch {failed['batch'] + 1} ({failed['size']} tools): {failed['error']}"
+            for failed in summary["failed_batches"]
+        )
+        self.results["latency"] = summary["latency"]
+
+        if summary["aborted"] or summary["failed_batches"]:
+            # Leave the run open so the next sync resumes it
+            self.journal.close()
+        else:
+            self.journal.finish({"total_synced": self.results["success"], "total_errors": len(self.results["errors"])})
+
+        return {
+            "streamed": self.results,
+            "run_id": self.journal.run_id,
+            "total_synced": self.results["success"],
+            "total_errors": len(self.results["errors"]),
+            "total_created": self.results["created"],
+            "total_changed": self.results["changed"],
+            "total_unchanged": self.results["unchanged"],
+        }
@@ -3,17 +3,23 @@ Sync scraped tool data to Convex database.
 Reads from scraped JSON files and upserts tools via Convex HTTP API.
 """
 import os
-import json
 import httpx
 import asyncio
 from typing import Optional
 from urllib.parse import urlparse
 import re
+from rule_engine import RuleEngine
+from sync_ledger import SyncLedger, content_hash
+from sync_journal import SyncJournal
+from artifacts import find_artifact, iter_artifact
 
 
 CONVEX_URL = os.environ.get("CONVEX_URL", "")
 CONVEX_DEPLOY_KEY = os.environ.get("CONVEX_DEPLOY_KEY", "")
 
+# Tools per listToolSyncHashes page; keeps each query well inside Convex read limits
+SYNC_HASH_PAGE_SIZE = 1000
+
 CATEGORY_MAPPING = {
     "orchestration": "cli-agents",
     "cli_agent": "cli-agents",
@@ -226,10 +232,36 @@ TAG_RULES = {
 }
 
 
-def generate_tags_from_metadata(tool: dict) -> list[str]:
-    """Generate comprehensive tags based on tool metadata analysis."""
-    tags = set()
-    
+TAG_ENGINE = RuleEngine(
+    (tag_name, keywords)
+    for tag_rules in TAG_RULES.values()
+    for tag_name, keywords in tag_rules.items()
+)
+
+# Ordered: the first matching category wins. Keywords are matched against the
+# tool name and URL on word boundaries, so compound tokens such as "mongodb"
+# or "postgresql" need their own entries.
+MCP_CATEGORY_RULES = [
+    ("database", ["postgres", "postgresql", "mysql", "sqlite", "mongo", "mongodb", "redis", "supabase", "neon", "planetscale", "database", "db"]),
+    ("version_control", ["github", "gitlab", "git", "bitbucket"]),
+    ("communication", ["slack", "discord", "telegram", "whatsapp", "email", "gmail", "teams"]),
+    ("productivity", ["notion", "linear", "jira", "asana", "todoist", "trello", "clickup"]),
+    ("deployment", ["vercel", "netlify", "railway", "render", "fly", "aws", "azure", "gcp", "cloudflare"]),
+    ("api", ["stripe", "twilio", "sendgrid", "mailchimp"]),
+    ("analytics", ["sentry", "datadog", "axiom", "analytics"]),
+    ("file_system", ["filesystem", "file", "drive", "dropbox", "storage"]),
+    ("devtools", ["browser", "puppeteer", "playwright", "selenium"]),
+    ("ai", ["openai", "anthropic", "llm", "ai", "langchain", "ollama"]),
+    ("documentation", ["docs", "documentation", "context7"]),
+    ("testing", ["test", "jest", "pytest"]),
+    ("security", ["auth", "oauth", "authentication", "security", "vault"]),
+]
+
+MCP_CATEGORY_ENGINE = RuleEngine(MCP_CATEGORY_RULES, default="other")
+
+
+def build_tag_search_text(tool: dict) -> str:
+    """Build the lowercased text that tag rules are matched against."""
     name = tool.get("name", "").lower()
     description = tool.get("description", "").lower()
     url = tool.get("url", "").lower() if tool.get("url") else ""
@@ -239,14 +271,27 @@ def generate_tags_from_metadata(tool: dict) -> list[str]:
     github_topics = metadata.get("github", {}).get("topics", []) if isinstance(metadata.get("github"), dict) else []
     npm_keywords = metadata.get("npm", {}).get("keywords", []) if isinstance(metadata.get("npm"), dict) else []
     
-    searchable_text = f"{name} {description} {url} {category} {' '.join(github_topics)} {' '.join(npm_keywords)}"
+    return f"{name} {description} {url} {category} {' '.join(github_topics)} {' '.join(npm_keywords)}"
+
+
+def generate_tags_from_metadata(tool: dict, rule_tags: Optional[list[str]] = None) -> list[str]:
+    """
+    Generate comprehensive tags based on tool metadata analysis.
+    
+    Args:
+        tool: Tool record
+        rule_tags: Tags already matched by TAG_ENGINE (from a batch call)
+    """
+    if rule_tags is None:
+        rule_tags = TAG_ENGINE.match({"text": build_tag_search_text(tool)})
+    tags = set(rule_tags)
+    
+    url = tool.get("url", "").lower() if tool.get("url") else ""
+    category = tool.get("category", "").lower()
     
-    for tag_category, tag_rules in TAG_RULES.items():
-        for tag_name, keywords in tag_rules.items():
-            for keyword in keywords:
-                if keyword.lower() in searchable_text:
-                    tags.add(tag_name)
-                    break
+    metadata = tool.get("metadata", {}) or {}
+    github_topics = metadata.get("github", {}).get("topics", []) if isinstance(metadata.get("github"), dict) else []
+    npm_keywords = metadata.get("npm", {}).get("keywords", []) if isinstance(metadata.get("npm"), dict) else []
     
     for topic in github_topics:
         topic_lower = topic.lower().replace("_", "-")
@@ -274,40 +319,19 @@ def generate_tags_from_metadata(tool: dict) -> list[str]:
     
     return sorted(list(tags))[:20]
 
+
+def generate_tags_for_tools(tools: list[dict]) -> list[list[str]]:
+    """Generate tags for many tools with a single rule-engine pass."""
+    records = [{"text": build_tag_search_text(tool)} for tool in tools]
+    matched = TAG_ENGINE.match_many(records)
+    return [generate_tags_from_metadata(tool, tags) for tool, tags in zip(tools, matched)]
+
+
 def determine_mcp_category(tool: dict) -> str:
     """Determine MCP server category from tool metadata."""
-    name = tool.get("name", "").lower()
-    url = tool.get("url", "").lower()
-    description = tool.get("description", "").lower() if tool.get("description") else ""
-    
-    if any(x in name or x in url for x in ["postgres", "mysql", "sqlite", "mongo", "redis", "supabase", "neon", "planetscale", "database", "db"]):
-        return "database"
-    if any(x in name or x in url for x in ["github", "gitlab", "git", "bitbucket"]):
-        return "version_control"
-    if any(x in name or x in url for x in ["slack", "discord", "telegram", "whatsapp", "email", "gmail", "teams"]):
-        return "communication"
-    if any(x in name or x in url for x in ["notion", "linear", "jira", "asana", "todoist", "trello", "clickup"]):
-        return "productivity"
-    if any(x in name or x in url for x in ["vercel", "netlify", "railway", "render", "fly", "aws", "azure", "gcp", "cloudflare"]):
-        return "deployment"
-    if any(x in name or x in url for x in ["stripe", "twilio", "sendgrid", "mailchimp"]):
-        return "api"
-    if any(x in name or x in url for x in ["sentry", "datadog", "axiom", "analytics"]):
-        return "analytics"
-    if any(x in name or x in url for x in ["filesystem", "file", "drive", "dropbox", "storage"]):
-        return "file_system"
-    if any(x in name or x in url for x in ["browser", "puppeteer", "playwright", "selenium"]):
-        return "devtools"
-    if any(x in name or x in url for x in ["openai", "anthropic", "llm", "ai", "langchain", "ollama"]):
-        return "ai"
-    if any(x in name or x in url for x in ["docs", "documentation", "context7"]):
-        return "documentation"
-    if any(x in name or x in url for x in ["test", "jest", "pytest"]):
-        return "testing"
-    if any(x in name or x in url for x in ["auth", "security", "vault"]):
-        return "security"
-    
-    return "other"
+    name = tool.get("name", "")
+    url = tool.get("url", "")
+    return MCP_CATEGORY_ENGINE.classify({"text": f"{name} {url}"})
 
 
 def slugify(name: str) -> str:
@@ -414,6 +438,19 @@ def transform_vibe_tool(tool: dict) -> Optional[dict]:
     }
 
 
+def mutation_result(response: httpx.Response) -> dict:
+    """
+    Body of a Convex HTTP API call, or {"error": ...} if the function threw.
+    
+    A mutation that throws still answers HTTP 200, with
+    {"status": "error", "errorMessage": ...}.
+    """
+    body = response.json()
+    if body.get("status") == "error":
+        return {"error": body.get("errorMessage") or "unknown Convex error"}
+    return body
+
+
 async def upsert_tool(client: httpx.AsyncClient, tool_data: dict) -> dict:
     """Upsert a tool to Convex via HTTP API."""
     url = f"{CONVEX_URL}/api/run"
@@ -432,7 +469,10 @@ async def upsert_tool(client: httpx.AsyncClient, tool_data: dict) -> dict:
     try:
         response = await client.post(url, json=payload, headers=headers, timeout=30.0)
         if response.status_code == 200:
-            return response.json()
+            result = mutation_result(response)
+            if "error" in result:
+                print(f"Error upserting tool: {result['error'][:200]}")
+            return result
         else:
             error_text = response.text[:200] if len(response.text) > 200 else response.text
             print(f"Error upserting tool: HTTP {response.status_code}: {error_text}")
@@ -442,6 +482,84 @@ async def upsert_tool(client: httpx.AsyncClient, tool_data: dict) -> dict:
         return {"error": f"{type(e).__name__}: {str(e)}"}
 
 
+async def fetch_remote_sync_hashes(client: httpx.AsyncClient, page_size: int = SYNC_HASH_PAGE_SIZE) -> Optional[dict]:
+    """
+    Fetch the compact slug -> syncHash listing stored in Convex.
+    
+    The query is paginated so no single call reads the whole tools table.
+    """
+    url = f"{CONVEX_URL}/api/query"
+    headers = {
+        "Authorization": f"Convex {CONVEX_DEPLOY_KEY}",
+        "Content-Type": "application/json",
+    }
+    
+    hashes = {}
+    cursor = None
+    try:
+        while True:
+            payload = {
+                "path": "ingest:listToolSyncHashes",
+                "args": {"paginationOpts": {"numItems": page_size, "cursor": cursor}},
+                "format": "json",
+            }
+            response = await client.post(url, json=payload, headers=headers, timeout=60.0)
+            if response.status_code != 200:
+                print(f"Error fetching sync hashes: HTTP {response.status_code}")
+                return None
+            result = response.json().get("value", {})
+            for row in result.get("page", []):
+                hashes[row["slug"]] = row.get("syncHash")
+            if result.get("isDone", True):
+                return hashes
+            cursor = result.get("continueCursor")
+    except Exception as e:
+        print(f"Error fetching sync hashes: {type(e).__name__}: {str(e)}")
+        return None
+
+
+async def sync_tool(
+    client: httpx.AsyncClient,
+    tool_data: dict,
+    results: dict,
+    ledger: SyncLedger,
+    force: bool = False,
+    journal: Optional[SyncJournal] = None,
+) -> Optional[dict]:
+    """
+    Upsert a tool only if its content hash differs from the ledger.
+    
+    Returns:
+        The upsert result, or None if the tool was unchanged and skipped
+    """
+    slug = tool_data["slug"]
+    sync_hash = content_hash(tool_data)
+    status = ledger.status(slug, sync_hash)
+    
+    if journal and journal.is_committed(f"tool:{slug}", sync_hash):
+        results["resumed"] += 1
+        return None
+    
+    if status == SyncLedger.UNCHANGED and not force:
+        ledger.count(status)
+        results["unchanged"] += 1
+        return None
+    
+    result = await upsert_tool(client, {**tool_data, "syncHash": sync_hash})
+    
+    if "error" in result:
+        results["errors"].append(f"{tool_data['name']}: {result['error']}")
+    else:
+        results["success"] += 1
+        results[status] += 1
+        ledger.count(status)
+        ledger.record(slug, sync_hash)
+        if journal:
+            journal.commit(f"tool:{slug}", sync_hash)
+    
+    return result
+
+
 def transform_discovered_tool(tool: dict) -> Optional[dict]:
     """Transform a discovered tool (from awesome lists, directories, search) into Convex format."""
     name = tool.get("name", "")
@@ -506,35 +624,41 @@ def transform_discovered_tool(tool: dict) -> Optional[dict]:
     }
 
 
-async def sync_vibe_tools():
-    """Sync vibe tools from scraped data to Convex."""
-    data_dir = os.path.join(os.path.dirname(__file__), "data")
-    vibe_tools_path = os.path.join(data_dir, "vibe_tools.json")
-    
-    if not os.path.exists(vibe_tools_path):
-        print(f"No vibe tools data found at {vibe_tools_path}")
+async def sync_vibe_tools(
+    ledger: Optional[SyncLedger] = None,
+    force: bool = False,
+    journal: Optional[SyncJournal] = None,
+):
+    """
+    Sync vibe tools from scraped data to Convex.
+    
+    Args:
+        ledger: Sync ledger used to skip unchanged tools
+        force: Push every tool even if its content hash is unchanged
+        journal: Started sync journal; tools committed by an interrupted run are skipped
+    """
+    if ledger is None:
+        ledger = SyncLedger(name="tools")
+    if find_artifact("vibe_tools") is None:
+        print("No vibe tools data found in the data directory")
         return {"error": "No data file found"}
     
-    with open(vibe_tools_path, "r") as f:
-        data = json.load(f)
-    
-    known_tools = data.get("known_tools", [])
-    awesome_list_tools = data.get("awesome_list_tools", [])
-    mcp_directory_tools = data.get("mcp_directory_tools", [])
-    discovered_tools = data.get("discovered_tools", [])
-    
     results = {
         "processed": 0,
         "success": 0,
         "skipped": 0,
+        "created": 0,
+        "changed": 0,
+        "unchanged": 0,
+        "resumed": 0,
         "errors": [],
     }
     
     seen_slugs = set()
     
     async with httpx.AsyncClient() as client:
-        print(f"\n--- Syncing {len(known_tools)} known tools ---")
-        for tool in known_tools:
+        print("\n--- Syncing known tools ---")
+        for tool in iter_artifact("vibe_tools", "known_tools"):
             tool_data = transform_vibe_tool(tool)
             if not tool_data:
                 continue
@@ -546,20 +670,19 @@ async def sync_vibe_tools():
             seen_slugs.add(slug)
             
             results["processed"] += 1
-            print(f"Syncing: {tool_data['name']}")
             
-            result = await upsert_tool(client, tool_data)
+            result = await sync_tool(client, tool_data, results, ledger, force, journal)
+            if result is None:
+                continue
             
-            if "error" in result:
-                results["errors"].append(f"{tool_data['name']}: {result['error']}")
-            else:
-                results["success"] += 1
+            print(f"Synced: {tool_data['name']}")
+            if "error" not in result:
                 print(f"  -> {result.get('action', 'done')}")
             
             await asyncio.sleep(0.3)
         
-        print(f"\n--- Syncing {len(awesome_list_tools)} awesome list tools ---")
-        for tool in awesome_list_tools:
+        print("\n--- Syncing awesome list tools ---")
+        for tool in iter_artifact("vibe_tools", "awesome_list_tools"):
             tool_data = transform_discovered_tool(tool)
             if not tool_data:
                 continue
@@ -574,17 +697,14 @@ async def sync_vibe_tools():
             if results["processed"] % 50 == 0:
                 print(f"Progress: {results['processed']} processed, {results['success']} synced")
             
-            result = await upsert_tool(client, tool_data)
-            
-            if "error" in result:
-                results["errors"].append(f"{tool_data['name']}: {result['error']}")
-            else:
-                results["success"] += 1
+            result = await sync_tool(client, tool_data, results, ledger, force, journal)
+            if result is None:
+                continue
             
             await asyncio.sleep(0.1)
         
-        print(f"\n--- Syncing {len(mcp_directory_tools)} MCP directory tools ---")
-        for tool in mcp_directory_tools:
+        print("\n--- Syncing MCP directory tools ---")
+        for tool in iter_artifact("vibe_tools", "mcp_directory_tools"):
             tool["category"] = "mcp"
             tool_data = transform_discovered_tool(tool)
             if not tool_data:
@@ -598,17 +718,14 @@ async def sync_vibe_tools():
             
             results["processed"] += 1
             
-            result = await upsert_tool(client, tool_data)
-            
-            if "error" in result:
-                results["errors"].append(f"{tool_data['name']}: {result['error']}")
-            else:
-                results["success"] += 1
+            result = await sync_tool(client, tool_data, results, ledger, force, journal)
+            if result is None:
+                continue
             
             await asyncio.sleep(0.1)
         
-        print(f"\n--- Syncing {len(discovered_tools)} discovered tools ---")
-        for tool in discovered_tools:
+        print("\n--- Syncing discovered tools ---")
+        for tool in iter_artifact("vibe_tools", "discovered_tools"):
             tool_data = transform_discovered_tool(tool)
             if not tool_data:
                 continue
@@ -621,16 +738,18 @@ async def sync_vibe_tools():
             
             results["processed"] += 1
             
-            result = await upsert_tool(client, tool_data)
-            
-            if "error" in result:
-                results["errors"].append(f"{tool_data['name']}: {result['error']}")
-            else:
-                results["success"] += 1
+            result = await sync_tool(client, tool_data, results, ledger, force, journal)
+            if result is None:
+                continue
             
             await asyncio.sleep(0.1)
     
+    ledger.save()
+    
     print(f"\nTotal: {results['processed']} processed, {results['success']} synced, {results['skipped']} skipped (duplicates)")
+    print(f"Changes: {results['created']} created, {results['changed']} changed, {results['unchanged']} unchanged")
+    if results["resumed"]:
+        print(f"Resumed: {results['resumed']} tools already committed by the interrupted run")
     return results
 
 
@@ -693,6 +812,38 @@ def transform_mcp_tool(tool: dict) -> Optional[dict]:
     }
 
 
+def normalize_vibe_tool(kind: str, tool: dict) -> list[tuple[str, dict]]:
+    """
+    Normalize one scraped vibe tool into the records it syncs as.
+    
+    Mirrors the per-section transforms of sync_vibe_tools and sync_mcp_servers,
+    so streamed records match what the file-based sync would push.
+    
+    Args:
+        kind: Section of the vibe tools data ("known_tools", "awesome_list_tools",
+            "mcp_directory_tools" or "discovered_tools")
+        tool: Scraped tool
+    
+    Returns:
+        (target, record) pairs, where target is "tool" or "mcp"
+    """
+    if kind == "known_tools":
+        records = []
+        tool_data = transform_vibe_tool(tool)
+        if tool_data:
+            records.append(("tool", tool_data))
+        if tool.get("category") == "mcp":
+            server_data = transform_mcp_tool(tool)
+            if server_data:
+                records.append(("mcp", server_data))
+        return records
+    
+    if kind == "mcp_directory_tools":
+        tool = {**tool, "category": "mcp"}
+    tool_data = transform_discovered_tool(tool)
+    return [("tool", tool_data)] if tool_data else []
+
+
 async def upsert_mcp_server(client: httpx.AsyncClient, server_data: dict) -> dict:
     """Upsert a single MCP server to Convex."""
     if not CONVEX_URL or not CONVEX_DEPLOY_KEY:
@@ -715,31 +866,41 @@ async def upsert_mcp_server(client: httpx.AsyncClient, server_data: dict) -> dic
     try:
         response = await client.post(url, json=payload, headers=headers, timeout=30.0)
         if response.status_code == 200:
-            return response.json()
+            return mutation_result(response)
         else:
             return {"error": f"HTTP {response.status_code}: {response.text}"}
     except Exception as e:
         return {"error": str(e)}
 
 
-async def sync_mcp_servers():
-    """Sync MCP servers from scraped data to Convex."""
-    data_dir = os.path.join(os.path.dirname(__file__), "data")
-    vibe_tools_path = os.path.join(data_dir, "vibe_tools.json")
-    
-    if not os.path.exists(vibe_tools_path):
-        print(f"No vibe tools data found at {vibe_tools_path}")
+async def sync_mcp_servers(
+    ledger: Optional[SyncLedger] = None,
+    force: bool = False,
+    journal: Optional[SyncJournal] = None,
+):
+    """
+    Sync MCP servers from scraped data to Convex.
+    
+    Args:
+        ledger: Sync ledger used to skip unchanged servers
+        force: Push every server even if its content hash is unchanged
+        journal: Started sync journal; servers committed by an interrupted run are skipped
+    """
+    if ledger is None:
+        ledger = SyncLedger(name="mcp_servers")
+    if find_artifact("vibe_tools") is None:
+        print("No vibe tools data found in the data directory")
         return {"error": "No data file found"}
     
-    with open(vibe_tools_path, "r") as f:
-        data = json.load(f)
-    
-    known_tools = data.get("known_tools", [])
-    mcp_tools = [t for t in known_tools if t.get("category") == "mcp"]
+    mcp_tools = [t for t in iter_artifact("vibe_tools", "known_tools") if t.get("category") == "mcp"]
     
     results = {
         "processed": 0,
         "success": 0,
+        "created": 0,
+        "changed": 0,
+        "unchanged": 0,
+        "resumed": 0,
         "errors": [],
     }
     
@@ -750,6 +911,17 @@ async def sync_mcp_servers():
                 continue
             
             results["processed"] += 1
+            
+            sync_hash = content_hash(server_data)
+            status = ledger.status(server_data["slug"], sync_hash)
+            if journal and journal.is_committed(f"mcp:{server_data['slug']}", sync_hash):
+                results["resumed"] += 1
+                continue
+            if status == SyncLedger.UNCHANGED and not force:
+                ledger.count(status)
+                results["unchanged"] += 1
+                continue
+            
             print(f"Syncing MCP: {server_data['name']}")
             
             result = await upsert_mcp_server(client, server_data)
@@ -759,39 +931,91 @@ async def sync_mcp_servers():
                 print(f"  -> ERROR: {result['error'][:50]}")
             else:
                 results["success"] += 1
+                results[status] += 1
+                ledger.count(status)
+                ledger.record(server_data["slug"], sync_hash)
+                if journal:
+                    journal.commit(f"mcp:{server_data['slug']}", sync_hash)
                 action = result.get("value", {}).get("action", "done")
                 print(f"  -> {action}")
             
             await asyncio.sleep(0.3)
     
+    ledger.save()
+    
     return results
 
 
-async def sync_all_scraped_tools():
-    """Sync all scraped tools from various sources to Convex."""
-    data_dir = os.path.join(os.path.dirname(__file__), "data")
-    
+def add_change_counts(results: dict, sync_result: dict):
+    """Accumulate created/changed/unchanged counts into a summary."""
+    for status in (SyncLedger.CREATED, SyncLedger.CHANGED, SyncLedger.UNCHANGED):
+        results[f"total_{status}"] = results.get(f"total_{status}", 0) + sync_result.get(status, 0)
+
+
+def replay_journal(journal: SyncJournal, tool_ledger: SyncLedger, mcp_ledger: SyncLedger):
+    """Apply hashes committed by an interrupted run to the ledgers."""
+    for key, sync_hash in journal.committed.items():
+        kind, _, slug = key.partition(":")
+        ledger = tool_ledger if kind == "tool" else mcp_ledger
+        ledger.record(slug, sync_hash)
+
+
+async def sync_all_scraped_tools(reconcile: bool = False, force: bool = False, restart: bool = False):
+    """
+    Sync all scraped tools from various sources to Convex.
+    
+    Progress is checkpointed to a sync journal; if a previous run was
+    interrupted, it is resumed under the same run id unless restart is set.
+    
+    Args:
+        reconcile: Re-align the local ledger with the hashes stored in Convex first
+        force: Push every tool even if its content hash is unchanged
+        restart: Ignore an interrupted run and start a new one
+    """
     results = {
         "vibe_tools": None,
         "mcp_servers": None,
         "total_synced": 0,
         "total_errors": 0,
+        "total_created": 0,
+        "total_changed": 0,
+        "total_unchanged": 0,
     }
     
-    vibe_result = await sync_vibe_tools()
+    tool_ledger = SyncLedger(name="tools")
+    mcp_ledger = SyncLedger(name="mcp_servers")
+    
+    journal = SyncJournal("convex_sync")
+    if journal.begin(resume=not restart):
+        print(f"Resuming interrupted sync run {journal.run_id} ({len(journal.committed)} records already committed)")
+        replay_journal(journal, tool_ledger, mcp_ledger)
+    results["run_id"] = journal.run_id
+    
+    if reconcile:
+        async with httpx.AsyncClient() as client:
+            remote_hashes = await fetch_remote_sync_hashes(client)
+        if remote_hashes is not None:
+            results["reconcile"] = tool_ledger.reconcile(remote_hashes)
+            print(f"Reconciled ledger with Convex: {results['reconcile']}")
+    
+    vibe_result = await sync_vibe_tools(ledger=tool_ledger, force=force, journal=journal)
     results["vibe_tools"] = vibe_result
     results["total_synced"] += vibe_result.get("success", 0)
     results["total_errors"] += len(vibe_result.get("errors", []))
+    add_change_counts(results, vibe_result)
     
-    mcp_result = await sync_mcp_servers()
+    mcp_result = await sync_mcp_servers(ledger=mcp_ledger, force=force, journal=journal)
     results["mcp_servers"] = mcp_result
     results["total_synced"] += mcp_result.get("success", 0)
     results["total_errors"] += len(mcp_result.get("errors", []))
+    add_change_counts(results, mcp_result)
+    
+    journal.finish({"total_synced": results["total_synced"], "total_errors": results["total_errors"]})
     
     return results
 
 
-async def sync_mcp_only():
+async def sync_mcp_only(force: bool = False):
     """Sync only MCP servers to Convex."""
     results = {
         "mcp_servers": None,
@@ -799,10 +1023,11 @@ async def sync_mcp_only():
         "total_errors": 0,
     }
     
-    mcp_result = await sync_mcp_servers()
+    mcp_result = await sync_mcp_servers(force=force)
     results["mcp_servers"] = mcp_result
     results["total_synced"] += mcp_result.get("success", 0)
     results["total_errors"] += len(mcp_result.get("errors", []))
+    add_change_counts(results, mcp_result)
     
     return results
 
@@ -822,6 +1047,9 @@ def main():
         return
     
     mcp_only = "--mcp" in sys.argv or "--mcp-only" in sys.argv
+    reconcile = "--reconcile" in sys.argv
+    force = "--force" in sys.argv or "--full" in sys.argv
+    restart = "--restart" in sys.argv
     
     print("=" * 50)
     if mcp_only:
@@ -834,9 +1062,9 @@ def main():
     
     try:
         if mcp_only:
-            results = asyncio.run(sync_mcp_only())
+            results = asyncio.run(sync_mcp_only(force=force))
         else:
-            results = asyncio.run(sync_all_scraped_tools())
+            results = asyncio.run(sync_all_scraped_tools(reconcile=reconcile, force=force, restart=restart))
     except Exception as e:
         print(f"ERROR during sync: {e}")
         import traceback
@@ -851,6 +1079,7 @@ def main():
     if results:
         print(f"Total synced: {results.get('total_synced', 0)}")
         print(f"Total errors: {results.get('total_errors', 0)}")
+        print(f"Created: {results.get('total_created', 0)}, changed: {results.get('total_changed', 0)}, unchanged: {results.get('total_unchanged', 0)}")
         
         mcp_servers = results.get("mcp_servers")
         if mcp_servers and mcp_servers.get("errors"):
@@ -2,9 +2,9 @@
 Batch sync tools to Convex using transformed data.
 Outputs JSON batches that can be used with the Convex MCP.
 """
-import json
 import re
-import os
+from rule_engine import RuleEngine
+from artifacts import ArtifactWriter, find_artifact, iter_artifact
 
 CATEGORY_MAPPING = {
     "orchestration": "cli-agents",
@@ -129,25 +129,28 @@ def is_excluded_name(name: str) -> bool:
 def is_article(url: str, name: str) -> bool:
     return is_excluded_url(url) or is_excluded_name(name)
 
+ARTICLE_TYPE_ENGINE = RuleEngine([
+    ("tutorial", {"url": ["/tutorial"], "name": ["tutorial"]}),
+    ("guide", {"url": ["/guide"], "name": ["guide", "how to", "how-to"]}),
+    ("comparison", {"url": ["/comparison", "/vs/"], "name": ["vs.", "alternatives", "comparison"]}),
+    ("review", {"url": ["/review"], "name": ["review", "tested"]}),
+    ("news", {"url": ["/news/", "/announcements/"]}),
+    ("blog", {"url": ["/blog/", "medium.com", "dev.to"]}),
+    ("documentation", {"url": ["/docs/", "/documentation/"]}),
+], default="other")
+
+RELATED_TOOL_KEYWORDS = [
+    "cursor", "windsurf", "claude", "gpt", "copilot", "codeium", "tabnine",
+    "replit", "v0", "bolt", "lovable", "vercel", "netlify", "supabase",
+    "convex", "firebase", "prisma", "drizzle", "nextjs", "react", "vue",
+    "angular", "svelte", "tailwind", "shadcn", "radix", "langchain",
+    "openai", "anthropic", "gemini", "ollama", "llama", "mistral"
+]
+
+RELATED_TOOL_ENGINE = RuleEngine((keyword, [keyword]) for keyword in RELATED_TOOL_KEYWORDS)
+
 def determine_article_type(url: str, name: str) -> str:
-    url_lower = url.lower()
-    name_lower = name.lower()
-    
-    if "/tutorial" in url_lower or "tutorial" in name_lower:
-        return "tutorial"
-    if "/guide" in url_lower or "guide" in name_lower or "how to" in name_lower or "how-to" in name_lower:
-        return "guide"
-    if "/comparison" in url_lower or "/vs/" in url_lower or "vs." in name_lower or "alternatives" in name_lower or "comparison" in name_lower:
-        return "comparison"
-    if "/review" in url_lower or "review" in name_lower or "tested" in name_lower:
-        return "review"
-    if "/news/" in url_lower or "/announcements/" in url_lower:
-        return "news"
-    if "/blog/" in url_lower or "medium.com" in url_lower or "dev.to" in url_lower:
-        return "blog"
-    if "/docs/" in url_lower or "/documentation/" in url_lower:
-        return "documentation"
-    return "other"
+    return ARTICLE_TYPE_ENGINE.classify({"url": url, "name": name})
 
 def extract_source_from_url(url: str) -> str:
     try:
@@ -159,19 +162,7 @@ def extract_source_from_url(url: str) -> str:
         return ""
 
 def extract_related_tool_slugs(name: str, description: str = "") -> list:
-    text = f"{name} {description}".lower()
-    tool_keywords = [
-        "cursor", "windsurf", "claude", "gpt", "copilot", "codeium", "tabnine",
-        "replit", "v0", "bolt", "lovable", "vercel", "netlify", "supabase",
-        "convex", "firebase", "prisma", "drizzle", "nextjs", "react", "vue",
-        "angular", "svelte", "tailwind", "shadcn", "radix", "langchain",
-        "openai", "anthropic", "gemini", "ollama", "llama", "mistral"
-    ]
-    found = []
-    for keyword in tool_keywords:
-        if keyword in text:
-            found.append(keyword)
-    return found
+    return RELATED_TOOL_ENGINE.match({"text": f"{name} {description}"})
 
 def slugify(name: str) -> str:
     slug = name.lower()
@@ -330,20 +321,44 @@ def transform_article(tool: dict) -> dict | None:
         result["source"] = source
     return result
 
+class BatchArtifactWriter:
+    """Groups records into fixed-size batches and streams each batch to an artifact."""
+    
+    def __init__(self, name: str, batch_size: int):
+        self.writer = ArtifactWriter(name, layout="records", meta={"batch_size": batch_size})
+        self.batch_size = batch_size
+        self.batch = []
+        self.records = 0
+        self.batches = 0
+    
+    def add(self, record: dict):
+        self.batch.append(record)
+        self.records += 1
+        if len(self.batch) >= self.batch_size:
+            self.flush()
+    
+    def flush(self):
+        if self.batch:
+            self.writer.write(self.batch)
+            self.batches += 1
+            self.batch = []
+    
+    def close(self) -> str:
+        self.flush()
+        return self.writer.close()
+    
+    def abort(self):
+        self.writer.abort()
+
+
 def main():
-    data_dir = os.path.join(os.path.dirname(__file__), "data")
-    vibe_tools_path = os.path.join(data_dir, "vibe_tools.json")
-    
-    with open(vibe_tools_path, "r") as f:
-        data = json.load(f)
-    
-    known_tools = data.get("known_tools", [])
-    awesome_list_tools = data.get("awesome_list_tools", [])
-    mcp_directory_tools = data.get("mcp_directory_tools", [])
-    discovered_tools = data.get("discovered_tools", [])
+    if find_artifact("vibe_tools") is None:
+        print("No vibe tools data found in the data directory")
+        return None
     
-    all_tools = []
-    all_articles = []
+    batch_size = 50
+    tool_batches = BatchArtifactWriter("tools_batches", batch_size)
+    article_batches = BatchArtifactWriter("articles_batches", batch_size)
     seen_tool_slugs = set()
     seen_article_urls = set()
     
@@ -356,71 +371,46 @@ def main():
                 article = transform_article(tool)
                 if article:
                     seen_article_urls.add(url)
-                    all_articles.append(article)
-            return None
-        else:
-            transformed = transform_func(tool)
-            if transformed:
-                slug = transformed["slug"]
-                if slug not in seen_tool_slugs:
-                    seen_tool_slugs.add(slug)
-                    return transformed
-        return None
-    
-    print(f"Processing {len(known_tools)} known tools...")
-    for tool in known_tools:
-        result = process_item(tool, transform_known_tool)
-        if result:
-            all_tools.append(result)
-    
-    print(f"Processing {len(awesome_list_tools)} awesome list tools...")
-    for tool in awesome_list_tools:
-        result = process_item(tool, transform_discovered_tool)
-        if result:
-            all_tools.append(result)
-    
-    print(f"Processing {len(mcp_directory_tools)} MCP directory tools...")
-    for tool in mcp_directory_tools:
-        tool["category"] = "mcp"
-        result = process_item(tool, transform_discovered_tool)
-        if result:
-            all_tools.append(result)
-    
-    print(f"Processing {len(discovered_tools)} discovered tools...")
-    for tool in discovered_tools:
-        result = process_item(tool, transform_discovered_tool)
-        if result:
-            all_tools.append(result)
-    
-    print(f"\nTotal unique tools: {len(all_tools)}")
-    print(f"Total unique articles: {len(all_articles)}")
-    
-    batch_size = 50
-    tool_batches = []
-    for i in range(0, len(all_tools), batch_size):
-        batch = all_tools[i:i + batch_size]
-        tool_batches.append(batch)
-    
-    print(f"Created {len(tool_batches)} tool batches of {batch_size} each")
-    
-    article_batches = []
-    for i in range(0, len(all_articles), batch_size):
-        batch = all_articles[i:i + batch_size]
-        article_batches.append(batch)
-    
-    print(f"Created {len(article_batches)} article batches of {batch_size} each")
+                    article_batches.add(article)
+            return
+        
+        transformed = transform_func(tool)
+        if transformed:
+            slug = transformed["slug"]
+            if slug not in seen_tool_slugs:
+                seen_tool_slugs.add(slug)
+                tool_batches.add(transformed)
+    
+    sections = [
+        ("known_tools", "known tools", transform_known_tool),
+        ("awesome_list_tools", "awesome list tools", transform_discovered_tool),
+        ("mcp_directory_tools", "MCP directory tools", transform_discovered_tool),
+        ("discovered_tools", "discovered tools", transform_discovered_tool),
+    ]
     
-    tools_output_path = os.path.join(data_dir, "tools_batches.json")
-    with open(tools_output_path, "w") as f:
-        json.dump(tool_batches, f, indent=2)
+    try:
+        for section, label, transform_func in sections:
+            print(f"Processing {label}...")
+            for tool in iter_artifact("vibe_tools", section):
+                if section == "mcp_directory_tools":
+                    tool["category"] = "mcp"
+                process_item(tool, transform_func)
+        
+        tools_output_path = tool_batches.close()
+        articles_output_path = article_batches.close()
+    except BaseException:
+        tool_batches.abort()
+        article_batches.abort()
+        raise
+    
+    print(f"\nTotal unique tools: {tool_batches.records}")
+    print(f"Total unique articles: {article_batches.records}")
+    print(f"Created {tool_batches.batches} tool batches of {batch_size} each")
+    print(f"Created {article_batches.batches} article batches of {batch_size} each")
     print(f"Saved tool batches to: {tools_output_path}")
-    
-    articles_output_path = os.path.join(data_dir, "articles_batches.json")
-    with open(articles_output_path, "w") as f:
-        json.dump(article_batches, f, indent=2)
     print(f"Saved article batches to: {articles_output_path}")
     
-    return tool_batches, article_batches
+    return tool_batches.batches, article_batches.batches
 
 if __name__ == "__main__":
     main()
@@ -1,84 +1,46 @@
 """
-Sync tools to Convex using npx convex run command.
+Sync tools to Convex in parallel bulk batches.
+Uses the Convex HTTP API over one keep-alive session when CONVEX_DEPLOY_KEY
+is set, otherwise falls back to `convex run` through the CLI.
 """
-import json
-import subprocess
-import os
-import time
+import asyncio
 
-def main():
-    data_dir = os.path.join(os.path.dirname(__file__), "data")
-    batches_path = os.path.join(data_dir, "tools_batches.json")
-    
-    with open(batches_path, "r") as f:
-        batches = json.load(f)
-    
-    print(f"Total batches: {len(batches)}")
+from artifacts import find_artifact, iter_artifact
+from convex_batch_runner import ConvexBatchRunner, create_transport, print_summary, written_by_outcome
+from sync_journal import SyncJournal, file_fingerprint
+
+def main(concurrency: int = 4, transport: str = "auto", restart: bool = False):
+    batches_path = find_artifact("tools_batches")
     
-    total_created = 0
-    total_updated = 0
-    total_skipped = 0
-    total_errors = []
+    if batches_path is None:
+        print("No tools_batches artifact found. Run sync_tools_batch.py first.")
+        return
     
-    project_dir = os.path.dirname(os.path.dirname(os.path.dirname(__file__)))
+    print(f"Streaming tool batches from: {batches_path}")
     
-    for i, batch in enumerate(batches):
-        print(f"\nProcessing batch {i+1}/{len(batches)} ({len(batch)} tools)...")
-        
-        args_json = json.dumps({"tools": batch})
-        
-        cmd = [
-            "npx", "convex", "run", "ingest:bulkUpsertToolsPublic",
-            args_json
-        ]
-        
-        try:
-            result = subprocess.run(
-                cmd,
-                cwd=project_dir,
-                capture_output=True,
-                text=True,
-                timeout=120
-            )
-            
-            if result.returncode == 0:
-                try:
-                    output = json.loads(result.stdout.strip())
-                    created = output.get("created", 0)
-                    updated = output.get("updated", 0)
-                    skipped = output.get("skipped", 0)
-                    errors = output.get("errors", [])
-                    
-                    total_created += created
-                    total_updated += updated
-                    total_skipped += skipped
-                    total_errors.extend(errors)
-                    
-                    print(f"  Created: {created}, Updated: {updated}, Skipped: {skipped}")
-                except json.JSONDecodeError:
-                    print(f"  Output: {result.stdout[:200]}")
-            else:
-                print(f"  Error: {result.stderr[:200]}")
-                
-        except subprocess.TimeoutExpired:
-            print(f"  Timeout on batch {i+1}")
-        except Exception as e:
-            print(f"  Exception: {e}")
-        
-        time.sleep(0.5)
+    journal = SyncJournal("tools_cli")
+    journal.begin(file_fingerprint(batches_path), resume=not restart)
     
-    print("\n" + "=" * 50)
-    print("SYNC COMPLETE")
-    print("=" * 50)
-    print(f"Total created: {total_created}")
-    print(f"Total updated: {total_updated}")
-    print(f"Total skipped: {total_skipped}")
-    print(f"Total errors: {len(total_errors)}")
+    runner = ConvexBatchRunner(
+        "ingest:bulkUpsertToolsPublic",
+        "tools",
+        transport=create_transport(transport, concurrency=concurrency),
+        concurrency=concurrency,
+        journal=journal,
+        written_records=written_by_outcome(),
+    )
+    summary = asyncio.run(runner.run(iter_artifact("tools_batches")))
     
-    if total_errors[:10]:
-        print("\nFirst 10 errors:")
-        for err in total_errors[:10]:
-            print(f"  - {err}")
+    print_summary("SYNC COMPLETE", summary, ["created", "updated", "skipped"])
+    return summary
 
 if __name__ == "__main__":
-    main()
+    import argparse
+    
+    parser = argparse.ArgumentParser(description="Sync tool batches to Convex")
+    parser.add_argument("--concurrency", type=int, default=4, help="Parallel batches in flight (default: 4)")
+    parser.add_argument("--transport", choices=["auto", "http", "cli"], default="auto", help="How to call Convex (default: auto)")
+    parser.add_argument("--restart", action="store_true", help="Ignore an interrupted run and start from the first batch")
+    args = parser.parse_args()
+    
+    main(concurrency=args.concurrency, transport=args.transport, restart=args.restart)
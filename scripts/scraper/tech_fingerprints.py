@@ -0,0 +1,608 @@
+"""
+Tech Fingerprints - Wappalyzer-style technology detection in one pass per page
+Fingerprints over headers, cookies, script URLs, meta tags, HTML and prose are compiled into a few combined indexes
+"""
+import re
+from typing import Iterable, Optional
+
+
+# Each technology lists the signals that identify it on a page:
+#   headers:  {header name: value regex}      cookies: {cookie name: value regex}
+#   meta:     {meta name: content regex}      scripts: [script src regexes]
+#   html:     [markup regexes]                mention: prose regex (blog posts, docs)
+#   implies:  [other technologies]
+# Regexes are matched case-insensitively and their first group, if any,
+# captures the version. Use (?:...) for every other group.
+FINGERPRINTS = {
+    # Frontend
+    "react": {
+        "category": "frontend",
+        "html": [r"data-reactroot", r"data-reactid"],
+        "scripts": [r"/react(?:-dom)?@([\d.]+)", r"react(?:-dom)?(?:\.production)?(?:\.min)?\.js"],
+        "mention": r"react(?:\.js)?",
+    },
+    "next.js": {
+        "category": "frontend",
+        "headers": {"x-powered-by": r"next\.js ?([\d.]+)?"},
+        "html": [r"id=\"__next_data__\"", r"/_next/static/"],
+        "scripts": [r"/_next/static/"],
+        "mention": r"next\.?js",
+        "implies": ["react", "node.js"],
+    },
+    "vue.js": {
+        "category": "frontend",
+        "html": [r"data-v-[0-9a-f]{8}", r"\sv-cloak"],
+        "scripts": [r"/vue@([\d.]+)", r"vue(?:\.runtime)?(?:\.global)?(?:\.prod)?(?:\.min)?\.js"],
+        "mention": r"vue(?:\.?js)?",
+    },
+    "nuxt": {
+        "category": "frontend",
+        "html": [r"window\.__nuxt__", r"<div id=\"__nuxt\"", r"/_nuxt/"],
+        "scripts": [r"/_nuxt/"],
+        "mention": r"nuxt(?:\.?js)?",
+        "implies": ["vue.js", "node.js"],
+    },
+    "angular": {
+        "category": "frontend",
+        "html": [r"\sng-version=\"([\d.]+)\"", r"\sng-app"],
+        "scripts": [r"angular(?:\.min)?\.js"],
+        "mention": r"angular(?:js)?",
+    },
+    "svelte": {
+        "category": "frontend",
+        "html": [r"\bsvelte-[a-z0-9]{6,}"],
+        "mention": r"svelte(?:kit)?",
+    },
+    "remix": {
+        "category": "frontend",
+        "html": [r"window\.__remixcontext"],
+        "mention": r"remix",
+        "implies": ["react"],
+    },
+    "gatsby": {
+        "category": "frontend",
+        "html": [r"<div id=\"___gatsby\""],
+        "meta": {"generator": r"gatsby ?([\d.]+)?"},
+        "mention": r"gatsby",
+        "implies": ["react"],
+    },
+    "astro": {
+        "category": "frontend",
+        "html": [r"<astro-island"],
+        "meta": {"generator": r"astro v?([\d.]+)?"},
+        "mention": r"astro",
+    },
+    "jquery": {
+        "category": "frontend",
+        "scripts": [r"jquery[.-]([\d.]+)(?:\.min)?\.js", r"jquery(?:\.min)?\.js"],
+        "mention": r"jquery",
+    },
+    "tailwind": {
+        "category": "frontend",
+        "html": [r"--tw-(?:ring|shadow|translate)"],
+        "scripts": [r"cdn\.tailwindcss\.com"],
+        "mention": r"tailwind(?:\s?css)?",
+    },
+    "bootstrap": {
+        "category": "frontend",
+        "scripts": [r"bootstrap@([\d.]+)", r"bootstrap(?:\.bundle)?(?:\.min)?\.js"],
+        "html": [r"/bootstrap(?:\.min)?\.css"],
+        "mention": r"bootstrap",
+    },
+    "material-ui": {
+        "category": "frontend",
+        "html": [r"\bmui[a-z]+-root"],
+        "mention": r"material[- ]ui|mui",
+        "implies": ["react"],
+    },
+    "typescript": {
+        "category": "frontend",
+        "mention": r"typescript",
+    },
+    "javascript": {
+        "category": "frontend",
+        "mention": r"javascript",
+    },
+    # Backend
+    "node.js": {
+        "category": "backend",
+        "mention": r"node(?:\.?js)?",
+    },
+    "express": {
+        "category": "backend",
+        "headers": {"x-powered-by": r"^express$"},
+        "mention": r"express(?:\.?js)?",
+        "implies": ["node.js"],
+    },
+    "python": {
+        "category": "backend",
+        "mention": r"python",
+    },
+    "django": {
+        "category": "backend",
+        "cookies": {"csrftoken": r"", "django_language": r""},
+        "html": [r"name=\"csrfmiddlewaretoken\""],
+        "mention": r"django",
+        "implies": ["python"],
+    },
+    "flask": {
+        "category": "backend",
+        "headers": {"server": r"werkzeug/?([\d.]+)?"},
+        "mention": r"flask",
+        "implies": ["python"],
+    },
+    "fastapi": {
+        "category": "backend",
+        "mention": r"fastapi",
+        "implies": ["python"],
+    },
+    "ruby on rails": {
+        "category": "backend",
+        "headers": {"x-powered-by": r"phusion passenger", "server": r"phusion passenger"},
+        "cookies": {"_rails_session": r""},
+        "meta": {"csrf-param": r"^authenticity_token$"},
+        "mention": r"ruby on rails|rails",
+        "implies": ["ruby"],
+    },
+    "ruby": {
+        "category": "backend",
+        "mention": r"ruby",
+    },
+    "go": {
+        "category": "backend",
+        "mention": r"golang|go (?:services?|backend|microservices?)",
+    },
+    "rust": {
+        "category": "backend",
+        "mention": r"rust",
+    },
+    "java": {
+        "category": "backend",
+        "cookies": {"jsessionid": r""},
+        "mention": r"java",
+    },
+    "spring": {
+        "category": "backend",
+        "mention": r"spring(?: boot)?",
+        "implies": ["java"],
+    },
+    ".net": {
+        "category": "backend",
+        "headers": {"x-aspnet-version": r"([\d.]+)", "x-powered-by": r"asp\.net"},
+        "cookies": {"asp.net_sessionid": r""},
+        "html": [r"name=\"__viewstate\""],
+        "mention": r"\.net|asp\.net",
+    },
+    "php": {
+        "category": "backend",
+        "headers": {"x-powered-by": r"php/?([\d.]+)?"},
+        "cookies": {"phpsessid": r""},
+        "mention": r"php",
+    },
+    "laravel": {
+        "category": "backend",
+        "cookies": {"laravel_session": r""},
+        "mention": r"laravel",
+        "implies": ["php"],
+    },
+    "wordpress": {
+        "category": "backend",
+        "meta": {"generator": r"wordpress ?([\d.]+)?"},
+        "html": [r"/wp-content/", r"/wp-includes/"],
+        "mention": r"wordpress",
+        "implies": ["php"],
+    },
+    # Database
+    "postgresql": {"category": "database", "mention": r"postgres(?:ql)?"},
+    "mysql": {"category": "database", "mention": r"mysql"},
+    "mongodb": {"category": "database", "mention": r"mongo(?:db)?"},
+    "redis": {"category": "database", "mention": r"redis"},
+    "elasticsearch": {"category": "database", "mention": r"elastic ?search"},
+    "dynamodb": {"category": "database", "mention": r"dynamo ?db"},
+    "cassandra": {"category": "database", "mention": r"cassandra"},
+    "sqlite": {"category": "database", "mention": r"sqlite"},
+    "supabase": {
+        "category": "database",
+        "html": [r"[a-z0-9]{20}\.supabase\.co"],
+        "scripts": [r"@supabase/supabase-js@?([\d.]+)?"],
+        "mention": r"supabase",
+        "implies": ["postgresql"],
+    },
+    "firebase": {
+        "category": "database",
+        "html": [r"[a-z0-9-]+\.firebaseapp\.com"],
+        "scripts": [r"firebase(?:-app)?(?:\.js|/([\d.]+)/)", r"gstatic\.com/firebasejs/([\d.]+)/"],
+        "mention": r"firebase",
+    },
+    # Infrastructure
+    "aws": {
+        "category": "infrastructure",
+        "headers": {"server": r"amazons3|awselb", "x-amz-cf-id": r"", "x-amz-request-id": r""},
+        "mention": r"aws|amazon web services",
+    },
+    "cloudfront": {
+        "category": "infrastructure",
+        "headers": {"x-amz-cf-id": r"", "via": r"cloudfront"},
+        "implies": ["aws"],
+    },
+    "gcp": {
+        "category": "infrastructure",
+        "headers": {"server": r"^(?:gws|google frontend|gse)$", "via": r"google"},
+        "mention": r"gcp|google cloud(?: platform)?",
+    },
+    "azure": {
+        "category": "infrastructure",
+        "headers": {"x-azure-ref": r"", "x-ms-request-id": r""},
+        "mention": r"azure",
+    },
+    "docker": {"category": "infrastructure", "mention": r"docker"},
+    "kubernetes": {"category": "infrastructure", "mention": r"kubernetes|k8s"},
+    "terraform": {"category": "infrastructure", "mention": r"terraform"},
+    "vercel": {
+        "category": "infrastructure",
+        "headers": {"server": r"^vercel$", "x-vercel-id": r"", "x-vercel-cache": r""},
+        "mention": r"vercel",
+    },
+    "netlify": {
+        "category": "infrastructure",
+        "headers": {"server": r"^netlify$", "x-nf-request-id": r""},
+        "mention": r"netlify",
+    },
+    "cloudflare": {
+        "category": "infrastructure",
+        "headers": {"server": r"^cloudflare$", "cf-ray": r""},
+        "cookies": {"__cf_bm": r"", "__cflb": r""},
+        "scripts": [r"cdnjs\.cloudflare\.com", r"/cdn-cgi/"],
+        "mention": r"cloudflare",
+    },
+    "heroku": {
+        "category": "infrastructure",
+        "headers": {"via": r"vegur"},
+        "mention": r"heroku",
+    },
+    "railway": {
+        "category": "infrastructure",
+        "headers": {"server": r"^railway"},
+        "mention": r"railway",
+    },
+    "fly.io": {
+        "category": "infrastructure",
+        "headers": {"server": r"^fly/", "fly-request-id": r""},
+        "mention": r"fly\.io",
+    },
+    "github pages": {
+        "category": "infrastructure",
+        "headers": {"server": r"^github\.com$"},
+        "mention": r"github pages",
+    },
+    "nginx": {
+        "category": "infrastructure",
+        "headers": {"server": r"nginx(?:/([\d.]+))?"},
+        "mention": r"nginx",
+    },
+    "apache": {
+        "category": "infrastructure",
+        "headers": {"server": r"apache(?:/([\d.]+))?"},
+    },
+    "fastly": {
+        "category": "infrastructure",
+        "headers": {"x-served-by": r"cache-", "x-fastly-request-id": r""},
+        "mention": r"fastly",
+    },
+    # Monitoring
+    "datadog": {
+        "category": "monitoring",
+        "scripts": [r"datadoghq(?:-browser-agent)?\.com", r"/datadog-rum(?:-v\d)?\.js"],
+        "mention": r"datadog",
+    },
+    "sentry": {
+        "category": "monitoring",
+        "scripts": [r"browser\.sentry-cdn\.com/([\d.]+)/", r"js\.sentry-cdn\.com"],
+        "html": [r"sentry_dsn|ingest\.sentry\.io"],
+        "mention": r"sentry",
+    },
+    "new relic": {
+        "category": "monitoring",
+        "html": [r"nreum|newrelic"],
+        "scripts": [r"js-agent\.newrelic\.com"],
+        "mention": r"new ?relic",
+    },
+    "grafana": {"category": "monitoring", "mention": r"grafana"},
+    "prometheus": {"category": "monitoring", "mention": r"prometheus"},
+    "logflare": {"category": "monitoring", "mention": r"logflare"},
+    "papertrail": {"category": "monitoring", "mention": r"papertrail"},
+    "logtail": {"category": "monitoring", "mention": r"logtail|better stack"},
+    # Analytics
+    "google analytics": {
+        "category": "analytics",
+        "scripts": [r"google-analytics\.com/(?:ga|analytics)\.js", r"googletagmanager\.com/gtag/js"],
+        "cookies": {"_ga": r""},
+    },
+    "google tag manager": {
+        "category": "analytics",
+        "scripts": [r"googletagmanager\.com/gtm\.js"],
+        "html": [r"googletagmanager\.com/ns\.html"],
+    },
+    "segment": {
+        "category": "analytics",
+        "scripts": [r"cdn\.segment\.com/analytics\.js"],
+        "mention": r"segment",
+    },
+    "posthog": {
+        "category": "analytics",
+        "scripts": [r"(?:app|us|eu)(?:-assets)?\.i\.posthog\.com|posthog(?:-js)?@?([\d.]+)?"],
+        "mention": r"posthog",
+    },
+    "plausible": {
+        "category": "analytics",
+        "scripts": [r"plausible\.io/js/"],
+        "mention": r"plausible",
+    },
+    "mixpanel": {
+        "category": "analytics",
+        "scripts": [r"cdn\.mxpnl\.com|mixpanel"],
+        "mention": r"mixpanel",
+    },
+    "hotjar": {
+        "category": "analytics",
+        "scripts": [r"static\.hotjar\.com"],
+        "mention": r"hotjar",
+    },
+    "intercom": {
+        "category": "analytics",
+        "scripts": [r"widget\.intercom\.io|js\.intercomcdn\.com"],
+        "mention": r"intercom",
+    },
+    "stripe": {
+        "category": "backend",
+        "scripts": [r"js\.stripe\.com/v(\d+)"],
+        "mention": r"stripe",
+    },
+}
+
+
+def _split_alternatives(pattern: str) -> list[str]:
+    """Split a regex at its top-level "|" so each branch can be indexed on its own."""
+    branches, depth, start, i = [], 0, 0, 0
+    while i < len(pattern):
+        c = pattern[i]
+        if c == "\\":
+            i += 2
+            continue
+        if c == "[":
+            i = _class_end(pattern, i)
+        elif c == "(":
+            depth += 1
+        elif c == ")":
+            depth -= 1
+        elif c == "|" and depth == 0:
+            branches.append(pattern[start:i])
+            start = i + 1
+        i += 1
+    branches.append(pattern[start:])
+    return branches
+
+
+def _class_end(pattern: str, i: int) -> int:
+    """Index of the "]" closing the character class opened at i."""
+    i += 2 if pattern[i + 1:i + 2] == "^" else 1
+    i += 1  # a leading "]" is a literal
+    while i < len(pattern) and pattern[i] != "]":
+        i += 2 if pattern[i] == "\\" else 1
+    return i
+
+
+def _group_end(pattern: str, i: int) -> int:
+    """Index of the ")" closing the group opened at i."""
+    depth = 0
+    while i < len(pattern):
+        c = pattern[i]
+        if c == "\\":
+            i += 1
+        elif c == "[":
+            i = _class_end(pattern, i)
+        elif c == "(":
+            depth += 1
+        elif c == ")":
+            depth -= 1
+            if depth == 0:
+                return i
+        i += 1
+    return i
+
+
+def required_literal(branch: str) -> Optional[str]:
+    """
+    Longest plain substring every match of a single regex branch contains.
+
+    Groups, classes and optional characters are skipped, so the result is
+    conservative: if it is absent from the text the branch cannot match.
+
+    Returns:
+        The lowercased literal, or None if there is none of at least 3 chars
+    """
+    runs, current, i = [], "", 0
+    while i < len(branch):
+        c = branch[i]
+        if c == "\\":
+            escaped = branch[i + 1:i + 2]
+            if escaped.isalnum():
+                runs.append(current)
+                current = ""
+            else:
+                current += escaped
+            i += 2
+            continue
+        if c in "[(":
+            runs.append(current)
+            current = ""
+            i = (_class_end if c == "[" else _group_end)(branch, i)
+        elif c in "?*{":
+            runs.append(current[:-1])
+            current = ""
+            if c == "{":
+                i = branch.find("}", i)
+        elif c in "+.^$":
+            runs.append(current)
+            current = ""
+        else:
+            current += c
+        i += 1
+    runs.append(current)
+    longest = max(runs, key=len)
+    return longest.lower() if len(longest) >= 3 else None
+
+
+class _LiteralIndex:
+    """
+    (technology, regex) pairs prefiltered by a required literal.
+
+    Each regex branch is keyed by a substring every match must contain.
+    A scan lowercases the text once and runs a cheap substring test per
+    branch; only branches whose literal is present run their regex. Most
+    fingerprints are absent from any given page, so the cost is dominated
+    by substring tests rather than regex scans, and the regex that does run
+    captures the version directly.
+    """
+
+    def __init__(self, entries: list[tuple[str, str]], word_bounded: bool = False):
+        self.entries = []
+        for name, pattern in entries:
+            for branch in _split_alternatives(pattern):
+                regex = f"(?<!\\w)(?:{branch})(?!\\w)" if word_bounded else branch
+                self.entries.append((required_literal(branch), name, re.compile(regex, re.IGNORECASE)))
+
+    def scan(self, text: str, found: dict):
+        if not text:
+            return
+        text_lower = text.lower()
+        for literal, name, pattern in self.entries:
+            if found.get(name) or (literal is not None and literal not in text_lower):
+                continue
+            match = pattern.search(text)
+            if match:
+                _record(found, name, _version(match))
+
+
+def _version(match: Optional[re.Match]) -> Optional[str]:
+    if match and match.re.groups and match.group(1):
+        return match.group(1)
+    return None
+
+
+def _record(found: dict, name: str, version: Optional[str]):
+    if name not in found or (version and not found[name]):
+        found[name] = version
+
+
+class FingerprintEngine:
+    """
+    Detects technologies from page signals using a compiled fingerprint index.
+
+    HTML, script URLs and prose each get a literal-prefiltered index, so a
+    regex only runs when its required substring occurs on the page.
+    Headers, cookies and meta tags are looked up by name in a dict index and
+    only the value patterns registered for names present on the page run.
+    """
+
+    def __init__(self, fingerprints: dict = FINGERPRINTS):
+        """
+        Initialize the engine.
+
+        Args:
+            fingerprints: {technology: fingerprint}, see FINGERPRINTS for the format
+        """
+        self.fingerprints = fingerprints
+        self.categories = {name: fp["category"] for name, fp in fingerprints.items()}
+
+        self.headers: dict[str, list] = {}
+        self.cookies: dict[str, list] = {}
+        self.meta: dict[str, list] = {}
+        html, scripts, mentions = [], [], []
+
+        for name, fp in fingerprints.items():
+            for index, key in ((self.headers, "headers"), (self.cookies, "cookies"), (self.meta, "meta")):
+                for field, pattern in fp.get(key, {}).items():
+                    index.setdefault(field.lower(), []).append((name, re.compile(pattern, re.IGNORECASE)))
+            html.extend((name, pattern) for pattern in fp.get("html", []))
+            scripts.extend((name, pattern) for pattern in fp.get("scripts", []))
+            if fp.get("mention"):
+                mentions.append((name, fp["mention"]))
+
+        self.html = _LiteralIndex(html)
+        self.scripts = _LiteralIndex(scripts)
+        self.mentions = _LiteralIndex(mentions, word_bounded=True)
+
+    def _lookup(self, index: dict, values: dict, found: dict):
+        for field, value in values.items():
+            for name, pattern in index.get(field.lower(), ()):
+                match = pattern.search(value or "")
+                if match:
+                    _record(found, name, _version(match))
+
+    def _with_implied(self, found: dict) -> dict:
+        pending = list(found)
+        while pending:
+            for implied in self.fingerprints[pending.pop()].get("implies", []):
+                if implied not in found:
+                    found[implied] = None
+                    pending.append(implied)
+        return found
+
+    def analyze(
+        self,
+        html: str = "",
+        headers: Optional[dict] = None,
+        cookies: Optional[dict] = None,
+        scripts: Iterable[str] = (),
+        meta: Optional[dict] = None,
+    ) -> dict:
+        """
+        Detect technologies on a page.
+
+        Args:
+            html: Page markup
+            headers: Response headers
+            cookies: {cookie name: value}
+            scripts: Script src URLs
+            meta: {meta name: content}
+
+        Returns:
+            {technology: version or None}, including implied technologies
+        """
+        found = {}
+        self._lookup(self.headers, headers or {}, found)
+        self._lookup(self.cookies, cookies or {}, found)
+        self._lookup(self.meta, meta or {}, found)
+        self.scripts.scan("\n".join(scripts), found)
+        self.html.scan(html, found)
+        return self._with_implied(found)
+
+    def analyze_text(self, text: str) -> dict:
+        """
+        Detect technologies mentioned in prose, such as an engineering blog post.
+
+        Returns:
+            {technology: None}, including implied technologies
+        """
+        found = {}
+        self.mentions.scan(text, found)
+        return self._with_implied(found)
+
+    def by_category(self, found: dict) -> dict:
+        """Group detected technologies as {category: [technology, ...]}."""
+        grouped: dict[str, list] = {}
+        for name in sorted(found):
+            grouped.setdefault(self.categories[name], []).append(name)
+        return grouped
+
+
+_shared_engine: Optional[FingerprintEngine] = None
+
+
+def get_fingerprint_engine() -> FingerprintEngine:
+    """Process-wide engine over FINGERPRINTS, compiled on first use."""
+    global _shared_engine
+    if _shared_engine is None:
+        _shared_engine = FingerprintEngine()
+    return _shared_engine
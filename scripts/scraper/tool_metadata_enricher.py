@@ -2,12 +2,15 @@
 Tool Metadata Enricher - Fetches comprehensive metadata for tools and updates Convex
 """
 import os
-import json
 import asyncio
 import httpx
 from datetime import datetime
 from typing import Optional
 from dotenv import load_dotenv
+from artifacts import load_artifact, save_artifact_async
+from npm_changes import NpmChangesFollower
+from npm_downloads import get_downloads_client
+from npm_registry import NpmRegistryError, fetch_package_lean, get_publish_time_cache
 
 load_dotenv()
 
@@ -124,39 +127,30 @@ async def fetch_npm_metadata(client: httpx.AsyncClient, package_name: str) -> Op
         return None
     
     try:
-        response = await client.get(f"https://registry.npmjs.org/{package_name}")
-        if response.status_code != 200:
+        try:
+            latest_info, time_data = await fetch_package_lean(client, package_name)
+        except NpmRegistryError:
             return None
-        
-        data = response.json()
-        latest_version = data.get("dist-tags", {}).get("latest")
-        latest_info = data.get("versions", {}).get(latest_version, {}) if latest_version else {}
-        time_data = data.get("time", {})
+        latest_version = latest_info.get("version")
         
         result = {
             "downloadsWeekly": 0,
             "version": latest_version,
-            "license": latest_info.get("license") or data.get("license"),
+            "license": latest_info.get("license"),
             "dependencies": len(latest_info.get("dependencies", {})),
             "devDependencies": len(latest_info.get("devDependencies", {})),
-            "maintainers": len(data.get("maintainers", [])),
-            "lastPublished": time_data.get(latest_version) if latest_version else None,
+            "maintainers": len(latest_info.get("maintainers", [])),
+            "lastPublished": time_data.get("latest_published"),
             "firstPublished": time_data.get("created"),
             "types": "types" in latest_info or "@types" in package_name,
-            "keywords": latest_info.get("keywords", []) or data.get("keywords", []),
+            "keywords": latest_info.get("keywords", []),
         }
         
-        weekly_response = await client.get(f"https://api.npmjs.org/downloads/point/last-week/{package_name}")
-        if weekly_response.status_code == 200:
-            result["downloadsWeekly"] = weekly_response.json().get("downloads", 0)
-        
-        monthly_response = await client.get(f"https://api.npmjs.org/downloads/point/last-month/{package_name}")
-        if monthly_response.status_code == 200:
-            result["downloadsMonthly"] = monthly_response.json().get("downloads", 0)
-        
-        yearly_response = await client.get(f"https://api.npmjs.org/downloads/point/last-year/{package_name}")
-        if yearly_response.status_code == 200:
-            result["downloadsYearly"] = yearly_response.json().get("downloads", 0)
+        downloads = await get_downloads_client().get(client, package_name)
+        if downloads:
+            result["downloadsWeekly"] = downloads["weekly"]
+            result["downloadsMonthly"] = downloads["monthly"]
+            result["downloadsYearly"] = downloads["yearly"]
         
         return result
     except Exception as e:
@@ -295,17 +289,39 @@ TOOL_METADATA_MAP = {
 }
 
 
-async def enrich_tool_metadata(tool: dict) -> dict:
-    """Enrich a single tool with external metadata."""
+def resolve_npm_package(tool: dict) -> Optional[str]:
+    """npm package of a tool, from Convex or the built-in metadata map."""
+    return tool.get("npmPackageName") or TOOL_METADATA_MAP.get(tool.get("slug", ""), {}).get("npm")
+
+
+async def enrich_tool_metadata(
+    tool: dict,
+    previous: Optional[dict] = None,
+    npm_changed: Optional[set] = None,
+) -> dict:
+    """
+    Enrich a single tool with external metadata.
+    
+    Args:
+        tool: Tool from Convex
+        previous: externalData from the previous run, if any
+        npm_changed: Packages published since the previous run; when given,
+            npm and bundlephobia data of other packages is reused from
+            previous with fresh download stats
+    """
     slug = tool.get("slug", "")
     github_url = tool.get("githubUrl")
-    npm_package = tool.get("npmPackageName")
+    npm_package = resolve_npm_package(tool)
     
     metadata_config = TOOL_METADATA_MAP.get(slug, {})
     if not github_url and "github" in metadata_config:
         github_url = metadata_config["github"]
-    if not npm_package and "npm" in metadata_config:
-        npm_package = metadata_config["npm"]
+    
+    reuse_npm = (
+        npm_changed is not None
+        and npm_package not in npm_changed
+        and bool(previous and previous.get("npm"))
+    )
     
     external_data = {}
     
@@ -317,7 +333,18 @@ async def enrich_tool_metadata(tool: dict) -> dict:
                 external_data["github"] = github_data
             await asyncio.sleep(0.5)
         
-        if npm_package:
+        if npm_package and reuse_npm:
+            print(f"  Reusing npm data for {slug} ({npm_package}), unchanged since last run")
+            npm_data = dict(previous["npm"])
+            downloads = await get_downloads_client().get(client, npm_package)
+            if downloads:
+                npm_data["downloadsWeekly"] = downloads["weekly"]
+                npm_data["downloadsMonthly"] = downloads["monthly"]
+                npm_data["downloadsYearly"] = downloads["yearly"]
+            external_data["npm"] = npm_data
+            if previous.get("bundlephobia"):
+                external_data["bundlephobia"] = previous["bundlephobia"]
+        elif npm_package:
             print(f"  Fetching npm data for {slug} ({npm_package})...")
             npm_data = await fetch_npm_metadata(client, npm_package)
             if npm_data:
@@ -364,13 +391,35 @@ async def main():
     tools = await fetch_all_tools_from_convex()
     print(f"Found {len(tools)} tools")
     
+    npm_packages = [resolve_npm_package(tool) for tool in tools]
+    previous = (load_artifact("enriched_tools") or {}).get("tools", {})
+    follower = NpmChangesFollower("tool_metadata_enricher")
+    
+    async with httpx.AsyncClient(timeout=30.0) as client:
+        try:
+            npm_changed = set(await follower.follow(client, filter(None, npm_packages)))
+            print(f"npm changes feed: {len(npm_changed)} tracked packages to refresh")
+        except Exception as e:
+            print(f"Error reading npm changes feed ({e}), refreshing every package")
+            npm_changed = None
+        
+        print("Prefetching npm download stats...")
+        await get_downloads_client().get_many(client, npm_packages)
+    
     enriched_data = {}
+    refreshed_packages = []
     
     for i, tool in enumerate(tools):
         slug = tool.get("slug", "unknown")
         print(f"\n[{i+1}/{len(tools)}] Processing: {tool.get('name', slug)}")
         
-        external_data = await enrich_tool_metadata(tool)
+        external_data = await enrich_tool_metadata(
+            tool,
+            previous=previous.get(slug, {}).get("externalData"),
+            npm_changed=npm_changed,
+        )
+        if "npm" in external_data and npm_packages[i]:
+            refreshed_packages.append(npm_packages[i])
         
         if external_data:
             enriched_data[slug] = {
@@ -383,17 +432,15 @@ async def main():
         else:
             print(f"  No external data found")
     
-    output_dir = os.path.join(os.path.dirname(__file__), "data")
-    os.makedirs(output_dir, exist_ok=True)
+    get_publish_time_cache().save()
+    follower.acknowledge(refreshed_packages)
     
-    output_path = os.path.join(output_dir, "enriched_tools.json")
-    with open(output_path, "w") as f:
-        json.dump({
-            "scraped_at": datetime.now().isoformat(),
-            "total_tools": len(tools),
-            "enriched_count": len(enriched_data),
-            "tools": enriched_data,
-        }, f, indent=2)
+    output_path = await save_artifact_async("enriched_tools", {
+        "scraped_at": datetime.now().isoformat(),
+        "total_tools": len(tools),
+        "enriched_count": len(enriched_data),
+        "tools": enriched_data,
+    })
     
     print(f"\n{'=' * 60}")
     print(f"Enrichment complete!")
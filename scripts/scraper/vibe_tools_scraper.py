@@ -3,14 +3,29 @@ Vibe Tools Scraper - Discovers AI coding workflow and orchestration tools
 Scrapes directories, GitHub, and curated lists for vibe coding tools
 """
 import os
-import json
 import httpx
 from bs4 import BeautifulSoup
-from typing import Optional
+from typing import Awaitable, Callable, Optional
 import asyncio
 import re
 from datetime import datetime
 from urllib.parse import urljoin, urlparse
+from dotenv import load_dotenv
+from artifacts import save_artifact_async
+from awesome_lists_scraper import extract_list_items
+from bot_avoidance import get_api_headers
+from cache_manager import CacheManager, ConditionalFetcher
+import search_service
+from website_metadata import get_website_metadata_service
+
+load_dotenv()
+
+GITHUB_TOKEN = os.getenv("GITHUB_TOKEN")
+
+# README locations rarely change; their content is revalidated with ETags
+README_URL_TTL_HOURS = 720
+cache = CacheManager(cache_dir="cache", default_ttl_hours=168)
+conditional_fetcher = ConditionalFetcher(cache)
 
 
 VIBE_TOOL_DIRECTORIES = [
@@ -679,124 +694,129 @@ VIBE_TOOL_CATEGORIES = {
 
 
 async def scrape_website_for_tools(client: httpx.AsyncClient, url: str) -> dict:
-    """Scrape a website and extract tool metadata."""
-    headers = {
-        "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
-        "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+    """Scrape a website and extract tool metadata (via the shared website metadata service)."""
+    record = await get_website_metadata_service().get(client, url)
+    if "error" in record:
+        return {"error": record["error"], "url": url}
+    
+    meta, links, features = record["meta"] or {}, record["links"] or {}, record["features"] or {}
+    og = meta.get("og") or {}
+    return {
+        "url": record["final_url"],
+        "title": meta.get("title"),
+        "description": meta.get("description") or og.get("description"),
+        "og_title": og.get("title"),
+        "og_image": og.get("image"),
+        "github_url": links.get("github_url"),
+        "features_detected": features.get("workflow", []),
+        "supported_agents": features.get("supported_agents", []),
+        "scraped_at": record["fetched_at"],
     }
+
+
+async def resolve_readme_url(client: httpx.AsyncClient, owner: str, repo: str) -> str:
+    """
+    Raw URL of a repo's default-branch README, resolved once and cached.
+    
+    The contents API names both the default branch and the README's actual
+    file name (README.md, readme.md, README.rst...). If it fails (e.g.
+    unauthenticated rate limit), raw HEAD/README.md is used uncached.
+    """
+    cache_key = f"github:readme_url:{owner}/{repo}"
+    cached = cache.get(cache_key, ttl_hours=README_URL_TTL_HOURS)
+    if cached:
+        return cached["download_url"]
     
     try:
-        response = await client.get(url, headers=headers, follow_redirects=True, timeout=15.0)
-        if response.status_code != 200:
-            return {"error": f"HTTP {response.status_code}", "url": url}
-        
-        soup = BeautifulSoup(response.text, "lxml")
-        
-        title = soup.title.string.strip() if soup.title and soup.title.string else None
-        
-        meta_desc = soup.find("meta", attrs={"name": "description"})
-        description = meta_desc.get("content") if meta_desc else None
-        
-        og_title = soup.find("meta", property="og:title")
-        og_desc = soup.find("meta", property="og:description")
-        og_image = soup.find("meta", property="og:image")
-        
-        github_url = None
-        for a in soup.find_all("a", href=True):
-            href = a.get("href", "")
-            if "github.com" in href and "/issues" not in href and "/pull" not in href:
-                github_url = href
-                break
-        
-        features = []
-        page_text = soup.get_text(separator=" ", strip=True).lower()
-        
-        feature_indicators = [
-            ("parallel execution", "Parallel agent execution"),
-            ("git worktree", "Git worktree isolation"),
-            ("code review", "AI code review"),
-            ("multi-agent", "Multi-agent support"),
-            ("mcp", "MCP integration"),
-            ("vs code", "VS Code extension"),
-            ("vscode", "VS Code extension"),
-            ("cli", "CLI interface"),
-            ("terminal", "Terminal-based"),
-            ("autonomous", "Autonomous operation"),
-            ("self-healing", "Self-healing code"),
-            ("context", "Context-aware"),
-        ]
-        
-        for keyword, feature_name in feature_indicators:
-            if keyword in page_text:
-                features.append(feature_name)
-        
-        supported_agents = []
-        agent_names = ["claude code", "gemini cli", "aider", "copilot", "cursor", "cline", "opencode", "amp"]
-        for agent in agent_names:
-            if agent in page_text:
-                supported_agents.append(agent.title())
-        
-        return {
-            "url": str(response.url),
-            "title": title,
-            "description": description or (og_desc.get("content") if og_desc else None),
-            "og_title": og_title.get("content") if og_title else None,
-            "og_image": og_image.get("content") if og_image else None,
-            "github_url": github_url,
-            "features_detected": list(set(features)),
-            "supported_agents": list(set(supported_agents)),
-            "scraped_at": datetime.now().isoformat(),
-        }
+        response = await client.get(
+            f"https://api.github.com/repos/{owner}/{repo}/readme",
+            headers=get_api_headers(api_key=GITHUB_TOKEN),
+            timeout=15.0,
+        )
+        if response.status_code == 200 and response.json().get("download_url"):
+            download_url = response.json()["download_url"]
+            cache.set(cache_key, {"download_url": download_url}, ttl_hours=README_URL_TTL_HOURS)
+            return download_url
     except Exception as e:
-        return {"error": str(e), "url": url}
+        print(f"Error resolving README for {owner}/{repo}: {e}")
+    
+    return f"https://raw.githubusercontent.com/{owner}/{repo}/HEAD/README.md"
+
+
+async def fetch_markdown(client: httpx.AsyncClient, raw_url: str) -> Optional[str]:
+    """Fetch raw markdown, revalidating the cached copy with a conditional request."""
+    cache_key = f"awesome_markdown:{raw_url}"
+    cached = cache.get(cache_key)
+    
+    headers = conditional_fetcher.get_conditional_headers(raw_url) if cached else {}
+    response = await client.get(raw_url, headers=headers, follow_redirects=True, timeout=15.0)
+    
+    if response.status_code == 304 and cached:
+        cache.set(cache_key, cached)
+        return cached["content"]
+    if response.status_code != 200:
+        return None
+    
+    cache.set(cache_key, {"content": response.text})
+    conditional_fetcher.update_headers(
+        raw_url, response.headers.get("ETag"), response.headers.get("Last-Modified")
+    )
+    return response.text
+
+
+def markdown_section(content: str, anchor: str) -> str:
+    """
+    The part of a markdown document under the heading a URL fragment points to.
+    
+    Headings are matched by GitHub's anchor slug (lowercased, punctuation
+    dropped, spaces to hyphens); the whole document is returned if none match.
+    """
+    headings = list(re.finditer(r'^(#{1,6})\s+(.+?)\s*#*$', content, re.M))
+    for i, heading in enumerate(headings):
+        slug = re.sub(r'[^\w\- ]', '', heading.group(2).lower()).replace(" ", "-")
+        if slug != anchor.lower():
+            continue
+        level = len(heading.group(1))
+        end = next((h.start() for h in headings[i + 1:] if len(h.group(1)) <= level), len(content))
+        return content[heading.end():end]
+    return content
 
 
 async def scrape_github_awesome_list(client: httpx.AsyncClient, repo_url: str) -> list[dict]:
-    """Scrape tools from a GitHub awesome list."""
-    headers = {
-        "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36",
-        "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
-    }
+    """
+    Scrape tools from a GitHub awesome list.
     
+    Reads the README's raw markdown (resolved once per repo, revalidated with
+    ETags) instead of the rendered repo page; a #fragment in repo_url limits
+    the list to that section.
+    """
     tools = []
     
+    parsed = urlparse(repo_url)
+    parts = parsed.path.strip("/").split("/")
+    if len(parts) < 2:
+        return tools
+    owner, repo = parts[0], parts[1]
+    
     try:
-        response = await client.get(repo_url, headers=headers, follow_redirects=True, timeout=15.0)
-        if response.status_code != 200:
+        raw_url = await resolve_readme_url(client, owner, repo)
+        content = await fetch_markdown(client, raw_url)
+        if content is None:
             return tools
         
-        soup = BeautifulSoup(response.text, "lxml")
-        readme = soup.find("article", class_="markdown-body")
+        if parsed.fragment:
+            content = markdown_section(content, parsed.fragment)
         
-        if not readme:
-            return tools
+        # Relative links point into the repo, as they do on the rendered page
+        base_url = f"https://github.com/{owner}/{repo}/blob/HEAD/"
         
-        for li in readme.find_all("li"):
-            a_tag = li.find("a")
-            if not a_tag:
-                continue
-            
-            href = a_tag.get("href", "")
-            name = a_tag.get_text(strip=True)
-            
-            if not href or not name:
-                continue
-            
-            if href.startswith("#"):
-                continue
-            
-            description = ""
-            text = li.get_text(strip=True)
-            if " - " in text:
-                description = text.split(" - ", 1)[1]
-            elif ": " in text:
-                description = text.split(": ", 1)[1]
-            
-            if len(name) > 2 and len(name) < 100:
+        for item in extract_list_items(content):
+            name = item["text"]
+            if 2 < len(name) < 100:
                 tools.append({
                     "name": name,
-                    "url": href,
-                    "description": description[:500] if description else "",
+                    "url": urljoin(base_url, item["url"]),
+                    "description": item["description"][:500],
                     "source": repo_url,
                 })
         
@@ -889,45 +909,15 @@ async def search_for_vibe_tools(client: httpx.AsyncClient) -> list[dict]:
     ]
     
     for query in search_queries:
-        try:
-            url = "https://html.duckduckgo.com/html/"
-            headers = {
-                "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36"
-            }
-            
-            response = await client.post(url, data={"q": query}, headers=headers, timeout=15.0)
-            if response.status_code != 200:
-                continue
-            
-            soup = BeautifulSoup(response.text, "lxml")
-            
-            for result in soup.select(".result")[:5]:
-                title_elem = result.select_one(".result__title")
-                snippet_elem = result.select_one(".result__snippet")
-                
-                if title_elem:
-                    a_tag = title_elem.select_one("a")
-                    if a_tag and a_tag.get("href"):
-                        href = a_tag.get("href", "")
-                        link = ""
-                        if "uddg=" in href:
-                            import urllib.parse
-                            parsed = urllib.parse.parse_qs(urllib.parse.urlparse(href).query)
-                            link = parsed.get("uddg", [""])[0]
-                        else:
-                            link = href
-                        
-                        if link and not any(x in link for x in ["google.com", "bing.com", "duckduckgo.com"]):
-                            discovered.append({
-                                "name": title_elem.get_text(strip=True),
-                                "url": link,
-                                "description": snippet_elem.get_text(strip=True) if snippet_elem else "",
-                                "source": f"search:{query}",
-                            })
-            
-            await asyncio.sleep(2)
-        except Exception as e:
-            print(f"Search error for '{query}': {e}")
+        for result in await search_service.search(client, query, max_results=5):
+            link = result["url"]
+            if link and not any(x in link for x in ["google.com", "bing.com", "duckduckgo.com"]):
+                discovered.append({
+                    "name": result["title"],
+                    "url": link,
+                    "description": result["snippet"],
+                    "source": f"search:{query}",
+                })
     
     return discovered
 
@@ -955,8 +945,14 @@ def deduplicate_tools(tools: list[dict]) -> list[dict]:
     return unique_tools
 
 
-async def scrape_vibe_tools() -> dict:
-    """Main function to scrape and discover vibe coding tools."""
+async def scrape_vibe_tools(emit: Optional[Callable[[str, dict], Awaitable[None]]] = None) -> dict:
+    """
+    Main function to scrape and discover vibe coding tools.
+    
+    Args:
+        emit: Optional async callback receiving (section, tool) as each tool
+            is scraped, so a sync consumer can upsert while scraping continues
+    """
     results = {
         "scraped_at": datetime.now().isoformat(),
         "known_tools": [],
@@ -975,6 +971,8 @@ async def scrape_vibe_tools() -> dict:
                 **tool,
                 "metadata": metadata,
             })
+            if emit:
+                await emit("known_tools", results["known_tools"][-1])
             await asyncio.sleep(1)
         
         print("\nScraping awesome lists...")
@@ -983,6 +981,9 @@ async def scrape_vibe_tools() -> dict:
                 print(f"  - {directory['name']}")
                 tools = await scrape_github_awesome_list(client, directory["url"])
                 results["awesome_list_tools"].extend(tools)
+                if emit:
+                    for found in tools:
+                        await emit("awesome_list_tools", found)
                 await asyncio.sleep(2)
         
         print("\nScraping MCP directories...")
@@ -991,11 +992,17 @@ async def scrape_vibe_tools() -> dict:
                 print(f"  - {directory['name']}")
                 tools = await scrape_mcp_directory(client, directory)
                 results["mcp_directory_tools"].extend(tools)
+                if emit:
+                    for found in tools:
+                        await emit("mcp_directory_tools", found)
                 await asyncio.sleep(2)
         
         print("\nSearching for new vibe tools...")
         discovered = await search_for_vibe_tools(client)
         results["discovered_tools"] = discovered
+        if emit:
+            for found in discovered:
+                await emit("discovered_tools", found)
         
         all_tools = (
             [{"name": t["name"], "url": t["url"]} for t in results["known_tools"]] +
@@ -1007,6 +1014,7 @@ async def scrape_vibe_tools() -> dict:
         results["total_unique_tools"] = len(unique_tools)
         results["all_unique_tools"] = unique_tools
     
+    get_website_metadata_service().save()
     return results
 
 
@@ -1014,12 +1022,7 @@ if __name__ == "__main__":
     async def main():
         results = await scrape_vibe_tools()
         
-        output_dir = os.path.join(os.path.dirname(__file__), "data")
-        os.makedirs(output_dir, exist_ok=True)
-        
-        output_path = os.path.join(output_dir, "vibe_tools.json")
-        with open(output_path, "w") as f:
-            json.dump(results, f, indent=2)
+        output_path = await save_artifact_async("vibe_tools", results)
         
         mcp_tools = [t for t in results.get("known_tools", []) if t.get("category") == "mcp"]
         
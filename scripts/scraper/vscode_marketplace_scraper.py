@@ -1,12 +1,11 @@
 """
 VS Code Marketplace Scraper - Fetches extension metadata from VS Code Marketplace
 """
-import os
-import json
 import asyncio
 import httpx
 from datetime import datetime
 from typing import Optional
+from artifacts import save_artifact_async
 
 
 EXTENSION_CATEGORIES = [
@@ -79,136 +78,189 @@ POPULAR_EXTENSIONS = [
 MARKETPLACE_API = "https://marketplace.visualstudio.com/_apis/public/gallery/extensionquery"
 
 
-async def fetch_extension_details(client: httpx.AsyncClient, extension_id: str) -> dict:
-    """Fetch details for a specific extension."""
-    payload = {
-        "filters": [
-            {
-                "criteria": [
-                    {"filterType": 7, "value": extension_id}
-                ]
-            }
+MARKETPLACE_HEADERS = {
+    "Content-Type": "application/json",
+    "Accept": "application/json;api-version=7.1-preview.1",
+}
+
+QUERY_FLAGS = 950
+
+# Extension IDs resolved by a single filter (criteria are OR'ed)
+DETAIL_BATCH_SIZE = 50
+
+SEARCH_QUERIES = [
+    "ai coding",
+    "copilot",
+    "code completion",
+    "ai assistant",
+    "developer tools",
+    "productivity",
+    "react",
+    "typescript",
+    "tailwind",
+    "prisma",
+]
+
+
+def _extension_id(ext: dict) -> str:
+    return f"{ext.get('publisher', {}).get('publisherName')}.{ext.get('extensionName')}"
+
+
+def parse_extension(ext: dict) -> dict:
+    """Convert a gallery extension object into our extension record."""
+    statistics = {}
+    for stat in ext.get("statistics", []):
+        statistics[stat["statisticName"]] = stat["value"]
+    
+    versions = ext.get("versions", [])
+    latest_version = versions[0] if versions else {}
+    
+    properties = {}
+    for prop in latest_version.get("properties", []):
+        properties[prop["key"]] = prop["value"]
+    
+    extension_id = _extension_id(ext)
+    return {
+        "id": ext.get("extensionId"),
+        "name": ext.get("extensionName"),
+        "display_name": ext.get("displayName"),
+        "publisher": ext.get("publisher", {}).get("publisherName"),
+        "publisher_display_name": ext.get("publisher", {}).get("displayName"),
+        "short_description": ext.get("shortDescription"),
+        "version": latest_version.get("version"),
+        "last_updated": latest_version.get("lastUpdated"),
+        "published_date": ext.get("publishedDate"),
+        "install_count": statistics.get("install", 0),
+        "average_rating": statistics.get("averagerating", 0),
+        "rating_count": statistics.get("ratingcount", 0),
+        "trending_daily": statistics.get("trendingdaily", 0),
+        "trending_weekly": statistics.get("trendingweekly", 0),
+        "trending_monthly": statistics.get("trendingmonthly", 0),
+        "categories": ext.get("categories", []),
+        "tags": ext.get("tags", []),
+        "repository": properties.get("Microsoft.VisualStudio.Services.Links.Source"),
+        "homepage": properties.get("Microsoft.VisualStudio.Services.Links.Homepage"),
+        "marketplace_url": f"https://marketplace.visualstudio.com/items?itemName={extension_id}",
+    }
+
+
+def _summarize_search_result(ext: dict) -> dict:
+    statistics = {}
+    for stat in ext.get("statistics", []):
+        statistics[stat["statisticName"]] = stat["value"]
+    
+    return {
+        "id": _extension_id(ext),
+        "name": ext.get("extensionName"),
+        "display_name": ext.get("displayName"),
+        "publisher": ext.get("publisher", {}).get("publisherName"),
+        "short_description": ext.get("shortDescription"),
+        "install_count": statistics.get("install", 0),
+        "average_rating": statistics.get("averagerating", 0),
+        "categories": ext.get("categories", []),
+    }
+
+
+def detail_filter(extension_ids: list[str]) -> dict:
+    """Filter resolving several extension IDs ("publisher.name") at once."""
+    return {
+        "criteria": [{"filterType": 7, "value": ext_id} for ext_id in extension_ids],
+        "pageNumber": 1,
+        "pageSize": len(extension_ids),
+    }
+
+
+def search_filter(query: str, page_size: int = 50) -> dict:
+    """Filter searching VS Code extensions by text, most installed first."""
+    return {
+        "criteria": [
+            {"filterType": 10, "value": query},
+            {"filterType": 8, "value": "Microsoft.VisualStudio.Code"},
         ],
-        "flags": 950
+        "pageNumber": 1,
+        "pageSize": page_size,
+        "sortBy": 4,
+        "sortOrder": 0,
     }
+
+
+async def query_marketplace(client: httpx.AsyncClient, filters: list[dict]) -> list[list[dict]]:
+    """
+    Run several filters in one ExtensionQuery request.
+    
+    Returns:
+        The raw extensions matched by each filter, in filter order
+    """
+    response = await client.post(
+        MARKETPLACE_API,
+        json={"filters": filters, "flags": QUERY_FLAGS},
+        headers=MARKETPLACE_HEADERS,
+    )
+    response.raise_for_status()
+    
+    results = response.json().get("results", [])
+    return [
+        results[i].get("extensions", []) if i < len(results) else []
+        for i in range(len(filters))
+    ]
+
+
+def _match_details(extension_ids: list[str], extensions: list[dict]) -> dict:
+    by_id = {_extension_id(ext).lower(): ext for ext in extensions}
+    details = {}
+    for ext_id in extension_ids:
+        ext = by_id.get(ext_id.lower())
+        details[ext_id] = parse_extension(ext) if ext else {"id": ext_id, "error": "Not found"}
+    return details
+
+
+async def fetch_extension_details(client: httpx.AsyncClient, extension_id: str) -> dict:
+    """Fetch details for a specific extension."""
+    return (await fetch_extensions_batch(client, [extension_id]))[extension_id]
+
+
+async def fetch_extensions_batch(
+    client: httpx.AsyncClient,
+    extension_ids: list[str],
+    batch_size: int = DETAIL_BATCH_SIZE,
+) -> dict:
+    """
+    Fetch details for many extensions, batch_size IDs per filter, one request.
     
+    Returns:
+        Mapping of requested extension ID to its record (or an error record)
+    """
+    chunks = [extension_ids[i:i + batch_size] for i in range(0, len(extension_ids), batch_size)]
     try:
-        response = await client.post(
-            MARKETPLACE_API,
-            json=payload,
-            headers={
-                "Content-Type": "application/json",
-                "Accept": "application/json;api-version=7.1-preview.1",
-            }
-        )
-        response.raise_for_status()
-        
-        data = response.json()
-        results = data.get("results", [])
-        
-        if not results or not results[0].get("extensions"):
-            return {"id": extension_id, "error": "Not found"}
-        
-        ext = results[0]["extensions"][0]
-        
-        statistics = {}
-        for stat in ext.get("statistics", []):
-            statistics[stat["statisticName"]] = stat["value"]
-        
-        versions = ext.get("versions", [])
-        latest_version = versions[0] if versions else {}
-        
-        properties = {}
-        for prop in latest_version.get("properties", []):
-            properties[prop["key"]] = prop["value"]
-        
-        return {
-            "id": ext.get("extensionId"),
-            "name": ext.get("extensionName"),
-            "display_name": ext.get("displayName"),
-            "publisher": ext.get("publisher", {}).get("publisherName"),
-            "publisher_display_name": ext.get("publisher", {}).get("displayName"),
-            "short_description": ext.get("shortDescription"),
-            "version": latest_version.get("version"),
-            "last_updated": latest_version.get("lastUpdated"),
-            "published_date": ext.get("publishedDate"),
-            "install_count": statistics.get("install", 0),
-            "average_rating": statistics.get("averagerating", 0),
-            "rating_count": statistics.get("ratingcount", 0),
-            "trending_daily": statistics.get("trendingdaily", 0),
-            "trending_weekly": statistics.get("trendingweekly", 0),
-            "trending_monthly": statistics.get("trendingmonthly", 0),
-            "categories": ext.get("categories", []),
-            "tags": ext.get("tags", []),
-            "repository": properties.get("Microsoft.VisualStudio.Services.Links.Source"),
-            "homepage": properties.get("Microsoft.VisualStudio.Services.Links.Homepage"),
-            "marketplace_url": f"https://marketplace.visualstudio.com/items?itemName={extension_id}",
-        }
+        matched = await query_marketplace(client, [detail_filter(chunk) for chunk in chunks])
     except Exception as e:
-        print(f"Error fetching extension {extension_id}: {e}")
-        return {"id": extension_id, "error": str(e)}
+        print(f"Error fetching extensions: {e}")
+        return {ext_id: {"id": ext_id, "error": str(e)} for ext_id in extension_ids}
+    
+    details = {}
+    for chunk, extensions in zip(chunks, matched):
+        details.update(_match_details(chunk, extensions))
+    return details
 
 
 async def search_extensions(client: httpx.AsyncClient, query: str, page_size: int = 50) -> list:
     """Search for extensions by query."""
-    payload = {
-        "filters": [
-            {
-                "criteria": [
-                    {"filterType": 10, "value": query},
-                    {"filterType": 8, "value": "Microsoft.VisualStudio.Code"},
-                ],
-                "pageNumber": 1,
-                "pageSize": page_size,
-                "sortBy": 4,
-                "sortOrder": 0,
-            }
-        ],
-        "flags": 950
-    }
-    
     try:
-        response = await client.post(
-            MARKETPLACE_API,
-            json=payload,
-            headers={
-                "Content-Type": "application/json",
-                "Accept": "application/json;api-version=7.1-preview.1",
-            }
-        )
-        response.raise_for_status()
-        
-        data = response.json()
-        results = data.get("results", [])
-        
-        if not results:
-            return []
-        
-        extensions = []
-        for ext in results[0].get("extensions", []):
-            statistics = {}
-            for stat in ext.get("statistics", []):
-                statistics[stat["statisticName"]] = stat["value"]
-            
-            extensions.append({
-                "id": f"{ext.get('publisher', {}).get('publisherName')}.{ext.get('extensionName')}",
-                "name": ext.get("extensionName"),
-                "display_name": ext.get("displayName"),
-                "publisher": ext.get("publisher", {}).get("publisherName"),
-                "short_description": ext.get("shortDescription"),
-                "install_count": statistics.get("install", 0),
-                "average_rating": statistics.get("averagerating", 0),
-                "categories": ext.get("categories", []),
-            })
-        
-        return extensions
+        matched = await query_marketplace(client, [search_filter(query, page_size)])
     except Exception as e:
         print(f"Error searching extensions for '{query}': {e}")
         return []
+    return [_summarize_search_result(ext) for ext in matched[0]]
 
 
-async def scrape_vscode_marketplace() -> dict:
-    """Scrape VS Code Marketplace for extensions."""
+async def scrape_vscode_marketplace(batch_size: int = DETAIL_BATCH_SIZE, search_page_size: int = 20) -> dict:
+    """
+    Scrape VS Code Marketplace for extensions.
+    
+    Detail lookups for every known extension and all search queries are
+    sent as filters of a single ExtensionQuery request; search results
+    already covered by the detail set are not added twice.
+    """
     results = {
         "scraped_at": datetime.now().isoformat(),
         "ai_extensions": {},
@@ -217,55 +269,41 @@ async def scrape_vscode_marketplace() -> dict:
         "all_extensions": [],
     }
     
-    seen_extensions = set()
+    detail_ids = list(dict.fromkeys(AI_EXTENSIONS + POPULAR_EXTENSIONS))
+    chunks = [detail_ids[i:i + batch_size] for i in range(0, len(detail_ids), batch_size)]
+    filters = [detail_filter(chunk) for chunk in chunks]
+    filters.extend(search_filter(query, search_page_size) for query in SEARCH_QUERIES)
     
+    print(f"  Querying {len(detail_ids)} extensions and {len(SEARCH_QUERIES)} searches in one request...")
     async with httpx.AsyncClient(timeout=30.0) as client:
-        for ext_id in AI_EXTENSIONS:
-            print(f"  Fetching AI extension: {ext_id}...")
-            ext_data = await fetch_extension_details(client, ext_id)
-            results["ai_extensions"][ext_id] = ext_data
-            
-            if "error" not in ext_data and ext_id not in seen_extensions:
-                seen_extensions.add(ext_id)
-                results["all_extensions"].append(ext_data)
-            
-            await asyncio.sleep(0.5)
-        
-        for ext_id in POPULAR_EXTENSIONS:
-            print(f"  Fetching popular extension: {ext_id}...")
-            ext_data = await fetch_extension_details(client, ext_id)
-            results["popular_extensions"][ext_id] = ext_data
+        try:
+            matched = await query_marketplace(client, filters)
+        except Exception as e:
+            print(f"Error querying marketplace: {e}")
+            matched = [[] for _ in filters]
+    
+    details = {}
+    for chunk, extensions in zip(chunks, matched[:len(chunks)]):
+        details.update(_match_details(chunk, extensions))
+    
+    seen_extensions = set()
+    for group, ext_ids in (("ai_extensions", AI_EXTENSIONS), ("popular_extensions", POPULAR_EXTENSIONS)):
+        for ext_id in ext_ids:
+            ext_data = details[ext_id]
+            results[group][ext_id] = ext_data
             
-            if "error" not in ext_data and ext_id not in seen_extensions:
-                seen_extensions.add(ext_id)
+            if "error" not in ext_data and ext_id.lower() not in seen_extensions:
+                seen_extensions.add(ext_id.lower())
                 results["all_extensions"].append(ext_data)
-            
-            await asyncio.sleep(0.5)
-        
-        search_queries = [
-            "ai coding",
-            "copilot",
-            "code completion",
-            "ai assistant",
-            "developer tools",
-            "productivity",
-            "react",
-            "typescript",
-            "tailwind",
-            "prisma",
-        ]
+    
+    for query, extensions in zip(SEARCH_QUERIES, matched[len(chunks):]):
+        search_results = [_summarize_search_result(ext) for ext in extensions]
+        results["search_results"][query] = search_results
         
-        for query in search_queries:
-            print(f"  Searching: {query}...")
-            search_results = await search_extensions(client, query, page_size=20)
-            results["search_results"][query] = search_results
-            
-            for ext in search_results:
-                if ext["id"] not in seen_extensions:
-                    seen_extensions.add(ext["id"])
-                    results["all_extensions"].append(ext)
-            
-            await asyncio.sleep(1)
+        for ext in search_results:
+            if ext["id"].lower() not in seen_extensions:
+                seen_extensions.add(ext["id"].lower())
+                results["all_extensions"].append(ext)
     
     results["total_unique_extensions"] = len(results["all_extensions"])
     return results
@@ -276,12 +314,7 @@ if __name__ == "__main__":
         print("Scraping VS Code Marketplace...")
         results = await scrape_vscode_marketplace()
         
-        output_dir = os.path.join(os.path.dirname(__file__), "data")
-        os.makedirs(output_dir, exist_ok=True)
-        
-        output_path = os.path.join(output_dir, "vscode_marketplace.json")
-        with open(output_path, "w") as f:
-            json.dump(results, f, indent=2)
+        output_path = await save_artifact_async("vscode_marketplace", results)
         
         print(f"\nSaved {results['total_unique_extensions']} unique extensions to {output_path}")
     
@@ -2,314 +2,105 @@
 Web Search - General web search for tool information using DuckDuckGo
 Enhanced with AI-powered tool extraction and comprehensive metadata
 """
-import os
-import json
 import httpx
-from bs4 import BeautifulSoup
 from typing import Optional
 import asyncio
-import re
-from datetime import datetime
-from bot_avoidance import (
-    get_realistic_headers,
-    random_delay,
-    retry_with_backoff,
-    RateLimiter,
-    create_client_with_limits,
-)
+from bot_avoidance import create_client_with_limits
+from artifacts import save_artifact_async
+import search_service
+from website_metadata import get_website_metadata_service
 
-rate_limiter = RateLimiter(requests_per_minute=20)
 
-
-PRICING_PATTERNS = [
-    r'\$(\d+(?:\.\d{2})?)\s*(?:/\s*(?:mo|month|user|seat))?',
-    r'(\d+)\s*(?:USD|dollars?)\s*(?:per\s*)?(?:month|mo|user)?',
-    r'free\s*(?:tier|plan|forever)?',
-    r'open\s*source',
-    r'(?:starts?\s*(?:at|from)\s*)?\$(\d+)',
-]
-
-FEATURE_KEYWORDS = [
-    "ai-powered", "real-time", "collaboration", "api", "sdk", "cli",
-    "self-hosted", "cloud", "serverless", "edge", "typescript",
-    "react", "vue", "svelte", "next.js", "authentication", "database",
-    "analytics", "monitoring", "testing", "deployment", "ci/cd",
-    "open source", "enterprise", "team", "solo", "free tier",
-]
-
-INTEGRATION_PATTERNS = [
-    r'integrat(?:es?|ion)\s+with\s+([^.]+)',
-    r'works\s+with\s+([^.]+)',
-    r'connect(?:s)?\s+to\s+([^.]+)',
-    r'support(?:s)?\s+([^.]+)',
-]
+async def search_duckduckgo(client: httpx.AsyncClient, query: str, max_results: int = 5) -> list:
+    """Search DuckDuckGo for information about a tool (via the shared search service)."""
+    return await search_service.search(client, query, max_results=max_results)
 
 
-def extract_pricing_info(text: str) -> dict:
-    """Extract pricing information from text."""
-    text_lower = text.lower()
-    pricing = {
-        "has_free_tier": False,
-        "is_open_source": False,
-        "prices_found": [],
+async def scrape_tool_website(client: httpx.AsyncClient, url: str) -> dict:
+    """Scrape comprehensive metadata from a tool's website (via the shared website metadata service)."""
+    record = await get_website_metadata_service().get(client, url)
+    if "error" in record:
+        return {"error": record["error"]}
+    
+    meta, links, features = record["meta"] or {}, record["links"] or {}, record["features"] or {}
+    return {
+        "url": record["final_url"],
+        "title": meta.get("title"),
+        "description": meta.get("description"),
+        "og": meta.get("og"),
+        "twitter": meta.get("twitter"),
+        "keywords": meta.get("keywords", []),
+        "pricing": record["pricing"],
+        "features_detected": features.get("keywords", []),
+        "integrations_detected": features.get("integrations", []),
+        "github_links": links.get("github_links", []),
+        "social_links": links.get("social_links", {}),
+        "docs_url": links.get("docs_url"),
+        "pricing_url": links.get("pricing_url"),
+        "changelog_url": links.get("changelog_url"),
+        "schema_org": meta.get("schema_org"),
+        "scraped_at": record["fetched_at"],
     }
-    
-    if "free" in text_lower and any(x in text_lower for x in ["tier", "plan", "forever", "trial"]):
-        pricing["has_free_tier"] = True
-    
-    if "open source" in text_lower or "open-source" in text_lower:
-        pricing["is_open_source"] = True
-    
-    for pattern in PRICING_PATTERNS:
-        matches = re.findall(pattern, text_lower)
-        for match in matches:
-            if match and match not in pricing["prices_found"]:
-                pricing["prices_found"].append(match)
-    
-    return pricing
-
-
-def extract_features(text: str) -> list[str]:
-    """Extract feature keywords from text."""
-    text_lower = text.lower()
-    found_features = []
-    
-    for feature in FEATURE_KEYWORDS:
-        if feature in text_lower:
-            found_features.append(feature)
-    
-    return found_features
 
 
-def extract_integrations(text: str) -> list[str]:
-    """Extract integration mentions from text."""
-    integrations = []
-    
-    for pattern in INTEGRATION_PATTERNS:
-        matches = re.findall(pattern, text, re.IGNORECASE)
-        for match in matches:
-            items = re.split(r',\s*|\s+and\s+|\s+or\s+', match)
-            integrations.extend([i.strip() for i in items if len(i.strip()) > 2])
-    
-    return list(set(integrations))[:20]
-
-
-async def search_duckduckgo(client: httpx.AsyncClient, query: str, max_results: int = 5) -> list:
-    """Search DuckDuckGo for information about a tool."""
-    url = "https://html.duckduckgo.com/html/"
-    
-    await rate_limiter.wait()
-    
-    headers = get_realistic_headers()
-    
-    async def _search():
-        return await client.post(url, data={"q": query}, headers=headers)
+async def search_tool_info(
+    tool_name: str,
+    tool_url: Optional[str] = None,
+    client: Optional[httpx.AsyncClient] = None,
+) -> dict:
+    """Search for comprehensive information about a tool."""
+    if client is None:
+        async with create_client_with_limits(timeout=30.0) as own_client:
+            return await search_tool_info(tool_name, tool_url, own_client)
+    
+    result = {
+        "name": tool_name,
+        "search_results": [],
+        "website_metadata": None,
+    }
     
-    try:
-        response = await retry_with_backoff(_search, max_retries=2)
-        if response.status_code != 200:
-            return []
-        
-        soup = BeautifulSoup(response.text, "lxml")
-        results = []
-        
-        for result in soup.select(".result")[:max_results]:
-            title_elem = result.select_one(".result__title")
-            snippet_elem = result.select_one(".result__snippet")
-            link_elem = result.select_one(".result__url")
-            
-            if title_elem:
-                # Extract actual URL from DuckDuckGo redirect
-                link = ""
-                a_tag = title_elem.select_one("a")
-                if a_tag and a_tag.get("href"):
-                    href = a_tag.get("href", "")
-                    # DuckDuckGo uses redirect URLs, extract the actual URL
-                    if "uddg=" in href:
-                        import urllib.parse
-                        parsed = urllib.parse.parse_qs(urllib.parse.urlparse(href).query)
-                        link = parsed.get("uddg", [""])[0]
-                    else:
-                        link = href
-                
-                results.append({
-                    "title": title_elem.get_text(strip=True),
-                    "snippet": snippet_elem.get_text(strip=True) if snippet_elem else "",
-                    "url": link,
-                })
-        
-        await random_delay(0.5, 1.5)
-        return results
-    except Exception as e:
-        print(f"Search error for '{query}': {e}")
-        return []
-
-
-async def scrape_tool_website(client: httpx.AsyncClient, url: str) -> dict:
-    """Scrape comprehensive metadata from a tool's website."""
-    await rate_limiter.wait()
+    # Search for the tool
+    queries = [
+        f"{tool_name} developer tool",
+        f"{tool_name} pricing features",
+        f"{tool_name} vs alternatives comparison",
+    ]
     
-    headers = get_realistic_headers()
+    for query in queries:
+        search_results = await search_duckduckgo(client, query, max_results=3)
+        result["search_results"].extend(search_results)
     
-    async def _fetch():
-        return await client.get(url, headers=headers, follow_redirects=True, timeout=15.0)
+    # Scrape the tool's website if provided
+    if tool_url:
+        result["website_metadata"] = await scrape_tool_website(client, tool_url)
     
-    try:
-        response = await retry_with_backoff(_fetch, max_retries=2)
-        if response.status_code != 200:
-            return {"error": f"HTTP {response.status_code}"}
-        
-        soup = BeautifulSoup(response.text, "lxml")
-        page_text = soup.get_text(separator=" ", strip=True)
-        
-        title = soup.title.string if soup.title else None
-        
-        meta_desc = soup.find("meta", attrs={"name": "description"})
-        description = meta_desc.get("content") if meta_desc else None
-        
-        og_title = soup.find("meta", property="og:title")
-        og_desc = soup.find("meta", property="og:description")
-        og_image = soup.find("meta", property="og:image")
-        og_type = soup.find("meta", property="og:type")
-        og_site = soup.find("meta", property="og:site_name")
-        
-        twitter_title = soup.find("meta", attrs={"name": "twitter:title"})
-        twitter_desc = soup.find("meta", attrs={"name": "twitter:description"})
-        twitter_image = soup.find("meta", attrs={"name": "twitter:image"})
-        twitter_creator = soup.find("meta", attrs={"name": "twitter:creator"})
-        
-        meta_keywords = soup.find("meta", attrs={"name": "keywords"})
-        keywords = meta_keywords.get("content").split(",") if meta_keywords and meta_keywords.get("content") else []
-        
-        pricing_info = extract_pricing_info(page_text)
-        features = extract_features(page_text)
-        integrations = extract_integrations(page_text)
-        
-        github_links = []
-        for a in soup.find_all("a", href=True):
-            href = a.get("href", "")
-            if "github.com" in href and href not in github_links:
-                github_links.append(href)
-        
-        social_links = {}
-        for a in soup.find_all("a", href=True):
-            href = a.get("href", "")
-            if "twitter.com" in href or "x.com" in href:
-                social_links["twitter"] = href
-            elif "discord" in href:
-                social_links["discord"] = href
-            elif "linkedin.com" in href:
-                social_links["linkedin"] = href
-            elif "youtube.com" in href:
-                social_links["youtube"] = href
-        
-        docs_link = None
-        for a in soup.find_all("a", href=True):
-            text = a.get_text(strip=True).lower()
-            href = a.get("href", "")
-            if any(x in text for x in ["docs", "documentation", "api reference"]):
-                docs_link = href if href.startswith("http") else f"{url.rstrip('/')}/{href.lstrip('/')}"
-                break
-        
-        pricing_link = None
-        for a in soup.find_all("a", href=True):
-            text = a.get_text(strip=True).lower()
-            href = a.get("href", "")
-            if "pricing" in text or "pricing" in href:
-                pricing_link = href if href.startswith("http") else f"{url.rstrip('/')}/{href.lstrip('/')}"
-                break
-        
-        changelog_link = None
-        for a in soup.find_all("a", href=True):
-            text = a.get_text(strip=True).lower()
-            href = a.get("href", "")
-            if any(x in text or x in href for x in ["changelog", "releases", "what's new"]):
-                changelog_link = href if href.startswith("http") else f"{url.rstrip('/')}/{href.lstrip('/')}"
-                break
-        
-        schema_org = None
-        for script in soup.find_all("script", type="application/ld+json"):
-            try:
-                schema_org = json.loads(script.string)
-                break
-            except:
-                pass
-        
-        return {
-            "url": str(response.url),
-            "title": title,
-            "description": description,
-            "og": {
-                "title": og_title.get("content") if og_title else None,
-                "description": og_desc.get("content") if og_desc else None,
-                "image": og_image.get("content") if og_image else None,
-                "type": og_type.get("content") if og_type else None,
-                "site_name": og_site.get("content") if og_site else None,
-            },
-            "twitter": {
-                "title": twitter_title.get("content") if twitter_title else None,
-                "description": twitter_desc.get("content") if twitter_desc else None,
-                "image": twitter_image.get("content") if twitter_image else None,
-                "creator": twitter_creator.get("content") if twitter_creator else None,
-            },
-            "keywords": [k.strip() for k in keywords[:20]],
-            "pricing": pricing_info,
-            "features_detected": features,
-            "integrations_detected": integrations,
-            "github_links": github_links[:5],
-            "social_links": social_links,
-            "docs_url": docs_link,
-            "pricing_url": pricing_link,
-            "changelog_url": changelog_link,
-            "schema_org": schema_org,
-            "scraped_at": datetime.now().isoformat(),
-        }
-        await random_delay(0.3, 0.8)
-    except Exception as e:
-        return {"error": str(e)}
-
-
-async def search_tool_info(tool_name: str, tool_url: Optional[str] = None) -> dict:
-    """Search for comprehensive information about a tool."""
-    async with create_client_with_limits(timeout=30.0) as client:
-        result = {
-            "name": tool_name,
-            "search_results": [],
-            "website_metadata": None,
-        }
-        
-        # Search for the tool
-        queries = [
-            f"{tool_name} developer tool",
-            f"{tool_name} pricing features",
-            f"{tool_name} vs alternatives comparison",
-        ]
-        
-        for query in queries:
-            search_results = await search_duckduckgo(client, query, max_results=3)
-            result["search_results"].extend(search_results)
-            await random_delay(1.0, 2.0)
-        
-        # Scrape the tool's website if provided
-        if tool_url:
-            result["website_metadata"] = await scrape_tool_website(client, tool_url)
-        
-        return result
+    return result
 
 
-async def search_multiple_tools(tools: list[dict]) -> dict:
-    """Search for information about multiple tools."""
+async def search_multiple_tools(tools: list[dict], concurrency: int = 4) -> dict:
+    """
+    Search for information about multiple tools.
+    
+    Tools are processed concurrently on one client; DuckDuckGo pacing
+    comes from the search service's shared limiter rather than per-tool
+    sleeps.
+    """
     results = {}
+    semaphore = asyncio.Semaphore(concurrency)
     
-    for tool in tools:
-        name = tool.get("name")
-        url = tool.get("url")
+    async with create_client_with_limits(timeout=30.0) as client:
+        async def search_one(tool: dict):
+            name = tool.get("name")
+            async with semaphore:
+                print(f"Searching for: {name}")
+                results[name] = await search_tool_info(name, tool.get("url"), client)
         
-        print(f"Searching for: {name}")
-        results[name] = await search_tool_info(name, url)
-        await random_delay(2.0, 4.0)
+        await asyncio.gather(*(search_one(tool) for tool in tools))
     
-    return results
+    get_website_metadata_service().save()
+    print(f"Search service: {search_service.get_stats()}")
+    print(f"Website metadata: {get_website_metadata_service().get_stats()}")
+    return {tool.get("name"): results[tool.get("name")] for tool in tools}
 
 
 # Tools to search for - Comprehensive list
@@ -489,11 +280,7 @@ if __name__ == "__main__":
     async def main():
         results = await search_multiple_tools(TOOLS_TO_SEARCH)
         
-        output_path = os.path.join(os.path.dirname(__file__), "data", "web_search.json")
-        os.makedirs(os.path.dirname(output_path), exist_ok=True)
-        
-        with open(output_path, "w") as f:
-            json.dump(results, f, indent=2)
+        output_path = await save_artifact_async("web_search", results, layout="mapping")
         
         print(f"\nSaved search results for {len(results)} tools to {output_path}")
     
@@ -0,0 +1,430 @@
+"""
+Website Metadata - One fetch and one parse per website, shared by every scraper
+Registered extractors (meta/OG, links, features, pricing, tech) run together and their output is cached per URL
+"""
+import os
+import re
+import json
+import asyncio
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Callable, Optional
+from urllib.parse import urljoin
+import httpx
+from bs4 import BeautifulSoup
+from bot_avoidance import get_realistic_headers, retry_with_backoff
+from tech_fingerprints import get_fingerprint_engine
+
+
+DATA_DIR = os.path.join(os.path.dirname(__file__), "data")
+
+
+PRICING_PATTERNS = [
+    r'\$(\d+(?:\.\d{2})?)\s*(?:/\s*(?:mo|month|user|seat))?',
+    r'(\d+)\s*(?:USD|dollars?)\s*(?:per\s*)?(?:month|mo|user)?',
+    r'free\s*(?:tier|plan|forever)?',
+    r'open\s*source',
+    r'(?:starts?\s*(?:at|from)\s*)?\$(\d+)',
+]
+
+FEATURE_KEYWORDS = [
+    "ai-powered", "real-time", "collaboration", "api", "sdk", "cli",
+    "self-hosted", "cloud", "serverless", "edge", "typescript",
+    "react", "vue", "svelte", "next.js", "authentication", "database",
+    "analytics", "monitoring", "testing", "deployment", "ci/cd",
+    "open source", "enterprise", "team", "solo", "free tier",
+]
+
+INTEGRATION_PATTERNS = [
+    r'integrat(?:es?|ion)\s+with\s+([^.]+)',
+    r'works\s+with\s+([^.]+)',
+    r'connect(?:s)?\s+to\s+([^.]+)',
+    r'support(?:s)?\s+([^.]+)',
+]
+
+WORKFLOW_FEATURE_INDICATORS = [
+    ("parallel execution", "Parallel agent execution"),
+    ("git worktree", "Git worktree isolation"),
+    ("code review", "AI code review"),
+    ("multi-agent", "Multi-agent support"),
+    ("mcp", "MCP integration"),
+    ("vs code", "VS Code extension"),
+    ("vscode", "VS Code extension"),
+    ("cli", "CLI interface"),
+    ("terminal", "Terminal-based"),
+    ("autonomous", "Autonomous operation"),
+    ("self-healing", "Self-healing code"),
+    ("context", "Context-aware"),
+]
+
+AGENT_NAMES = ["claude code", "gemini cli", "aider", "copilot", "cursor", "cline", "opencode", "amp"]
+
+def extract_pricing_info(text: str) -> dict:
+    """Extract pricing information from text."""
+    text_lower = text.lower()
+    pricing = {
+        "has_free_tier": False,
+        "is_open_source": False,
+        "prices_found": [],
+    }
+
+    if "free" in text_lower and any(x in text_lower for x in ["tier", "plan", "forever", "trial"]):
+        pricing["has_free_tier"] = True
+
+    if "open source" in text_lower or "open-source" in text_lower:
+        pricing["is_open_source"] = True
+
+    for pattern in PRICING_PATTERNS:
+        matches = re.findall(pattern, text_lower)
+        for match in matches:
+            if match and match not in pricing["prices_found"]:
+                pricing["prices_found"].append(match)
+
+    return pricing
+
+
+def extract_features(text: str) -> list[str]:
+    """Extract feature keywords from text."""
+    text_lower = text.lower()
+    found_features = []
+
+    for feature in FEATURE_KEYWORDS:
+        if feature in text_lower:
+            found_features.append(feature)
+
+    return found_features
+
+
+def extract_integrations(text: str) -> list[str]:
+    """Extract integration mentions from text."""
+    integrations = []
+
+    for pattern in INTEGRATION_PATTERNS:
+        matches = re.findall(pattern, text, re.IGNORECASE)
+        for match in matches:
+            items = re.split(r',\s*|\s+and\s+|\s+or\s+', match)
+            integrations.extend([i.strip() for i in items if len(i.strip()) > 2])
+
+    return list(set(integrations))[:20]
+
+
+class Page:
+    """A fetched page, parsed once and shared by every extractor."""
+
+    def __init__(self, url: str, html: str, headers: dict, cookies: Optional[dict] = None):
+        self.url = url
+        self.html = html
+        self.headers = {k.lower(): v for k, v in headers.items()}
+        self.cookies = cookies or {}
+        self.soup = BeautifulSoup(html, "lxml")
+        self.text = self.soup.get_text(separator=" ", strip=True)
+        self.text_lower = self.text.lower()
+
+    def meta(self, **attrs) -> Optional[str]:
+        tag = self.soup.find("meta", attrs=attrs)
+        return tag.get("content") if tag else None
+
+    def absolute(self, href: str) -> str:
+        return href if href.startswith("http") else urljoin(self.url, href)
+
+
+EXTRACTORS: dict[str, Callable[[Page], dict]] = {}
+EXTRACTOR_VERSIONS: dict[str, int] = {}
+
+
+def register_extractor(name: str, version: int = 1):
+    """
+    Register an extractor run on every fetched page.
+
+    Bump the version when an extractor's output changes, so stored records
+    built by an older version are re-extracted.
+
+    Example:
+        @register_extractor("pricing")
+        def extract_pricing(page: Page) -> dict:
+            ...
+    """
+    def decorator(fn: Callable[[Page], dict]):
+        EXTRACTORS[name] = fn
+        EXTRACTOR_VERSIONS[name] = version
+        return fn
+    return decorator
+
+
+def is_current(record: dict) -> bool:
+    """Whether a record holds the output of every registered extractor at its current version."""
+    built = record.get("extractor_versions", {})
+    return all(
+        built.get(name, 1 if name in record else None) == version
+        for name, version in EXTRACTOR_VERSIONS.items()
+    )
+
+
+@register_extractor("meta")
+def extract_meta(page: Page) -> dict:
+    soup = page.soup
+    keywords = page.meta(name="keywords")
+
+    schema_org = None
+    for script in soup.find_all("script", type="application/ld+json"):
+        try:
+            schema_org = json.loads(script.string)
+            break
+        except Exception:
+            pass
+
+    return {
+        "title": soup.title.string.strip() if soup.title and soup.title.string else None,
+        "description": page.meta(name="description"),
+        "og": {
+            "title": page.meta(property="og:title"),
+            "description": page.meta(property="og:description"),
+            "image": page.meta(property="og:image"),
+            "type": page.meta(property="og:type"),
+            "site_name": page.meta(property="og:site_name"),
+        },
+        "twitter": {
+            "title": page.meta(name="twitter:title"),
+            "description": page.meta(name="twitter:description"),
+            "image": page.meta(name="twitter:image"),
+            "creator": page.meta(name="twitter:creator"),
+        },
+        "keywords": [k.strip() for k in keywords.split(",")[:20]] if keywords else [],
+        "schema_org": schema_org,
+    }
+
+
+@register_extractor("links")
+def extract_links(page: Page) -> dict:
+    github_links = []
+    github_url = None
+    social_links = {}
+    docs_url = pricing_url = changelog_url = None
+
+    for a in page.soup.find_all("a", href=True):
+        href = a.get("href", "")
+        text = a.get_text(strip=True).lower()
+
+        if "github.com" in href:
+            if href not in github_links:
+                github_links.append(href)
+            if github_url is None and "/issues" not in href and "/pull" not in href:
+                github_url = href
+
+        if "twitter.com" in href or "x.com" in href:
+            social_links["twitter"] = href
+        elif "discord" in href:
+            social_links["discord"] = href
+        elif "linkedin.com" in href:
+            social_links["linkedin"] = href
+        elif "youtube.com" in href:
+            social_links["youtube"] = href
+
+        if docs_url is None and any(x in text for x in ["docs", "documentation", "api reference"]):
+            docs_url = page.absolute(href)
+        if pricing_url is None and ("pricing" in text or "pricing" in href):
+            pricing_url = page.absolute(href)
+        if changelog_url is None and any(x in text or x in href for x in ["changelog", "releases", "what's new"]):
+            changelog_url = page.absolute(href)
+
+    return {
+        "github_links": github_links[:5],
+        "github_url": github_url,
+        "social_links": social_links,
+        "docs_url": docs_url,
+        "pricing_url": pricing_url,
+        "changelog_url": changelog_url,
+    }
+
+
+@register_extractor("features")
+def extract_feature_signals(page: Page) -> dict:
+    return {
+        "keywords": extract_features(page.text),
+        "integrations": extract_integrations(page.text),
+        "workflow": sorted({name for keyword, name in WORKFLOW_FEATURE_INDICATORS if keyword in page.text_lower}),
+        "supported_agents": sorted({agent.title() for agent in AGENT_NAMES if agent in page.text_lower}),
+    }
+
+
+@register_extractor("pricing")
+def extract_pricing(page: Page) -> dict:
+    return extract_pricing_info(page.text)
+
+
+@register_extractor("tech", version=2)
+def extract_tech(page: Page) -> dict:
+    engine = get_fingerprint_engine()
+    scripts = [tag["src"] for tag in page.soup.find_all("script", src=True)]
+    meta = {
+        tag["name"].lower(): tag.get("content", "")
+        for tag in page.soup.find_all("meta", attrs={"name": True})
+    }
+    found = engine.analyze(page.html, page.headers, page.cookies, scripts, meta)
+    return {
+        "by_category": engine.by_category(found),
+        "versions": {name: version for name, version in found.items() if version},
+    }
+
+
+class WebsiteMetadataService:
+    """
+    Fetches each website at most once per TTL and caches its combined record.
+
+    Within the TTL a stored record is returned without any request. After
+    it, the page is revalidated with If-None-Match / If-Modified-Since; a
+    304 keeps the record, anything else is re-extracted. A record missing
+    the output of a registered extractor, or built by an older version of
+    one, counts as stale. Concurrent
+    requests for one URL share a single fetch.
+    """
+
+    def __init__(
+        self,
+        store_file: Optional[str] = None,
+        ttl_hours: int = 24,
+        concurrency: int = 8,
+        autosave_every: int = 25,
+    ):
+        """
+        Initialize the service.
+
+        Args:
+            store_file: Path to the record store (defaults to data/website_metadata.json)
+            ttl_hours: Age after which a record is revalidated
+            concurrency: Maximum website fetches in flight
+            autosave_every: Save after this many updated records
+        """
+        if store_file is None:
+            store_file = os.path.join(DATA_DIR, "website_metadata.json")
+        self.store_file = Path(store_file)
+        self.store_file.parent.mkdir(parents=True, exist_ok=True)
+        self.ttl = timedelta(hours=ttl_hours)
+        self.semaphore = asyncio.Semaphore(concurrency)
+        self.autosave_every = autosave_every
+        self.entries: dict[str, dict] = self._load_store()
+        self.stats = {"fresh": 0, "revalidated": 0, "fetched": 0, "errors": 0}
+        self._in_flight: dict[str, asyncio.Future] = {}
+        self._unsaved = 0
+
+    def _load_store(self) -> dict:
+        """Load stored records from disk."""
+        if self.store_file.exists():
+            try:
+                with open(self.store_file, 'r') as f:
+                    return json.load(f).get('sites', {})
+            except Exception:
+                return {}
+        return {}
+
+    def save(self):
+        """Atomically write the store to disk if it changed."""
+        if not self._unsaved:
+            return
+
+        tmp_file = self.store_file.with_suffix(self.store_file.suffix + ".tmp")
+        with open(tmp_file, 'w') as f:
+            json.dump({'sites': self.entries}, f, indent=2, sort_keys=True)
+        os.replace(tmp_file, self.store_file)
+        self._unsaved = 0
+
+    def _touch(self, url: str, entry: dict):
+        self.entries[url] = entry
+        self._unsaved += 1
+        if self.autosave_every and self._unsaved >= self.autosave_every:
+            self.save()
+
+    async def get(self, client: httpx.AsyncClient, url: str) -> dict:
+        """
+        Get the combined metadata record for a website.
+
+        Returns:
+            {"url", "final_url", "fetched_at", "validated_at", <extractor>: ...}
+            or {"url", "error"} if the site could not be fetched
+        """
+        entry = self.entries.get(url)
+        if entry and is_current(entry["record"]):
+            validated_at = datetime.fromisoformat(entry["record"]["validated_at"])
+            if datetime.now() - validated_at <= self.ttl:
+                self.stats["fresh"] += 1
+                return entry["record"]
+
+        if url not in self._in_flight:
+            self._in_flight[url] = asyncio.ensure_future(self._refresh(client, url, entry))
+        try:
+            return await asyncio.shield(self._in_flight[url])
+        finally:
+            self._in_flight.pop(url, None)
+
+    async def _refresh(self, client: httpx.AsyncClient, url: str, entry: Optional[dict]) -> dict:
+        headers = get_realistic_headers()
+        complete = entry is not None and is_current(entry["record"])
+        if complete:
+            if entry.get("etag"):
+                headers["If-None-Match"] = entry["etag"]
+            if entry.get("last_modified"):
+                headers["If-Modified-Since"] = entry["last_modified"]
+
+        async def _fetch():
+            return await client.get(url, headers=headers, follow_redirects=True, timeout=15.0)
+
+        try:
+            async with self.semaphore:
+                response = await retry_with_backoff(_fetch, max_retries=2)
+        except Exception as e:
+            self.stats["errors"] += 1
+            return {"url": url, "error": str(e)}
+
+        now = datetime.now().isoformat()
+        if response.status_code == 304 and complete:
+            self.stats["revalidated"] += 1
+            entry["record"]["validated_at"] = now
+            self._touch(url, entry)
+            return entry["record"]
+
+        if response.status_code != 200:
+            self.stats["errors"] += 1
+            return {"url": url, "error": f"HTTP {response.status_code}"}
+
+        self.stats["fetched"] += 1
+        cookies = {cookie.name: cookie.value for cookie in response.cookies.jar}
+        page = Page(str(response.url), response.text, dict(response.headers), cookies)
+        record = {
+            "url": url,
+            "final_url": page.url,
+            "fetched_at": now,
+            "validated_at": now,
+            "extractor_versions": dict(EXTRACTOR_VERSIONS),
+        }
+        for name, extractor in EXTRACTORS.items():
+            try:
+                record[name] = extractor(page)
+            except Exception as e:
+                print(f"  Extractor {name} failed for {url}: {e}")
+                record[name] = None
+
+        self._touch(url, {
+            "record": record,
+            "etag": response.headers.get("etag"),
+            "last_modified": response.headers.get("last-modified"),
+        })
+        return record
+
+    def get_stats(self) -> dict:
+        """Get service statistics."""
+        return {
+            **self.stats,
+            'sites': len(self.entries),
+            'store_file': str(self.store_file),
+        }
+
+
+_shared_service: Optional[WebsiteMetadataService] = None
+
+
+def get_website_metadata_service() -> WebsiteMetadataService:
+    """Process-wide service, so scrapers running together share fetches."""
+    global _shared_service
+    if _shared_service is None:
+        _shared_service = WebsiteMetadataService()
+    return _shared_service